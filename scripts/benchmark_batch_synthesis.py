@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""一括合成のスループットベンチマーク.
+
+ローカルに模擬VOICEVOX Engine（固定遅延つき）を立て、逐次のspeakとspeak_manyで
+複数行を合成する時間を比較する。/multi_synthesis対応・非対応の両方のEngineで計測する。
+
+使い方:
+    uv run python scripts/benchmark_batch_synthesis.py
+    uv run python scripts/benchmark_batch_synthesis.py --lines 20 --latency 0.05 --concurrency 4
+"""
+
+import argparse
+import io
+import json
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import numpy as np
+import soundfile as sf
+
+from ping_tuber_kai.voicevox.client import VoicevoxClient
+
+
+def _wav(seconds: float) -> bytes:
+    buffer = io.BytesIO()
+    sf.write(buffer, np.zeros(int(24000 * seconds), dtype=np.float32), 24000, format="WAV")
+    return buffer.getvalue()
+
+
+def _query(text: str) -> dict:
+    moras = [
+        {
+            "text": "ア",
+            "consonant": None,
+            "consonant_length": None,
+            "vowel": "a",
+            "vowel_length": 0.1,
+            "pitch": 5.5,
+        }
+        for _ in text
+    ]
+    return {
+        "accent_phrases": [{"moras": moras, "accent": 1, "pause_mora": None}],
+        "speedScale": 1.0,
+        "pitchScale": 0.0,
+        "intonationScale": 1.0,
+        "volumeScale": 1.0,
+        "prePhonemeLength": 0.1,
+        "postPhonemeLength": 0.1,
+        "outputSamplingRate": 24000,
+        "outputStereo": False,
+        "kana": text,
+    }
+
+
+def make_handler(latency: float, synthesis_cost: float, multi: bool) -> type:
+    """模擬Engineのリクエストハンドラを作成.
+
+    Args:
+        latency: リクエストごとの固定遅延（秒、ネットワーク往復相当）
+        synthesis_cost: 1発話あたりの合成時間（秒）
+        multi: /multi_synthesisに対応するか
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args) -> None:
+            pass
+
+        def _reply(self, status: int, body: bytes, content_type: str) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self) -> None:  # noqa: N802
+            url = urlparse(self.path)
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(latency)
+
+            if url.path == "/audio_query":
+                text = url.query.split("text=")[1].split("&")[0]
+                self._reply(200, json.dumps(_query(text)).encode(), "application/json")
+            elif url.path == "/synthesis":
+                time.sleep(synthesis_cost)
+                self._reply(200, _wav(0.5), "audio/wav")
+            elif url.path == "/multi_synthesis" and multi:
+                queries = json.loads(body)
+                time.sleep(synthesis_cost * len(queries))
+                archive = io.BytesIO()
+                with zipfile.ZipFile(archive, "w") as zf:
+                    for i in range(len(queries)):
+                        zf.writestr(f"{i + 1:03}.wav", _wav(0.5))
+                self._reply(200, archive.getvalue(), "application/zip")
+            else:
+                self._reply(404, b"{}", "application/json")
+
+    return Handler
+
+
+def run(name: str, func, lines: int) -> None:
+    """計測して結果を表示."""
+    started = time.perf_counter()
+    results = func()
+    elapsed = time.perf_counter() - started
+    assert len(results) == lines
+    print(f"{name:<28} {elapsed * 1000:>8.1f} ms {lines / elapsed:>8.1f} lines/s")
+
+
+def main() -> None:
+    """メイン関数."""
+    parser = argparse.ArgumentParser(description="一括合成のスループットベンチマーク")
+    parser.add_argument("--lines", type=int, default=20, help="合成する行数")
+    parser.add_argument("--latency", type=float, default=0.03, help="リクエストごとの遅延（秒）")
+    parser.add_argument("--cost", type=float, default=0.01, help="1発話の合成時間（秒）")
+    parser.add_argument("--concurrency", type=int, default=4, help="最大同時接続数")
+    args = parser.parse_args()
+
+    texts = [f"line{i}" for i in range(args.lines)]
+    for multi in (True, False):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.latency, args.cost, multi))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host = f"http://127.0.0.1:{server.server_address[1]}"
+        print(f"--- mock engine (multi_synthesis={'yes' if multi else 'no'}) ---")
+
+        with VoicevoxClient(host=host) as client:
+            run("sequential speak", lambda: [client.speak(t) for t in texts], args.lines)
+        with VoicevoxClient(host=host) as client:
+            run(
+                "speak_many",
+                lambda: client.speak_many(texts, max_concurrency=args.concurrency),
+                args.lines,
+            )
+
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
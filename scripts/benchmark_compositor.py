@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""レイヤー合成の描画量・アセットメモリのベンチマーク.
+
+早口の発話（母音の繰り返し）の口形状ブレンドを1フレームずつ描画し、
+毎フレーム全体を描き直す従来方式と、変化した矩形だけを描き直すレイヤー合成で
+1フレームあたりの描画画素数と、口形状画像の画素データのメモリを比較する。
+ウィンドウは開かない（SDLのdummyドライバ）。
+
+使い方:
+    uv run python scripts/benchmark_compositor.py
+    uv run python scripts/benchmark_compositor.py --assets assets/mouth --size 1920x1080
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+
+def main() -> None:
+    """メイン関数."""
+    parser = argparse.ArgumentParser(description="レイヤー合成のベンチマーク")
+    parser.add_argument("--assets", type=Path, default=None, help="口形状アセット（省略時は仮）")
+    parser.add_argument("--size", default="1920x1080", help="ウィンドウサイズ（幅x高さ）")
+    parser.add_argument("--seconds", type=float, default=5.0, help="発話の長さ")
+    args = parser.parse_args()
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+    import pygame
+
+    from ping_tuber_kai.lipsync.blend import create_blend_schedule
+    from ping_tuber_kai.lipsync.phoneme import PhonemeEvent
+    from ping_tuber_kai.output.pygame_window import PygameWindow
+
+    width, height = (int(v) for v in args.size.split("x"))
+    vowels = "aiueo" * int(args.seconds / 0.4 + 1)
+    timeline = [
+        PhonemeEvent(phoneme=v, start=i * 0.08, duration=0.08, is_vowel=True, is_voiced=True)
+        for i, v in enumerate(vowels)
+    ]
+    blend = create_blend_schedule(timeline, len(vowels) * 0.08, fps=60)
+
+    with tempfile.TemporaryDirectory() as empty:
+        assets = args.assets or Path(empty)
+        with PygameWindow(width=width, height=height, assets_dir=assets) as window:
+            frame_images = len(window._images) + len(window._variants)
+            bytesize = window.screen.get_bytesize()
+
+            start = time.perf_counter()
+            for frame in range(len(blend)):
+                window.set_blend(blend.at_frame(frame))
+                rects = window.draw()
+                if rects:
+                    pygame.display.update(rects)
+            per_frame = (time.perf_counter() - start) / len(blend)
+
+            layered_pixels = window.compositor.pixels_drawn / len(blend)
+            layered_bytes = window.asset_bytes
+            mouth = window.compositor.mouth_rect
+
+    full_pixels = width * height
+    full_bytes = frame_images * full_pixels * bytesize
+
+    print(f"{width}x{height}, {len(blend)} frames, mouth rect {mouth.width}x{mouth.height}")
+    print(f"{'':<16}{'pixels/frame':>14}{'assets (MiB)':>14}")
+    print(f"{'full frame':<16}{full_pixels:>14,.0f}{full_bytes / 2**20:>14.1f}")
+    print(f"{'layered':<16}{layered_pixels:>14,.0f}{layered_bytes / 2**20:>14.1f}")
+    print(
+        f"  pixels: {layered_pixels / full_pixels:.1%}, assets: {layered_bytes / full_bytes:.1%}"
+        f" of full frame; {per_frame * 1000:.2f} ms/frame"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""アイドル中のCPU使用率ベンチマーク.
+
+発話していないアプリのメインループを一定時間回し、60fpsで回し続ける場合
+（PING_TUBER_IDLE_SLEEP=false）と、次のまばたき・呼吸まで眠る場合のCPU使用率を比較する。
+ウィンドウは開かない（SDLのdummyドライバ）。
+
+使い方:
+    uv run python scripts/benchmark_idle.py
+    uv run python scripts/benchmark_idle.py --seconds 10
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import threading
+import time
+
+
+def child(seconds: float) -> None:
+    """計測対象のプロセス（seconds秒アイドルで回してCPU使用率をJSONで出力）."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+    from ping_tuber_kai.ui.app import App
+
+    with App(warmup=False) as app:
+        frames = 0
+        window = app.avatars[0].window
+        tick = window.tick
+
+        def counting_tick(fps: int | None = None) -> float:
+            nonlocal frames
+            frames += 1
+            return tick(fps)
+
+        window.tick = counting_tick
+        threading.Timer(seconds, app.stop).start()
+
+        before = resource.getrusage(resource.RUSAGE_SELF)
+        started = time.perf_counter()
+        app.run()
+        wall = time.perf_counter() - started
+        after = resource.getrusage(resource.RUSAGE_SELF)
+
+    cpu = (after.ru_utime + after.ru_stime) - (before.ru_utime + before.ru_stime)
+    print(json.dumps({"cpu": cpu / wall, "fps": frames / wall}))
+
+
+def measure(seconds: float, sleep: bool) -> dict:
+    """子プロセスで計測."""
+    env = {**os.environ, "PING_TUBER_IDLE_SLEEP": "true" if sleep else "false"}
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", "--seconds", str(seconds)],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> None:
+    """メイン関数."""
+    parser = argparse.ArgumentParser(description="アイドル中のCPU使用率ベンチマーク")
+    parser.add_argument("--seconds", type=float, default=5.0, help="計測時間")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.seconds)
+        return
+
+    print(f"idle main loop, {args.seconds:.1f}s")
+    print(f"{'':<16}{'CPU':>8}{'loop/s':>10}")
+    for label, sleep in (("60fps spin", False), ("idle sleep", True)):
+        result = measure(args.seconds, sleep)
+        print(f"{label:<16}{result['cpu']:>8.1%}{result['fps']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
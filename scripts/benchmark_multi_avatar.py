@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""複数アバターのリソース使用量ベンチマーク.
+
+N体のアバターを「1体ずつ別プロセス」で動かした場合と「1プロセスでN体」動かした場合の
+CPU時間・最大RSSの合計を比較する。ウィンドウは開かず（SDLのdummyドライバ）、
+各プロセスは出力ストリームを開いてから一定時間フレームループを回す。
+
+使い方:
+    uv run python scripts/benchmark_multi_avatar.py
+    uv run python scripts/benchmark_multi_avatar.py --avatars 3 --seconds 5
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+
+def child(avatars: int, seconds: float) -> None:
+    """計測対象のプロセス（avatars体をseconds秒動かして使用量をJSONで出力）."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+    import pygame
+
+    from ping_tuber_kai.ui.app import App
+    from ping_tuber_kai.ui.avatar import AvatarConfig
+
+    configs = [AvatarConfig(f"avatar{i}", speaker_id=i + 1) for i in range(avatars)]
+    with App(avatars=configs, warmup=False) as app:
+        for avatar in app.avatars:
+            avatar.sync_engine.player.warm_up()
+
+        primary = app.avatars[0].window
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            dirty = []
+            for avatar in app.avatars:
+                avatar.update()
+                dirty.extend(avatar.window.draw())
+            primary.handle_events()
+            if dirty:
+                pygame.display.update(dirty)
+            primary.tick()
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    print(json.dumps({"cpu": usage.ru_utime + usage.ru_stime, "rss_kb": usage.ru_maxrss}))
+
+
+def spawn(avatars: int, seconds: float) -> subprocess.Popen:
+    """計測対象のプロセスを起動."""
+    return subprocess.Popen(
+        [sys.executable, __file__, "--child", str(avatars), "--seconds", str(seconds)],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+
+
+def collect(processes: list[subprocess.Popen]) -> tuple[float, float]:
+    """CPU時間（秒）と最大RSS（MiB）の合計."""
+    cpu = rss = 0.0
+    for process in processes:
+        out, _ = process.communicate()
+        result = json.loads(out.strip().splitlines()[-1])
+        cpu += result["cpu"]
+        rss += result["rss_kb"] / 1024
+    return cpu, rss
+
+
+def main() -> None:
+    """メイン関数."""
+    parser = argparse.ArgumentParser(description="複数アバターのリソース使用量ベンチマーク")
+    parser.add_argument("--avatars", type=int, default=2, help="アバター数")
+    parser.add_argument("--seconds", type=float, default=3.0, help="フレームループを回す時間")
+    parser.add_argument("--child", type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        child(args.child, args.seconds)
+        return
+
+    n = args.avatars
+    separate = collect([spawn(1, args.seconds) for _ in range(n)])
+    shared = collect([spawn(n, args.seconds)])
+
+    print(f"{n} avatars, {args.seconds:.1f}s frame loop")
+    print(f"{'':<24}{'CPU (s)':>10}{'max RSS (MiB)':>16}")
+    print(f"{f'{n} processes x 1 avatar':<24}{separate[0]:>10.2f}{separate[1]:>16.1f}")
+    print(f"{f'1 process x {n} avatars':<24}{shared[0]:>10.2f}{shared[1]:>16.1f}")
+    print(f"  CPU: {shared[0] / separate[0]:.0%}, RSS: {shared[1] / separate[1]:.0%} of separate")
+
+
+if __name__ == "__main__":
+    main()
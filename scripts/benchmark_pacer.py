@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""フレームペーサーのベンチマーク.
+
+pygame.time.Clock.tickとFramePacerでフレームを待ち、フレーム間隔のぶれ（周期との差）と
+CPU時間を比較する。描画の代わりに毎フレーム一定時間の処理を挟む。
+
+使い方:
+    uv run python scripts/benchmark_pacer.py
+    uv run python scripts/benchmark_pacer.py --frames 600 --work 0.004
+"""
+
+import argparse
+import os
+import time
+
+
+def measure(wait, fps: int, frames: int, work: float) -> dict:
+    """waitでframes回待ち、間隔のぶれとCPU時間を返す."""
+    period = 1.0 / fps
+    errors = []
+    last = time.perf_counter()
+    cpu = time.process_time()
+    for _ in range(frames):
+        # 描画の代わり
+        until = time.perf_counter() + work
+        while time.perf_counter() < until:
+            pass
+        wait(fps)
+        now = time.perf_counter()
+        errors.append(abs(now - last - period))
+        last = now
+    cpu = time.process_time() - cpu
+    errors.sort()
+    return {
+        "mean": sum(errors) / len(errors),
+        "p99": errors[int(len(errors) * 0.99)],
+        "max": errors[-1],
+        "cpu": cpu / (frames * period),
+    }
+
+
+def main() -> None:
+    """メイン関数."""
+    parser = argparse.ArgumentParser(description="フレームペーサーのベンチマーク")
+    parser.add_argument("--frames", type=int, default=300, help="計測するフレーム数")
+    parser.add_argument("--work", type=float, default=0.002, help="1フレームの処理時間（秒）")
+    args = parser.parse_args()
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+    import pygame
+
+    from ping_tuber_kai.output.pacer import FramePacer
+
+    pygame.init()
+    print(f"{args.frames} frames, {args.work * 1000:.1f} ms work/frame")
+    print(f"{'':<20}{'mean (ms)':>10}{'p99 (ms)':>10}{'max (ms)':>10}{'CPU':>8}")
+    for fps in (60, 144):
+        clock = pygame.time.Clock()
+        pacer = FramePacer(fps=fps)
+        for label, wait in (("Clock.tick", clock.tick), ("FramePacer", pacer.wait)):
+            result = measure(wait, fps, args.frames, args.work)
+            print(
+                f"{label + f' @{fps}':<20}{result['mean'] * 1000:>10.3f}"
+                f"{result['p99'] * 1000:>10.3f}{result['max'] * 1000:>10.3f}{result['cpu']:>8.1%}"
+            )
+        print(f"  dropped: {pacer.stats.dropped}, spin: {pacer.stats.spin * 1000:.1f} ms total")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""AudioQueryのパース・再シリアライズのベンチマーク.
+
+長文相当のAudioQuery（コーパスを連結）について、以下を比較する。
+
+- 受信: response.json() + model_validate / model_validate_json / 軽量ビュー
+- 送信: model_dump(by_alias=True) + json.dumps / 受け取ったJSONをそのまま転送
+- タイムライン抽出: AudioQuery / 軽量ビュー
+
+使い方:
+    uv run python scripts/benchmark_query_parse.py
+    uv run python scripts/benchmark_query_parse.py --repeat 20 --iterations 200
+"""
+
+import argparse
+import json
+import timeit
+from pathlib import Path
+
+from ping_tuber_kai.lipsync.phoneme import extract_phoneme_timeline
+from ping_tuber_kai.voicevox.models import AudioQuery
+from ping_tuber_kai.voicevox.view import parse_query_view
+
+CORPUS = Path(__file__).parent.parent / "tests" / "data" / "audio_queries.json"
+
+
+def build_payload(repeat: int) -> bytes:
+    """コーパスのアクセント句を連結した長文AudioQueryのJSON."""
+    corpus = json.loads(CORPUS.read_text(encoding="utf-8"))
+    query = dict(corpus[0])
+    query["accent_phrases"] = [
+        phrase for _ in range(repeat) for item in corpus for phrase in item["accent_phrases"]
+    ]
+    return json.dumps(query, ensure_ascii=False).encode()
+
+
+def report(name: str, func, iterations: int) -> float:
+    """計測して1回あたりの時間を表示."""
+    seconds = min(timeit.repeat(func, number=iterations, repeat=5)) / iterations
+    print(f"{name:<40} {seconds * 1e6:>10.1f} us")
+    return seconds
+
+
+def main() -> None:
+    """メイン関数."""
+    parser = argparse.ArgumentParser(description="AudioQueryパースのベンチマーク")
+    parser.add_argument("--repeat", type=int, default=10, help="コーパスの連結回数")
+    parser.add_argument("--iterations", type=int, default=100, help="計測ごとの実行回数")
+    args = parser.parse_args()
+
+    payload = build_payload(args.repeat)
+    query = AudioQuery.from_json(payload)
+    view = parse_query_view(payload)
+    moras = sum(len(phrase.moras) for phrase in query.accent_phrases)
+    print(f"payload: {len(payload)} bytes, {moras} moras")
+    print()
+
+    n = args.iterations
+    print("# parse")
+    base = report(
+        "json.loads + model_validate", lambda: AudioQuery.model_validate(json.loads(payload)), n
+    )
+    fast = report(
+        "AudioQuery.from_json (model_validate_json)", lambda: AudioQuery.from_json(payload), n
+    )
+    lean = report("parse_query_view", lambda: parse_query_view(payload), n)
+    print(f"  model_validate_json: {base / fast:.1f}x, lean view: {base / lean:.1f}x")
+    print()
+
+    print("# synthesis payload")
+    dumped = query.model_copy(deep=True)
+    dumped.discard_raw_json()
+    base = report(
+        "json.dumps(model_dump(by_alias=True))",
+        lambda: json.dumps(dumped.model_dump(by_alias=True)).encode(),
+        n,
+    )
+    report("to_json (modified, model_dump_json)", dumped.to_json, n)
+    raw = report("to_json (unmodified, raw bytes)", query.to_json, n)
+    print(f"  raw forward: {base / raw:.0f}x")
+    print()
+
+    print("# timeline")
+    base = report(
+        "extract_phoneme_timeline(AudioQuery)", lambda: extract_phoneme_timeline(query), n
+    )
+    lean = report("extract_phoneme_timeline(view)", lambda: extract_phoneme_timeline(view), n)
+    print(f"  lean view: {base / lean:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
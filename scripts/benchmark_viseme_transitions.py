@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""口形状の切り替え回数ベンチマーク.
+
+旧来の母音のみマッピング（子音はすべて閉じ）と子音考慮マッピングで、
+AudioQueryコーパスの口形状切り替え回数を比較する。
+
+使い方:
+    # 保存済みAudioQuery（JSON、単体またはリスト）から
+    uv run python scripts/benchmark_viseme_transitions.py tests/data/audio_queries.json
+
+    # 起動中のVOICEVOX Engineから取得
+    uv run python scripts/benchmark_viseme_transitions.py --text こんにちは --text ありがとう
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from ping_tuber_kai.lipsync.phoneme import extract_phoneme_timeline
+from ping_tuber_kai.lipsync.stabilizer import count_transitions, stabilize_timeline
+from ping_tuber_kai.lipsync.viseme import VisemeMap
+from ping_tuber_kai.voicevox.client import VoicevoxClient
+from ping_tuber_kai.voicevox.models import AudioQuery
+
+
+def load_corpus(paths: list[Path]) -> list[AudioQuery]:
+    """JSONファイルからAudioQueryを読み込み."""
+    queries: list[AudioQuery] = []
+    for path in paths:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        items = data if isinstance(data, list) else [data]
+        queries.extend(AudioQuery.model_validate(item) for item in items)
+    return queries
+
+
+def fetch_corpus(texts: list[str], speaker_id: int | None) -> list[AudioQuery]:
+    """VOICEVOX EngineからAudioQueryを取得."""
+    with VoicevoxClient() as client:
+        return [client.audio_query(text, speaker_id) for text in texts]
+
+
+def main() -> None:
+    """メイン関数."""
+    parser = argparse.ArgumentParser(description="口形状の切り替え回数ベンチマーク")
+    parser.add_argument("paths", nargs="*", type=Path, help="AudioQuery JSONファイル")
+    parser.add_argument("--text", action="append", default=[], help="Engineから取得するテキスト")
+    parser.add_argument("--speaker", type=int, default=None, help="話者ID")
+    parser.add_argument("--save", type=Path, default=None, help="取得したコーパスの保存先")
+    args = parser.parse_args()
+
+    queries = load_corpus(args.paths)
+    if args.text:
+        fetched = fetch_corpus(args.text, args.speaker)
+        queries.extend(fetched)
+        if args.save is not None:
+            data = [q.model_dump(by_alias=True, mode="json") for q in fetched]
+            args.save.write_text(json.dumps(data, ensure_ascii=False, indent=1), encoding="utf-8")
+
+    if not queries:
+        parser.error("no AudioQuery given")
+
+    legacy_map = VisemeMap.vowels_only()
+    aware_map = VisemeMap()
+
+    totals = {"legacy": 0, "consonant": 0, "stabilized": 0}
+    print(f"{'#':>3} {'moras':>6} {'legacy':>7} {'consonant':>10} {'stabilized':>11}")
+    for i, query in enumerate(queries):
+        legacy = count_transitions(extract_phoneme_timeline(query, legacy_map))
+        aware_timeline = extract_phoneme_timeline(query, aware_map)
+        aware = count_transitions(aware_timeline)
+        stabilized = stabilize_timeline(aware_timeline).transitions_after
+        moras = sum(len(phrase.moras) for phrase in query.accent_phrases)
+
+        totals["legacy"] += legacy
+        totals["consonant"] += aware
+        totals["stabilized"] += stabilized
+        print(f"{i:>3} {moras:>6} {legacy:>7} {aware:>10} {stabilized:>11}")
+
+    print("-" * 41)
+    print(f"{'sum':>10} {totals['legacy']:>7} {totals['consonant']:>10} {totals['stabilized']:>11}")
+    removed = totals["legacy"] - totals["consonant"]
+    print(
+        f"consonant-aware mapping removes {removed} transitions "
+        f"({removed / max(totals['legacy'], 1):.0%})"
+    )
+
+
+if __name__ == "__main__":
+    main()
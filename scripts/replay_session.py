@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""記録したセッションの再現.
+
+`ping-tuber --record session.jsonl` で記録したセッションを再現し、締め切りに遅れた
+フレームと、記録と口形状が違ったフレームを表示する。口形状の生成を変更した前後で
+実行すれば、配信中の途切れや口形状の変化をオフラインで比較できる。
+
+使い方:
+    uv run python scripts/replay_session.py session.jsonl
+    uv run python scripts/replay_session.py session.jsonl --session 0 --show 50
+    uv run python scripts/replay_session.py session.jsonl --speed 1 --osc
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from ping_tuber_kai.output.osc import OSCSink
+from ping_tuber_kai.session import SessionFormatError, read_sessions, replay
+
+
+def main() -> None:
+    """メイン関数."""
+    parser = argparse.ArgumentParser(description="記録したセッションの再現")
+    parser.add_argument("path", type=Path, help="記録ファイル")
+    parser.add_argument(
+        "--session", type=int, default=-1, help="再現するセッション（追記順、デフォルト: 最後）"
+    )
+    parser.add_argument(
+        "--speed", type=float, default=None, help="実時間に対する速さ（デフォルト: 待たない）"
+    )
+    parser.add_argument("--osc", action="store_true", help="再現した口形状をOSC/VMCで送る")
+    parser.add_argument("--show", type=int, default=20, help="表示する遅延・差分の最大件数")
+    args = parser.parse_args()
+
+    try:
+        sessions = read_sessions(args.path)
+    except (OSError, SessionFormatError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    if not sessions:
+        print(f"Error: no session in {args.path}", file=sys.stderr)
+        sys.exit(1)
+    session = sessions[args.session]
+
+    sinks: dict[str, list[OSCSink]] = {}
+    if args.osc:
+        for name in session.avatars:
+            sink = OSCSink()
+            sink.start()
+            sinks[name] = [sink]
+    try:
+        report = replay(session, sinks=sinks, speed=args.speed)
+    finally:
+        for avatar_sinks in sinks.values():
+            for sink in avatar_sinks:
+                sink.close()
+
+    index = args.session % len(sessions)
+    print(f"{args.path} session {index}: avatars {', '.join(session.avatars)}")
+    print(report.summary())
+
+    if report.late:
+        print(f"\nlate frames (first {args.show}):")
+        print(f"{'frame':>8}{'time':>10}{'late':>10}{'dropped':>9}")
+        for frame in report.late[: args.show]:
+            print(
+                f"{frame.index:>8}{frame.time:>10.3f}"
+                f"{frame.lateness * 1000:>8.1f}ms{frame.dropped:>9}"
+            )
+
+    if report.divergences:
+        print(f"\ndiverged frames (first {args.show}):")
+        print(f"{'frame':>8}{'time':>10}{'position':>10}  {'avatar':<12}recorded -> replayed")
+        for d in report.divergences[: args.show]:
+            print(
+                f"{d.index:>8}{d.time:>10.3f}{d.position:>10.3f}  {d.avatar:<12}"
+                f"{d.recorded.value} -> {d.replayed.value}"
+            )
+
+    if report.divergences:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""共有メモリのフレームを読む参照コンシューマー.
+
+`ping-tuber --shared-frames` が書き込むフレームを別プロセスからコピーなしで読み、
+受け取ったフレーム数・取りこぼし・書き込みから読み出しまでの遅れを表示する。
+--save を指定すると最後に読んだフレームをPNGに保存する。
+
+使い方:
+    uv run python scripts/shared_frames_consumer.py
+    uv run python scripts/shared_frames_consumer.py --seconds 10 --save frame.png
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+
+def main() -> None:
+    """メイン関数."""
+    parser = argparse.ArgumentParser(description="共有メモリのフレームの参照コンシューマー")
+    parser.add_argument("--name", default=None, help="共有メモリ名（省略時は設定から取得）")
+    parser.add_argument("--seconds", type=float, default=5.0, help="読み続ける時間")
+    parser.add_argument("--save", type=Path, default=None, help="最後のフレームを保存するPNG")
+    args = parser.parse_args()
+
+    from ping_tuber_kai.output.shared_frames import SharedFrameReader
+
+    with SharedFrameReader(args.name) as reader:
+        print(f"{reader.width}x{reader.height} RGBA, {reader.slots} slots")
+        last = reader.sequence
+        frames = dropped = torn = 0
+        delays: list[float] = []
+        saved = None
+
+        deadline = time.monotonic() + args.seconds
+        while time.monotonic() < deadline:
+            frame = reader.read(after=last)
+            if frame is None:
+                time.sleep(0.001)
+                continue
+            # 使い終わるまではコピーしない（保存するときだけコピー）
+            delay = time.time() - frame.timestamp
+            pixels = frame.pixels.copy() if args.save else None
+            if not frame.is_valid():
+                torn += 1
+                continue
+            dropped += frame.sequence - last - 1 if last else 0
+            last = frame.sequence
+            frames += 1
+            delays.append(delay)
+            if pixels is not None:
+                saved = pixels
+            del frame
+
+    print(f"frames: {frames} ({frames / args.seconds:.1f}/s), dropped: {dropped}, torn: {torn}")
+    if delays:
+        delays.sort()
+        median = delays[len(delays) // 2] * 1000
+        print(f"delay: median {median:.2f} ms, max {delays[-1] * 1000:.2f} ms")
+
+    if args.save and saved is not None:
+        import pygame
+
+        surface = pygame.image.frombuffer(saved.tobytes(), saved.shape[1::-1], "RGBA")
+        pygame.image.save(surface, str(args.save))
+        print(f"saved: {args.save}")
+
+
+if __name__ == "__main__":
+    main()
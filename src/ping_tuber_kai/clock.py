@@ -0,0 +1,183 @@
+"""時計モジュール.
+
+再生位置・フレームの締め切り・アイドルの待機が読む時刻と待ち方をまとめる。
+Clockは実時間（perf_counter・time.sleep）で、VirtualClockは手動で進める仮想時間。
+仮想時間では待機が時計を進めるだけなので、長時間の配信シナリオを数秒で回せる。
+
+時計の値はperf_counterと同じく起点に意味のない秒で、差だけを使う。
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+
+class Clock:
+    """実時間の時計."""
+
+    # sleep()が指定どおりに起きるか（実時間では寝過ごすのでフレームペーサーはスピンで補う）
+    exact_sleep = False
+
+    def now(self) -> float:
+        """現在時刻（秒、perf_counter）."""
+        return time.perf_counter()
+
+    def sleep(self, seconds: float) -> None:
+        """指定時間待つ.
+
+        Args:
+            seconds: 待つ時間（秒、0以下なら待たない）
+        """
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def wait(self, event: threading.Event, timeout: float | None = None) -> bool:
+        """イベントがセットされるか、タイムアウトまで待つ.
+
+        Args:
+            event: 待つイベント
+            timeout: タイムアウト（秒、Noneで無期限）
+
+        Returns:
+            bool: イベントがセットされた場合True
+        """
+        return event.wait(timeout)
+
+    def every(self, interval: float, callback: Callable[[float], None]) -> Callable[[], None]:
+        """interval秒ごとにcallbackを呼ぶ（専用スレッド、締め切りは一定間隔に並べる）.
+
+        Args:
+            interval: 間隔（秒）
+            callback: 呼ぶ関数（引数は締め切りの時刻）
+
+        Returns:
+            Callable[[], None]: 止める関数
+        """
+        stopped = threading.Event()
+
+        def run() -> None:
+            due = self.now() + interval
+            while not stopped.wait(max(due - self.now(), 0.0)):
+                callback(due)
+                due += interval
+
+        threading.Thread(target=run, name="clock-every", daemon=True).start()
+        return stopped.set
+
+
+@dataclass(order=True)
+class _Timer:
+    due: float
+    sequence: int
+    interval: float | None = field(compare=False)
+    callback: Callable[[float], None] = field(compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+
+class VirtualClock(Clock):
+    """手動で進める仮想時間の時計.
+
+    sleep()・wait()は待たずに時計を進め、その間に期限が来たevery()・call_at()の
+    コールバックを時刻順に実行する（進めたスレッドで呼ぶ）。時計を進めるのは
+    描画ループなど1つのスレッドにする。
+    """
+
+    exact_sleep = True
+
+    def __init__(self, start: float = 0.0):
+        """初期化.
+
+        Args:
+            start: 開始時刻（秒）
+        """
+        self._now = start
+        self._timers: list[_Timer] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        """現在時刻（秒）."""
+        return self._now
+
+    def sleep(self, seconds: float) -> None:
+        """時計をseconds秒進める（期限の来たコールバックを実行）."""
+        self.advance(seconds)
+
+    def wait(self, event: threading.Event, timeout: float | None = None) -> bool:
+        """イベントがセットされるまで時計を進める（最大timeout秒）.
+
+        コールバックがイベントをセットしたら、その時刻で止まる。
+
+        Raises:
+            RuntimeError: timeoutがNoneで、イベントをセットしうるコールバックがない場合
+        """
+        end = None if timeout is None else self._now + timeout
+        while not event.is_set():
+            due = self._next_due()
+            if due is None or (end is not None and due > end):
+                if end is None:
+                    raise RuntimeError("VirtualClock.wait() would block forever")
+                self._now = max(self._now, end)
+                break
+            self._run_next()
+        return event.is_set()
+
+    def advance(self, seconds: float) -> None:
+        """時計を進める.
+
+        Args:
+            seconds: 進める時間（秒、0以下なら進めない）
+        """
+        end = self._now + max(seconds, 0.0)
+        while (due := self._next_due()) is not None and due <= end:
+            self._run_next()
+        self._now = max(self._now, end)
+
+    def call_at(self, due: float, callback: Callable[[float], None]) -> Callable[[], None]:
+        """時計がdueに達したらcallbackを1回呼ぶ.
+
+        Args:
+            due: 時刻（秒）
+            callback: 呼ぶ関数（引数は時刻）
+
+        Returns:
+            Callable[[], None]: 取り消す関数
+        """
+        return self._add(due, None, callback)
+
+    def every(self, interval: float, callback: Callable[[float], None]) -> Callable[[], None]:
+        """interval秒ごとにcallbackを呼ぶ（時計を進めたときに実行）."""
+        return self._add(self._now + interval, interval, callback)
+
+    def _add(
+        self, due: float, interval: float | None, callback: Callable[[float], None]
+    ) -> Callable[[], None]:
+        timer = _Timer(due, next(self._sequence), interval, callback)
+        with self._lock:
+            heapq.heappush(self._timers, timer)
+
+        def cancel() -> None:
+            timer.cancelled = True
+
+        return cancel
+
+    def _next_due(self) -> float | None:
+        with self._lock:
+            while self._timers and self._timers[0].cancelled:
+                heapq.heappop(self._timers)
+            return self._timers[0].due if self._timers else None
+
+    def _run_next(self) -> None:
+        """次のタイマーの時刻まで進めて実行（繰り返しなら次の回を登録）."""
+        with self._lock:
+            timer = heapq.heappop(self._timers)
+        self._now = max(self._now, timer.due)
+        if timer.interval is not None:
+            timer.due += timer.interval
+            timer.sequence = next(self._sequence)
+            with self._lock:
+                heapq.heappush(self._timers, timer)
+        timer.callback(self._now)
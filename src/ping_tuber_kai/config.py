@@ -1,6 +1,7 @@
 """設定管理モジュール."""
 
 from pathlib import Path
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -18,14 +19,110 @@ class Settings(BaseSettings):
     # VOICEVOX設定
     voicevox_host: str = Field(default="http://localhost:50021", description="VOICEVOX Engine URL")
     voicevox_speaker_id: int = Field(default=1, description="話者ID（デフォルト: ずんだもん）")
+    voicevox_max_concurrency: int = Field(default=4, description="一括リクエストの最大同時接続数")
+    voicevox_query_cache_size: int = Field(
+        default=32, description="AudioQueryキャッシュの件数（0で無効）"
+    )
+    voicevox_retries: int = Field(default=2, description="一時的な失敗時の再試行回数")
+    voicevox_retry_backoff: float = Field(default=0.1, description="再試行の初回待機上限（秒）")
+    voicevox_breaker_threshold: int = Field(
+        default=5, description="サーキットブレーカーが遮断する連続失敗回数"
+    )
+    voicevox_breaker_reset: float = Field(
+        default=5.0, description="遮断後に試行を再開するまでの時間（秒）"
+    )
+    voicevox_health_ttl: float = Field(default=2.0, description="接続確認結果の有効期限（秒）")
+    voicevox_stream_synthesis: bool = Field(
+        default=True, description="合成音声を受信しながら再生（最初のバイトから再生開始）"
+    )
+
+    # 発話キュー設定
+    speech_queue_depth: int = Field(default=16, description="発話キューの最大件数")
+    speech_queue_policy: Literal["oldest", "lowest_priority"] = Field(
+        default="lowest_priority", description="キューが満杯のときに捨てる発話"
+    )
+    speech_prefetch: int = Field(default=2, description="再生中に先行合成する発話数")
+    speech_buffer_bytes: int = Field(
+        default=8_000_000, description="先行合成したWAVの合計サイズの目安（バイト）"
+    )
+
+    # ウォームアップ設定
+    warmup: bool = Field(default=False, description="起動時に話者・音声デバイスを事前準備")
+    warmup_speaker_ids: list[int] = Field(
+        default_factory=list, description="追加でウォームアップする話者ID"
+    )
+    warmup_text: str = Field(default="あ", description="ウォームアップ用の短い発話")
 
     # 音声設定
     audio_sample_rate: int = Field(default=24000, description="サンプリングレート")
+    audio_blocksize: int = Field(
+        default=256, description="出力ブロックのサンプル数（キャンセル時のフェード長）"
+    )
+    audio_channels: int = Field(default=1, description="出力チャンネル数")
+    mixer_duck_gain: float = Field(default=0.3, description="発話中のBGMの音量（線形）")
+    mixer_duck_ramp: float = Field(default=0.15, description="ダッキングの切り替え時間（秒）")
+    bgm_gain: float = Field(default=0.5, description="BGMの音量（線形）")
+    stream_prebuffer: float = Field(
+        default=0.05, description="ストリーム再生の開始・再開に必要な受信量（秒）"
+    )
+    stream_buffer_seconds: float = Field(
+        default=10.0, description="ストリーム再生のリングバッファ容量（秒）"
+    )
+
+    # ライブ入力設定
+    live_input_latency: float = Field(
+        default=0.02, description="ライブ入力のブロックレイテンシ（秒）"
+    )
+    live_input_device: int | None = Field(default=None, description="ライブ入力デバイスID")
 
     # 表示設定
     window_width: int = Field(default=400, description="ウィンドウ幅")
     window_height: int = Field(default=400, description="ウィンドウ高さ")
+    mouth_rect: tuple[int, int, int, int] | None = Field(
+        default=None,
+        description="口レイヤーの矩形（x, y, 幅, 高さ。base.png使用時のみ、未指定時は中央下）",
+    )
     fps: int = Field(default=60, description="フレームレート")
+    frame_spin_max: float = Field(
+        default=0.002, description="締め切り直前にスピンで待つ最大時間（秒、0でスリープのみ）"
+    )
+
+    # アイドルアニメーション設定
+    idle_enabled: bool = Field(default=True, description="発話していない間のまばたき・呼吸")
+    idle_sleep: bool = Field(
+        default=True, description="何も動かない間は次のアイドルイベントまで描画ループを止める"
+    )
+    idle_max_sleep: float = Field(
+        default=0.1, description="描画ループを止める最大時間（秒、入力への反応の遅れの上限）"
+    )
+    idle_blink_interval: tuple[float, float] = Field(
+        default=(2.0, 6.0), description="まばたきの間隔の範囲（秒、一様乱数）"
+    )
+    idle_blink_duration: float = Field(default=0.12, description="目を閉じている時間（秒）")
+    idle_blink_defer: float = Field(
+        default=0.3, description="口が動いている間、まばたきを先送りする間隔（秒）"
+    )
+    idle_blink_max_defer: float = Field(
+        default=4.0, description="まばたきを先送りする最大時間（秒、超えたら発話中でも瞬く）"
+    )
+    idle_breathe_period: float = Field(default=4.0, description="呼吸の周期（秒）")
+    idle_breathe_amplitude: int = Field(default=2, description="呼吸の上下幅（ピクセル、0で無効）")
+
+    # 音素→口形状テーブル（JSON、未指定時は組み込みテーブル）
+    viseme_map_path: Path | None = Field(default=None, description="音素→口形状テーブル")
+
+    # 口形状安定化設定（min_hold=0で無効）
+    min_hold: float = Field(default=0.04, description="口形状の最小保持時間（秒）")
+    flicker_window: float = Field(default=0.06, description="A-B-Aちらつきとみなす区間長（秒）")
+
+    # 口の開き具合設定
+    openness_enabled: bool = Field(default=True, description="ピッチ・音量で開き具合を変える")
+    openness_threshold: float = Field(default=0.8, description="開き具合を切り替えるスコア閾値")
+
+    # 口形状ブレンド設定（blend_transition=0でハード切り替え）
+    blend_transition: float = Field(default=0.06, description="口形状の遷移時間（秒）")
+    blend_lookahead: float = Field(default=0.02, description="口形状の先読み時間（秒）")
+    blend_hold: float = Field(default=0.03, description="口形状の最小保持時間（秒）")
 
     # アセット設定
     assets_dir: Path = Field(
@@ -38,6 +135,28 @@ class Settings(BaseSettings):
     obs_port: int = Field(default=4455, description="OBS WebSocket ポート")
     obs_password: str = Field(default="", description="OBS WebSocket パスワード")
 
+    # ブラウザソース設定（オプション）
+    browser_source_host: str = Field(default="127.0.0.1", description="ブラウザソースのアドレス")
+    browser_source_port: int = Field(default=8765, description="ブラウザソースのポート")
+
+    # 共有メモリのフレーム出力設定（オプション）
+    shared_frames_name: str = Field(default="ping_tuber_frames", description="共有メモリ名")
+    shared_frames_slots: int = Field(default=3, description="共有メモリのフレームのスロット数")
+
+    # OSC/VMC出力設定（オプション）
+    osc_host: str = Field(default="127.0.0.1", description="OSC/VMCの送信先ホスト")
+    osc_port: int = Field(default=39539, description="OSC/VMCの送信先ポート")
+    osc_protocol: Literal["vmc", "osc"] = Field(
+        default="vmc", description="vmc: /VMC/Ext/Blend/Val、osc: osc_addressに名前を付けたアドレス"
+    )
+    osc_address: str = Field(
+        default="/avatar/parameters/Mouth", description="osc使用時のアドレス（末尾に A〜O が付く）"
+    )
+    osc_rate: float = Field(default=60.0, description="OSC/VMCの最大送信頻度（Hz）")
+    osc_heartbeat: float = Field(
+        default=1.0, description="値が変わらない間にOSC/VMCを送り直す間隔（秒）"
+    )
+
     @property
     def mouth_assets_dir(self) -> Path:
         """口形状アセットディレクトリ."""
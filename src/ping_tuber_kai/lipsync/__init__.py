@@ -1,7 +1,16 @@
 """リップシンクモジュール."""
 
+from .amplitude import (
+    AmplitudeAnalyzer,
+    ScheduleComparison,
+    compare_schedules,
+    create_amplitude_schedule,
+)
+from .blend import BlendSchedule, VisemeBlend, create_blend_schedule
+from .openness import Openness, OpennessTrack, create_openness_track
 from .phoneme import PhonemeEvent, PhonemeTimeline, extract_phoneme_timeline
-from .scheduler import MouthFrame, MouthSchedule, create_mouth_schedule
+from .scheduler import MouthFrame, MouthSchedule, create_mouth_schedule, get_transitions
+from .stabilizer import StabilizeResult, count_transitions, stabilize_timeline
 from .viseme import Viseme, get_viseme
 
 __all__ = [
@@ -13,4 +22,18 @@ __all__ = [
     "MouthFrame",
     "MouthSchedule",
     "create_mouth_schedule",
+    "get_transitions",
+    "AmplitudeAnalyzer",
+    "create_amplitude_schedule",
+    "ScheduleComparison",
+    "compare_schedules",
+    "BlendSchedule",
+    "VisemeBlend",
+    "create_blend_schedule",
+    "StabilizeResult",
+    "count_transitions",
+    "stabilize_timeline",
+    "Openness",
+    "OpennessTrack",
+    "create_openness_track",
 ]
@@ -0,0 +1,432 @@
+"""音量（RMS）ベースのリップシンク解析モジュール.
+
+モーラタイミングを持たない任意のWAV（収録済みボイス・他TTS出力など）向けのフォールバック。
+フレーム単位のRMSエンベロープと簡易フォルマント推定から、
+SyncEngineが扱うものと同じMouthSchedule / Visemeを生成する。
+"""
+
+import io
+from dataclasses import dataclass
+
+import numpy as np
+import soundfile as sf
+
+from ..config import settings
+from .scheduler import MouthFrame, MouthSchedule, get_viseme_at_frame
+from .viseme import Viseme
+
+# 母音フォルマント代表値（F1, F2）[Hz]（日本語成人話者の概算）
+VOWEL_FORMANTS: dict[Viseme, tuple[float, float]] = {
+    Viseme.A: (800.0, 1200.0),
+    Viseme.I: (300.0, 2300.0),
+    Viseme.U: (350.0, 1300.0),
+    Viseme.E: (500.0, 1900.0),
+    Viseme.O: (500.0, 850.0),
+}
+
+# フォルマント探索帯域（Hz）とピーク間の最小間隔（Hz）
+FORMANT_BAND: tuple[float, float] = (200.0, 3000.0)
+FORMANT_MIN_SEPARATION: float = 250.0
+
+# スペクトル推定を一度に処理する最大フレーム数（メモリ上限）
+SPECTRUM_CHUNK_FRAMES: int = 2048
+
+_VOWEL_VISEMES: tuple[Viseme, ...] = tuple(VOWEL_FORMANTS)
+_LOG_FORMANTS: np.ndarray = np.log(np.array(list(VOWEL_FORMANTS.values())))
+
+
+def decode_wav(wav_data: bytes) -> tuple[np.ndarray, int]:
+    """WAVデータをモノラルfloat32配列にデコード.
+
+    Args:
+        wav_data: WAV形式のバイトデータ
+
+    Returns:
+        tuple[np.ndarray, int]: (サンプル配列, サンプリングレート)
+    """
+    with io.BytesIO(wav_data) as f:
+        data, samplerate = sf.read(f, dtype="float32")
+    return to_mono(data), samplerate
+
+
+def to_mono(samples: np.ndarray) -> np.ndarray:
+    """多チャンネル音声をモノラルに変換.
+
+    Args:
+        samples: 音声サンプル（1次元または (frames, channels)）
+
+    Returns:
+        np.ndarray: モノラルfloat32配列
+    """
+    if samples.ndim == 2:
+        samples = samples.mean(axis=1)
+    return np.asarray(samples, dtype=np.float32)
+
+
+def frame_boundaries(start_frame: int, end_frame: int, sample_rate: int, fps: int) -> np.ndarray:
+    """フレーム境界のサンプル位置を計算.
+
+    MouthScheduleのフレームkは時刻 k / fps の口形状を表すため、
+    解析窓はその時刻を中心とする [(k - 0.5) / fps, (k + 0.5) / fps) とする。
+    ブロック処理でも全体処理と同じ境界になるよう、絶対フレーム番号から求める。
+
+    Args:
+        start_frame: 開始フレーム番号
+        end_frame: 終了フレーム番号（含まない）
+        sample_rate: サンプリングレート
+        fps: フレームレート
+
+    Returns:
+        np.ndarray: 境界サンプル位置（長さ end_frame - start_frame + 1）
+    """
+    frames = np.arange(start_frame, end_frame + 1, dtype=np.int64)
+    bounds = ((2 * frames - 1) * sample_rate + fps) // (2 * fps)
+    return np.maximum(bounds, 0)
+
+
+def frames_ending_before(num_samples: int, sample_rate: int, fps: int) -> int:
+    """num_samples以内に解析窓が収まるフレーム数.
+
+    Args:
+        num_samples: 利用可能なサンプル数
+        sample_rate: サンプリングレート
+        fps: フレームレート
+
+    Returns:
+        int: 確定できるフレーム数
+    """
+    frames = (2 * num_samples * fps + sample_rate) // (2 * sample_rate) + 1
+    while frames > 0 and frame_boundaries(frames, frames, sample_rate, fps)[0] > num_samples:
+        frames -= 1
+    return frames
+
+
+def rms_envelope(samples: np.ndarray, bounds: np.ndarray) -> np.ndarray:
+    """フレーム単位のRMSエンベロープを計算（ベクトル化）.
+
+    Args:
+        samples: モノラル音声サンプル
+        bounds: フレーム境界（samples内のオフセット）
+
+    Returns:
+        np.ndarray: フレームごとのRMS値
+    """
+    if len(bounds) < 2:
+        return np.zeros(0, dtype=np.float64)
+
+    starts = bounds[:-1]
+    counts = np.maximum(np.diff(bounds), 1)
+    sums = np.add.reduceat(np.square(samples, dtype=np.float32), starts, dtype=np.float64)
+    # reduceatは空区間で先頭要素を返すため、空フレームは0にする
+    sums[np.diff(bounds) == 0] = 0.0
+    return np.sqrt(sums / counts)
+
+
+def estimate_vowels(
+    samples: np.ndarray,
+    starts: np.ndarray,
+    frame_len: int,
+    sample_rate: int,
+) -> np.ndarray:
+    """フレームごとの母音を簡易フォルマント推定.
+
+    平滑化した振幅スペクトルから探索帯域内の上位2ピークをF1/F2とみなし、
+    VOWEL_FORMANTSに対数周波数距離が最も近い母音を選ぶ。
+
+    Args:
+        samples: モノラル音声サンプル
+        starts: 各フレームの開始サンプル位置
+        frame_len: フレーム長（サンプル数）
+        sample_rate: サンプリングレート
+
+    Returns:
+        np.ndarray: _VOWEL_VISEMESへのインデックス配列
+    """
+    num_frames = len(starts)
+    if num_frames == 0:
+        return np.zeros(0, dtype=np.intp)
+
+    frame_len = max(frame_len, 16)
+    n_fft = 1 << (frame_len - 1).bit_length()
+    window = np.hanning(frame_len).astype(np.float32)
+
+    freqs = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+    band = (freqs >= FORMANT_BAND[0]) & (freqs <= FORMANT_BAND[1])
+    band_freqs = freqs[band]
+    min_sep_bins = max(int(FORMANT_MIN_SEPARATION / (sample_rate / n_fft)), 1)
+
+    padded = np.concatenate([samples, np.zeros(frame_len, dtype=np.float32)])
+    offsets = np.arange(frame_len)
+    result = np.empty(num_frames, dtype=np.intp)
+
+    for lo in range(0, num_frames, SPECTRUM_CHUNK_FRAMES):
+        hi = min(lo + SPECTRUM_CHUNK_FRAMES, num_frames)
+        frames = padded[starts[lo:hi, None] + offsets[None, :]] * window
+        spectrum = np.abs(np.fft.rfft(frames, n_fft, axis=1))[:, band]
+        # 隣接ビンで平滑化（倍音の細かい凹凸を均す）
+        spectrum[:, 1:-1] += 0.5 * (spectrum[:, :-2] + spectrum[:, 2:])
+
+        peak1 = np.argmax(spectrum, axis=1)
+        bins = np.arange(spectrum.shape[1])
+        near = np.abs(bins[None, :] - peak1[:, None]) < min_sep_bins
+        peak2 = np.argmax(np.where(near, -1.0, spectrum), axis=1)
+
+        f_lo = band_freqs[np.minimum(peak1, peak2)]
+        f_hi = band_freqs[np.maximum(peak1, peak2)]
+        log_f = np.log(np.stack([f_lo, f_hi], axis=1))
+        dist = np.sum(np.square(log_f[:, None, :] - _LOG_FORMANTS[None, :, :]), axis=2)
+        result[lo:hi] = np.argmin(dist, axis=1)
+
+    return result
+
+
+def hysteresis(
+    level: np.ndarray,
+    open_threshold: float,
+    close_threshold: float,
+    initial: bool = False,
+) -> np.ndarray:
+    """ヒステリシス付き開閉判定（ベクトル化）.
+
+    open_threshold以上で開、close_threshold未満で閉、その間は直前の状態を維持する。
+
+    Args:
+        level: 正規化済みレベル
+        open_threshold: 開く閾値
+        close_threshold: 閉じる閾値
+        initial: 先頭フレーム以前の状態
+
+    Returns:
+        np.ndarray: 開いているフレームがTrueのbool配列
+    """
+    state = np.full(level.shape, -1, dtype=np.int8)
+    state[level >= open_threshold] = 1
+    state[level < close_threshold] = 0
+
+    # 直近で確定した状態を前方に伝播
+    decided = np.where(state >= 0, np.arange(len(level)), -1)
+    last = np.maximum.accumulate(decided) if len(level) else decided
+    return np.where(last >= 0, state[last] == 1, initial)
+
+
+class AmplitudeAnalyzer:
+    """音量ベースのリップシンク解析器.
+
+    バッファ全体の一括解析（analyze）と、ライブ入力向けのブロック逐次解析
+    （process_block）の両方に対応する。
+    """
+
+    def __init__(
+        self,
+        sample_rate: int | None = None,
+        fps: int | None = None,
+        open_threshold: float = 0.15,
+        close_threshold: float = 0.08,
+        min_level: float = 1e-3,
+        estimate_vowel: bool = True,
+        open_viseme: Viseme = Viseme.A,
+        peak_decay: float = 0.995,
+    ):
+        """初期化.
+
+        Args:
+            sample_rate: サンプリングレート（デフォルト: 設定から取得）
+            fps: フレームレート（デフォルト: 設定から取得）
+            open_threshold: 口を開く正規化レベル
+            close_threshold: 口を閉じる正規化レベル
+            min_level: 無音とみなすRMSの下限（正規化の基準値の下限）
+            estimate_vowel: スペクトルから母音を推定するか
+            open_viseme: 母音推定しない場合に開いたときのViseme
+            peak_decay: ブロック処理時の基準レベルのフレームあたり減衰率
+        """
+        self.sample_rate = sample_rate or settings.audio_sample_rate
+        self.fps = fps or settings.fps
+        self.open_threshold = open_threshold
+        self.close_threshold = close_threshold
+        self.min_level = min_level
+        self.estimate_vowel = estimate_vowel
+        self.open_viseme = open_viseme
+        self.peak_decay = peak_decay
+        self.reset()
+
+    def reset(self) -> None:
+        """ブロック処理の状態をリセット."""
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._pending_offset: int = 0  # _pendingの先頭の絶対サンプル位置
+        self._frame_index: int = 0
+        self._reference: float = self.min_level
+        self._is_open: bool = False
+
+    def analyze(self, samples: np.ndarray) -> MouthSchedule:
+        """バッファ全体を一括解析.
+
+        Args:
+            samples: 音声サンプル
+
+        Returns:
+            MouthSchedule: フレーム単位の口形状リスト
+        """
+        visemes = self.analyze_visemes(samples)
+        return [
+            MouthFrame(frame=i, time=i / self.fps, viseme=viseme)
+            for i, viseme in enumerate(visemes)
+        ]
+
+    def analyze_visemes(self, samples: np.ndarray) -> list[Viseme]:
+        """バッファ全体を一括解析し、フレームごとのVisemeを返す.
+
+        Args:
+            samples: 音声サンプル
+
+        Returns:
+            list[Viseme]: フレームごとの口形状
+        """
+        mono = to_mono(samples)
+        num_frames = -(-len(mono) * self.fps // self.sample_rate)
+        bounds = frame_boundaries(0, num_frames, self.sample_rate, self.fps)
+        np.minimum(bounds, len(mono), out=bounds)
+
+        envelope = rms_envelope(mono, bounds)
+        voiced = envelope[envelope > self.min_level]
+        reference = max(float(np.percentile(voiced, 95)) if len(voiced) else 0.0, self.min_level)
+        is_open = hysteresis(envelope / reference, self.open_threshold, self.close_threshold)
+
+        return self._to_visemes(mono, bounds, is_open)
+
+    def process_block(self, block: np.ndarray) -> list[Viseme]:
+        """入力ブロックを逐次解析.
+
+        フレーム境界に達した分だけVisemeを返し、端数サンプルは次回に持ち越す。
+
+        Args:
+            block: 入力音声ブロック
+
+        Returns:
+            list[Viseme]: このブロックで確定したフレームの口形状
+        """
+        mono = to_mono(block)
+        pending = np.concatenate([self._pending, mono]) if len(self._pending) else mono
+        available_end = self._pending_offset + len(pending)
+
+        # 確定できるフレーム数
+        end_frame = frames_ending_before(available_end, self.sample_rate, self.fps)
+        if end_frame <= self._frame_index:
+            self._pending = pending
+            return []
+
+        bounds = frame_boundaries(self._frame_index, end_frame, self.sample_rate, self.fps)
+        bounds -= self._pending_offset
+
+        envelope = rms_envelope(pending, bounds)
+        num_frames = len(envelope)
+        self._reference = max(
+            self._reference * self.peak_decay**num_frames,
+            float(envelope.max()),
+            self.min_level,
+        )
+        is_open = hysteresis(
+            envelope / self._reference,
+            self.open_threshold,
+            self.close_threshold,
+            initial=self._is_open,
+        )
+        visemes = self._to_visemes(pending, bounds, is_open)
+
+        consumed = int(bounds[-1])
+        self._pending = pending[consumed:].copy()
+        self._pending_offset += consumed
+        self._frame_index = end_frame
+        self._is_open = bool(is_open[-1])
+        return visemes
+
+    def _to_visemes(
+        self,
+        samples: np.ndarray,
+        bounds: np.ndarray,
+        is_open: np.ndarray,
+    ) -> list[Viseme]:
+        """開閉判定と母音推定からVisemeリストを組み立てる.
+
+        Args:
+            samples: モノラル音声サンプル
+            bounds: フレーム境界
+            is_open: フレームごとの開閉判定
+
+        Returns:
+            list[Viseme]: フレームごとの口形状
+        """
+        codes = np.full(len(is_open), -1, dtype=np.intp)
+        open_idx = np.flatnonzero(is_open)
+
+        if len(open_idx):
+            if self.estimate_vowel:
+                # 開いているフレームだけスペクトル推定する
+                frame_len = int(np.max(np.diff(bounds)))
+                codes[open_idx] = estimate_vowels(
+                    samples, bounds[open_idx], frame_len, self.sample_rate
+                )
+            else:
+                codes[open_idx] = _VOWEL_VISEMES.index(self.open_viseme)
+
+        lookup = (*_VOWEL_VISEMES, Viseme.CLOSED)
+        return [lookup[code] for code in codes.tolist()]
+
+
+def create_amplitude_schedule(
+    wav_data: bytes,
+    fps: int | None = None,
+    estimate_vowel: bool = True,
+) -> MouthSchedule:
+    """WAVデータから音量ベースのMouthScheduleを生成.
+
+    Args:
+        wav_data: WAV形式のバイトデータ
+        fps: フレームレート（デフォルト: 設定から取得）
+        estimate_vowel: スペクトルから母音を推定するか
+
+    Returns:
+        MouthSchedule: フレーム単位の口形状リスト
+    """
+    samples, sample_rate = decode_wav(wav_data)
+    analyzer = AmplitudeAnalyzer(sample_rate=sample_rate, fps=fps, estimate_vowel=estimate_vowel)
+    return analyzer.analyze(samples)
+
+
+@dataclass
+class ScheduleComparison:
+    """MouthSchedule同士の一致度."""
+
+    frames: int  # 比較フレーム数
+    viseme_accuracy: float  # Visemeが一致したフレームの割合
+    open_accuracy: float  # 開閉（CLOSEDか否か）が一致したフレームの割合
+
+
+def compare_schedules(reference: MouthSchedule, estimate: MouthSchedule) -> ScheduleComparison:
+    """推定スケジュールを基準スケジュール（モーラ由来など）と比較.
+
+    長さが異なる場合、範囲外のフレームはCLOSEDとして扱う。
+
+    Args:
+        reference: 基準となるMouthSchedule
+        estimate: 評価対象のMouthSchedule
+
+    Returns:
+        ScheduleComparison: 一致度
+    """
+    frames = max(len(reference), len(estimate))
+    if frames == 0:
+        return ScheduleComparison(frames=0, viseme_accuracy=1.0, open_accuracy=1.0)
+
+    viseme_hits = 0
+    open_hits = 0
+    for frame in range(frames):
+        ref = get_viseme_at_frame(reference, frame)
+        est = get_viseme_at_frame(estimate, frame)
+        viseme_hits += ref == est
+        open_hits += (ref == Viseme.CLOSED) == (est == Viseme.CLOSED)
+
+    return ScheduleComparison(
+        frames=frames,
+        viseme_accuracy=viseme_hits / frames,
+        open_accuracy=open_hits / frames,
+    )
@@ -0,0 +1,150 @@
+"""Visemeブレンド（調音結合）モジュール.
+
+音素ごとの口形状をハードに切り替える代わりに、前後の音素から
+フレームごとのVisemeの重みを発話全体ぶん事前計算する。
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from ..config import settings
+from .phoneme import PhonemeTimeline
+from .viseme import Viseme
+
+# 重み配列の列順
+VISEMES: tuple[Viseme, ...] = tuple(Viseme)
+VISEME_INDEX: dict[Viseme, int] = {viseme: i for i, viseme in enumerate(VISEMES)}
+
+
+@dataclass
+class VisemeBlend:
+    """ある時刻の口形状ブレンド（上位2形状）."""
+
+    primary: Viseme  # 最も重みの大きい口形状
+    secondary: Viseme  # 2番目の口形状
+    mix: float  # secondaryの混合率（0.0〜0.5）
+
+
+@dataclass
+class BlendSchedule:
+    """発話全体のViseme重み（フレーム × Viseme）."""
+
+    fps: int
+    weights: np.ndarray  # (frames, len(VISEMES)) 各行の和は1
+    primary: np.ndarray  # フレームごとの最大重みVisemeのインデックス
+    secondary: np.ndarray  # フレームごとの2番目のVisemeのインデックス
+    mix: np.ndarray  # フレームごとのsecondaryの混合率
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+    def at_frame(self, frame: int) -> VisemeBlend:
+        """指定フレームのブレンドを取得.
+
+        Args:
+            frame: フレーム番号
+
+        Returns:
+            VisemeBlend: 口形状ブレンド（範囲外は閉じ）
+        """
+        if not 0 <= frame < len(self.weights):
+            return VisemeBlend(Viseme.CLOSED, Viseme.CLOSED, 0.0)
+        return VisemeBlend(
+            primary=VISEMES[self.primary[frame]],
+            secondary=VISEMES[self.secondary[frame]],
+            mix=float(self.mix[frame]),
+        )
+
+    def at_time(self, time: float) -> VisemeBlend:
+        """指定時刻のブレンドを取得.
+
+        Args:
+            time: 時刻（秒）
+
+        Returns:
+            VisemeBlend: 口形状ブレンド
+        """
+        return self.at_frame(int(time * self.fps))
+
+
+def _smoothstep(x: np.ndarray) -> np.ndarray:
+    """0〜1のイージング（smoothstep）."""
+    x = np.clip(x, 0.0, 1.0)
+    return x * x * (3.0 - 2.0 * x)
+
+
+def create_blend_schedule(
+    timeline: PhonemeTimeline,
+    total_duration: float,
+    fps: int | None = None,
+    transition: float | None = None,
+    lookahead: float | None = None,
+    hold: float | None = None,
+) -> BlendSchedule:
+    """音素タイムラインからViseme重みを事前計算.
+
+    各音素の口形状は lookahead 秒前倒しで立ち上がり、少なくとも hold 秒は最大重みを保ち、
+    前後 transition 秒かけてsmoothstepで出入りする。重なった区間は正規化して混合する。
+
+    Args:
+        timeline: 音素タイムライン
+        total_duration: 総再生時間（秒）
+        fps: フレームレート（デフォルト: 設定から取得）
+        transition: 遷移時間（秒、デフォルト: 設定から取得）
+        lookahead: 先読み時間（秒、デフォルト: 設定から取得）
+        hold: 最小保持時間（秒、デフォルト: 設定から取得）
+
+    Returns:
+        BlendSchedule: フレーム単位のViseme重み
+    """
+    frame_rate = fps or settings.fps
+    transition = settings.blend_transition if transition is None else transition
+    lookahead = settings.blend_lookahead if lookahead is None else lookahead
+    hold = settings.blend_hold if hold is None else hold
+
+    total_frames = int(total_duration * frame_rate) + 1
+    times = np.arange(total_frames) / frame_rate
+    weights = np.zeros((total_frames, len(VISEMES)), dtype=np.float32)
+    half = transition / 2
+
+    for event in timeline:
+        column = VISEME_INDEX[event.resolve_viseme()]
+        start = event.start - lookahead
+        end = max(event.end, event.start + hold) - lookahead
+
+        # 影響範囲のフレームだけ計算（遷移は境界をまたいで半分ずつ）
+        lo = max(int(np.floor((start - half) * frame_rate)), 0)
+        hi = min(int(np.ceil((end + half) * frame_rate)) + 1, total_frames)
+        if lo >= hi:
+            continue
+
+        t = times[lo:hi]
+        if half > 0:
+            rise = _smoothstep((t - (start - half)) / transition)
+            fall = _smoothstep(((end + half) - t) / transition)
+            envelope = np.minimum(rise, fall)
+        else:
+            envelope = ((t >= start) & (t < end)).astype(np.float32)
+        np.maximum(weights[lo:hi, column], envelope, out=weights[lo:hi, column])
+
+    # タイムライン外・未割り当てフレームは閉じ
+    total = weights.sum(axis=1)
+    weights[:, VISEME_INDEX[Viseme.CLOSED]] += np.clip(1.0 - total, 0.0, None)
+    weights /= weights.sum(axis=1, keepdims=True)
+
+    order = np.argsort(weights, axis=1)
+    primary = order[:, -1]
+    secondary = order[:, -2]
+    rows = np.arange(total_frames)
+    top = weights[rows, primary]
+    second = weights[rows, secondary]
+    mix = np.where(top + second > 0, second / np.maximum(top + second, 1e-9), 0.0)
+
+    return BlendSchedule(
+        fps=frame_rate,
+        weights=weights,
+        primary=primary,
+        secondary=secondary,
+        mix=mix.astype(np.float32),
+    )
@@ -0,0 +1,164 @@
+"""口の開き具合（Openness）モジュール.
+
+モーラのピッチと合成WAVのモーラ区間RMSから、強調された音節は大きく、
+弱い音節は小さく口を開くよう、モーラごとの開き具合を発話単位で一括計算する。
+"""
+
+from dataclasses import dataclass
+from enum import StrEnum
+
+import numpy as np
+
+from ..config import settings
+from ..voicevox.view import QueryLike
+from .phoneme import length_scaler, pause_length
+
+
+class Openness(StrEnum):
+    """口の開き具合."""
+
+    SMALL = "small"  # 小さく開く
+    NORMAL = "normal"  # 通常
+    WIDE = "wide"  # 大きく開く
+
+
+# レベル配列の値→Openness
+OPENNESS_LEVELS: tuple[Openness, ...] = (Openness.SMALL, Openness.NORMAL, Openness.WIDE)
+
+
+@dataclass
+class OpennessTrack:
+    """モーラ単位の開き具合."""
+
+    starts: np.ndarray  # モーラ開始時刻（秒、昇順）
+    ends: np.ndarray  # モーラ終了時刻（秒）
+    levels: np.ndarray  # OPENNESS_LEVELSへのインデックス
+    scores: np.ndarray  # 強調度スコア（0が発話内の中央値）
+
+    def at_time(self, time: float) -> Openness:
+        """指定時刻の開き具合を取得.
+
+        Args:
+            time: 時刻（秒）
+
+        Returns:
+            Openness: 開き具合（モーラ外は通常）
+        """
+        i = int(np.searchsorted(self.starts, time, side="right")) - 1
+        if i < 0 or time >= self.ends[i]:
+            return Openness.NORMAL
+        return OPENNESS_LEVELS[self.levels[i]]
+
+
+def mora_spans(
+    query: QueryLike,
+    quantize: bool = False,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """AudioQueryからモーラ区間を抽出.
+
+    Args:
+        query: VOICEVOX AudioQuery（または軽量ビュー）
+        quantize: Engineと同じフレーム丸めを行うか
+
+    Returns:
+        tuple: (開始時刻, 終了時刻, ピッチ, 有声母音か) の配列
+    """
+    starts: list[float] = []
+    lengths: list[float] = []
+    pitches: list[float] = []
+    voiced: list[bool] = []
+    scaled = length_scaler(query, quantize)
+    current_time = scaled(query.pre_phoneme_length)
+
+    for phrase in query.accent_phrases:
+        for mora in phrase.moras:
+            length = scaled(mora.vowel_length)
+            if mora.consonant and mora.consonant_length:
+                length += scaled(mora.consonant_length)
+            starts.append(current_time)
+            lengths.append(length)
+            pitches.append(mora.pitch)
+            voiced.append(mora.is_voiced_vowel and mora.pitch > 0)
+            current_time += length
+        if phrase.pause_mora:
+            current_time += scaled(pause_length(phrase.pause_mora, query))
+
+    start_arr = np.array(starts, dtype=np.float64)
+    return (
+        start_arr,
+        start_arr + np.array(lengths, dtype=np.float64),
+        np.array(pitches, dtype=np.float64),
+        np.array(voiced, dtype=bool),
+    )
+
+
+def span_rms(
+    samples: np.ndarray,
+    sample_rate: int,
+    starts: np.ndarray,
+    ends: np.ndarray,
+) -> np.ndarray:
+    """区間ごとのRMSを累積和でまとめて計算.
+
+    Args:
+        samples: モノラル音声サンプル
+        sample_rate: サンプリングレート
+        starts: 区間開始時刻（秒）
+        ends: 区間終了時刻（秒）
+
+    Returns:
+        np.ndarray: 区間ごとのRMS
+    """
+    energy = np.concatenate([[0.0], np.cumsum(np.square(samples, dtype=np.float64))])
+    lo = np.clip((starts * sample_rate).astype(np.int64), 0, len(samples))
+    hi = np.clip((ends * sample_rate).astype(np.int64), 0, len(samples))
+    counts = np.maximum(hi - lo, 1)
+    return np.sqrt(np.maximum(energy[hi] - energy[lo], 0.0) / counts)
+
+
+def create_openness_track(
+    query: QueryLike,
+    samples: np.ndarray,
+    sample_rate: int,
+    threshold: float | None = None,
+    pitch_weight: float = 0.4,
+    quantize: bool = False,
+) -> OpennessTrack:
+    """ピッチと音量からモーラごとの開き具合を計算.
+
+    スコアは発話内中央値からの差（音量はdB/6、ピッチは半音相当/2）を重み付けし、
+    volume_scaleを全体のバイアスとして加える。threshold以上で大、-threshold以下で小。
+
+    Args:
+        query: VOICEVOX AudioQuery（または軽量ビュー）
+        samples: デコード済みのモノラル音声サンプル
+        sample_rate: サンプリングレート
+        threshold: 大小を切り替えるスコア閾値（デフォルト: 設定から取得）
+        pitch_weight: ピッチの重み（残りが音量の重み）
+        quantize: Engineと同じフレーム丸めを行うか
+
+    Returns:
+        OpennessTrack: モーラ単位の開き具合
+    """
+    threshold = settings.openness_threshold if threshold is None else threshold
+    starts, ends, pitches, voiced = mora_spans(query, quantize)
+    scores = np.zeros(len(starts), dtype=np.float64)
+
+    if voiced.any():
+        rms = span_rms(samples, sample_rate, starts, ends)
+        loudness_db = 20.0 * np.log10(np.maximum(rms, 1e-6))
+        loudness = (loudness_db - np.median(loudness_db[voiced])) / 6.0
+
+        # VOICEVOXのピッチはF0の自然対数（差1.0 ≒ 17.3半音）
+        semitones = (pitches - np.median(pitches[voiced])) * (12.0 / np.log(2.0))
+        pitch_score = np.where(voiced, semitones / 2.0, 0.0)
+
+        scores = (1.0 - pitch_weight) * loudness + pitch_weight * pitch_score
+        scores += np.log2(max(query.volume_scale, 1e-3))
+        scores[~voiced] = 0.0
+
+    levels = np.ones(len(starts), dtype=np.intp)
+    levels[scores >= threshold] = 2
+    levels[scores <= -threshold] = 0
+
+    return OpennessTrack(starts=starts, ends=ends, levels=levels, scores=scores)
@@ -1,8 +1,11 @@
 """音素タイムライン抽出モジュール."""
 
+from collections.abc import Callable
 from dataclasses import dataclass
 
-from ..voicevox.models import AudioQuery
+from ..voicevox.models import Mora
+from ..voicevox.view import MoraView, QueryLike
+from .viseme import Viseme, VisemeMap, get_viseme, get_viseme_map
 
 
 @dataclass
@@ -14,6 +17,17 @@ class PhonemeEvent:
     duration: float  # 持続時間（秒）
     is_vowel: bool  # 母音かどうか
     is_voiced: bool  # 有声音かどうか（大文字母音=無声）
+    viseme: Viseme | None = None  # 文脈から決めた口形状（Noneなら音素から求める）
+
+    def resolve_viseme(self) -> Viseme:
+        """このイベントの口形状.
+
+        Returns:
+            Viseme: 口形状
+        """
+        if self.viseme is not None:
+            return self.viseme
+        return get_viseme(self.phoneme, self.is_vowel)
 
     @property
     def end(self) -> float:
@@ -24,78 +38,137 @@ class PhonemeEvent:
 # 型エイリアス
 PhonemeTimeline = list[PhonemeEvent]
 
+# VOICEVOX Engineが音素長を丸めるフレームレート（24000Hz / 256サンプル）
+ENGINE_FRAME_RATE = 93.75
+
+
+def pause_length(pause: Mora | MoraView, query: QueryLike) -> float:
+    """ポーズモーラの長さ（話速適用前）.
+
+    VOICEVOX Engineと同様に、pause_lengthが指定されていれば置き換え、
+    pause_length_scaleを掛ける。
+
+    Args:
+        pause: ポーズモーラ
+        query: VOICEVOX AudioQuery（または軽量ビュー）
+
+    Returns:
+        float: ポーズの長さ（秒）
+    """
+    length = query.pause_length if query.pause_length is not None else pause.vowel_length
+    return length * query.pause_length_scale
+
 
-def extract_phoneme_timeline(query: AudioQuery) -> PhonemeTimeline:
+def length_scaler(query: QueryLike, quantize: bool = False) -> Callable[[float], float]:
+    """クエリの長さを実際の再生時間に変換する関数を作成.
+
+    Engineは前後無音を含むすべての音素長をspeed_scaleで割り、
+    音素ごとにENGINE_FRAME_RATE単位で丸めてから合成する。
+
+    Args:
+        query: VOICEVOX AudioQuery（または軽量ビュー）
+        quantize: Engineと同じフレーム丸めを行うか
+
+    Returns:
+        Callable[[float], float]: 長さ（秒）→再生時間（秒）
+    """
+    scale = 1.0 / query.speed_scale if query.speed_scale > 0 else 1.0
+    if not quantize:
+        return lambda length: length * scale
+    return lambda length: round(length * scale * ENGINE_FRAME_RATE) / ENGINE_FRAME_RATE
+
+
+def extract_phoneme_timeline(
+    query: QueryLike,
+    viseme_map: VisemeMap | None = None,
+    quantize: bool = False,
+) -> PhonemeTimeline:
     """AudioQueryから音素タイムラインを抽出.
 
+    speed_scale・前後無音・ポーズ長の設定を反映した再生時刻で返す。
+
     Args:
-        query: VOICEVOX AudioQuery
+        query: VOICEVOX AudioQuery（または軽量ビュー）
+        viseme_map: 子音の口形状を決めるテーブル（デフォルト: 現在のテーブル）
+        quantize: Engineと同じフレーム丸めを行うか（合成WAVと時刻が一致する）
 
     Returns:
         PhonemeTimeline: 音素イベントのリスト（時系列順）
     """
+    table = viseme_map or get_viseme_map()
+    scaled = length_scaler(query, quantize)
     timeline: PhonemeTimeline = []
-    current_time = query.pre_phoneme_length  # 開始無音を考慮
+    current_time = scaled(query.pre_phoneme_length)  # 開始無音を考慮
 
     for phrase in query.accent_phrases:
         for mora in phrase.moras:
             # 子音部分
             if mora.consonant and mora.consonant_length:
+                consonant_length = scaled(mora.consonant_length)
                 timeline.append(
                     PhonemeEvent(
                         phoneme=mora.consonant,
                         start=current_time,
-                        duration=mora.consonant_length,
+                        duration=consonant_length,
                         is_vowel=False,
                         is_voiced=True,  # 子音は基本的に有声扱い
+                        # 両唇音は閉じ、それ以外は後続母音の口形状を保持
+                        viseme=table.lookup(mora.consonant, is_vowel=False, next_vowel=mora.vowel),
                     )
                 )
-                current_time += mora.consonant_length
+                current_time += consonant_length
 
             # 母音部分
+            vowel_length = scaled(mora.vowel_length)
             timeline.append(
                 PhonemeEvent(
                     phoneme=mora.vowel,
                     start=current_time,
-                    duration=mora.vowel_length,
+                    duration=vowel_length,
                     is_vowel=True,
                     is_voiced=mora.is_voiced_vowel,
+                    viseme=table.lookup(mora.vowel),
                 )
             )
-            current_time += mora.vowel_length
+            current_time += vowel_length
 
         # ポーズモーラ
         if phrase.pause_mora:
-            pause = phrase.pause_mora
+            pause = scaled(pause_length(phrase.pause_mora, query))
             timeline.append(
                 PhonemeEvent(
                     phoneme="pau",
                     start=current_time,
-                    duration=pause.vowel_length,
+                    duration=pause,
                     is_vowel=False,
                     is_voiced=False,
+                    viseme=Viseme.CLOSED,
                 )
             )
-            current_time += pause.vowel_length
+            current_time += pause
 
     return timeline
 
 
-def get_total_duration(query: AudioQuery) -> float:
+def get_total_duration(query: QueryLike, quantize: bool = False) -> float:
     """AudioQueryの総再生時間を計算.
 
     Args:
-        query: VOICEVOX AudioQuery
+        query: VOICEVOX AudioQuery（または軽量ビュー）
+        quantize: Engineと同じフレーム丸めを行うか
 
     Returns:
         float: 総再生時間（秒）
     """
-    duration = query.pre_phoneme_length + query.post_phoneme_length
+    scaled = length_scaler(query, quantize)
+    duration = scaled(query.pre_phoneme_length) + scaled(query.post_phoneme_length)
 
     for phrase in query.accent_phrases:
         for mora in phrase.moras:
-            duration += mora.total_length
+            if mora.consonant and mora.consonant_length:
+                duration += scaled(mora.consonant_length)
+            duration += scaled(mora.vowel_length)
         if phrase.pause_mora:
-            duration += phrase.pause_mora.vowel_length
+            duration += scaled(pause_length(phrase.pause_mora, query))
 
     return duration
@@ -4,7 +4,7 @@ from dataclasses import dataclass
 
 from ..config import settings
 from .phoneme import PhonemeTimeline
-from .viseme import Viseme, get_viseme
+from .viseme import Viseme
 
 
 @dataclass
@@ -60,7 +60,7 @@ def get_viseme_at_time(timeline: PhonemeTimeline, time: float) -> Viseme:
     """
     for event in timeline:
         if event.start <= time < event.end:
-            return get_viseme(event.phoneme, event.is_vowel)
+            return event.resolve_viseme()
 
     # タイムライン外は閉じ
     return Viseme.CLOSED
@@ -79,3 +79,19 @@ def get_viseme_at_frame(schedule: MouthSchedule, frame: int) -> Viseme:
     if 0 <= frame < len(schedule):
         return schedule[frame].viseme
     return Viseme.CLOSED
+
+
+def get_transitions(schedule: MouthSchedule) -> list[tuple[float, Viseme]]:
+    """口形状が切り替わる時刻の一覧（同じ口形状が続くフレームはまとめる）.
+
+    Args:
+        schedule: MouthSchedule
+
+    Returns:
+        list[tuple[float, Viseme]]: (時刻（秒）, 切り替わった後の口形状)
+    """
+    transitions: list[tuple[float, Viseme]] = []
+    for frame in schedule:
+        if not transitions or transitions[-1][1] != frame.viseme:
+            transitions.append((frame.time, frame.viseme))
+    return transitions
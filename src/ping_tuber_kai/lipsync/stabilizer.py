@@ -0,0 +1,127 @@
+"""口形状の安定化（最小保持・ちらつき抑制）モジュール.
+
+extract_phoneme_timelineと描画の間に挟む後処理。
+無声化やフレーム未満の短いモーラで口が1フレームだけ開く現象と、
+A-B-A型のちらつきを除去し、描画やOBSへの切り替え回数を減らす。
+"""
+
+from dataclasses import dataclass, replace
+
+from ..config import settings
+from .phoneme import PhonemeTimeline
+from .viseme import Viseme
+
+
+@dataclass
+class StabilizeResult:
+    """安定化の結果."""
+
+    timeline: PhonemeTimeline  # 安定化後のタイムライン（同一口形状の連続は1イベント）
+    transitions_before: int  # 安定化前の口形状切り替え回数
+    transitions_after: int  # 安定化後の口形状切り替え回数
+
+    @property
+    def removed_transitions(self) -> int:
+        """除去した切り替え回数."""
+        return self.transitions_before - self.transitions_after
+
+
+def count_transitions(timeline: PhonemeTimeline) -> int:
+    """口形状の切り替え回数を数える.
+
+    発話前後の閉じ状態からの切り替えも含む。
+
+    Args:
+        timeline: 音素タイムライン
+
+    Returns:
+        int: 切り替え回数
+    """
+    transitions = 0
+    previous = Viseme.CLOSED
+    for event in timeline:
+        viseme = event.resolve_viseme()
+        transitions += viseme != previous
+        previous = viseme
+    return transitions + (previous != Viseme.CLOSED)
+
+
+def stabilize_timeline(
+    timeline: PhonemeTimeline,
+    min_hold: float | None = None,
+    flicker_window: float | None = None,
+) -> StabilizeResult:
+    """最小保持時間とA-B-Aちらつき抑制をタイムラインに適用.
+
+    タイムラインを1回だけ走査し、直前2区間だけを振り返って判定する。
+
+    - 同じ口形状が続くイベントは1区間にまとめる
+    - A-B-AのBが flicker_window 未満ならAにまとめる
+    - min_hold 未満の区間は直前の区間に吸収する（先頭のみ直後の区間に吸収）
+
+    Args:
+        timeline: 音素タイムライン
+        min_hold: 最小保持時間（秒、デフォルト: 設定から取得、0で無効）
+        flicker_window: ちらつきとみなす区間長（秒、デフォルト: 設定から取得）
+
+    Returns:
+        StabilizeResult: 安定化後のタイムラインと切り替え回数
+    """
+    min_hold = settings.min_hold if min_hold is None else min_hold
+    flicker_window = settings.flicker_window if flicker_window is None else flicker_window
+    flicker_window = max(flicker_window, min_hold)
+
+    spans: PhonemeTimeline = []
+    visemes: list[Viseme] = []
+    transitions_before = 0
+    previous = Viseme.CLOSED
+
+    def extend_last(end: float) -> None:
+        last = spans[-1]
+        spans[-1] = replace(last, duration=end - last.start)
+
+    for event in timeline:
+        viseme = event.resolve_viseme()
+        transitions_before += viseme != previous
+        previous = viseme
+
+        # 同一口形状の連続はまとめる
+        if visemes and visemes[-1] == viseme:
+            extend_last(event.end)
+            continue
+
+        if spans:
+            last = spans[-1]
+            # A-B-A: 短いBを潰して前のAを延長
+            if len(spans) >= 2 and visemes[-2] == viseme and last.duration < flicker_window:
+                spans.pop()
+                visemes.pop()
+                extend_last(event.end)
+                continue
+
+            # 短い区間は直前の区間に吸収（先頭なら今のイベントに吸収）
+            if last.duration < min_hold:
+                spans.pop()
+                visemes.pop()
+                if spans:
+                    extend_last(last.end)
+                    if visemes[-1] == viseme:
+                        extend_last(event.end)
+                        continue
+                else:
+                    event = replace(event, start=last.start, duration=event.end - last.start)
+
+        spans.append(replace(event))
+        visemes.append(viseme)
+
+    # 末尾の短い区間も直前に吸収
+    if len(spans) >= 2 and spans[-1].duration < min_hold:
+        last = spans.pop()
+        visemes.pop()
+        extend_last(last.end)
+
+    return StabilizeResult(
+        timeline=spans,
+        transitions_before=transitions_before + (previous != Viseme.CLOSED),
+        transitions_after=count_transitions(spans),
+    )
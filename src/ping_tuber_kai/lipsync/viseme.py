@@ -1,6 +1,11 @@
-"""母音→口形状（Viseme）マッピングモジュール."""
+"""音素→口形状（Viseme）マッピングモジュール."""
 
+import json
+from dataclasses import dataclass, field
 from enum import StrEnum
+from pathlib import Path
+
+from ..config import settings
 
 
 class Viseme(StrEnum):
@@ -35,30 +40,193 @@ VOWEL_TO_VISEME: dict[str, Viseme] = {
 }
 
 
-def get_viseme(phoneme: str, is_vowel: bool = True) -> Viseme:
+class ConsonantClass(StrEnum):
+    """子音の口形状クラス."""
+
+    BILABIAL = "bilabial"  # 両唇音 - 唇を閉じる
+    FOLLOWING = "following"  # その他 - 後続母音の口形状を保持
+
+
+# 子音→クラスマッピング（VOICEVOXの子音表記）
+CONSONANT_CLASSES: dict[str, ConsonantClass] = {
+    # 両唇音（マ行・バ行・パ行）
+    "m": ConsonantClass.BILABIAL,
+    "my": ConsonantClass.BILABIAL,
+    "b": ConsonantClass.BILABIAL,
+    "by": ConsonantClass.BILABIAL,
+    "p": ConsonantClass.BILABIAL,
+    "py": ConsonantClass.BILABIAL,
+    # その他の子音
+    **{
+        c: ConsonantClass.FOLLOWING
+        for c in "k ky g gy ng s sh z j t ts ty ch d dy n ny h hy f v r ry w y".split()
+    },
+}
+
+# 子音クラス→口形状（Noneは後続母音を保持）
+_CLASS_TO_VISEME: dict[ConsonantClass, Viseme | None] = {
+    ConsonantClass.BILABIAL: Viseme.CLOSED,
+    ConsonantClass.FOLLOWING: None,
+}
+
+
+@dataclass
+class VisemeMap:
+    """音素→口形状テーブル.
+
+    子音の値がNoneの場合は後続母音の口形状を保持する。
+    テーブルは辞書として事前に展開し、参照は辞書引き1回で済むようにする。
+    """
+
+    vowels: dict[str, Viseme] = field(default_factory=lambda: dict(VOWEL_TO_VISEME))
+    consonants: dict[str, Viseme | None] = field(
+        default_factory=lambda: {c: _CLASS_TO_VISEME[cls] for c, cls in CONSONANT_CLASSES.items()}
+    )
+    unknown_consonant: Viseme | None = None  # テーブルにない子音の扱い
+
+    def lookup(self, phoneme: str, is_vowel: bool = True, next_vowel: str | None = None) -> Viseme:
+        """音素から口形状を取得.
+
+        Args:
+            phoneme: 音素文字列
+            is_vowel: 母音（ポーズ含む）かどうか
+            next_vowel: 後続母音（子音の場合、口形状の保持に使う）
+
+        Returns:
+            Viseme: 対応する口形状
+        """
+        if is_vowel:
+            return self.vowels.get(phoneme, Viseme.CLOSED)
+
+        viseme = self.consonants.get(phoneme, self.unknown_consonant)
+        if viseme is not None:
+            return viseme
+        if next_vowel is None:
+            return Viseme.CLOSED
+        return self.vowels.get(next_vowel, Viseme.CLOSED)
+
+    @classmethod
+    def vowels_only(cls) -> "VisemeMap":
+        """母音のみのテーブル（子音はすべて閉じ、旧来の挙動）.
+
+        Returns:
+            VisemeMap: 音素→口形状テーブル
+        """
+        return cls(consonants={}, unknown_consonant=Viseme.CLOSED)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "VisemeMap":
+        """辞書からテーブルを生成（デフォルトに上書き）.
+
+        値にはViseme値（"a", "closed" など）か子音クラス名（"bilabial", "following"）を指定する。
+
+        例: {"consonants": {"f": "u", "w": "following"}, "vowels": {"N": "closed"}}
+
+        Args:
+            data: テーブル定義
+
+        Returns:
+            VisemeMap: 音素→口形状テーブル
+
+        Raises:
+            ValueError: 不明な値が含まれる場合
+        """
+        viseme_map = cls()
+        for phoneme, value in data.get("vowels", {}).items():
+            viseme = _parse_viseme(value)
+            if viseme is None:
+                raise ValueError(f"Vowel {phoneme!r} must map to a viseme, got {value!r}")
+            viseme_map.vowels[phoneme] = viseme
+        for phoneme, value in data.get("consonants", {}).items():
+            viseme_map.consonants[phoneme] = _parse_viseme(value)
+        if "unknown_consonant" in data:
+            viseme_map.unknown_consonant = _parse_viseme(data["unknown_consonant"])
+        return viseme_map
+
+    @classmethod
+    def load(cls, path: Path) -> "VisemeMap":
+        """JSONファイルからテーブルを読み込み.
+
+        Args:
+            path: JSONファイルパス
+
+        Returns:
+            VisemeMap: 音素→口形状テーブル
+        """
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def _parse_viseme(value: str) -> Viseme | None:
+    """テーブル定義の値を解釈.
+
+    Args:
+        value: Viseme値または子音クラス名
+
+    Returns:
+        Viseme | None: 口形状（Noneは後続母音を保持）
+
+    Raises:
+        ValueError: 不明な値の場合
+    """
+    if value in ConsonantClass.__members__.values():
+        return _CLASS_TO_VISEME[ConsonantClass(value)]
+    try:
+        return Viseme(value)
+    except ValueError:
+        raise ValueError(f"Unknown viseme or consonant class: {value!r}") from None
+
+
+_viseme_map: VisemeMap | None = None
+
+
+def get_viseme_map() -> VisemeMap:
+    """現在の音素→口形状テーブルを取得（初回は設定から読み込み）.
+
+    Returns:
+        VisemeMap: 音素→口形状テーブル
+    """
+    global _viseme_map
+    if _viseme_map is None:
+        path = settings.viseme_map_path
+        _viseme_map = VisemeMap.load(path) if path is not None else VisemeMap()
+    return _viseme_map
+
+
+def set_viseme_map(viseme_map: VisemeMap | None) -> None:
+    """音素→口形状テーブルを差し替え.
+
+    Args:
+        viseme_map: テーブル（Noneで設定から再読み込み）
+    """
+    global _viseme_map
+    _viseme_map = viseme_map
+
+
+def get_viseme(phoneme: str, is_vowel: bool = True, next_vowel: str | None = None) -> Viseme:
     """音素からVisemeを取得.
 
     Args:
         phoneme: 音素文字列
         is_vowel: 母音かどうか
+        next_vowel: 後続母音（子音の場合、両唇音以外は後続母音の口形状を保持）
 
     Returns:
-        Viseme: 対応する口形状
+        Viseme: 対応する口形状（後続母音が不明な子音は閉じ）
     """
-    if not is_vowel:
-        # 子音・ポーズは閉じ
-        return Viseme.CLOSED
-
-    return VOWEL_TO_VISEME.get(phoneme, Viseme.CLOSED)
+    return get_viseme_map().lookup(phoneme, is_vowel, next_vowel)
 
 
-def get_viseme_image_name(viseme: Viseme) -> str:
+def get_viseme_image_name(viseme: Viseme, openness: str | None = None) -> str:
     """Visemeに対応する画像ファイル名を取得.
 
     Args:
         viseme: 口形状
+        openness: 開き具合（"small", "wide" など。None・"normal"は通常画像）
 
     Returns:
-        str: 画像ファイル名（拡張子付き）
+        str: 画像ファイル名（拡張子付き、例: a.png, a_wide.png）
     """
-    return f"{viseme.value}.png"
+    if openness is None or openness == "normal":
+        return f"{viseme.value}.png"
+    return f"{viseme.value}_{openness}.png"
@@ -65,6 +65,32 @@ def main() -> None:
         help="OBS WebSocket連携を有効化",
     )
 
+    parser.add_argument(
+        "--browser-source",
+        action="store_true",
+        help="OBSブラウザソース用のローカルサーバーを起動",
+    )
+
+    parser.add_argument(
+        "--osc",
+        action="store_true",
+        help="OSC/VMCで口形状パラメータを送信（Live2D・3Dアバターのアプリ向け）",
+    )
+
+    parser.add_argument(
+        "--shared-frames",
+        action="store_true",
+        help="合成した画面を共有メモリにRGBAで書き込む（キャプチャ用）",
+    )
+
+    parser.add_argument(
+        "--record",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="セッション（発話・口形状・フレームの時刻）をファイルに追記（scripts/replay_session.pyで再現）",
+    )
+
     parser.add_argument(
         "--assets",
         type=Path,
@@ -72,6 +98,26 @@ def main() -> None:
         help="口形状アセットディレクトリ",
     )
 
+    parser.add_argument(
+        "--wav",
+        type=Path,
+        default=None,
+        help="WAVファイルを音量ベースのリップシンクで再生（VOICEVOX不要）",
+    )
+
+    parser.add_argument(
+        "--mic",
+        action="store_true",
+        help="マイク入力のライブリップシンクを有効化（TTS再生中はTTS優先）",
+    )
+
+    parser.add_argument(
+        "--warmup",
+        action="store_true",
+        default=settings.warmup,
+        help="起動時に話者モデル・音声デバイスを事前準備（初回発話の遅延を削減）",
+    )
+
     parser.add_argument(
         "--list-speakers",
         action="store_true",
@@ -106,19 +152,35 @@ def main() -> None:
         print("Install with: uv sync --extra obs")
         args.obs = False
 
+    # WAV再生（VOICEVOX不要）
+    wav_data = None
+    if args.wav is not None and not args.text:
+        try:
+            wav_data = args.wav.read_bytes()
+        except OSError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+
     # VOICEVOX確認
-    if not check_voicevox():
+    needs_voicevox = bool(args.text) or (wav_data is None and not args.mic)
+    if needs_voicevox and not check_voicevox():
         print(f"Error: VOICEVOX Engine is not available at {settings.voicevox_host}")
         print("Please start VOICEVOX Engine first.")
         print("  Docker: docker run --rm -p 50021:50021 voicevox/voicevox_engine:cpu-latest")
         sys.exit(1)
 
     # テキスト未指定時はインタラクティブモード案内
-    if not args.text:
+    if not args.text and wav_data is None:
         print("ping-tuber-kai")
         print("=" * 40)
         print(f"Speaker ID: {args.speaker}")
         print(f"OBS integration: {'enabled' if args.obs else 'disabled'}")
+        print(f"Browser source: {'enabled' if args.browser_source else 'disabled'}")
+        print(f"OSC/VMC: {'enabled' if args.osc else 'disabled'}")
+        print(f"Shared frames: {'enabled' if args.shared_frames else 'disabled'}")
+        print(f"Session record: {args.record or 'disabled'}")
+        print(f"Live input: {'enabled' if args.mic else 'disabled'}")
+        print(f"Warm-up: {'enabled' if args.warmup else 'disabled'}")
         print()
         print("Usage: ping-tuber --text 'こんにちは'")
         print()
@@ -127,8 +189,20 @@ def main() -> None:
 
     # アプリケーション実行
     try:
-        with App(use_obs=args.obs, assets_dir=args.assets) as app:
-            app.run(text=args.text, speaker_id=args.speaker)
+        # 話者のウォームアップはVOICEVOXを使う場合のみ
+        warmup_speakers = [args.speaker, *settings.warmup_speaker_ids] if needs_voicevox else []
+        with App(
+            use_obs=args.obs,
+            use_browser_source=args.browser_source,
+            use_osc=args.osc,
+            use_shared_frames=args.shared_frames,
+            record_path=args.record,
+            assets_dir=args.assets,
+            use_live_input=args.mic,
+            warmup=args.warmup,
+            warmup_speakers=warmup_speakers,
+        ) as app:
+            app.run(text=args.text, speaker_id=args.speaker, wav_data=wav_data)
     except KeyboardInterrupt:
         print("\nInterrupted.")
     except VoicevoxError as e:
@@ -1,5 +1,24 @@
 """出力モジュール."""
 
+from .browser_source import BrowserChannel, BrowserSource, BrowserSourceError
+from .compositor import Layer, LayerCompositor
+from .osc import OSCSink
+from .pacer import FramePacer, FrameStats
 from .pygame_window import PygameWindow
+from .shared_frames import SharedFrame, SharedFrameError, SharedFrameReader, SharedFrameWriter
 
-__all__ = ["PygameWindow"]
+__all__ = [
+    "BrowserChannel",
+    "BrowserSource",
+    "BrowserSourceError",
+    "FramePacer",
+    "FrameStats",
+    "Layer",
+    "LayerCompositor",
+    "OSCSink",
+    "PygameWindow",
+    "SharedFrame",
+    "SharedFrameError",
+    "SharedFrameReader",
+    "SharedFrameWriter",
+]
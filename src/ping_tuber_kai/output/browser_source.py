@@ -0,0 +1,579 @@
+"""OBSブラウザソース出力モジュール.
+
+ローカルHTTPサーバーが口形状画像とページを配信し、WebSocketで口形状の切り替え予定を送る。
+発話1回につき（再生開始時刻, 切り替え時刻と口形状の一覧）を1メッセージで送り、
+ページ側がrequestAnimationFrameで画像を切り替えるので、フレームごとの通信はない。
+何も変化しない間は何も送らない。
+
+WebSocketはサーバーからの送信だけを使うため、標準ライブラリで最小限（RFC 6455の
+ハンドシェイク・テキストフレーム送信・close/pingへの応答）を実装している。
+"""
+
+import base64
+import hashlib
+import json
+import queue
+import socket
+import struct
+import threading
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+from ..config import settings
+from ..lipsync.openness import Openness
+from ..lipsync.viseme import Viseme, get_viseme_image_name
+from .pygame_window import BASE_IMAGE_NAME, OVERLAY_PREFIX, get_mouth_rect
+
+# RFC 6455のハンドシェイク用GUID
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+# WebSocketのオペコード
+OPCODE_TEXT = 0x1
+OPCODE_CLOSE = 0x8
+OPCODE_PING = 0x9
+OPCODE_PONG = 0xA
+
+# 送信が詰まった視聴者を切断するまでの時間（秒）
+SEND_TIMEOUT = 1.0
+
+# 視聴者ごとの送信待ちフレームの上限（溢れた視聴者は切断）
+VIEWER_QUEUE_SIZE = 64
+
+
+class BrowserSourceError(Exception):
+    """ブラウザソースのエラー."""
+
+    pass
+
+
+def encode_frame(payload: bytes, opcode: int = OPCODE_TEXT) -> bytes:
+    """サーバーから送るWebSocketフレーム（マスクなし・分割なし）.
+
+    Args:
+        payload: 本文
+        opcode: オペコード
+
+    Returns:
+        bytes: フレーム
+    """
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+def _read_exact(sock: socket.socket, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        data += chunk
+    return data
+
+
+def read_frame(sock: socket.socket) -> tuple[int, bytes]:
+    """クライアントからのWebSocketフレームを読む（マスクを外す）.
+
+    Returns:
+        tuple[int, bytes]: オペコード、本文
+
+    Raises:
+        ConnectionError: 切断された場合
+    """
+    first, second = _read_exact(sock, 2)
+    opcode = first & 0x0F
+    length = second & 0x7F
+    if length == 126:
+        (length,) = struct.unpack("!H", _read_exact(sock, 2))
+    elif length == 127:
+        (length,) = struct.unpack("!Q", _read_exact(sock, 8))
+    mask = _read_exact(sock, 4) if second & 0x80 else b""
+    payload = _read_exact(sock, length)
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return opcode, payload
+
+
+@dataclass(eq=False)
+class _Viewer:
+    """接続中の視聴者1人.
+
+    送信は視聴者ごとのスレッドが上限付きのキューから取り出して行うので、
+    send()は描画スレッドから呼んでもソケットの書き込みを待たない。
+    ソケットのタイムアウト（SEND_TIMEOUT）を超えて書き込めない視聴者は切断する。
+    """
+
+    sock: socket.socket
+    outbox: queue.Queue = field(default_factory=lambda: queue.Queue(VIEWER_QUEUE_SIZE))
+    closed: bool = False
+    thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """送信スレッドを開始."""
+        self.thread = threading.Thread(target=self._run, name="browser-viewer", daemon=True)
+        self.thread.start()
+
+    def send(self, frame: bytes) -> bool:
+        """フレームを送信キューに積む（切断済み・キューが溢れた場合はFalse）."""
+        if self.closed:
+            return False
+        try:
+            self.outbox.put_nowait(frame)
+            return True
+        except queue.Full:
+            return False
+
+    def _run(self) -> None:
+        """送信スレッド（Noneを受け取るか、書き込みに失敗したら終わる）."""
+        while (frame := self.outbox.get()) is not None:
+            try:
+                self.sock.sendall(frame)
+            except OSError:
+                self.closed = True
+                _close_quietly(self.sock)
+                return
+
+    def close(self) -> None:
+        """切断（受信側のループもソケットの終了で抜ける）."""
+        if self.closed:
+            return
+        self.closed = True
+        _close_quietly(self.sock)
+        try:
+            self.outbox.put_nowait(None)
+        except queue.Full:
+            pass  # 残りのフレームの書き込みが失敗して送信スレッドは終わる
+
+    def finish(self) -> None:
+        """積んだフレームを送り終えてから送信スレッドを止める（書き込めなければ切断）."""
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.outbox.put(None, timeout=SEND_TIMEOUT)
+        except queue.Full:
+            _close_quietly(self.sock)
+        if self.thread is not None:
+            self.thread.join(SEND_TIMEOUT)
+
+
+class BrowserChannel:
+    """アバター1体ぶんの配信（画像セットと口形状の状態）.
+
+    play()・stop()・set_viseme()・set_overlay()はどのスレッドからでも呼べる。
+    """
+
+    def __init__(self, name: str, assets_dir: Path, size: tuple[int, int]):
+        """初期化.
+
+        Args:
+            name: アバター名（ページのURLで指定）
+            assets_dir: 口形状アセットディレクトリ
+            size: 描画領域のサイズ（口レイヤーの位置の基準）
+        """
+        self.name = name
+        self.assets_dir = assets_dir
+        self.size = size
+        self.messages_sent = 0  # 送ったメッセージ数（視聴者ごとには数えない）
+        self._viewers: list[_Viewer] = []
+        self._lock = threading.Lock()
+        self._viseme = Viseme.CLOSED
+        self._overlays: dict[str, bool] = {}
+        self._playing: dict | None = None  # 再生中の予定（途中から接続した視聴者に送る）
+        self.sprites = self._find_sprites()
+
+    def _find_sprites(self) -> dict[str, str]:
+        """配信する画像（キー → ファイル名）."""
+        sprites: dict[str, str] = {}
+        for viseme in Viseme:
+            for openness in (None, Openness.SMALL, Openness.WIDE):
+                name = get_viseme_image_name(viseme, openness)
+                if (self.assets_dir / name).is_file():
+                    sprites[name.removesuffix(".png")] = name
+        if (self.assets_dir / BASE_IMAGE_NAME).is_file():
+            sprites["base"] = BASE_IMAGE_NAME
+        for path in sorted(self.assets_dir.glob(f"{OVERLAY_PREFIX}*.png")):
+            sprites[path.stem] = path.name
+            self._overlays.setdefault(path.stem.removeprefix(OVERLAY_PREFIX), True)
+        return sprites
+
+    def manifest(self) -> dict:
+        """ページが最初に取得する画像一覧と配置."""
+        prefix = f"/sprites/{quote(self.name)}/"
+        manifest: dict = {
+            "size": list(self.size),
+            "sprites": {key: prefix + quote(name) for key, name in self.sprites.items()},
+            "mouth": None,
+        }
+        if "base" in self.sprites:
+            rect = get_mouth_rect(*self.size)
+            manifest["mouth"] = [rect.x, rect.y, rect.width, rect.height]
+        return manifest
+
+    def play(self, transitions: Sequence[tuple[float, Viseme]], started_at: float) -> None:
+        """発話の口形状の切り替え予定を送る.
+
+        Args:
+            transitions: (再生開始からの時刻（秒）, 口形状) の一覧
+            started_at: 再生開始（先頭のサンプルが聞こえた）時刻（time.time()）
+        """
+        message = {
+            "t": "play",
+            "at": round(started_at * 1000),
+            "e": [[round(t * 1000), viseme.value] for t, viseme in transitions],
+        }
+        with self._lock:
+            self._playing = message
+            if transitions:
+                self._viseme = transitions[-1][1]
+        self._broadcast(message)
+
+    def stop(self, viseme: Viseme = Viseme.CLOSED) -> None:
+        """再生中の予定を打ち切り、口形状を設定.
+
+        Args:
+            viseme: 打ち切った後の口形状
+        """
+        with self._lock:
+            if self._playing is None and viseme == self._viseme:
+                return
+            self._playing = None
+            self._viseme = viseme
+        self._broadcast({"t": "stop", "v": viseme.value})
+
+    def set_viseme(self, viseme: Viseme) -> None:
+        """口形状を設定（変わった場合だけ送る）.
+
+        Args:
+            viseme: 口形状
+        """
+        with self._lock:
+            if self._playing is None and viseme == self._viseme:
+                return
+            self._playing = None
+            self._viseme = viseme
+        self._broadcast({"t": "set", "v": viseme.value})
+
+    def set_overlay(self, name: str, visible: bool) -> None:
+        """オーバーレイ（overlay_<name>.png）の表示を設定（変わった場合だけ送る）.
+
+        Args:
+            name: レイヤー名
+            visible: 表示するか
+        """
+        with self._lock:
+            if name not in self._overlays or self._overlays[name] == visible:
+                return
+            self._overlays[name] = visible
+        self._broadcast({"t": "ov", "n": name, "on": visible})
+
+    def _snapshot(self) -> list[dict]:
+        """接続した視聴者に最初に送る現在の状態（_lockを取った状態で呼ぶ）."""
+        messages = [
+            {"t": "hello", "now": round(time.time() * 1000), "v": self._viseme.value},
+            *({"t": "ov", "n": n, "on": on} for n, on in self._overlays.items()),
+        ]
+        if self._playing is not None:
+            messages.append(self._playing)
+        return messages
+
+    def _broadcast(self, message: dict) -> None:
+        """全視聴者の送信キューに積む（フレームは1回だけ組み立てる）."""
+        frame = encode_frame(json.dumps(message, separators=(",", ":")).encode())
+        with self._lock:
+            self.messages_sent += 1
+            dead = [viewer for viewer in self._viewers if not viewer.send(frame)]
+            if dead:
+                self._viewers = [v for v in self._viewers if v not in dead]
+        for viewer in dead:
+            viewer.close()
+
+    def _serve(self, sock: socket.socket) -> None:
+        """視聴者1人の接続を維持（ハンドラのスレッド、切断まで戻らない）."""
+        sock.settimeout(SEND_TIMEOUT)
+        viewer = _Viewer(sock)
+        # 現在の状態と登録を同じロックの中で行い、その間の変化を取りこぼさない
+        with self._lock:
+            for message in self._snapshot():
+                viewer.send(encode_frame(json.dumps(message, separators=(",", ":")).encode()))
+            self._viewers.append(viewer)
+        viewer.start()
+
+        # 受信はclose/pingへの応答だけ。タイムアウトは送信の詰まり検出用なので、
+        # 何も届かずにタイムアウトした場合は待ち続ける（フレームの途中なら切断）
+        try:
+            while not viewer.closed:
+                try:
+                    if not sock.recv(1, socket.MSG_PEEK):
+                        break
+                except TimeoutError:
+                    continue
+                opcode, payload = read_frame(sock)
+                if opcode == OPCODE_CLOSE:
+                    viewer.send(encode_frame(payload[:2], OPCODE_CLOSE))
+                    break
+                if opcode == OPCODE_PING:
+                    viewer.send(encode_frame(payload, OPCODE_PONG))
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            with self._lock:
+                if viewer in self._viewers:
+                    self._viewers.remove(viewer)
+            # closeの応答を送り終えてからハンドラに戻る（戻るとソケットが閉じられる）
+            viewer.finish()
+
+    @property
+    def viewer_count(self) -> int:
+        """接続中の視聴者数."""
+        with self._lock:
+            return len(self._viewers)
+
+
+def _close_quietly(sock: socket.socket) -> None:
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+
+
+class BrowserSource:
+    """OBSのブラウザソースに口形状を配信するローカルサーバー.
+
+    OBSでは http://<host>:<port>/?avatar=<名前> をブラウザソースに指定する。
+    """
+
+    def __init__(self, host: str | None = None, port: int | None = None):
+        """初期化.
+
+        Args:
+            host: 待ち受けるアドレス（デフォルト: 設定から取得）
+            port: 待ち受けるポート（デフォルト: 設定から取得、0で空きポート）
+        """
+        self.host = host or settings.browser_source_host
+        self.port = settings.browser_source_port if port is None else port
+        self._channels: dict[str, BrowserChannel] = {}
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    def add_avatar(
+        self,
+        name: str,
+        assets_dir: Path | None = None,
+        size: tuple[int, int] | None = None,
+    ) -> BrowserChannel:
+        """アバターの配信を追加.
+
+        Args:
+            name: アバター名
+            assets_dir: 口形状アセット（デフォルト: 設定から取得）
+            size: 描画領域のサイズ（デフォルト: ウィンドウサイズ）
+
+        Returns:
+            BrowserChannel: アバターの配信
+        """
+        channel = BrowserChannel(
+            name,
+            assets_dir or settings.mouth_assets_dir,
+            size or (settings.window_width, settings.window_height),
+        )
+        self._channels[name] = channel
+        return channel
+
+    def channel(self, name: str | None = None) -> BrowserChannel | None:
+        """名前で配信を取得（Noneなら最初のアバター）."""
+        if name is None:
+            return next(iter(self._channels.values()), None)
+        return self._channels.get(name)
+
+    def start(self) -> None:
+        """サーバーを起動（バックグラウンドのスレッドで待ち受ける）.
+
+        Raises:
+            BrowserSourceError: ポートを開けない場合
+        """
+        if self._server is not None:
+            return
+        handler = type("_Handler", (_BrowserSourceHandler,), {"source": self})
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        except OSError as e:
+            raise BrowserSourceError(f"Failed to listen on {self.host}:{self.port}: {e}") from e
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="browser-source", daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        """サーバーを停止し、視聴者を切断."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        for channel in self._channels.values():
+            with channel._lock:
+                viewers, channel._viewers = channel._viewers, []
+            for viewer in viewers:
+                viewer.close()
+        self._server = None
+        self._thread = None
+
+    def __enter__(self) -> "BrowserSource":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def url(self, name: str | None = None) -> str:
+        """ブラウザソースに指定するURL."""
+        url = f"http://{self.host}:{self.port}/"
+        return url if name is None else f"{url}?avatar={quote(name)}"
+
+
+class _BrowserSourceHandler(BaseHTTPRequestHandler):
+    """ページ・画像一覧・画像・WebSocketを返すハンドラ."""
+
+    source: BrowserSource
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:  # noqa: N802
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        channel = self.source.channel(query.get("avatar", [None])[0])
+
+        if url.path == "/ws":
+            if channel is None:
+                self._send(404, b"unknown avatar", "text/plain")
+            else:
+                self._upgrade(channel)
+            return
+        if url.path in ("/", "/index.html"):
+            self._send(200, PAGE.encode(), "text/html; charset=utf-8")
+        elif url.path == "/manifest.json" and channel is not None:
+            self._send(200, json.dumps(channel.manifest()).encode(), "application/json")
+        elif url.path.startswith("/sprites/"):
+            self._send_sprite(url.path.removeprefix("/sprites/"))
+        else:
+            self._send(404, b"not found", "text/plain")
+
+    def _send(self, status: int, body: bytes, content_type: str, cache: bool = False) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "max-age=3600" if cache else "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_sprite(self, path: str) -> None:
+        """画像を返す（画像一覧にあるファイルだけ）."""
+        name, _, file_name = unquote(path).partition("/")
+        channel = self.source.channel(name)
+        if channel is None or file_name not in channel.sprites.values():
+            self._send(404, b"not found", "text/plain")
+            return
+        self._send(200, (channel.assets_dir / file_name).read_bytes(), "image/png", cache=True)
+
+    def _upgrade(self, channel: BrowserChannel) -> None:
+        """WebSocketに切り替えて、切断まで視聴者として扱う."""
+        key = self.headers.get("Sec-WebSocket-Key")
+        if key is None or self.headers.get("Upgrade", "").lower() != "websocket":
+            self._send(400, b"websocket upgrade required", "text/plain")
+            return
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest())
+        self.send_response(101)
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", accept.decode())
+        self.end_headers()
+        self.wfile.flush()
+        self.close_connection = True
+        channel._serve(self.connection)
+
+
+# ブラウザソースのページ（画像を先読みし、予定に沿ってrequestAnimationFrameで切り替える）
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>ping-tuber-kai</title>
+<style>
+html,body{margin:0;background:transparent;overflow:hidden}
+#stage{position:relative}
+#stage img{position:absolute;left:0;top:0;width:100%;height:100%}
+#stage img.mouth{width:auto;height:auto}
+</style></head>
+<body><div id="stage"></div>
+<script>
+const avatar = new URLSearchParams(location.search).get("avatar");
+const query = avatar ? "?avatar=" + encodeURIComponent(avatar) : "";
+const stage = document.getElementById("stage");
+let sprites = {}, mouth = null, overlays = {}, skew = 0, plan = null;
+let viseme = "closed";
+
+function layer(src, cls) {
+  const img = document.createElement("img");
+  img.src = src;
+  if (cls) img.className = cls;
+  stage.appendChild(img);
+  return img;
+}
+
+function show(v) {
+  viseme = v;
+  const src = sprites[v] || sprites.closed;
+  if (src && mouth.getAttribute("src") !== src) mouth.src = src;
+}
+
+function tick() {
+  if (!plan) return;
+  const t = Date.now() - skew - plan.at;
+  while (plan.i < plan.e.length && plan.e[plan.i][0] <= t) show(plan.e[plan.i++][1]);
+  if (plan.i < plan.e.length) requestAnimationFrame(tick); else plan = null;
+}
+
+function handle(msg) {
+  if (msg.t === "hello") { skew = Date.now() - msg.now; plan = null; show(msg.v); }
+  else if (msg.t === "play") { plan = {at: msg.at, e: msg.e, i: 0}; requestAnimationFrame(tick); }
+  else if (msg.t === "stop" || msg.t === "set") { plan = null; show(msg.v); }
+  else if (msg.t === "ov" && overlays[msg.n]) {
+    overlays[msg.n].style.visibility = msg.on ? "visible" : "hidden";
+  }
+}
+
+function connect() {
+  const ws = new WebSocket("ws://" + location.host + "/ws" + query);
+  ws.onmessage = (event) => handle(JSON.parse(event.data));
+  ws.onclose = () => setTimeout(connect, 1000);
+}
+
+fetch("/manifest.json" + query).then((r) => r.json()).then((m) => {
+  sprites = m.sprites;
+  for (const src of Object.values(sprites)) new Image().src = src;
+  stage.style.width = m.size[0] + "px";
+  stage.style.height = m.size[1] + "px";
+  if (sprites.base) layer(sprites.base);
+  mouth = layer(sprites.closed || "", m.mouth ? "mouth" : "");
+  if (m.mouth) {
+    const [x, y, w, h] = m.mouth;
+    Object.assign(mouth.style, {left: x + "px", top: y + "px", width: w + "px", height: h + "px"});
+  }
+  for (const key of Object.keys(sprites)) {
+    if (key.startsWith("overlay_")) overlays[key.slice(8)] = layer(sprites[key]);
+  }
+  show(viseme);
+  connect();
+});
+</script></body></html>
+"""
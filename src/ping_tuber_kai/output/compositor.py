@@ -0,0 +1,269 @@
+"""レイヤー合成モジュール.
+
+アバターを静的なベースレイヤー・口レイヤー・オーバーレイ（目・アクセサリーなど）に分け、
+変化した矩形だけを描き直す。口形状が変わっても描き直すのは口の矩形だけで、
+画面への反映もその矩形だけで済む。
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+import pygame
+
+# 差分から求めた口の矩形の余白（ピクセル、アンチエイリアスのにじみ分）
+MOUTH_RECT_MARGIN = 2
+
+
+@dataclass
+class Layer:
+    """オーバーレイ1枚（不透明な部分だけに切り詰めた画像とアバター内の位置）."""
+
+    name: str
+    surface: pygame.Surface
+    rect: pygame.Rect
+    visible: bool = True
+
+
+def surface_bytes(surface: pygame.Surface) -> int:
+    """サーフェスの画素データのバイト数."""
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+def find_changed_rect(
+    reference: pygame.Surface,
+    frames: Sequence[pygame.Surface],
+    margin: int = MOUTH_RECT_MARGIN,
+) -> pygame.Rect | None:
+    """基準画像といずれかのフレームで色が異なる画素をすべて囲む矩形.
+
+    全身を描いた口形状画像の組から、口の矩形を自動で求めるのに使う。
+
+    Args:
+        reference: 基準画像
+        frames: 比較するフレーム（基準画像と同じサイズ）
+        margin: 矩形の余白（ピクセル）
+
+    Returns:
+        pygame.Rect | None: 変化する矩形（差がなければNone）
+    """
+    changed = np.zeros(reference.get_size(), dtype=bool)
+    if reference.get_bytesize() == 4 and all(f.get_bytesize() == 4 for f in frames):
+        # 32bitなら画素を整数のまま比較する（コピーしないので1080pでも速い）
+        r, g, b, _ = reference.get_masks()
+        rgb = np.uint32(r | g | b)
+        base = pygame.surfarray.pixels2d(reference)
+        for frame in frames:
+            if frame is not reference:
+                pixels = pygame.surfarray.pixels2d(frame)
+                changed |= ((pixels ^ base) & rgb) != 0
+                del pixels  # サーフェスのロックを解除
+        del base
+    else:
+        base = pygame.surfarray.array3d(reference)
+        for frame in frames:
+            if frame is not reference:
+                changed |= np.any(pygame.surfarray.array3d(frame) != base, axis=2)
+
+    xs = np.flatnonzero(changed.any(axis=1))
+    ys = np.flatnonzero(changed.any(axis=0))
+    if len(xs) == 0:
+        return None
+    rect = pygame.Rect(xs[0], ys[0], xs[-1] - xs[0] + 1, ys[-1] - ys[0] + 1)
+    return rect.inflate(2 * margin, 2 * margin).clip(reference.get_rect())
+
+
+class LayerCompositor:
+    """ベース・口・オーバーレイを重ね、変化した矩形だけを描き直す.
+
+    ベースレイヤーは最初の描画（とinvalidate()後）にだけ全体を描く。
+    口の画像は口の矩形と同じサイズで、ベースの上に合成済みの不透明な画像を想定する。
+    set_offset()でアバター全体をずらすと（呼吸など）、描画領域全体を描き直す。
+    """
+
+    def __init__(
+        self,
+        size: tuple[int, int],
+        base: pygame.Surface | None = None,
+        mouth_rect: pygame.Rect | None = None,
+    ):
+        """初期化.
+
+        Args:
+            size: アバターのサイズ
+            base: ベースレイヤー（Noneなら黒で塗る）
+            mouth_rect: 口の矩形（アバター内の座標、デフォルト: 全体）
+        """
+        self.size = size
+        self.base = base
+        self.mouth_rect = pygame.Rect(mouth_rect or ((0, 0), size))
+        self.overlays: list[Layer] = []
+        self.offset: tuple[int, int] = (0, 0)  # アバター全体のずれ
+        self.pixels_drawn = 0  # 描き直した画素数の累計
+        self._background = base.get_at((0, 0)) if base is not None else (0, 0, 0)
+        self._shifted = False
+        self._mouth: pygame.Surface | None = None
+        self._dirty: list[pygame.Rect] = [pygame.Rect((0, 0), size)]
+
+    def add_overlay(
+        self,
+        name: str,
+        surface: pygame.Surface,
+        position: tuple[int, int] = (0, 0),
+        visible: bool = True,
+    ) -> Layer:
+        """オーバーレイを追加（透明な周囲は切り詰めて保持する）.
+
+        Args:
+            name: レイヤー名
+            surface: 画像（透過あり）
+            position: 画像の左上のアバター内の位置
+            visible: 表示するか
+
+        Returns:
+            Layer: 追加したレイヤー
+        """
+        bounds = surface.get_bounding_rect()
+        layer = Layer(
+            name=name,
+            surface=surface.subsurface(bounds).copy(),
+            rect=bounds.move(position),
+            visible=visible,
+        )
+        self.overlays.append(layer)
+        self.invalidate(layer.rect)
+        return layer
+
+    def get_overlay(self, name: str) -> Layer | None:
+        """名前でオーバーレイを取得."""
+        for layer in self.overlays:
+            if layer.name == name:
+                return layer
+        return None
+
+    def set_overlay_visible(self, name: str, visible: bool) -> None:
+        """オーバーレイの表示を切り替え（変わった場合だけその矩形を描き直す）.
+
+        Args:
+            name: レイヤー名
+            visible: 表示するか
+
+        Raises:
+            KeyError: レイヤーがない場合
+        """
+        layer = self.get_overlay(name)
+        if layer is None:
+            raise KeyError(name)
+        if layer.visible != visible:
+            layer.visible = visible
+            self.invalidate(layer.rect)
+
+    def set_mouth(self, surface: pygame.Surface | None) -> None:
+        """口の画像を設定（前回と別の画像なら口の矩形を描き直す）.
+
+        Args:
+            surface: 口の矩形と同じサイズの画像
+        """
+        if surface is not self._mouth:
+            self._mouth = surface
+            self.invalidate(self.mouth_rect)
+
+    def set_offset(self, offset: tuple[int, int]) -> None:
+        """アバター全体のずれを設定（変わった場合は全体を描き直す）.
+
+        ずらして空いた部分はベースの左上の色で塗る。
+
+        Args:
+            offset: ずれ（x, y、ピクセル）
+        """
+        if offset != self.offset:
+            self.offset = offset
+            self._shifted = True
+            self.invalidate()
+
+    def invalidate(self, rect: pygame.Rect | None = None) -> None:
+        """次の描画で描き直す矩形を追加.
+
+        Args:
+            rect: アバター内の矩形（Noneで全体）
+        """
+        self._dirty.append(pygame.Rect(rect or ((0, 0), self.size)))
+
+    def render(self, target: pygame.Surface, origin: tuple[int, int] = (0, 0)) -> list[pygame.Rect]:
+        """変化した矩形を描き直す.
+
+        Args:
+            target: 描画先
+            origin: 描画先でのアバターの左上
+
+        Returns:
+            list[pygame.Rect]: 描き直した描画先の矩形（display.updateに渡す）
+        """
+        if not self._dirty:
+            return []
+
+        areas = merge_rects(self._dirty)
+        self._dirty = []
+        bounds = pygame.Rect(origin, self.size)
+        shifted, self._shifted = self._shifted, False
+        if shifted:
+            target.fill(self._background, bounds)
+
+        # ずらした分がはみ出しても隣の描画領域には描かない
+        draw_origin = (origin[0] + self.offset[0], origin[1] + self.offset[1])
+        clip = target.get_clip()
+        target.set_clip(bounds.clip(clip))
+        for area in areas:
+            self._paint(target, draw_origin, area)
+            self.pixels_drawn += area.width * area.height
+        target.set_clip(clip)
+
+        if shifted:
+            return [bounds]
+        return [area.move(draw_origin).clip(bounds) for area in areas]
+
+    def _paint(self, target: pygame.Surface, origin: tuple[int, int], area: pygame.Rect) -> None:
+        """アバター内の矩形をベースから順に描く."""
+        ox, oy = origin
+        if self.base is not None:
+            target.blit(self.base, (ox + area.x, oy + area.y), area)
+        else:
+            target.fill((0, 0, 0), area.move(origin))
+
+        if self._mouth is not None:
+            _blit_clipped(target, origin, area, self._mouth, self.mouth_rect)
+        for layer in self.overlays:
+            if layer.visible:
+                _blit_clipped(target, origin, area, layer.surface, layer.rect)
+
+    @property
+    def asset_bytes(self) -> int:
+        """ベースとオーバーレイの画素データのバイト数."""
+        total = surface_bytes(self.base) if self.base is not None else 0
+        return total + sum(surface_bytes(layer.surface) for layer in self.overlays)
+
+
+def _blit_clipped(
+    target: pygame.Surface,
+    origin: tuple[int, int],
+    area: pygame.Rect,
+    surface: pygame.Surface,
+    rect: pygame.Rect,
+) -> None:
+    """rectに置いた画像のうちareaに重なる部分だけを描く."""
+    clip = area.clip(rect)
+    if clip.width and clip.height:
+        target.blit(surface, (origin[0] + clip.x, origin[1] + clip.y), clip.move(-rect.x, -rect.y))
+
+
+def merge_rects(rects: Sequence[pygame.Rect]) -> list[pygame.Rect]:
+    """重なる矩形をまとめる（同じ画素を2回描かないように）."""
+    merged: list[pygame.Rect] = []
+    for rect in rects:
+        rect = rect.copy()
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
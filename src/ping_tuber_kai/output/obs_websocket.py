@@ -48,6 +48,7 @@ class OBSController:
 
         self._client: obs.ReqClient | None = None
         self._current_viseme: Viseme = Viseme.CLOSED
+        self._overlays: dict[str, bool] = {}  # 口形状以外のソースの表示状態
         self._connected: bool = False
 
     def connect(self) -> None:
@@ -106,6 +107,22 @@ class OBSController:
 
         self._current_viseme = viseme
 
+    def set_overlay_visible(self, name: str, visible: bool) -> None:
+        """口形状以外のソース（まばたきなど）の表示/非表示を設定.
+
+        ソース名は "{source_prefix}{name}" の形式。例: mouth_blink
+
+        Args:
+            name: ソース名（プレフィックスを除く）
+            visible: 表示する場合True
+        """
+        if not self._connected or self._client is None:
+            return
+        if self._overlays.get(name) == visible:
+            return
+        self._overlays[name] = visible
+        self._set_item_enabled(f"{self.source_prefix}{name}", visible)
+
     def _set_source_visible(self, viseme: Viseme, visible: bool) -> None:
         """ソースの表示/非表示を設定.
 
@@ -113,11 +130,18 @@ class OBSController:
             viseme: 口形状
             visible: 表示する場合True
         """
+        self._set_item_enabled(f"{self.source_prefix}{viseme.value}", visible)
+
+    def _set_item_enabled(self, source_name: str, visible: bool) -> None:
+        """現在のシーンのソースの表示/非表示を設定.
+
+        Args:
+            source_name: ソース名
+            visible: 表示する場合True
+        """
         if self._client is None:
             return
 
-        source_name = f"{self.source_prefix}{viseme.value}"
-
         try:
             # 現在のシーンを取得
             scene_resp = self._client.get_current_program_scene()
@@ -134,9 +158,12 @@ class OBSController:
             pass
 
     def hide_all(self) -> None:
-        """すべての口形状ソースを非表示."""
+        """すべての口形状ソース（と表示中のまばたきなどのソース）を非表示."""
         for viseme in Viseme:
             self._set_source_visible(viseme, False)
+        for name, visible in list(self._overlays.items()):
+            if visible:
+                self.set_overlay_visible(name, False)
 
     @property
     def is_connected(self) -> bool:
@@ -0,0 +1,237 @@
+"""OSC/VMC出力モジュール.
+
+口形状（とブレンド）を母音ごとのパラメータ（A・I・U・E・O、0.0〜1.0）に変換し、
+Live2D・3Dアバターのアプリ（VMCプロトコル対応アプリなど）にUDPで送る。
+送信は専用のスレッドで行い、描画ループからは最新の値を渡すだけにする。
+値が変わったときだけ送り（間隔はrateで制限）、変わらない間もheartbeatごとに送り直す。
+"""
+
+import socket
+import struct
+import threading
+import time
+from collections.abc import Sequence
+
+from ..config import settings
+from ..lipsync.blend import VisemeBlend
+from ..lipsync.viseme import Viseme
+
+# 口形状 → 母音パラメータ名（VRMの表情プリセット名）
+VOWEL_PARAMETERS: dict[Viseme, str] = {
+    Viseme.A: "A",
+    Viseme.I: "I",
+    Viseme.U: "U",
+    Viseme.E: "E",
+    Viseme.O: "O",
+}
+
+# VMCプロトコルのアドレス
+VMC_BLEND_VALUE = "/VMC/Ext/Blend/Val"
+VMC_BLEND_APPLY = "/VMC/Ext/Blend/Apply"
+
+# OSCバンドルのタイムタグ（即時）
+IMMEDIATELY = 1
+
+# 値を丸める桁数（わずかな差では送り直さない）
+PARAMETER_DIGITS = 3
+
+OscArgument = str | float | int
+
+
+def _pad(data: bytes) -> bytes:
+    """OSC文字列（NUL終端、4バイト境界まで埋める）."""
+    return data + b"\0" * (4 - len(data) % 4)
+
+
+def encode_message(address: str, *args: OscArgument) -> bytes:
+    """OSCメッセージを組み立てる.
+
+    Args:
+        address: アドレス（例: /VMC/Ext/Blend/Val）
+        *args: 引数（str・float・int）
+
+    Returns:
+        bytes: メッセージ
+    """
+    tags = ","
+    payload = b""
+    for arg in args:
+        if isinstance(arg, str):
+            tags += "s"
+            payload += _pad(arg.encode())
+        elif isinstance(arg, int):
+            tags += "i"
+            payload += struct.pack(">i", arg)
+        else:
+            tags += "f"
+            payload += struct.pack(">f", arg)
+    return _pad(address.encode()) + _pad(tags.encode()) + payload
+
+
+def encode_bundle(messages: Sequence[bytes]) -> bytes:
+    """OSCバンドルを組み立てる（1つのUDPパケットで送る）.
+
+    Args:
+        messages: encode_message()で組み立てたメッセージ
+
+    Returns:
+        bytes: バンドル
+    """
+    data = _pad(b"#bundle") + struct.pack(">Q", IMMEDIATELY)
+    for message in messages:
+        data += struct.pack(">i", len(message)) + message
+    return data
+
+
+def viseme_parameters(viseme: Viseme, blend: VisemeBlend | None = None) -> dict[str, float]:
+    """口形状を母音ごとのパラメータに変換.
+
+    「ん」・閉じはすべて0。ブレンドがあれば上位2形状を混合率で按分する。
+
+    Args:
+        viseme: 口形状
+        blend: 口形状ブレンド（指定時はこちらを使う）
+
+    Returns:
+        dict[str, float]: パラメータ名 → 値（0.0〜1.0）
+    """
+    values = dict.fromkeys(VOWEL_PARAMETERS.values(), 0.0)
+    weights = [(viseme, 1.0)]
+    if blend is not None:
+        weights = [(blend.primary, 1.0 - blend.mix), (blend.secondary, blend.mix)]
+    for shape, weight in weights:
+        name = VOWEL_PARAMETERS.get(shape)
+        if name is not None:
+            values[name] = round(values[name] + weight, PARAMETER_DIGITS)
+    return values
+
+
+class OSCSink:
+    """母音パラメータをUDPで送る出力先.
+
+    set_viseme()は描画ループから毎フレーム呼んでよい（値を置き換えて送信スレッドを起こすだけ）。
+    送信は1つのソケットを使い回し、rate（Hz）を超える頻度では送らない。
+    """
+
+    def __init__(
+        self,
+        host: str | None = None,
+        port: int | None = None,
+        protocol: str | None = None,
+        rate: float | None = None,
+        heartbeat: float | None = None,
+    ):
+        """初期化.
+
+        Args:
+            host: 送信先ホスト（デフォルト: 設定から取得）
+            port: 送信先ポート（デフォルト: 設定から取得）
+            protocol: "vmc"（/VMC/Ext/Blend/Val）か "osc"（{osc_address}{名前}）
+            rate: 最大送信頻度（Hz、デフォルト: 設定から取得）
+            heartbeat: 値が変わらない間に送り直す間隔（秒、デフォルト: 設定から取得）
+        """
+        self.host = host or settings.osc_host
+        self.port = port or settings.osc_port
+        self.protocol = protocol or settings.osc_protocol
+        self.rate = rate or settings.osc_rate
+        self.heartbeat = heartbeat or settings.osc_heartbeat
+        self.packets_sent = 0  # 送ったパケット数
+        self.errors = 0  # 送信に失敗した回数
+
+        self._values = viseme_parameters(Viseme.CLOSED)
+        self._sent: dict[str, float] | None = None
+        self._sent_at = 0.0
+        self._lock = threading.Lock()
+        self._changed = threading.Event()
+        self._closed = threading.Event()
+        self._socket: socket.socket | None = None
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """ソケットを開き、送信スレッドを開始."""
+        if self._thread is not None:
+            return
+        self._closed.clear()
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._thread = threading.Thread(target=self._run, name="osc-sink", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """送信スレッドを止め、口を閉じた値を送ってソケットを閉じる."""
+        if self._thread is None:
+            return
+        self._closed.set()
+        self._changed.set()
+        self._thread.join()
+        self._thread = None
+        self._send(viseme_parameters(Viseme.CLOSED))
+        self._socket.close()
+        self._socket = None
+
+    def __enter__(self) -> "OSCSink":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def set_viseme(self, viseme: Viseme, blend: VisemeBlend | None = None) -> None:
+        """送る口形状を設定（値が変わった場合だけ送信スレッドを起こす）.
+
+        Args:
+            viseme: 口形状
+            blend: 口形状ブレンド（指定時は上位2形状を混合）
+        """
+        values = viseme_parameters(viseme, blend)
+        with self._lock:
+            if values == self._values:
+                return
+            self._values = values
+        self._changed.set()
+
+    def encode(self, values: dict[str, float]) -> bytes:
+        """パラメータを1パケットに組み立てる.
+
+        Args:
+            values: パラメータ名 → 値
+
+        Returns:
+            bytes: OSCバンドル
+        """
+        if self.protocol == "vmc":
+            messages = [encode_message(VMC_BLEND_VALUE, name, v) for name, v in values.items()]
+            messages.append(encode_message(VMC_BLEND_APPLY))
+        else:
+            messages = [
+                encode_message(f"{settings.osc_address}{name}", v) for name, v in values.items()
+            ]
+        return encode_bundle(messages)
+
+    def _run(self) -> None:
+        """送信スレッド（変化かheartbeatまで眠り、送ったら1/rate秒は送らない）."""
+        interval = 1.0 / self.rate
+        while not self._closed.is_set():
+            now = time.monotonic()
+            if self._sent is not None:
+                self._changed.wait(max(self._sent_at + self.heartbeat - now, 0.0))
+            if self._closed.is_set():
+                break
+            self._changed.clear()
+            with self._lock:
+                values = self._values
+
+            now = time.monotonic()
+            if values != self._sent or now - self._sent_at >= self.heartbeat:
+                self._send(values)
+                self._sent = values
+                self._sent_at = now
+                # 間隔内の変化は次の送信にまとめる
+                self._closed.wait(interval)
+
+    def _send(self, values: dict[str, float]) -> None:
+        try:
+            self._socket.sendto(self.encode(values), (self.host, self.port))
+            self.packets_sent += 1
+        except OSError:
+            # 受信側が起動していない場合などは次の送信で再試行
+            self.errors += 1
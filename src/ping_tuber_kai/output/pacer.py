@@ -0,0 +1,147 @@
+"""フレームペーサーモジュール.
+
+pygame.time.Clock.tickはミリ秒単位の粗いスリープで待つため、フレーム間隔が数ミリ秒ぶれる。
+FramePacerは一定間隔の締め切り（deadline）を並べ、締め切りの少し手前までスリープしてから
+残りをスピンで待つ。スリープの寝過ごし量は計測して手前に取る幅に反映する。
+
+描画が遅れて締め切りを過ぎたフレームは詰めて取り戻さず、次の締め切りまで飛ばす。
+描画ループは締め切りの時刻（時計（Clock.now）の値）で口形状を求めるので、起きた時刻がぶれても
+音声のサンプルクロックと位相が揃う。
+"""
+
+import math
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from ..config import settings
+from ..player.audio import LatencyStats
+
+# 締め切りをこの割合（周期比）以上過ぎたら、そのフレームは飛ばす
+LATE_TOLERANCE = 0.5
+
+# スリープの寝過ごし量の推定に使う最小の幅（秒）
+MIN_SPIN = 0.0002
+
+
+@dataclass
+class FrameStats:
+    """フレームのタイミング統計."""
+
+    frames: int = 0  # 待ったフレーム数
+    dropped: int = 0  # 遅れて飛ばした締め切りの数
+    lateness: LatencyStats = field(default_factory=LatencyStats)  # 締め切りから起きるまで
+    jitter: LatencyStats = field(default_factory=LatencyStats)  # フレーム間隔と周期の差（絶対値）
+    spin: float = 0.0  # スピンで待った時間の累計（秒）
+
+
+class FramePacer:
+    """締め切りベースのフレームペーサー（スリープ＋スピン）."""
+
+    def __init__(
+        self,
+        fps: int | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+        sleep: Callable[[float], None] = time.sleep,
+        spin_max: float | None = None,
+    ):
+        """初期化.
+
+        Args:
+            fps: フレームレート（デフォルト: 設定から取得）
+            clock: 時計（秒、Clock.nowなど）
+            sleep: スリープ関数
+            spin_max: スピンで待つ最大時間（秒、デフォルト: 設定から取得、0でスリープのみ）
+        """
+        self.fps = fps or settings.fps
+        self.clock = clock
+        self.sleep = sleep
+        self.spin_max = settings.frame_spin_max if spin_max is None else spin_max
+        self.stats = FrameStats()
+        self.deadline: float | None = None  # 直前に待った締め切り
+        self._woke_at: float | None = None
+        # スリープの寝過ごし量（平均・分散、Welford法）
+        self._oversleep_count = 0
+        self._oversleep_mean = 0.0
+        self._oversleep_m2 = 0.0
+
+    @property
+    def period(self) -> float:
+        """フレーム周期（秒）."""
+        return 1.0 / self.fps
+
+    def reset(self) -> None:
+        """締め切りを現在時刻から並べ直す（アイドルで眠った後など）."""
+        self.deadline = None
+        self._woke_at = None
+
+    def wait(self, fps: int | None = None) -> float:
+        """次の締め切りまで待つ.
+
+        Args:
+            fps: フレームレート（変わった場合は現在時刻から並べ直す）
+
+        Returns:
+            float: 前のフレームからの経過時間（秒）
+        """
+        if fps and fps != self.fps:
+            self.fps = fps
+            self.reset()
+
+        now = self.clock()
+        if self.deadline is None:
+            self.deadline = now
+            self._woke_at = now
+            return 0.0
+
+        period = self.period
+        deadline = self.deadline + period
+        late = now - deadline
+        if late > period * LATE_TOLERANCE:
+            # 取り戻さずに次の締め切りまで飛ばす
+            skipped = math.floor(late / period) + 1
+            self.stats.dropped += skipped
+            deadline += skipped * period
+
+        self._wait_until(deadline)
+        woke_at = self.clock()
+        self.stats.frames += 1
+        self.stats.lateness.add(max(woke_at - deadline, 0.0))
+        interval = woke_at - self._woke_at
+        self.stats.jitter.add(abs(interval - period))
+        self.deadline = deadline
+        self._woke_at = woke_at
+        return interval
+
+    def _wait_until(self, deadline: float) -> None:
+        """寝過ごしの推定ぶん手前までスリープし、残りはスピンで待つ."""
+        margin = self._spin_margin()
+        remaining = deadline - self.clock()
+        if remaining > margin:
+            target = remaining - margin
+            slept_from = self.clock()
+            self.sleep(target)
+            self._observe(self.clock() - slept_from - target)
+        if self.spin_max <= 0:
+            return
+
+        spin_from = self.clock()
+        now = spin_from
+        while now < deadline:
+            now = self.clock()
+        self.stats.spin += now - spin_from
+
+    def _spin_margin(self) -> float:
+        """スピンで待つ幅（寝過ごし量の平均＋3σ、spin_maxまで）."""
+        if self.spin_max <= 0:
+            return 0.0
+        if self._oversleep_count < 2:
+            return self.spin_max
+        sigma = math.sqrt(self._oversleep_m2 / (self._oversleep_count - 1))
+        return min(max(self._oversleep_mean + 3 * sigma, MIN_SPIN), self.spin_max)
+
+    def _observe(self, oversleep: float) -> None:
+        self._oversleep_count += 1
+        delta = oversleep - self._oversleep_mean
+        self._oversleep_mean += delta / self._oversleep_count
+        self._oversleep_m2 += delta * (oversleep - self._oversleep_mean)
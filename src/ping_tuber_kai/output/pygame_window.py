@@ -1,15 +1,75 @@
 """PyGame表示モジュール."""
 
+from collections import OrderedDict
 from pathlib import Path
 
 import pygame
 
+from ..clock import Clock
 from ..config import settings
+from ..lipsync.blend import VisemeBlend
+from ..lipsync.openness import Openness
 from ..lipsync.viseme import Viseme, get_viseme_image_name
+from .compositor import LayerCompositor, find_changed_rect, surface_bytes
+from .pacer import FramePacer
+
+# ベースレイヤー画像（あれば口形状画像は口の矩形サイズの部品として扱う）
+BASE_IMAGE_NAME = "base.png"
+
+# オーバーレイ画像のプレフィックス（例: overlay_eyes.png → レイヤー名 eyes）
+OVERLAY_PREFIX = "overlay_"
+
+# ブレンド率の量子化段数（キャッシュキーに使う）
+BLEND_LEVELS = 16
+
+# ブレンド済みサーフェスのキャッシュ上限
+BLEND_CACHE_SIZE = 64
+
+# プレースホルダーの開き具合ごとの口の縦倍率
+PLACEHOLDER_OPENNESS_SCALE: dict[Openness, float] = {
+    Openness.SMALL: 0.6,
+    Openness.NORMAL: 1.0,
+    Openness.WIDE: 1.5,
+}
+
+
+# プレースホルダーの口の大きさ（幅, 高さ）
+PLACEHOLDER_MOUTH_SHAPES: dict[Viseme, tuple[int, int]] = {
+    Viseme.A: (100, 60),  # 大きく開く
+    Viseme.I: (80, 20),  # 横に広げる
+    Viseme.U: (30, 40),  # すぼめる
+    Viseme.E: (70, 30),  # 少し開く+横
+    Viseme.O: (50, 50),  # 丸く開く
+    Viseme.N: (40, 10),  # 軽く閉じ
+    Viseme.CLOSED: (40, 5),  # 閉じ
+}
+
+
+def get_mouth_rect(width: int, height: int) -> pygame.Rect:
+    """base.png使用時の口レイヤーの矩形.
+
+    Args:
+        width: 描画領域の幅
+        height: 描画領域の高さ
+
+    Returns:
+        pygame.Rect: 設定の矩形（未指定時は中央下）
+    """
+    bounds = pygame.Rect(0, 0, width, height)
+    if settings.mouth_rect is not None:
+        return pygame.Rect(settings.mouth_rect).clip(bounds)
+    rect = pygame.Rect(0, 0, width // 3, height // 4)
+    rect.center = (width // 2, height * 2 // 3)
+    return rect
 
 
 class PygameWindow:
-    """PyGameウィンドウ."""
+    """PyGameウィンドウ.
+
+    表示はベース・口・オーバーレイのレイヤーに分けて合成し、口形状が変わったときは
+    口の矩形だけを描き直す。アセットにbase.pngがあれば口形状画像は口の矩形サイズの部品、
+    なければ従来の全身画像として読み込み、画像間の差分から口の矩形を求めて切り出す。
+    """
 
     def __init__(
         self,
@@ -17,57 +77,181 @@ class PygameWindow:
         height: int | None = None,
         title: str = "ping-tuber-kai",
         assets_dir: Path | None = None,
+        position: tuple[int, int] = (0, 0),
+        clock: Clock | None = None,
     ):
         """初期化.
 
         Args:
-            width: ウィンドウ幅
-            height: ウィンドウ高さ
+            width: ウィンドウ幅（共有時は描画領域の幅）
+            height: ウィンドウ高さ（共有時は描画領域の高さ）
             title: ウィンドウタイトル
             assets_dir: 口形状アセットディレクトリ
+            position: 画面内の描画位置（複数アバターで1つの画面を共有する場合）
+            clock: フレームの締め切りに使う時計（デフォルト: 実時間）
         """
         self.width = width or settings.window_width
         self.height = height or settings.window_height
         self.title = title
         self.assets_dir = assets_dir or settings.mouth_assets_dir
+        self.position = position
+        self.clock = clock or Clock()
 
         self._screen: pygame.Surface | None = None
-        self._clock: pygame.time.Clock | None = None
+        self._compositor: LayerCompositor | None = None
+        self._pacer: FramePacer | None = None
         self._images: dict[Viseme, pygame.Surface] = {}
+        self._variants: dict[tuple[Viseme, Openness], pygame.Surface] = {}
+        self._blend_cache: OrderedDict[tuple[Viseme, Viseme, int, Openness], pygame.Surface] = (
+            OrderedDict()
+        )
         self._current_viseme: Viseme = Viseme.CLOSED
+        self._current_openness: Openness = Openness.NORMAL
+        self._current_blend: VisemeBlend = VisemeBlend(Viseme.CLOSED, Viseme.CLOSED, 0.0)
         self._running: bool = False
         self._initialized: bool = False
+        self._owns_display: bool = True
+
+    def init(
+        self,
+        screen: pygame.Surface | None = None,
+        screen_size: tuple[int, int] | None = None,
+    ) -> None:
+        """PyGame初期化.
 
-    def init(self) -> None:
-        """PyGame初期化."""
+        Args:
+            screen: 共有する画面（指定時はウィンドウを作らず、この画面のpositionに描画）
+            screen_size: 作成するウィンドウのサイズ（デフォルト: width x height）
+        """
         if self._initialized:
             return
 
-        pygame.init()
-        self._screen = pygame.display.set_mode((self.width, self.height))
-        pygame.display.set_caption(self.title)
-        self._clock = pygame.time.Clock()
+        if screen is None:
+            pygame.init()
+            self._screen = pygame.display.set_mode(screen_size or (self.width, self.height))
+            pygame.display.set_caption(self.title)
+            self._owns_display = True
+        else:
+            self._screen = screen
+            self._owns_display = False
+        # 仮想時間ではスリープが締め切りちょうどに起きるのでスピンしない
+        self._pacer = FramePacer(
+            clock=self.clock.now,
+            sleep=self.clock.sleep,
+            spin_max=0.0 if self.clock.exact_sleep else None,
+        )
         self._load_images()
         self._initialized = True
 
     def _load_images(self) -> None:
-        """口形状画像を読み込み."""
+        """口形状・ベース・オーバーレイ画像を読み込み、レイヤーを組み立てる."""
+        base = self._load_image(BASE_IMAGE_NAME)
+        if base is not None:
+            self._compositor = self._load_mouth_parts(base)
+        else:
+            self._compositor = self._load_frames()
+
+        for path in sorted(self.assets_dir.glob(f"{OVERLAY_PREFIX}*.png")):
+            image = pygame.image.load(str(path))
+            image = pygame.transform.scale(image, (self.width, self.height)).convert_alpha()
+            self._compositor.add_overlay(path.stem.removeprefix(OVERLAY_PREFIX), image)
+
+    def _load_frames(self) -> LayerCompositor:
+        """全身の口形状画像を読み込み、閉じ口をベースに口の矩形だけを切り出す.
+
+        開き具合の差分画像（例: a_small.png, a_wide.png）があれば併せて読み込む。
+        通常画像がプレースホルダーの場合は差分もプレースホルダーで生成する。
+
+        Returns:
+            LayerCompositor: 閉じ口の画像をベースにしたコンポジタ
+        """
         for viseme in Viseme:
-            image_path = self.assets_dir / get_viseme_image_name(viseme)
-            if image_path.exists():
-                img = pygame.image.load(str(image_path))
-                # ウィンドウサイズにスケール
-                img = pygame.transform.scale(img, (self.width, self.height))
-                self._images[viseme] = img
-            else:
+            image = self._load_image(get_viseme_image_name(viseme))
+            placeholder = image is None
+            if placeholder:
                 # 画像がない場合はプレースホルダーを生成
-                self._images[viseme] = self._create_placeholder(viseme)
+                image = self._create_placeholder(viseme).convert()
+            self._images[viseme] = image
+
+            for openness in (Openness.SMALL, Openness.WIDE):
+                variant = self._load_image(get_viseme_image_name(viseme, openness))
+                if variant is None and placeholder:
+                    variant = self._create_placeholder(viseme, openness).convert()
+                if variant is not None:
+                    self._variants[(viseme, openness)] = variant
+
+        # 全画像で変化する範囲を口の矩形として切り出し、全身画像は閉じ口の1枚だけ残す
+        base = self._images[Viseme.CLOSED]
+        frames = [*self._images.values(), *self._variants.values()]
+        rect = find_changed_rect(base, frames) or base.get_rect()
+        self._images = {v: image.subsurface(rect).copy() for v, image in self._images.items()}
+        self._variants = {k: image.subsurface(rect).copy() for k, image in self._variants.items()}
+        return LayerCompositor((self.width, self.height), base, rect)
+
+    def _load_mouth_parts(self, base: pygame.Surface) -> LayerCompositor:
+        """ベース画像と口の矩形サイズの口形状画像を読み込む.
+
+        口形状画像は透過ありの部品として口の矩形に合わせてスケールし、
+        ベースの同じ範囲に重ねた不透明な画像にしておく。
+
+        Args:
+            base: ウィンドウサイズのベース画像
 
-    def _create_placeholder(self, viseme: Viseme) -> pygame.Surface:
+        Returns:
+            LayerCompositor: ベース画像のコンポジタ
+        """
+        rect = get_mouth_rect(self.width, self.height)
+
+        def compose(part: pygame.Surface) -> pygame.Surface:
+            surface = base.subsurface(rect).copy()
+            surface.blit(part, (0, 0))
+            return surface
+
+        for viseme in Viseme:
+            part = self._load_image(get_viseme_image_name(viseme), rect.size)
+            placeholder = part is None
+            if placeholder:
+                part = self._create_mouth_placeholder(viseme, rect.size)
+            self._images[viseme] = compose(part)
+
+            for openness in (Openness.SMALL, Openness.WIDE):
+                variant = self._load_image(get_viseme_image_name(viseme, openness), rect.size)
+                if variant is None and placeholder:
+                    variant = self._create_mouth_placeholder(viseme, rect.size, openness)
+                if variant is not None:
+                    self._variants[(viseme, openness)] = compose(variant)
+
+        return LayerCompositor((self.width, self.height), base, rect)
+
+    def _load_image(self, name: str, size: tuple[int, int] | None = None) -> pygame.Surface | None:
+        """画像を読み込み、指定サイズ・表示フォーマットに変換.
+
+        Args:
+            name: 画像ファイル名
+            size: スケール後のサイズ（指定時は透過を保持、デフォルト: ウィンドウサイズ）
+
+        Returns:
+            pygame.Surface | None: 画像（存在しない場合None）
+        """
+        image_path = self.assets_dir / name
+        if not image_path.exists():
+            return None
+
+        img = pygame.image.load(str(image_path))
+        img = pygame.transform.scale(img, size or (self.width, self.height))
+        # 表示フォーマットに変換して毎フレームのblitを高速化
+        return img.convert_alpha() if size is not None else img.convert()
+
+    def _create_placeholder(
+        self,
+        viseme: Viseme,
+        openness: Openness = Openness.NORMAL,
+    ) -> pygame.Surface:
         """プレースホルダー画像を生成.
 
         Args:
             viseme: 口形状
+            openness: 開き具合
 
         Returns:
             pygame.Surface: プレースホルダー画像
@@ -82,16 +266,8 @@ class PygameWindow:
         surface.blit(text, text_rect)
 
         # 口の形を簡易描画
-        mouth_shapes = {
-            Viseme.A: (100, 60),  # 大きく開く
-            Viseme.I: (80, 20),  # 横に広げる
-            Viseme.U: (30, 40),  # すぼめる
-            Viseme.E: (70, 30),  # 少し開く+横
-            Viseme.O: (50, 50),  # 丸く開く
-            Viseme.N: (40, 10),  # 軽く閉じ
-            Viseme.CLOSED: (40, 5),  # 閉じ
-        }
-        w, h = mouth_shapes.get(viseme, (40, 20))
+        w, h = PLACEHOLDER_MOUTH_SHAPES.get(viseme, (40, 20))
+        h = max(int(h * PLACEHOLDER_OPENNESS_SCALE[openness]), 1)
         mouth_rect = pygame.Rect(
             (self.width - w) // 2,
             self.height // 2 + 50,
@@ -102,6 +278,31 @@ class PygameWindow:
 
         return surface
 
+    def _create_mouth_placeholder(
+        self,
+        viseme: Viseme,
+        size: tuple[int, int],
+        openness: Openness = Openness.NORMAL,
+    ) -> pygame.Surface:
+        """口の矩形サイズのプレースホルダー部品を生成（背景は透過）.
+
+        Args:
+            viseme: 口形状
+            size: 口の矩形のサイズ
+            openness: 開き具合
+
+        Returns:
+            pygame.Surface: プレースホルダー部品
+        """
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        w, h = PLACEHOLDER_MOUTH_SHAPES.get(viseme, (40, 20))
+        w = min(w, size[0])
+        h = min(max(int(h * PLACEHOLDER_OPENNESS_SCALE[openness]), 1), size[1])
+        mouth_rect = pygame.Rect(0, 0, w, h)
+        mouth_rect.center = (size[0] // 2, size[1] // 2)
+        pygame.draw.ellipse(surface, (200, 100, 100), mouth_rect)
+        return surface
+
     def set_viseme(self, viseme: Viseme) -> None:
         """表示するVisemeを設定.
 
@@ -109,31 +310,153 @@ class PygameWindow:
             viseme: 口形状
         """
         self._current_viseme = viseme
+        self._current_blend = VisemeBlend(viseme, viseme, 0.0)
 
-    def update(self) -> bool:
-        """画面更新.
+    def set_blend(self, blend: VisemeBlend) -> None:
+        """表示する口形状ブレンドを設定.
+
+        上位2形状をアルファブレンドして表示する。
+
+        Args:
+            blend: 口形状ブレンド
+        """
+        self._current_viseme = blend.primary
+        self._current_blend = blend
+
+    def set_openness(self, openness: Openness) -> None:
+        """口の開き具合を設定.
+
+        差分画像がない口形状は通常画像のまま表示する。
+
+        Args:
+            openness: 開き具合
+        """
+        self._current_openness = openness
+
+    def _get_image(self, viseme: Viseme) -> pygame.Surface | None:
+        """現在の開き具合に対応する口形状画像を取得.
+
+        Args:
+            viseme: 口形状
 
         Returns:
-            bool: 継続する場合True、終了する場合False
+            pygame.Surface | None: 画像
         """
-        if not self._initialized or self._screen is None:
-            return False
+        if self._current_openness != Openness.NORMAL:
+            variant = self._variants.get((viseme, self._current_openness))
+            if variant is not None:
+                return variant
+        return self._images.get(viseme)
 
-        # イベント処理
+    def _get_frame_surface(self) -> pygame.Surface | None:
+        """現在のブレンドに対応するサーフェスを取得.
+
+        ブレンド率をBLEND_LEVELS段に量子化し、合成結果をLRUキャッシュする。
+
+        Returns:
+            pygame.Surface | None: 描画するサーフェス
+        """
+        blend = self._current_blend
+        level = round(blend.mix * BLEND_LEVELS)
+        if level == 0 or blend.primary == blend.secondary:
+            return self._get_image(blend.primary)
+
+        key = (blend.primary, blend.secondary, level, self._current_openness)
+        surface = self._blend_cache.get(key)
+        if surface is not None:
+            self._blend_cache.move_to_end(key)
+            return surface
+
+        base = self._get_image(blend.primary)
+        overlay = self._get_image(blend.secondary)
+        if base is None or overlay is None:
+            return base
+
+        surface = base.copy()
+        overlay.set_alpha(round(255 * level / BLEND_LEVELS))
+        surface.blit(overlay, (0, 0))
+        overlay.set_alpha(None)
+
+        self._blend_cache[key] = surface
+        if len(self._blend_cache) > BLEND_CACHE_SIZE:
+            self._blend_cache.popitem(last=False)
+        return surface
+
+    def handle_events(self) -> bool:
+        """イベント処理.
+
+        Returns:
+            bool: 継続する場合True、終了する場合False
+        """
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return False
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     return False
+        return True
 
-        # 描画
-        if self._current_viseme in self._images:
-            self._screen.blit(self._images[self._current_viseme], (0, 0))
-        else:
-            self._screen.fill((0, 0, 0))
+    def draw(self) -> list[pygame.Rect]:
+        """変化したレイヤーの矩形を画面のpositionに描画（画面への反映はしない）.
+
+        Returns:
+            list[pygame.Rect]: 描き直した画面上の矩形（変化がなければ空）
+        """
+        if self._screen is None or self._compositor is None:
+            return []
 
-        pygame.display.flip()
+        self._compositor.set_mouth(self._get_frame_surface())
+        return self._compositor.render(self._screen, self.position)
+
+    def invalidate(self) -> None:
+        """次の描画で描画領域全体を描き直す（画面を他で塗りつぶした場合など）."""
+        if self._compositor is not None:
+            self._compositor.invalidate()
+
+    def has_overlay(self, name: str) -> bool:
+        """オーバーレイ（overlay_<name>.png）があるか."""
+        return self._compositor is not None and self._compositor.get_overlay(name) is not None
+
+    def set_offset(self, offset: tuple[int, int]) -> None:
+        """アバター全体の描画位置のずれを設定（呼吸などの動き）.
+
+        Args:
+            offset: ずれ（x, y、ピクセル）
+        """
+        if self._compositor is not None:
+            self._compositor.set_offset(offset)
+
+    def set_overlay_visible(self, name: str, visible: bool) -> None:
+        """オーバーレイ（overlay_<name>.png）の表示を切り替え.
+
+        Args:
+            name: レイヤー名
+            visible: 表示するか
+
+        Raises:
+            KeyError: オーバーレイがない場合
+        """
+        if self._compositor is None:
+            raise KeyError(name)
+        self._compositor.set_overlay_visible(name, visible)
+
+    def update(self) -> bool:
+        """画面更新（変化した矩形だけを反映）.
+
+        Returns:
+            bool: 継続する場合True、終了する場合False
+        """
+        if not self._initialized or self._screen is None:
+            return False
+
+        # イベント処理
+        if not self.handle_events():
+            return False
+
+        # 描画
+        rects = self.draw()
+        if rects:
+            pygame.display.update(rects)
         return True
 
     def tick(self, fps: int | None = None) -> float:
@@ -145,18 +468,22 @@ class PygameWindow:
         Returns:
             float: 前フレームからの経過時間（ミリ秒）
         """
-        if self._clock is None:
+        if self._pacer is None:
             return 0.0
-        return self._clock.tick(fps or settings.fps)
+        return self._pacer.wait(fps) * 1000
 
     def quit(self) -> None:
         """PyGame終了."""
         if self._initialized:
-            pygame.quit()
+            if self._owns_display:
+                pygame.quit()
             self._initialized = False
             self._screen = None
-            self._clock = None
+            self._compositor = None
+            self._pacer = None
             self._images.clear()
+            self._variants.clear()
+            self._blend_cache.clear()
 
     def __enter__(self) -> "PygameWindow":
         self.init()
@@ -165,6 +492,29 @@ class PygameWindow:
     def __exit__(self, *args) -> None:
         self.quit()
 
+    @property
+    def pacer(self) -> FramePacer | None:
+        """フレームペーサー（初期化前はNone）."""
+        return self._pacer
+
+    @property
+    def screen(self) -> pygame.Surface | None:
+        """描画先の画面（初期化前はNone）."""
+        return self._screen
+
+    @property
+    def compositor(self) -> LayerCompositor | None:
+        """レイヤーのコンポジタ（初期化前はNone）."""
+        return self._compositor
+
+    @property
+    def asset_bytes(self) -> int:
+        """読み込んだ画像の画素データのバイト数（ブレンドキャッシュを除く）."""
+        if self._compositor is None:
+            return 0
+        images = [*self._images.values(), *self._variants.values()]
+        return self._compositor.asset_bytes + sum(surface_bytes(image) for image in images)
+
     @property
     def is_initialized(self) -> bool:
         """初期化済みかどうか."""
@@ -0,0 +1,261 @@
+"""共有メモリのフレーム出力モジュール.
+
+合成済みの画面をRGBAのまま共有メモリのリングバッファに書き込み、キャプチャなど
+別プロセスがウィンドウを画面キャプチャせずにコピーなしで読めるようにする。
+書き込むのは画面が変化したフレームだけで、描き直した矩形だけをスロットに反映する。
+
+レイアウト（リトルエンディアン、各フレームは64バイト境界から始まる）:
+    ヘッダ（64バイト）: magic "PTKF", version, width, height, slots, stride,
+        最新のシーケンス番号（u64、オフセット32）, その時刻（f64、オフセット40）
+    スロット × slots: シーケンス番号（u64）, 時刻（f64）, 余白 → 画素（height × stride）
+
+書き込み中のスロットはシーケンス番号を0にしておくので、読み手はフレームを使い終わった
+後にシーケンス番号が変わっていないこと（SharedFrame.is_valid）を確かめる。
+"""
+
+import struct
+import time
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import pygame
+
+from ..config import settings
+from .compositor import merge_rects
+
+MAGIC = b"PTKF"
+VERSION = 1
+
+# ヘッダ: magic, version, width, height, slots, stride
+HEADER_FORMAT = "<4s5I"
+HEADER_SIZE = 64
+LATEST_OFFSET = 32  # 最新のシーケンス番号・時刻
+
+# スロットごと: シーケンス番号, 時刻
+SLOT_FORMAT = "<Qd"
+SLOT_HEADER_SIZE = 64
+
+
+class SharedFrameError(Exception):
+    """共有メモリのフレーム出力のエラー."""
+
+    pass
+
+
+def _slot_offset(index: int, frame_bytes: int) -> int:
+    return HEADER_SIZE + index * (SLOT_HEADER_SIZE + frame_bytes)
+
+
+class SharedFrameWriter:
+    """画面をRGBAで共有メモリのリングバッファに書き込む."""
+
+    def __init__(
+        self,
+        size: tuple[int, int],
+        name: str | None = None,
+        slots: int | None = None,
+    ):
+        """初期化（共有メモリを作成）.
+
+        Args:
+            size: フレームのサイズ（幅, 高さ）
+            name: 共有メモリ名（デフォルト: 設定から取得）
+            slots: スロット数（デフォルト: 設定から取得、読み手が読む間に上書きされないよう3以上）
+
+        Raises:
+            SharedFrameError: 共有メモリを作成できない場合
+        """
+        self.width, self.height = size
+        self.slots = slots or settings.shared_frames_slots
+        self.stride = self.width * 4
+        self.frame_bytes = self.stride * self.height
+        self.sequence = 0  # 最後に書き込んだフレームの番号（1から）
+        self.pixels_written = 0  # 書き込んだ画素数の累計
+
+        name = name or settings.shared_frames_name
+        try:
+            self._shm = shared_memory.SharedMemory(
+                name=name, create=True, size=_slot_offset(self.slots, self.frame_bytes)
+            )
+        except OSError as e:
+            raise SharedFrameError(f"Failed to create shared memory {name!r}: {e}") from e
+        self.name = self._shm.name
+
+        buf = self._shm.buf
+        struct.pack_into(
+            HEADER_FORMAT, buf, 0, MAGIC, VERSION, self.width, self.height, self.slots, self.stride
+        )
+        self._surfaces = [
+            pygame.image.frombuffer(
+                buf[offset + SLOT_HEADER_SIZE : offset + SLOT_HEADER_SIZE + self.frame_bytes],
+                size,
+                "RGBA",
+            )
+            for offset in (_slot_offset(i, self.frame_bytes) for i in range(self.slots))
+        ]
+        # 直近slots回の書き込みで描き直した矩形（Noneは全体）
+        self._history: deque[list[pygame.Rect] | None] = deque(maxlen=self.slots)
+
+    def write(
+        self,
+        surface: pygame.Surface,
+        rects: Sequence[pygame.Rect] | None = None,
+        timestamp: float | None = None,
+    ) -> int:
+        """フレームを書き込む.
+
+        次のスロットはslots回前のフレームなので、その後の書き込みで描き直した矩形と
+        今回の矩形だけを写せば最新の画面になる。
+
+        Args:
+            surface: 画面（フレームと同じサイズ）
+            rects: 前回の書き込みから描き直した矩形（Noneで全体）
+            timestamp: フレームの時刻（time.time()、デフォルト: 現在時刻）
+
+        Returns:
+            int: 書き込んだフレームのシーケンス番号
+        """
+        if self._shm is None:
+            raise SharedFrameError("writer is closed")
+        self._history.append(list(rects) if rects is not None else None)
+        sequence = self.sequence + 1
+        index = (sequence - 1) % self.slots
+        offset = _slot_offset(index, self.frame_bytes)
+        buf = self._shm.buf
+
+        struct.pack_into(SLOT_FORMAT, buf, offset, 0, 0.0)  # 書き込み中
+        target = self._surfaces[index]
+        if sequence <= self.slots or any(r is None for r in self._history):
+            target.blit(surface, (0, 0))
+            self.pixels_written += self.width * self.height
+        else:
+            for rect in merge_rects([r for rs in self._history for r in rs]):
+                target.blit(surface, rect, rect)
+                self.pixels_written += rect.width * rect.height
+
+        timestamp = time.time() if timestamp is None else timestamp
+        struct.pack_into(SLOT_FORMAT, buf, offset, sequence, timestamp)
+        struct.pack_into("<Qd", buf, LATEST_OFFSET, sequence, timestamp)
+        self.sequence = sequence
+        return sequence
+
+    def close(self) -> None:
+        """共有メモリを破棄."""
+        if self._shm is None:
+            return
+        self._surfaces.clear()
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self) -> "SharedFrameWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+@dataclass
+class SharedFrame:
+    """読み出したフレーム（画素は共有メモリのビュー）."""
+
+    sequence: int
+    timestamp: float
+    pixels: np.ndarray  # (height, width, 4) RGBA
+    _reader: "SharedFrameReader"
+    _index: int
+
+    def is_valid(self) -> bool:
+        """読んでいる間に上書きされていないか（使い終わった後に確認する）."""
+        return self._reader._slot_sequence(self._index) == self.sequence
+
+
+class SharedFrameReader:
+    """共有メモリのフレームを読む（参照実装、別プロセスから使う）."""
+
+    def __init__(self, name: str | None = None):
+        """初期化（既存の共有メモリに接続）.
+
+        Args:
+            name: 共有メモリ名（デフォルト: 設定から取得）
+
+        Raises:
+            SharedFrameError: 共有メモリがない、または形式が違う場合
+        """
+        name = name or settings.shared_frames_name
+        try:
+            self._shm = _attach(name)
+        except FileNotFoundError as e:
+            raise SharedFrameError(f"Shared memory {name!r} not found") from e
+
+        magic, version, self.width, self.height, self.slots, self.stride = struct.unpack_from(
+            HEADER_FORMAT, self._shm.buf, 0
+        )
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise SharedFrameError(f"Unsupported shared frame format: {magic!r} v{version}")
+        self.frame_bytes = self.stride * self.height
+        self._pixels = [
+            np.ndarray(
+                (self.height, self.width, 4),
+                dtype=np.uint8,
+                buffer=self._shm.buf,
+                offset=_slot_offset(i, self.frame_bytes) + SLOT_HEADER_SIZE,
+                strides=(self.stride, 4, 1),
+            )
+            for i in range(self.slots)
+        ]
+
+    @property
+    def sequence(self) -> int:
+        """最新のシーケンス番号（まだ書き込みがなければ0）."""
+        return struct.unpack_from("<Q", self._shm.buf, LATEST_OFFSET)[0]
+
+    def read(self, after: int = 0) -> SharedFrame | None:
+        """最新のフレームを読む（コピーしない）.
+
+        Args:
+            after: このシーケンス番号より新しいフレームだけを返す
+
+        Returns:
+            SharedFrame | None: フレーム（新しいフレームがない、書き込み中の場合はNone）
+        """
+        sequence, timestamp = struct.unpack_from("<Qd", self._shm.buf, LATEST_OFFSET)
+        if sequence <= after:
+            return None
+        index = (sequence - 1) % self.slots
+        if self._slot_sequence(index) != sequence:
+            return None
+        return SharedFrame(sequence, timestamp, self._pixels[index], self, index)
+
+    def _slot_sequence(self, index: int) -> int:
+        offset = _slot_offset(index, self.frame_bytes)
+        return struct.unpack_from("<Q", self._shm.buf, offset)[0]
+
+    def close(self) -> None:
+        """共有メモリから切断（破棄は書き込み側が行う）."""
+        if self._shm is None:
+            return
+        self._pixels = []
+        self._shm.close()
+        self._shm = None
+
+    def __enter__(self) -> "SharedFrameReader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """既存の共有メモリに接続（終了時に破棄されないよう追跡しない）."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python 3.12以前はtrack引数がないので、登録を取り消す
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
@@ -1,6 +1,21 @@
 """音声再生・同期モジュール."""
 
 from .audio import AudioPlayer
+from .live import LiveInput
+from .mixer import AudioMixer, MixerVoice
+from .null_device import NullAudioDevice, NullOutputStream
+from .stream import PcmStream, RingBuffer, WavStreamError
 from .sync import SyncEngine
 
-__all__ = ["AudioPlayer", "SyncEngine"]
+__all__ = [
+    "AudioPlayer",
+    "AudioMixer",
+    "MixerVoice",
+    "NullAudioDevice",
+    "NullOutputStream",
+    "PcmStream",
+    "RingBuffer",
+    "SyncEngine",
+    "LiveInput",
+    "WavStreamError",
+]
@@ -2,13 +2,32 @@
 
 import io
 import threading
-import time
+from collections.abc import Callable
 from dataclasses import dataclass, field
 
 import numpy as np
 import sounddevice as sd
 import soundfile as sf
 
+from ..clock import Clock
+from ..config import settings
+
+# 出力ストリームを作る関数（sounddevice.OutputStreamと同じ引数、NullAudioDeviceなど）
+OutputFactory = Callable[..., sd.OutputStream]
+
+
+def open_output(output: OutputFactory | None, **kwargs) -> sd.OutputStream:
+    """出力ストリームを作る.
+
+    Args:
+        output: 出力ストリームを作る関数（Noneでsounddevice.OutputStream）
+        **kwargs: sounddevice.OutputStreamの引数
+
+    Returns:
+        sd.OutputStream: 出力ストリーム（開始前）
+    """
+    return (output or sd.OutputStream)(**kwargs)
+
 
 @dataclass
 class PlaybackState:
@@ -17,14 +36,19 @@ class PlaybackState:
     is_playing: bool = False
     start_time: float = 0.0
     duration: float = 0.0
+    clock: Clock = field(default_factory=Clock)
     _lock: threading.Lock = field(default_factory=threading.Lock)
 
     @property
     def elapsed_time(self) -> float:
         """経過時間（秒）."""
+        return self.elapsed_at(self.clock.now())
+
+    def elapsed_at(self, at: float) -> float:
+        """指定時刻（clockの値）の経過時間（秒）."""
         if not self.is_playing:
             return 0.0
-        return time.perf_counter() - self.start_time
+        return at - self.start_time
 
     @property
     def is_finished(self) -> bool:
@@ -34,20 +58,55 @@ class PlaybackState:
         return self.elapsed_time >= self.duration
 
 
+@dataclass
+class LatencyStats:
+    """レイテンシ統計（秒）."""
+
+    count: int = 0
+    last: float = 0.0
+    mean: float = 0.0
+    max: float = 0.0
+
+    def add(self, value: float) -> None:
+        """計測値を追加.
+
+        Args:
+            value: レイテンシ（秒）
+        """
+        self.count += 1
+        self.last = value
+        self.mean += (value - self.mean) / self.count
+        self.max = max(self.max, value)
+
+
 class AudioPlayer:
     """音声再生プレイヤー."""
 
-    def __init__(self, sample_rate: int = 24000):
+    def __init__(
+        self,
+        sample_rate: int = 24000,
+        blocksize: int | None = None,
+        clock: Clock | None = None,
+        output: OutputFactory | None = None,
+    ):
         """初期化.
 
         Args:
             sample_rate: サンプリングレート
+            blocksize: 出力ブロックのサンプル数（フェードアウトの長さ、デフォルト: 設定から取得）
+            clock: 時計（デフォルト: 実時間）
+            output: 出力ストリームを作る関数（デフォルト: sounddevice.OutputStream）
         """
         self.sample_rate = sample_rate
-        self.state = PlaybackState()
+        self.blocksize = blocksize or settings.audio_blocksize
+        self.clock = clock or Clock()
+        self.output = output  # Noneならsounddevice.OutputStream
+        self.state = PlaybackState(clock=self.clock)
         self._stream: sd.OutputStream | None = None
         self._audio_data: np.ndarray | None = None
         self._position: int = 0
+        self._fade_requested_at: float | None = None  # フェードアウト要求時刻（clockの値）
+        self.cancel_latency = LatencyStats()  # フェードアウト要求→無音までの遅延
 
     def load_wav(self, wav_data: bytes) -> float:
         """WAVデータを読み込み.
@@ -79,11 +138,18 @@ class AudioPlayer:
 
         self.stop()
         self._position = 0
+        self._fade_requested_at = None
 
         def callback(outdata, frames, time_info, status):
             end_pos = self._position + frames
             chunk = self._audio_data[self._position : end_pos]
 
+            # フェードアウト要求後の最初のブロックで0まで下げて停止
+            requested_at = self._fade_requested_at
+            if requested_at is not None:
+                self._fade_block(outdata, chunk, frames, time_info, requested_at)
+                raise sd.CallbackStop
+
             if len(chunk) < frames:
                 # 残りデータで埋める
                 outdata[: len(chunk)] = chunk.reshape(-1, 1) if chunk.ndim == 1 else chunk
@@ -94,8 +160,10 @@ class AudioPlayer:
 
             self._position = end_pos
 
-        self._stream = sd.OutputStream(
+        self._stream = open_output(
+            self.output,
             samplerate=self.sample_rate,
+            blocksize=self.blocksize,
             channels=1,
             dtype="float32",
             callback=callback,
@@ -104,13 +172,52 @@ class AudioPlayer:
 
         with self.state._lock:
             self.state.is_playing = True
-            self.state.start_time = time.perf_counter()
+            self.state.start_time = self.clock.now()
 
         self._stream.start()
 
         if blocking:
             self.wait()
 
+    def warm_up(self, duration: float = 0.05) -> float:
+        """出力デバイスを事前に開いて短い無音を再生（初回再生の遅延を前倒し）.
+
+        Args:
+            duration: 再生する無音の長さ（秒）
+
+        Returns:
+            float: デバイスを開いてから閉じるまでの時間（秒）
+        """
+        started = self.clock.now()
+        with open_output(
+            self.output, samplerate=self.sample_rate, channels=1, dtype="float32"
+        ) as stream:
+            stream.write(np.zeros((int(self.sample_rate * duration), 1), dtype=np.float32))
+        return self.clock.now() - started
+
+    def _fade_block(self, outdata, chunk, frames, time_info, requested_at: float) -> None:
+        """1ブロックで線形にフェードアウトし、無音までの遅延を記録（オーディオスレッド）."""
+        ramp = np.linspace(1.0, 0.0, frames, dtype=np.float32)[: len(chunk)]
+        samples = chunk if chunk.ndim == 1 else chunk[:, 0]
+        outdata[:] = 0
+        outdata[: len(chunk), 0] = samples * ramp
+
+        # ブロック末尾がDACに届く時刻まで（取得できないバックエンドではブロック長で近似）
+        output_delay = time_info.outputBufferDacTime - time_info.currentTime
+        if time_info.outputBufferDacTime <= 0 or output_delay < 0:
+            output_delay = 0.0
+        silence_delay = output_delay + frames / self.sample_rate
+        self.cancel_latency.add(self.clock.now() - requested_at + silence_delay)
+
+    def fade_out(self) -> None:
+        """再生中の音声を次の1ブロックでフェードアウトして停止（非ブロッキング）.
+
+        再生していなければ何もしない。停止するとis_playingがFalseになる。
+        """
+        if self._stream is None or not self.state.is_playing:
+            return
+        self._fade_requested_at = self.clock.now()
+
     def _on_finished(self) -> None:
         """再生完了コールバック."""
         with self.state._lock:
@@ -129,7 +236,7 @@ class AudioPlayer:
     def wait(self) -> None:
         """再生完了まで待機."""
         while self.state.is_playing and not self.state.is_finished:
-            time.sleep(0.01)
+            self.clock.sleep(0.01)
         self.stop()
 
     @property
@@ -137,6 +244,10 @@ class AudioPlayer:
         """経過時間（秒）."""
         return self.state.elapsed_time
 
+    def elapsed_at(self, at: float) -> float:
+        """指定時刻（clockの値）の経過時間（秒）."""
+        return self.state.elapsed_at(at)
+
     @property
     def is_playing(self) -> bool:
         """再生中かどうか."""
@@ -146,3 +257,8 @@ class AudioPlayer:
     def duration(self) -> float:
         """音声の長さ（秒）."""
         return self.state.duration
+
+    @property
+    def samples(self) -> np.ndarray | None:
+        """読み込み済みの音声サンプル."""
+        return self._audio_data
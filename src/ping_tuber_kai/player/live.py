@@ -0,0 +1,140 @@
+"""ライブマイク入力モジュール."""
+
+import threading
+import time
+from dataclasses import dataclass, field
+
+import sounddevice as sd
+
+from ..config import settings
+from ..lipsync.amplitude import AmplitudeAnalyzer
+from ..lipsync.viseme import Viseme
+from .audio import LatencyStats
+
+
+@dataclass
+class LiveState:
+    """ライブ入力の最新状態."""
+
+    viseme: Viseme = Viseme.CLOSED
+    updated_at: float = 0.0  # 最終更新時刻（perf_counter）
+    input_latency: float = 0.0  # 音声入力から解析完了までの遅延（秒）
+    consumed: bool = True  # 最新の更新を表示側が取得済みか
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class LiveInput:
+    """マイク入力からの音量ベースリップシンク.
+
+    sounddeviceのInputStreamコールバック内でブロック単位に解析し、
+    最新のVisemeを保持する。表示側はupdate()で取得する。
+    """
+
+    def __init__(
+        self,
+        sample_rate: int | None = None,
+        fps: int | None = None,
+        latency: float | None = None,
+        device: int | None = None,
+    ):
+        """初期化.
+
+        Args:
+            sample_rate: 入力サンプリングレート（デフォルト: 設定から取得）
+            fps: 解析フレームレート（デフォルト: 設定から取得）
+            latency: 入力ブロックの目標レイテンシ（秒、デフォルト: 設定から取得）
+            device: 入力デバイスID（デフォルト: 設定から取得）
+        """
+        self.sample_rate = sample_rate or settings.audio_sample_rate
+        self.fps = fps or settings.fps
+        self.latency = latency if latency is not None else settings.live_input_latency
+        self.device = device if device is not None else settings.live_input_device
+
+        # ブロック長はレイテンシ目標で上限を決める（解析窓は1フレーム分）
+        self.blocksize = max(int(self.sample_rate * self.latency), 32)
+        self.analyzer = AmplitudeAnalyzer(sample_rate=self.sample_rate, fps=self.fps)
+        self.state = LiveState()
+        self.latency_stats = LatencyStats()  # 入力→口形状反映までの遅延
+        self._stream: sd.InputStream | None = None
+
+    def start(self) -> None:
+        """入力開始."""
+        if self._stream is not None:
+            return
+
+        self.analyzer.reset()
+        self._stream = sd.InputStream(
+            samplerate=self.sample_rate,
+            blocksize=self.blocksize,
+            device=self.device,
+            channels=1,
+            dtype="float32",
+            latency=self.latency,
+            callback=self._callback,
+        )
+        self._stream.start()
+
+    def stop(self) -> None:
+        """入力停止."""
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+        with self.state._lock:
+            self.state.viseme = Viseme.CLOSED
+            self.state.consumed = True
+
+    def _callback(self, indata, frames, time_info, status) -> None:
+        """入力コールバック（オーディオスレッド）."""
+        started = time.perf_counter()
+        visemes = self.analyzer.process_block(indata[:, 0] if indata.ndim == 2 else indata)
+        if not visemes:
+            return
+
+        # ADC時刻が取れないバックエンドではブロック長で近似
+        capture_delay = time_info.currentTime - time_info.inputBufferAdcTime
+        if time_info.inputBufferAdcTime <= 0 or capture_delay < 0:
+            capture_delay = frames / self.sample_rate
+
+        now = time.perf_counter()
+        with self.state._lock:
+            self.state.viseme = visemes[-1]
+            self.state.updated_at = now
+            self.state.input_latency = capture_delay + (now - started)
+            self.state.consumed = False
+
+    def update(self) -> Viseme:
+        """最新のVisemeを取得（表示フレームごとに呼び出す）.
+
+        新しい解析結果を初めて取得した時点で、入力から反映までの遅延を記録する。
+        入力が途絶えた場合（ブロック数個分更新なし）は閉じる。
+
+        Returns:
+            Viseme: 現在の口形状
+        """
+        now = time.perf_counter()
+        with self.state._lock:
+            if not self.state.consumed:
+                self.state.consumed = True
+                self.latency_stats.add(self.state.input_latency + (now - self.state.updated_at))
+
+            stale = now - self.state.updated_at > 4 * max(self.latency, 1.0 / self.fps)
+            return Viseme.CLOSED if stale else self.state.viseme
+
+    @property
+    def is_active(self) -> bool:
+        """入力中かどうか."""
+        return self._stream is not None
+
+    @property
+    def viseme(self) -> Viseme:
+        """最新のViseme."""
+        return self.state.viseme
+
+    def __enter__(self) -> "LiveInput":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
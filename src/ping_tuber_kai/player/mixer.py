@@ -0,0 +1,583 @@
+"""ソフトウェアミキサーモジュール.
+
+1本の出力ストリームのコールバック内で複数のボイスを足し合わせて再生する。
+複数アバターの声やBGMが同じ出力デバイスを共有するために使う。
+
+コールバック内では配列を確保しない。作業用バッファはミキサーが事前に確保し、
+リサンプリング・ゲイン・ダッキングはすべてそのバッファ上のNumPy演算で行う。
+"""
+
+import io
+import math
+import threading
+
+import numpy as np
+import sounddevice as sd
+import soundfile as sf
+
+from ..clock import Clock
+from ..config import settings
+from .audio import LatencyStats, OutputFactory, PlaybackState, open_output
+from .stream import PcmStream
+
+
+class MixerVoice:
+    """ミキサー上の1ボイス（AudioPlayerと同じインターフェース）.
+
+    音声は元のサンプリングレートのまま保持し、出力レートと異なる場合は
+    コールバック内で線形補間して読み出す。経過時間はボイスごとのサンプルクロック
+    （読み出し位置と、そのブロックがDACに届く時刻）から求める。
+
+    load_stream()で受信中のストリームを渡すと、届いた分から再生する。
+    先頭は一定量溜まるまで待ち、途中で足りなくなったら無音を出して再び溜まるまで待つ
+    （その間サンプルクロックは止まるので口形状もずれない）。
+
+    再生状態の書き換え（読み込み・再生開始・停止）とオーディオスレッドの読み出しは
+    ボイスごとのロックで排他する。書き換えはフィールドの代入だけなので、
+    コールバックが待つのは長くても数マイクロ秒。
+    """
+
+    def __init__(
+        self,
+        mixer: "AudioMixer",
+        name: str = "",
+        gain: float = 1.0,
+        ducked: bool = False,
+    ):
+        """初期化.
+
+        Args:
+            mixer: 出力先のミキサー
+            name: ボイス名（表示用）
+            gain: 音量（線形）
+            ducked: 他のボイスが再生中の間、音量を下げるか（BGMなど）
+        """
+        self.mixer = mixer
+        self.name = name
+        self.gain = gain
+        self.ducked = ducked
+        self.loop = False
+        self.state = PlaybackState(clock=mixer.clock)
+        self.cancel_latency = LatencyStats()  # フェードアウト要求→無音までの遅延
+        self.sample_rate: int = mixer.sample_rate
+        self._audio_data: np.ndarray | None = None  # 元のサンプル（モノラル）
+        self._padded: np.ndarray | None = None  # 補間用に末尾へ0を1つ足したサンプル
+        self._position: float = 0.0  # 読み出し位置（元のサンプル単位）
+        self._step: float = 1.0  # 出力1サンプルあたりに進む元のサンプル数
+        self._current_gain: float | None = None  # 直前のブロック末尾のゲイン（None=再生直後）
+        self._active: bool = False  # オーディオスレッドが読み出し中
+        self._fade_requested_at: float | None = None
+        self._clock_position: float = 0.0  # ブロック先頭の再生位置（秒）
+        self._clock_at: float | None = None  # ブロック先頭がDACに届く時刻（clockの値）
+        self._clock_span: float = 0.0  # 直前のブロックで出力した音声の長さ（秒）
+        self._stream: PcmStream | None = None  # 受信中のストリーム（load_stream時）
+        self._prebuffer: int = 0  # 再生開始・再開に必要なサンプル数
+        self._buffering: bool = False  # ストリームの溜まり待ち
+        self.underruns: int = 0  # ストリームの受信が再生に追いつかなかった回数
+        self._lock = threading.Lock()  # 再生状態の書き換えと読み出しの排他
+
+    @property
+    def blocksize(self) -> int:
+        """出力ブロックのサンプル数（ミキサーと共通）."""
+        return self.mixer.blocksize
+
+    def load_wav(self, wav_data: bytes) -> float:
+        """WAVデータを読み込み.
+
+        Args:
+            wav_data: WAV形式のバイトデータ
+
+        Returns:
+            float: 音声の長さ（秒）
+        """
+        with io.BytesIO(wav_data) as f:
+            data, samplerate = sf.read(f, dtype="float32")
+        if data.ndim > 1:
+            data = data.mean(axis=1, dtype=np.float32)
+
+        padded = np.append(data, np.float32(0.0))
+
+        with self._lock:
+            self._stop_locked()
+            self._stream = None
+            self._audio_data = data
+            self._padded = padded
+            self.sample_rate = samplerate
+            self._step = samplerate / self.mixer.sample_rate
+            self.state.duration = len(data) / samplerate
+            self._position = 0.0
+        return self.state.duration
+
+    def load_stream(
+        self,
+        stream: PcmStream,
+        duration: float | None = None,
+        prebuffer: float | None = None,
+    ) -> float:
+        """受信中のストリームを読み込み（ヘッダ受信済みであること）.
+
+        Args:
+            stream: ヘッダを受信済みのストリーム
+            duration: 音声の長さ（秒、ヘッダにない場合に使用）
+            prebuffer: 再生開始・再開に必要な量（秒、デフォルト: 設定から取得）
+
+        Returns:
+            float: 音声の長さ（秒、不明なら0）
+
+        Raises:
+            ValueError: ヘッダ未受信、またはサンプリングレートがミキサーと異なる場合
+        """
+        header = stream.header
+        if header is None:
+            raise ValueError("Stream header has not been received")
+        if header.sample_rate != self.mixer.sample_rate:
+            raise ValueError(
+                f"Stream sample rate {header.sample_rate} != mixer rate {self.mixer.sample_rate}"
+            )
+
+        prebuffer = settings.stream_prebuffer if prebuffer is None else prebuffer
+        with self._lock:
+            self._stop_locked()
+            self._stream = stream
+            self._audio_data = None
+            self._padded = None
+            self.sample_rate = header.sample_rate
+            self._step = 1.0
+            self._prebuffer = int(prebuffer * header.sample_rate)
+            self.state.duration = header.duration or duration or 0.0
+            self._position = 0.0
+        return self.state.duration
+
+    def play(self, blocking: bool = False, loop: bool = False) -> None:
+        """再生開始.
+
+        Args:
+            blocking: ブロッキングモードで再生するか
+            loop: 末尾まで再生したら先頭に戻るか（BGMなど）
+        """
+        if self._audio_data is None and self._stream is None:
+            raise RuntimeError("No audio data loaded")
+
+        self.mixer.start()
+        # 読み出し中のブロックが終わってから書き換える（古い位置に加算させない）
+        with self._lock:
+            self.loop = loop and self._stream is None
+            self._buffering = self._stream is not None
+            self._position = 0.0
+            self._current_gain = None
+            self._fade_requested_at = None
+            self._clock_position = 0.0
+            self._clock_at = None
+            self._clock_span = 0.0
+            with self.state._lock:
+                self.state.is_playing = True
+                self.state.start_time = self.mixer.clock.now()
+            self._active = True
+
+        if blocking:
+            self.wait()
+
+    def warm_up(self, duration: float = 0.05) -> float:
+        """ミキサーの出力ストリームを事前に開始.
+
+        Args:
+            duration: 未使用（AudioPlayerとの互換のため）
+
+        Returns:
+            float: ストリーム開始にかかった時間（秒）
+        """
+        started = self.mixer.clock.now()
+        self.mixer.start()
+        return self.mixer.clock.now() - started
+
+    def _read(self, out: np.ndarray, frames: int) -> int:
+        """出力レートでframesサンプルを読み出す（オーディオスレッド）.
+
+        Args:
+            out: 書き込み先（長さframes以上）
+            frames: 出力サンプル数
+
+        Returns:
+            int: 書き込んだサンプル数（末尾に達した場合はframes未満）
+        """
+        data = self._padded
+        length = len(data) - 1
+        written = 0
+        while written < frames:
+            remaining = frames - written
+            if self._step == 1.0:
+                start = int(self._position)
+                count = max(min(remaining, length - start), 0)
+                out[written : written + count] = data[start : start + count]
+            else:
+                count = max(min(remaining, math.ceil((length - self._position) / self._step)), 0)
+                self.mixer._interpolate(data, self._position, self._step, out[written:], count)
+            written += count
+            self._position += count * self._step
+
+            if written < frames:
+                if not self.loop or length == 0:
+                    break
+                self._position = max(self._position - length, 0.0)
+        return written
+
+    def _read_stream(self, out: np.ndarray, frames: int) -> tuple[int, bool]:
+        """ストリームから読み出す（オーディオスレッド）.
+
+        Args:
+            out: 書き込み先（長さframes以上）
+            frames: 出力サンプル数
+
+        Returns:
+            tuple[int, bool]: 書き込んだサンプル数、ストリームの終端に達したか
+        """
+        stream = self._stream
+        buffer = stream.buffer
+        finished = stream.is_finished
+        if self._buffering:
+            if buffer.available < self._prebuffer and not finished:
+                return 0, False
+            self._buffering = False
+
+        count = buffer.read(out, frames)
+        if count < frames:
+            if finished and buffer.available == 0:
+                return count, True
+            # 受信が追いつかない: 足りない分は無音にして、再び溜まるまで待つ
+            self.underruns += 1
+            self._buffering = True
+        self._position += count
+        return count, False
+
+    def _render(
+        self,
+        mix: np.ndarray,
+        frames: int,
+        heard_at: float,
+        duck: tuple[float, float],
+    ) -> None:
+        """ミックスバッファに加算（オーディオスレッド）.
+
+        Args:
+            mix: ミックスバッファ（長さframes）
+            frames: 出力サンプル数
+            heard_at: このブロックの先頭がDACに届く時刻（clockの値）
+            duck: ダッキング係数（ブロック先頭, 末尾）
+        """
+        with self._lock:
+            if self._active and (self._padded is not None or self._stream is not None):
+                self._render_locked(mix, frames, heard_at, duck)
+
+    def _render_locked(
+        self,
+        mix: np.ndarray,
+        frames: int,
+        heard_at: float,
+        duck: tuple[float, float],
+    ) -> None:
+        """_render()の本体（ロックを取得済み）."""
+        self._clock_position = self._position / self.sample_rate
+        self._clock_at = heard_at
+
+        scratch = self.mixer._scratch[:frames]
+        if self._stream is not None:
+            count, ended = self._read_stream(scratch, frames)
+        else:
+            count = self._read(scratch, frames)
+            ended = count < frames
+        self._clock_span = count / self.mixer.sample_rate
+
+        # ゲインは前のブロック末尾から1ブロックかけて目標へ（クリックノイズ防止）
+        requested_at = self._fade_requested_at
+        duck_start, duck_end = duck if self.ducked else (1.0, 1.0)
+        start_gain = self._current_gain
+        if start_gain is None:
+            start_gain = self.gain * duck_start
+        end_gain = 0.0 if requested_at is not None else self.gain * duck_end
+        if start_gain == end_gain:
+            scratch[:count] *= end_gain
+        else:
+            scratch[:count] *= self.mixer._ramp(start_gain, end_gain, frames)[:count]
+        mix[:count] += scratch[:count]
+        self._current_gain = end_gain
+
+        if requested_at is not None:
+            latency = heard_at - requested_at + frames / self.mixer.sample_rate
+            self.cancel_latency.add(latency)
+            self._finish()
+        elif ended:
+            self._finish()
+
+    def _finish(self) -> None:
+        self._active = False
+        with self.state._lock:
+            self.state.is_playing = False
+
+    def fade_out(self) -> None:
+        """再生中の音声を次の1ブロックでフェードアウトして停止（非ブロッキング）."""
+        with self._lock:
+            if not self._active or not self.state.is_playing:
+                return
+            self._fade_requested_at = self.mixer.clock.now()
+            # 受信中のストリームは打ち切る（受信側の書き込み待ちを解除）
+            if self._stream is not None:
+                self._stream.close()
+
+    def stop(self) -> None:
+        """再生停止（ミキサーの出力ストリームは止めない）."""
+        with self._lock:
+            self._stop_locked()
+
+    def _stop_locked(self) -> None:
+        self._finish()
+        if self._stream is not None:
+            self._stream.close()
+
+    def wait(self) -> None:
+        """再生完了まで待機（ループ再生中は戻らない）."""
+        while self.state.is_playing:
+            self.mixer.clock.sleep(0.01)
+        self.stop()
+
+    @property
+    def elapsed_time(self) -> float:
+        """経過時間（秒、サンプルクロック基準）.
+
+        最後に出力したブロックの先頭位置に、そのブロックがDACに届いてからの時間を足す。
+        そのブロックで出力した音声の長さより先には進めないので、コールバックが滞ったり
+        ストリームの受信待ちで無音を出している間は止まる。
+        """
+        return self.elapsed_at(self.mixer.clock.now())
+
+    def elapsed_at(self, at: float) -> float:
+        """指定時刻（clockの値）に聞こえている位置（秒、サンプルクロック基準）.
+
+        描画ループはフレームの表示時刻を渡し、起きた時刻のぶれに左右されずに口形状を求める。
+
+        Args:
+            at: 時刻（clockの値）
+
+        Returns:
+            float: 経過時間（秒、再生していなければ0）
+        """
+        clock_at = self._clock_at
+        if not self.state.is_playing or clock_at is None:
+            return 0.0
+        offset = min(at - clock_at, self._clock_span)
+        return max(self._clock_position + offset, 0.0)
+
+    @property
+    def is_playing(self) -> bool:
+        """再生中かどうか."""
+        return self.state.is_playing
+
+    @property
+    def duration(self) -> float:
+        """音声の長さ（秒）."""
+        return self.state.duration
+
+    @property
+    def samples(self) -> np.ndarray | None:
+        """読み込み済みの音声サンプル（元のサンプリングレート、ストリーム再生時はNone）."""
+        return self._audio_data
+
+
+class AudioMixer:
+    """複数ボイスを1本の出力ストリームで再生するミキサー.
+
+    ダッキング対象（ducked=True）以外のボイスが再生中の間、ダッキング対象のボイスは
+    duck_gain倍までduck_ramp秒かけて音量を下げ、再生が終わると同じ速さで戻す。
+    """
+
+    def __init__(
+        self,
+        sample_rate: int | None = None,
+        blocksize: int | None = None,
+        channels: int | None = None,
+        duck_gain: float | None = None,
+        duck_ramp: float | None = None,
+        clock: Clock | None = None,
+        output: OutputFactory | None = None,
+    ):
+        """初期化.
+
+        Args:
+            sample_rate: 出力のサンプリングレート（デフォルト: 設定から取得）
+            blocksize: 出力ブロックのサンプル数（デフォルト: 設定から取得）
+            channels: 出力チャンネル数（全チャンネルに同じ信号、デフォルト: 設定から取得）
+            duck_gain: ダッキング中の音量（線形、デフォルト: 設定から取得）
+            duck_ramp: ダッキングの切り替え時間（秒、デフォルト: 設定から取得）
+            clock: 時計（再生位置の基準、デフォルト: 実時間）
+            output: 出力ストリームを作る関数（デフォルト: sounddevice.OutputStream）
+        """
+        self.sample_rate = sample_rate or settings.audio_sample_rate
+        self.blocksize = blocksize or settings.audio_blocksize
+        self.channels = channels or settings.audio_channels
+        self.duck_gain = duck_gain if duck_gain is not None else settings.mixer_duck_gain
+        self.duck_ramp = duck_ramp if duck_ramp is not None else settings.mixer_duck_ramp
+        self.clock = clock or Clock()
+        self.output = output  # Noneならsounddevice.OutputStream
+        self._duck: float = 1.0  # 現在のダッキング係数
+        self._voices: tuple[MixerVoice, ...] = ()
+        self._stream: sd.OutputStream | None = None
+        self._lock = threading.Lock()
+        self._allocate(self.blocksize)
+
+    def _allocate(self, frames: int) -> None:
+        """作業用バッファを確保（コールバックのブロック長が上回った場合のみ再確保）."""
+        self._capacity = frames
+        self._mix = np.zeros(frames, dtype=np.float32)
+        self._scratch = np.zeros(frames, dtype=np.float32)
+        self._upper = np.zeros(frames, dtype=np.float32)
+        self._gains = np.zeros(frames, dtype=np.float32)
+        self._counts = np.arange(1, frames + 1, dtype=np.float32)
+        self._offsets = np.arange(frames, dtype=np.float64)
+        self._positions = np.zeros(frames, dtype=np.float64)
+        self._index = np.zeros(frames, dtype=np.intp)
+
+    def _ramp(self, start: float, end: float, frames: int) -> np.ndarray:
+        """startから末尾でendに達する線形ランプ（作業用バッファのビュー）."""
+        gains = self._gains[:frames]
+        np.multiply(self._counts[:frames], (end - start) / frames, out=gains)
+        gains += start
+        return gains
+
+    def _interpolate(
+        self,
+        data: np.ndarray,
+        position: float,
+        step: float,
+        out: np.ndarray,
+        count: int,
+    ) -> None:
+        """positionからstep刻みでcount点を線形補間してoutに書き込む.
+
+        dataは末尾に補間用の0を1つ足したもの。
+        """
+        positions = self._positions[:count]
+        np.multiply(self._offsets[:count], step, out=positions)
+        positions += position
+        index = self._index[:count]
+        np.copyto(index, positions, casting="unsafe")  # 非負なので切り捨て=floor
+        positions -= index  # 小数部
+
+        lower = out[:count]
+        upper = self._upper[:count]
+        np.take(data, index, out=lower)
+        index += 1
+        np.take(data, index, out=upper)
+        upper -= lower
+        upper *= positions
+        lower += upper
+
+    def create_voice(
+        self,
+        name: str = "",
+        gain: float = 1.0,
+        ducked: bool = False,
+    ) -> MixerVoice:
+        """ボイスを追加.
+
+        Args:
+            name: ボイス名
+            gain: 音量（線形）
+            ducked: 他のボイスが再生中の間、音量を下げるか（BGMなど）
+
+        Returns:
+            MixerVoice: 追加したボイス
+        """
+        voice = MixerVoice(self, name, gain=gain, ducked=ducked)
+        with self._lock:
+            # コールバックはロックを取らずにタプルを読むので、差し替えで追加する
+            self._voices = (*self._voices, voice)
+        return voice
+
+    def remove_voice(self, voice: MixerVoice) -> None:
+        """ボイスを削除.
+
+        Args:
+            voice: 削除するボイス
+        """
+        voice.stop()
+        with self._lock:
+            self._voices = tuple(v for v in self._voices if v is not voice)
+
+    def start(self) -> None:
+        """出力ストリームを開始（開始済みなら何もしない）."""
+        with self._lock:
+            if self._stream is not None:
+                return
+            self._stream = open_output(
+                self.output,
+                samplerate=self.sample_rate,
+                blocksize=self.blocksize,
+                channels=self.channels,
+                dtype="float32",
+                callback=self._callback,
+            )
+            self._stream.start()
+
+    def _callback(self, outdata, frames, time_info, status) -> None:
+        """出力コールバック（オーディオスレッド）."""
+        if frames > self._capacity:
+            self._allocate(frames)
+
+        # このブロックの先頭がDACに届く時刻（取得できないバックエンドでは現在時刻）
+        output_delay = time_info.outputBufferDacTime - time_info.currentTime
+        if time_info.outputBufferDacTime <= 0 or output_delay < 0:
+            output_delay = 0.0
+        heard_at = self.clock.now() + output_delay
+
+        # ダッキング係数を1ブロックぶん目標へ近づける
+        voices = self._voices
+        speaking = any(voice._active and not voice.ducked for voice in voices)
+        target = self.duck_gain if speaking else 1.0
+        duck_start = self._duck
+        if self.duck_ramp > 0:
+            step = (1.0 - self.duck_gain) * frames / (self.duck_ramp * self.sample_rate)
+            self._duck = (
+                min(duck_start + step, target)
+                if duck_start < target
+                else max(duck_start - step, target)
+            )
+        else:
+            self._duck = target
+
+        mix = self._mix[:frames]
+        mix.fill(0.0)
+        for voice in voices:
+            voice._render(mix, frames, heard_at, (duck_start, self._duck))
+        np.clip(mix, -1.0, 1.0, out=mix)
+        outdata[:] = mix[:, np.newaxis]
+
+    def close(self) -> None:
+        """出力ストリームを停止して閉じる."""
+        for voice in self._voices:
+            voice.stop()
+        with self._lock:
+            stream, self._stream = self._stream, None
+        if stream is not None:
+            stream.stop()
+            stream.close()
+
+    def __enter__(self) -> "AudioMixer":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def voices(self) -> tuple[MixerVoice, ...]:
+        """登録済みのボイス."""
+        return self._voices
+
+    @property
+    def duck_level(self) -> float:
+        """現在のダッキング係数（1.0でダッキングなし）."""
+        return self._duck
+
+    @property
+    def is_running(self) -> bool:
+        """出力ストリームが動作中かどうか."""
+        return self._stream is not None
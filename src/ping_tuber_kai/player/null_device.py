@@ -0,0 +1,142 @@
+"""ヌル音声出力デバイスモジュール.
+
+sounddevice.OutputStreamの代わりに、時計（Clock）に合わせてブロックごとに出力コールバックを
+呼ぶだけの出力ストリーム。音は出さず、出力したサンプルの数とピークだけを数える。
+VirtualClockと組み合わせると、音声デバイスのない環境でも再生位置・口形状を
+実際のコールバックと同じ順序で進められる。
+"""
+
+from collections.abc import Callable
+from types import SimpleNamespace
+
+import numpy as np
+import sounddevice as sd
+
+from ..clock import Clock
+
+
+class NullOutputStream:
+    """ヌル出力ストリーム（sounddevice.OutputStreamと同じ使い方）."""
+
+    def __init__(
+        self,
+        clock: Clock,
+        samplerate: float,
+        blocksize: int | None = None,
+        channels: int = 1,
+        dtype: str = "float32",
+        callback: Callable | None = None,
+        finished_callback: Callable[[], None] | None = None,
+        latency: float = 0.0,
+        **kwargs,
+    ):
+        """初期化.
+
+        Args:
+            clock: コールバックを呼ぶ時計
+            samplerate: サンプリングレート
+            blocksize: 1回のコールバックのサンプル数（Noneで約10ms）
+            channels: チャンネル数
+            dtype: サンプルの型
+            callback: 出力コールバック（outdata, frames, time_info, status）
+            finished_callback: 停止時に呼ぶ関数
+            latency: ブロックが書き込まれてからDACに届くまでの時間（秒）
+            **kwargs: sounddevice.OutputStreamの他の引数（無視する）
+        """
+        self.clock = clock
+        self.samplerate = samplerate
+        self.blocksize = blocksize or max(int(samplerate / 100), 1)
+        self.channels = channels
+        self.latency = latency
+        self.callback = callback
+        self.finished_callback = finished_callback
+        self.frames_written = 0  # 出力したサンプル数（チャンネルあたり）
+        self.peak = 0.0  # 出力の最大振幅
+        self._outdata = np.zeros((self.blocksize, channels), dtype=dtype)
+        self._cancel: Callable[[], None] | None = None
+
+    @property
+    def active(self) -> bool:
+        """動作中かどうか."""
+        return self._cancel is not None
+
+    def start(self) -> None:
+        """ブロック周期でコールバックを呼び始める."""
+        if self._cancel is not None or self.callback is None:
+            return
+        self._cancel = self.clock.every(self.blocksize / self.samplerate, self._tick)
+
+    def _tick(self, now: float) -> None:
+        """1ブロックぶんのコールバック（時計のスレッド）."""
+        if self._cancel is None:
+            return
+        outdata = self._outdata
+        outdata.fill(0.0)
+        time_info = SimpleNamespace(
+            currentTime=now,
+            outputBufferDacTime=now + self.latency,
+            inputBufferAdcTime=0.0,
+        )
+        try:
+            self.callback(outdata, self.blocksize, time_info, None)
+        except sd.CallbackStop:
+            self._count(outdata)
+            self._finish()
+            return
+        self._count(outdata)
+
+    def _count(self, outdata: np.ndarray) -> None:
+        self.frames_written += len(outdata)
+        self.peak = max(self.peak, float(np.abs(outdata).max()))
+
+    def _finish(self) -> None:
+        cancel, self._cancel = self._cancel, None
+        if cancel is not None:
+            cancel()
+            if self.finished_callback is not None:
+                self.finished_callback()
+
+    def write(self, data: np.ndarray) -> None:
+        """ブロッキング書き込み（コールバックなしのストリーム用、数えるだけ）."""
+        self.frames_written += len(data)
+
+    def stop(self) -> None:
+        """停止."""
+        self._finish()
+
+    def abort(self) -> None:
+        """停止（stopと同じ）."""
+        self._finish()
+
+    def close(self) -> None:
+        """閉じる."""
+        self._finish()
+
+    def __enter__(self) -> "NullOutputStream":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+        self.close()
+
+
+class NullAudioDevice:
+    """ヌル出力ストリームを作る（AudioPlayer・AudioMixerのoutputに渡す）."""
+
+    def __init__(self, clock: Clock, latency: float = 0.0):
+        """初期化.
+
+        Args:
+            clock: コールバックを呼ぶ時計（VirtualClockなら時計を進めたときに呼ぶ）
+            latency: ブロックが書き込まれてからDACに届くまでの時間（秒）
+        """
+        self.clock = clock
+        self.latency = latency
+        self.streams: list[NullOutputStream] = []  # 作成したストリーム
+
+    def __call__(self, **kwargs) -> NullOutputStream:
+        """sounddevice.OutputStreamと同じ引数でストリームを作る."""
+        stream = NullOutputStream(self.clock, latency=self.latency, **kwargs)
+        self.streams.append(stream)
+        return stream
@@ -0,0 +1,303 @@
+"""ストリーミング再生モジュール.
+
+合成WAVを受信しながら再生するため、先頭チャンクからRIFFヘッダを解析し、
+届いたPCMをfloat32に変換してリングバッファに書き込む。出力コールバックは
+リングバッファから届いた分だけ読み出す。
+"""
+
+import struct
+import threading
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+# WAVのフォーマットID
+WAVE_FORMAT_PCM = 1
+WAVE_FORMAT_IEEE_FLOAT = 3
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# ストリーミング時にdataチャンクのサイズとして使われる値（長さ不明）
+UNKNOWN_DATA_SIZE = (0, 0xFFFFFFFF)
+
+
+class WavStreamError(Exception):
+    """WAVストリームの解析エラー."""
+
+    pass
+
+
+@dataclass(frozen=True)
+class WavHeader:
+    """WAVヘッダ."""
+
+    sample_rate: int
+    channels: int
+    bits_per_sample: int
+    format_tag: int
+    data_offset: int  # dataチャンク本体の先頭位置（バイト）
+    data_size: int | None  # dataチャンクのサイズ（不明ならNone）
+
+    @property
+    def frame_bytes(self) -> int:
+        """1フレーム（全チャンネル1サンプル）のバイト数."""
+        return self.channels * self.bits_per_sample // 8
+
+    @property
+    def duration(self) -> float | None:
+        """音声の長さ（秒、不明ならNone）."""
+        if self.data_size is None:
+            return None
+        return self.data_size / self.frame_bytes / self.sample_rate
+
+    def decode(self, data: bytes) -> np.ndarray:
+        """PCMバイト列をfloat32モノラルに変換（フレーム単位の長さであること）.
+
+        Args:
+            data: PCMバイト列
+
+        Returns:
+            np.ndarray: float32モノラルのサンプル
+        """
+        if self.format_tag == WAVE_FORMAT_IEEE_FLOAT:
+            samples = np.frombuffer(data, dtype="<f4")
+        elif self.bits_per_sample == 16:
+            samples = np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+        elif self.bits_per_sample == 32:
+            samples = np.frombuffer(data, dtype="<i4").astype(np.float32) / 2147483648.0
+        else:
+            raise WavStreamError(f"Unsupported bits per sample: {self.bits_per_sample}")
+
+        if self.channels > 1:
+            samples = samples.reshape(-1, self.channels).mean(axis=1, dtype=np.float32)
+        return samples.astype(np.float32, copy=False)
+
+
+def parse_wav_header(buffer: bytes) -> WavHeader | None:
+    """先頭バイト列からWAVヘッダを解析.
+
+    Args:
+        buffer: 受信済みの先頭バイト列
+
+    Returns:
+        WavHeader | None: ヘッダ（dataチャンクの開始まで届いていなければNone）
+
+    Raises:
+        WavStreamError: RIFF/WAVEでない、または未対応のフォーマットの場合
+    """
+    if len(buffer) < 12:
+        return None
+    if buffer[:4] != b"RIFF" or buffer[8:12] != b"WAVE":
+        raise WavStreamError("Not a RIFF/WAVE stream")
+
+    fmt: tuple[int, int, int, int] | None = None
+    offset = 12
+    while offset + 8 <= len(buffer):
+        chunk_id = buffer[offset : offset + 4]
+        (chunk_size,) = struct.unpack_from("<I", buffer, offset + 4)
+        body = offset + 8
+
+        if chunk_id == b"data":
+            if fmt is None:
+                raise WavStreamError("data chunk before fmt chunk")
+            format_tag, channels, sample_rate, bits = fmt
+            return WavHeader(
+                sample_rate=sample_rate,
+                channels=channels,
+                bits_per_sample=bits,
+                format_tag=format_tag,
+                data_offset=body,
+                data_size=None if chunk_size in UNKNOWN_DATA_SIZE else chunk_size,
+            )
+
+        if body + chunk_size > len(buffer):
+            return None
+        if chunk_id == b"fmt ":
+            format_tag, channels, sample_rate = struct.unpack_from("<HHI", buffer, body)
+            (bits,) = struct.unpack_from("<H", buffer, body + 14)
+            if format_tag == WAVE_FORMAT_EXTENSIBLE and chunk_size >= 26:
+                (format_tag,) = struct.unpack_from("<H", buffer, body + 24)
+            if format_tag not in (WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT):
+                raise WavStreamError(f"Unsupported WAV format: {format_tag}")
+            fmt = (format_tag, channels, sample_rate, bits)
+        # チャンクは2バイト境界に揃う
+        offset = body + chunk_size + (chunk_size & 1)
+    return None
+
+
+class RingBuffer:
+    """float32サンプルのリングバッファ（書き込み1スレッド・読み出し1スレッド）.
+
+    読み出し側（オーディオスレッド）はロックを待たず、メモリも確保しない。
+    書き込み側は空きができるまで待つ。
+    """
+
+    def __init__(self, capacity: int):
+        """初期化.
+
+        Args:
+            capacity: 容量（サンプル数）
+        """
+        self.capacity = capacity
+        self._buffer = np.zeros(capacity, dtype=np.float32)
+        self._written = 0  # 書き込んだ総サンプル数（書き込み側のみ更新）
+        self._read = 0  # 読み出した総サンプル数（読み出し側のみ更新）
+        self._space = threading.Condition()
+        self._closed = False
+
+    @property
+    def available(self) -> int:
+        """読み出せるサンプル数."""
+        return self._written - self._read
+
+    @property
+    def total_written(self) -> int:
+        """書き込んだ総サンプル数."""
+        return self._written
+
+    def write(self, samples: np.ndarray, timeout: float | None = None) -> int:
+        """サンプルを書き込む（空きがなければ待つ）.
+
+        Args:
+            samples: float32サンプル
+            timeout: 空きを待つ最大時間（秒、Noneで無制限）
+
+        Returns:
+            int: 書き込んだサンプル数（閉じられた・タイムアウトした場合は途中まで）
+        """
+        done = 0
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while done < len(samples):
+            # 読み出し側の通知は取りこぼすことがあるので短い間隔で確認し直す
+            with self._space:
+                while not self._closed and self.available >= self.capacity:
+                    if deadline is not None and time.monotonic() >= deadline:
+                        return done
+                    self._space.wait(0.01)
+                if self._closed:
+                    break
+            count = min(self.capacity - self.available, len(samples) - done)
+            start = self._written % self.capacity
+            first = min(count, self.capacity - start)
+            self._buffer[start : start + first] = samples[done : done + first]
+            self._buffer[: count - first] = samples[done + first : done + count]
+            self._written += count
+            done += count
+        return done
+
+    def read(self, out: np.ndarray, count: int) -> int:
+        """サンプルを読み出す（オーディオスレッド、待たない）.
+
+        Args:
+            out: 書き込み先
+            count: 読み出す最大サンプル数
+
+        Returns:
+            int: 読み出したサンプル数
+        """
+        count = min(count, self.available)
+        start = self._read % self.capacity
+        first = min(count, self.capacity - start)
+        out[:first] = self._buffer[start : start + first]
+        out[first:count] = self._buffer[: count - first]
+        self._read += count
+        # 書き込み側の待機を解除（取れなければ次のブロックで）
+        if self._space.acquire(blocking=False):
+            self._space.notify()
+            self._space.release()
+        return count
+
+    def close(self) -> None:
+        """閉じる（待機中の書き込みを解除）."""
+        with self._space:
+            self._closed = True
+            self._space.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        """閉じられたかどうか."""
+        return self._closed
+
+
+class PcmStream:
+    """受信中のWAVをリングバッファ経由で再生側に渡すストリーム.
+
+    受信側はfeed()でバイト列を渡し、終わったらfinish()（失敗時はfail()）を呼ぶ。
+    再生側はwait_header()でフォーマットを得てから、bufferを読み出す。
+    """
+
+    def __init__(self, capacity_seconds: float = 10.0):
+        """初期化.
+
+        Args:
+            capacity_seconds: リングバッファの容量（秒、ヘッダのサンプリングレートで換算）
+        """
+        self.capacity_seconds = capacity_seconds
+        self.header: WavHeader | None = None
+        self.buffer: RingBuffer | None = None
+        self.error: Exception | None = None
+        self._pending = b""  # ヘッダ解析前、またはフレーム境界に満たないバイト列
+        self._header_ready = threading.Event()
+        self._finished = threading.Event()
+
+    def feed(self, data: bytes) -> None:
+        """受信したバイト列を渡す（リングバッファが満杯なら空くまで待つ）.
+
+        Args:
+            data: 受信したバイト列
+
+        Raises:
+            WavStreamError: WAVとして解析できない場合
+        """
+        self._pending += data
+        if self.header is None:
+            header = parse_wav_header(self._pending)
+            if header is None:
+                return
+            self.header = header
+            self.buffer = RingBuffer(max(int(header.sample_rate * self.capacity_seconds), 1))
+            self._pending = self._pending[header.data_offset :]
+            self._header_ready.set()
+
+        usable = len(self._pending) - len(self._pending) % self.header.frame_bytes
+        if usable:
+            samples = self.header.decode(self._pending[:usable])
+            self._pending = self._pending[usable:]
+            self.buffer.write(samples)
+
+    def finish(self) -> None:
+        """受信完了."""
+        self._finished.set()
+        self._header_ready.set()
+
+    def fail(self, error: Exception) -> None:
+        """受信失敗（再生側は届いた分だけ再生して終わる）.
+
+        Args:
+            error: 発生したエラー
+        """
+        self.error = error
+        self.finish()
+
+    def close(self) -> None:
+        """再生側から打ち切る（受信側の書き込み待ちを解除）."""
+        if self.buffer is not None:
+            self.buffer.close()
+        self.finish()
+
+    def wait_header(self, timeout: float | None = None) -> WavHeader | None:
+        """ヘッダの受信を待つ.
+
+        Args:
+            timeout: 最大待機時間（秒）
+
+        Returns:
+            WavHeader | None: ヘッダ（受信前に終わった・タイムアウトした場合はNone）
+        """
+        self._header_ready.wait(timeout)
+        return self.header
+
+    @property
+    def is_finished(self) -> bool:
+        """受信が終わったか（以降バッファは増えない）."""
+        return self._finished.is_set()
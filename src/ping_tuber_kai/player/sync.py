@@ -3,43 +3,63 @@
 from collections.abc import Callable
 from dataclasses import dataclass
 
+from ..config import settings
+from ..lipsync.amplitude import AmplitudeAnalyzer, to_mono
+from ..lipsync.blend import BlendSchedule, VisemeBlend, create_blend_schedule
+from ..lipsync.openness import Openness, OpennessTrack, create_openness_track
 from ..lipsync.phoneme import PhonemeTimeline, extract_phoneme_timeline, get_total_duration
-from ..lipsync.scheduler import MouthSchedule, create_mouth_schedule, get_viseme_at_time
+from ..lipsync.scheduler import (
+    MouthSchedule,
+    create_mouth_schedule,
+    get_viseme_at_frame,
+    get_viseme_at_time,
+)
+from ..lipsync.stabilizer import stabilize_timeline
 from ..lipsync.viseme import Viseme
-from ..voicevox.models import AudioQuery
-from .audio import AudioPlayer
+from ..voicevox.view import QueryLike
+from .audio import AudioPlayer, LatencyStats
+from .mixer import MixerVoice
+from .stream import PcmStream
 
 
 @dataclass
 class SyncData:
-    """同期再生用データ."""
+    """同期再生用データ.
 
-    audio_query: AudioQuery
+    audio_queryがNoneの場合は音量解析によるスケジュール（モーラタイミングなし）。
+    """
+
+    audio_query: QueryLike | None
     audio_data: bytes
     timeline: PhonemeTimeline
     schedule: MouthSchedule
     duration: float
+    blend: BlendSchedule | None = None  # 口形状ブレンド（無効時・音量解析時はNone）
+    removed_transitions: int = 0  # 安定化で除去した口形状の切り替え回数
+    openness: OpennessTrack | None = None  # モーラごとの開き具合（無効時・音量解析時はNone）
 
 
 class SyncEngine:
     """音声・口形状同期エンジン."""
 
-    def __init__(self, fps: int = 60):
+    def __init__(self, fps: int = 60, player: AudioPlayer | MixerVoice | None = None):
         """初期化.
 
         Args:
             fps: フレームレート
+            player: 再生に使うプレイヤー（ミキサーのボイスを渡すと出力を共有、デフォルト: 専用）
         """
         self.fps = fps
-        self.player = AudioPlayer()
+        self.player = player if player is not None else AudioPlayer()
         self._sync_data: SyncData | None = None
         self._viseme_callback: Callable[[Viseme], None] | None = None
+        self._cancelled: bool = False  # キャンセル済み（フェードアウト中も口は閉じる）
 
-    def prepare(self, audio_query: AudioQuery, audio_data: bytes) -> SyncData:
+    def prepare(self, audio_query: QueryLike, audio_data: bytes) -> SyncData:
         """再生準備.
 
         Args:
-            audio_query: VOICEVOX AudioQuery
+            audio_query: VOICEVOX AudioQuery（または軽量ビュー）
             audio_data: WAV音声データ
 
         Returns:
@@ -48,19 +68,122 @@ class SyncEngine:
         # 音声読み込み
         duration = self.player.load_wav(audio_data)
 
-        # 音素タイムライン抽出
-        timeline = extract_phoneme_timeline(audio_query)
+        # 開き具合をデコード済みバッファから発話全体ぶん事前計算
+        openness = None
+        if settings.openness_enabled:
+            openness = create_openness_track(
+                audio_query,
+                to_mono(self.player.samples),
+                self.player.sample_rate,
+                quantize=True,
+            )
+
+        self._sync_data = self._build_sync_data(audio_query, audio_data, duration, openness)
+        return self._sync_data
+
+    def prepare_stream(self, audio_query: QueryLike, stream: PcmStream) -> SyncData:
+        """受信中の音声の再生準備（口形状はAudioQueryのタイミングから作る）.
+
+        音声全体が届く前に再生を始めるため、サンプルから求める開き具合は使わず
+        通常の開き具合で表示する。
+
+        Args:
+            audio_query: VOICEVOX AudioQuery（または軽量ビュー）
+            stream: WAVヘッダ受信済みのストリーム
+
+        Returns:
+            SyncData: 同期再生用データ
+
+        Raises:
+            RuntimeError: プレイヤーがミキサーのボイスでない場合
+        """
+        if not isinstance(self.player, MixerVoice):
+            raise RuntimeError("Streaming playback requires a mixer voice")
+
+        # 長さはEngineと同じ丸めでAudioQueryから求まる
+        total_duration = get_total_duration(audio_query, quantize=True)
+        duration = self.player.load_stream(stream, duration=total_duration)
+
+        self._sync_data = self._build_sync_data(audio_query, b"", duration)
+        return self._sync_data
+
+    def prepare_query(self, audio_query: QueryLike, duration: float | None = None) -> SyncData:
+        """音声を読み込まずに口形状だけを準備（記録したセッションの再現など）.
+
+        再生位置はプレイヤー側で進める。サンプルがないため開き具合は使わない。
+
+        Args:
+            audio_query: VOICEVOX AudioQuery（または軽量ビュー）
+            duration: 再生時間（秒、デフォルト: AudioQueryから求める）
+
+        Returns:
+            SyncData: 同期再生用データ
+        """
+        if duration is None:
+            duration = get_total_duration(audio_query, quantize=True)
+        self._sync_data = self._build_sync_data(audio_query, b"", duration)
+        return self._sync_data
+
+    def _build_sync_data(
+        self,
+        audio_query: QueryLike,
+        audio_data: bytes,
+        duration: float,
+        openness: OpennessTrack | None = None,
+    ) -> SyncData:
+        """AudioQueryから口形状スケジュールを作る."""
+        # 音素タイムライン抽出（Engineと同じ丸めで合成WAVの時刻に合わせる）
+        timeline = extract_phoneme_timeline(audio_query, quantize=True)
+
+        # 短い口形状・ちらつきを除去
+        removed_transitions = 0
+        if settings.min_hold > 0:
+            stabilized = stabilize_timeline(timeline)
+            timeline = stabilized.timeline
+            removed_transitions = stabilized.removed_transitions
 
         # MouthSchedule生成
-        total_duration = get_total_duration(audio_query)
+        total_duration = get_total_duration(audio_query, quantize=True)
         schedule = create_mouth_schedule(timeline, total_duration, self.fps)
 
-        self._sync_data = SyncData(
+        # 口形状ブレンドを発話全体ぶん事前計算
+        blend = None
+        if settings.blend_transition > 0:
+            blend = create_blend_schedule(timeline, total_duration, self.fps)
+
+        return SyncData(
             audio_query=audio_query,
             audio_data=audio_data,
             timeline=timeline,
             schedule=schedule,
             duration=duration,
+            blend=blend,
+            removed_transitions=removed_transitions,
+            openness=openness,
+        )
+
+    def prepare_wav(self, audio_data: bytes) -> SyncData:
+        """AudioQueryのないWAVの再生準備（音量ベースのリップシンク）.
+
+        Args:
+            audio_data: WAV音声データ
+
+        Returns:
+            SyncData: 同期再生用データ
+        """
+        # 音声読み込み
+        duration = self.player.load_wav(audio_data)
+
+        # デコード済みバッファから直接MouthSchedule生成
+        analyzer = AmplitudeAnalyzer(sample_rate=self.player.sample_rate, fps=self.fps)
+        schedule = analyzer.analyze(self.player.samples)
+
+        self._sync_data = SyncData(
+            audio_query=None,
+            audio_data=audio_data,
+            timeline=[],
+            schedule=schedule,
+            duration=duration,
         )
 
         return self._sync_data
@@ -78,31 +201,89 @@ class SyncEngine:
         if self._sync_data is None:
             raise RuntimeError("No sync data prepared. Call prepare() first.")
 
+        self._cancelled = False
         self.player.play(blocking=False)
 
     def stop(self) -> None:
         """再生停止."""
         self.player.stop()
 
-    def get_current_viseme(self) -> Viseme:
+    def cancel(self) -> None:
+        """再生を中断（バージイン）.
+
+        音声は次の出力ブロックでフェードアウトし、口形状は同じ時点で閉じる。
+        """
+        self._cancelled = True
+        self.player.fade_out()
+
+    def elapsed_at(self, at: float | None = None) -> float:
+        """再生位置（秒）.
+
+        Args:
+            at: 時刻（時計（Clock.now）の値、デフォルト: 現在）
+
+        Returns:
+            float: その時刻に出力されている音声の再生位置
+        """
+        if at is None:
+            return self.player.elapsed_time
+        return self.player.elapsed_at(at)
+
+    def get_current_viseme(self, at: float | None = None) -> Viseme:
         """現在のVisemeを取得.
 
+        Args:
+            at: 口形状を求める時刻（時計（Clock.now）の値、デフォルト: 現在）
+
         Returns:
             Viseme: 現在の口形状
         """
-        if self._sync_data is None or not self.player.is_playing:
+        if self._sync_data is None or not self.is_playing:
             return Viseme.CLOSED
 
-        elapsed = self.player.elapsed_time
+        elapsed = self.elapsed_at(at)
+        if self._sync_data.audio_query is None:
+            return get_viseme_at_frame(self._sync_data.schedule, int(elapsed * self.fps))
         return get_viseme_at_time(self._sync_data.timeline, elapsed)
 
-    def update(self) -> Viseme:
+    def get_current_blend(self, at: float | None = None) -> VisemeBlend | None:
+        """現在の口形状ブレンドを取得.
+
+        Args:
+            at: 求める時刻（時計（Clock.now）の値、デフォルト: 現在）
+
+        Returns:
+            VisemeBlend | None: ブレンド（ブレンド無効・非再生時はNone）
+        """
+        if self._sync_data is None or self._sync_data.blend is None or not self.is_playing:
+            return None
+
+        return self._sync_data.blend.at_time(self.elapsed_at(at))
+
+    def get_current_openness(self, at: float | None = None) -> Openness:
+        """現在の口の開き具合を取得.
+
+        Args:
+            at: 求める時刻（時計（Clock.now）の値、デフォルト: 現在）
+
+        Returns:
+            Openness: 開き具合（無効・非再生時は通常）
+        """
+        if self._sync_data is None or self._sync_data.openness is None or not self.is_playing:
+            return Openness.NORMAL
+
+        return self._sync_data.openness.at_time(self.elapsed_at(at))
+
+    def update(self, at: float | None = None) -> Viseme:
         """フレーム更新（毎フレーム呼び出す）.
 
+        Args:
+            at: フレームの時刻（時計（Clock.now）の値、デフォルト: 現在）
+
         Returns:
             Viseme: 現在の口形状
         """
-        viseme = self.get_current_viseme()
+        viseme = self.get_current_viseme(at)
 
         if self._viseme_callback is not None:
             self._viseme_callback(viseme)
@@ -111,8 +292,13 @@ class SyncEngine:
 
     @property
     def is_playing(self) -> bool:
-        """再生中かどうか."""
-        return self.player.is_playing
+        """再生中かどうか（キャンセル後はフェードアウト中でもFalse）."""
+        return self.player.is_playing and not self._cancelled
+
+    @property
+    def cancel_latency(self) -> LatencyStats:
+        """キャンセル要求から無音になるまでの遅延."""
+        return self.player.cancel_latency
 
     @property
     def elapsed_time(self) -> float:
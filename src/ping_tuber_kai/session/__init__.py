@@ -0,0 +1,23 @@
+"""セッション記録・再現モジュール."""
+
+from .recorder import SessionRecorder
+from .replay import (
+    Divergence,
+    LateFrame,
+    ReplayReport,
+    Session,
+    SessionFormatError,
+    read_sessions,
+    replay,
+)
+
+__all__ = [
+    "Divergence",
+    "LateFrame",
+    "ReplayReport",
+    "Session",
+    "SessionFormatError",
+    "SessionRecorder",
+    "read_sessions",
+    "replay",
+]
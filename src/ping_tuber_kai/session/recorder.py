@@ -0,0 +1,231 @@
+"""セッション記録モジュール.
+
+配信中の途切れを後から再現できるよう、発話リクエスト・AudioQuery・WAVのハッシュ・
+口形状の切り替え・フレームの時刻・VOICEVOXの所要時間を追記専用のファイルに記録する。
+
+1行に1レコード（JSONの配列、先頭が種別）を書き、途中で落ちても書けた行までは読める。
+時刻はセッション開始からの秒（時計（Clock.now）の値の差）、アバターはヘッダの一覧の番号で表す。
+
+    ["h", version, fps, [アバター名, ...], 開始時刻（time.time()）]  ヘッダ
+    ["s", t, avatar, text, speaker]                    発話リクエスト
+    ["p", t, avatar, query|null, wavハッシュ|null, duration]  再生開始
+    ["x", t, avatar]                                   中断
+    ["v", t, avatar, 再生位置|null, viseme]            口形状の切り替え
+    ["f", t, deadline, [再生位置|null, ...]]           フレーム（アバターごとの再生位置）
+    ["i", t]                                           アイドルで眠った（次の締め切りは並べ直し）
+    ["c", t, operation, seconds, ok]                   VOICEVOXへのリクエスト
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+from ..lipsync.viseme import Viseme
+from ..voicevox.models import AudioQuery
+from ..voicevox.view import MoraView, QueryLike
+
+FORMAT_VERSION = 1
+
+# 時刻・再生位置を丸める桁数（マイクロ秒）
+TIME_DIGITS = 6
+
+# WAVハッシュ（SHA-256）の先頭の文字数
+HASH_LENGTH = 16
+
+
+def wav_hash(audio: bytes) -> str:
+    """WAVデータのハッシュ（同じ音声が合成されたかの比較用）.
+
+    Args:
+        audio: WAVデータ
+
+    Returns:
+        str: SHA-256の先頭HASH_LENGTH文字
+    """
+    return hashlib.sha256(audio).hexdigest()[:HASH_LENGTH]
+
+
+def _mora_json(mora: MoraView) -> dict:
+    return {
+        "consonant": mora.consonant,
+        "consonant_length": mora.consonant_length,
+        "vowel": mora.vowel,
+        "vowel_length": mora.vowel_length,
+        "pitch": mora.pitch,
+    }
+
+
+def query_json(query: QueryLike) -> dict:
+    """AudioQuery（または軽量ビュー）をEngineと同じ形のdictにする.
+
+    軽量ビューはタイミングと音量のフィールドだけを含む（parse_query_viewで読み戻せる）。
+
+    Args:
+        query: AudioQuery（または軽量ビュー）
+
+    Returns:
+        dict: AudioQueryのJSONに相当するdict
+    """
+    if isinstance(query, AudioQuery):
+        return json.loads(query.to_json())
+    return {
+        "accent_phrases": [
+            {
+                "moras": [_mora_json(mora) for mora in phrase.moras],
+                "pause_mora": _mora_json(phrase.pause_mora) if phrase.pause_mora else None,
+            }
+            for phrase in query.accent_phrases
+        ],
+        "speedScale": query.speed_scale,
+        "volumeScale": query.volume_scale,
+        "prePhonemeLength": query.pre_phoneme_length,
+        "postPhonemeLength": query.post_phoneme_length,
+        "pauseLength": query.pause_length,
+        "pauseLengthScale": query.pause_length_scale,
+    }
+
+
+def _round(value: float | None) -> float | None:
+    return None if value is None else round(value, TIME_DIGITS)
+
+
+class SessionRecorder:
+    """セッションを追記専用のファイルに記録する.
+
+    どのスレッドから呼んでもよい（1行ずつロックして書き、行単位でフラッシュする）。
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        avatars: Sequence[str],
+        fps: int,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        """初期化（ファイルを追記で開き、ヘッダを書く）.
+
+        Args:
+            path: 記録ファイル（既存なら後ろに新しいセッションを追記）
+            avatars: アバター名（記録ではこの順の番号で表す）
+            fps: 描画のフレームレート
+            clock: 時計（秒、フレームの締め切りと同じ時計（Clock.now）の値）
+        """
+        self.path = Path(path)
+        self.clock = clock
+        self.records = 0  # 書いたレコード数
+        self._index = {name: index for index, name in enumerate(avatars)}
+        self._lock = threading.Lock()
+        self._started = clock()
+        self._file = self.path.open("a", encoding="utf-8", buffering=1)
+        self._write(["h", FORMAT_VERSION, fps, list(avatars), round(time.time(), 3)])
+
+    def _time(self, at: float | None = None) -> float:
+        """セッション開始からの秒."""
+        return round((self.clock() if at is None else at) - self._started, TIME_DIGITS)
+
+    def _write(self, record: list) -> None:
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(line + "\n")
+            self.records += 1
+
+    def speak(self, avatar: str, text: str, speaker: int) -> None:
+        """発話リクエストを記録.
+
+        Args:
+            avatar: アバター名
+            text: 発話テキスト
+            speaker: 話者ID
+        """
+        self._write(["s", self._time(), self._index[avatar], text, speaker])
+
+    def play(
+        self,
+        avatar: str,
+        query: QueryLike | None,
+        audio: bytes | None,
+        duration: float,
+    ) -> None:
+        """再生開始を記録.
+
+        Args:
+            avatar: アバター名
+            query: 口形状を作ったAudioQuery（音量ベースの再生ではNone）
+            audio: WAVデータ（受信しながら再生する場合はNone）
+            duration: 再生時間（秒）
+        """
+        self._write(
+            [
+                "p",
+                self._time(),
+                self._index[avatar],
+                query_json(query) if query is not None else None,
+                wav_hash(audio) if audio else None,
+                _round(duration),
+            ]
+        )
+
+    def stop(self, avatar: str) -> None:
+        """再生の中断を記録.
+
+        Args:
+            avatar: アバター名
+        """
+        self._write(["x", self._time(), self._index[avatar]])
+
+    def viseme(self, avatar: str, position: float | None, viseme: Viseme) -> None:
+        """口形状の切り替えを記録.
+
+        Args:
+            avatar: アバター名
+            position: 再生位置（秒、発話していなければNone）
+            viseme: 切り替わった後の口形状
+        """
+        self._write(["v", self._time(), self._index[avatar], _round(position), viseme.value])
+
+    def frame(self, deadline: float | None, positions: Sequence[float | None]) -> None:
+        """描画したフレームを記録（画面に反映した直後に呼ぶ）.
+
+        Args:
+            deadline: 口形状を求めた締め切り（時計（Clock.now）の値、最初のフレームではNone）
+            positions: アバターごとの再生位置（秒、発話していなければNone）
+        """
+        t = self._time()
+        self._write(
+            [
+                "f",
+                t,
+                t if deadline is None else self._time(deadline),
+                [_round(position) for position in positions],
+            ]
+        )
+
+    def idle(self) -> None:
+        """アイドルで眠ったことを記録（起きた後の締め切りは並べ直される）."""
+        self._write(["i", self._time()])
+
+    def request(self, operation: str, seconds: float, ok: bool) -> None:
+        """VOICEVOXへのリクエストを記録（VoicevoxClient.on_requestに渡す）.
+
+        Args:
+            operation: 操作名
+            seconds: リトライを含む所要時間
+            ok: 成功したか
+        """
+        self._write(["c", self._time(), operation, _round(seconds), int(ok)])
+
+    def close(self) -> None:
+        """ファイルを閉じる."""
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self) -> "SessionRecorder":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,275 @@
+"""セッション再現モジュール.
+
+SessionRecorderの記録から発話ごとに同期エンジンを作り直し、記録したフレームの時刻と
+再生位置で口形状を求め直す。時計は記録の時刻を進めるだけなので実時間より速く回る。
+
+記録した口形状と求め直した口形状が違うフレーム（口形状生成の変更による差）と、
+締め切りに遅れた・飛ばしたフレームを報告する。音声は再生せず、口形状の設定
+（min_hold・blend_transitionなど）は再現する側の設定を使う。
+"""
+
+import json
+import time
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Protocol
+
+from ..lipsync.viseme import Viseme
+from ..output.pacer import LATE_TOLERANCE
+from ..player.audio import LatencyStats
+from ..player.sync import SyncEngine
+from ..voicevox.view import parse_query_view
+from .recorder import FORMAT_VERSION
+
+
+class SessionFormatError(Exception):
+    """記録ファイルの形式エラー."""
+
+    pass
+
+
+class VisemeSink(Protocol):
+    """口形状の出力先（PygameWindow・OBSController・BrowserChannel・OSCSinkなど）."""
+
+    def set_viseme(self, viseme: Viseme) -> None: ...
+
+
+@dataclass
+class Session:
+    """記録ファイル内の1セッション."""
+
+    version: int
+    fps: int
+    avatars: list[str]
+    started: float  # 開始時刻（time.time()）
+    records: list[list] = field(default_factory=list)  # ヘッダ以降のレコード
+
+    @property
+    def duration(self) -> float:
+        """記録の長さ（秒）."""
+        return self.records[-1][1] if self.records else 0.0
+
+
+def read_sessions(path: str | Path) -> list[Session]:
+    """記録ファイルを読む.
+
+    書きかけの行（記録中に落ちた場合など）は読み飛ばす。
+
+    Args:
+        path: 記録ファイル
+
+    Returns:
+        list[Session]: 記録順のセッション
+
+    Raises:
+        SessionFormatError: ヘッダがない、または対応していない形式の場合
+    """
+    sessions: list[Session] = []
+    with Path(path).open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record[0] == "h":
+                _, version, fps, avatars, started = record
+                if version != FORMAT_VERSION:
+                    raise SessionFormatError(f"Unsupported session format: v{version}")
+                sessions.append(Session(version, fps, avatars, started))
+            elif not sessions:
+                raise SessionFormatError("Session header not found")
+            else:
+                sessions[-1].records.append(record)
+    return sessions
+
+
+@dataclass
+class LateFrame:
+    """締め切りに遅れた、または前の締め切りから飛ばしたフレーム."""
+
+    index: int  # フレーム番号（セッション内、0から）
+    time: float  # 画面に反映した時刻（セッション開始からの秒）
+    lateness: float  # 締め切りから画面に反映するまで（秒）
+    dropped: int  # 直前に飛ばした締め切りの数
+
+
+@dataclass
+class Divergence:
+    """記録と再現で口形状が違ったフレーム."""
+
+    index: int  # フレーム番号
+    time: float  # 画面に反映した時刻（秒）
+    avatar: str
+    position: float  # 再生位置（秒）
+    recorded: Viseme
+    replayed: Viseme
+
+
+@dataclass
+class ReplayReport:
+    """再現結果."""
+
+    frames: int = 0
+    speak_requests: int = 0  # 発話リクエスト数
+    utterances: int = 0  # 再現した発話数
+    skipped: int = 0  # AudioQueryがなく再現できなかった再生（音量ベース）
+    duration: float = 0.0  # 記録の長さ（秒）
+    replay_seconds: float = 0.0  # 再現にかかった時間（秒）
+    late: list[LateFrame] = field(default_factory=list)
+    divergences: list[Divergence] = field(default_factory=list)
+    request_latency: dict[str, LatencyStats] = field(default_factory=dict)  # 操作名 → 所要時間
+    request_errors: int = 0
+
+    @property
+    def speedup(self) -> float:
+        """実時間に対する速さ."""
+        return self.duration / self.replay_seconds if self.replay_seconds > 0 else 0.0
+
+    def summary(self) -> str:
+        """1行の要約.
+
+        Returns:
+            str: 要約文字列
+        """
+        dropped = sum(frame.dropped for frame in self.late)
+        requests = ", ".join(
+            f"{operation} {stats.mean * 1000:.0f}/{stats.max * 1000:.0f}ms"
+            for operation, stats in self.request_latency.items()
+        )
+        return (
+            f"Replayed {self.duration:.1f}s in {self.replay_seconds:.2f}s "
+            f"({self.speedup:.0f}x): {self.frames} frames, {len(self.late)} late "
+            f"({dropped} dropped), {len(self.divergences)} diverged, "
+            f"{self.utterances} utterances ({self.skipped} skipped); "
+            f"requests (mean/max): {requests or '-'}, {self.request_errors} failed"
+        )
+
+
+class _ReplayPlayer:
+    """記録した再生位置を返すプレイヤー（音は出さない）."""
+
+    def __init__(self):
+        self.position: float | None = None  # 現在のフレームの再生位置（Noneは停止中）
+        self.cancel_latency = LatencyStats()
+
+    @property
+    def is_playing(self) -> bool:
+        return self.position is not None
+
+    @property
+    def elapsed_time(self) -> float:
+        return self.position or 0.0
+
+    def elapsed_at(self, at: float) -> float:
+        return self.elapsed_time
+
+    def play(self, blocking: bool = False) -> None:
+        pass
+
+    def stop(self) -> None:
+        self.position = None
+
+    def fade_out(self) -> None:
+        pass
+
+
+def replay(
+    session: Session,
+    sinks: Mapping[str, Sequence[VisemeSink]] | None = None,
+    speed: float | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> ReplayReport:
+    """セッションを再現する.
+
+    Args:
+        session: read_sessions()で読んだセッション
+        sinks: アバター名 → 再現した口形状を送る出力先
+        speed: 実時間に対する速さ（指定時は記録の時刻に合わせて待つ、Noneで待たない）
+        sleep: スリープ関数
+
+    Returns:
+        ReplayReport: 再現結果
+    """
+    sinks = sinks or {}
+    report = ReplayReport(duration=session.duration)
+    period = 1.0 / session.fps
+    count = len(session.avatars)
+    players = [_ReplayPlayer() for _ in range(count)]
+    engines: list[SyncEngine | None] = [None] * count
+    recorded = [Viseme.CLOSED] * count  # 記録した最新の口形状
+    replayed = [Viseme.CLOSED] * count  # 出力先に送った口形状
+    previous_deadline: float | None = None
+
+    started = time.perf_counter()
+    for record in session.records:
+        kind = record[0]
+        if kind == "f":
+            _, t, deadline, positions = record
+            index = report.frames
+            report.frames += 1
+
+            dropped = 0
+            if previous_deadline is not None:
+                dropped = max(round((deadline - previous_deadline) / period) - 1, 0)
+            lateness = t - deadline
+            if dropped or lateness > period * LATE_TOLERANCE:
+                report.late.append(LateFrame(index, t, lateness, dropped))
+            previous_deadline = deadline
+
+            for avatar, position in enumerate(positions):
+                players[avatar].position = position
+                engine = engines[avatar]
+                viseme = Viseme.CLOSED
+                if engine is not None and position is not None:
+                    viseme = engine.update()
+                    if viseme != recorded[avatar]:
+                        report.divergences.append(
+                            Divergence(
+                                index,
+                                t,
+                                session.avatars[avatar],
+                                position,
+                                recorded[avatar],
+                                viseme,
+                            )
+                        )
+                if viseme != replayed[avatar]:
+                    replayed[avatar] = viseme
+                    for sink in sinks.get(session.avatars[avatar], ()):
+                        sink.set_viseme(viseme)
+
+            if speed:
+                wait = t / speed - (time.perf_counter() - started)
+                if wait > 0:
+                    sleep(wait)
+        elif kind == "v":
+            recorded[record[2]] = Viseme(record[4])
+        elif kind == "p":
+            _, _, avatar, query, _, duration = record
+            if query is None:
+                engines[avatar] = None
+                report.skipped += 1
+                continue
+            engine = SyncEngine(fps=session.fps, player=players[avatar])
+            engine.prepare_query(parse_query_view(json.dumps(query)), duration)
+            engine.play()
+            engines[avatar] = engine
+            report.utterances += 1
+        elif kind == "x":
+            engine = engines[record[2]]
+            if engine is not None:
+                engine.cancel()
+        elif kind == "s":
+            report.speak_requests += 1
+        elif kind == "i":
+            # 眠った後は締め切りが並べ直されるので、間隔を飛ばしたフレームとは数えない
+            previous_deadline = None
+        elif kind == "c":
+            _, _, operation, seconds, ok = record
+            report.request_latency.setdefault(operation, LatencyStats()).add(seconds)
+            if not ok:
+                report.request_errors += 1
+
+    report.replay_seconds = time.perf_counter() - started
+    return report
@@ -1,5 +1,21 @@
 """UIモジュール."""
 
 from .app import App
+from .avatar import Avatar, AvatarConfig
+from .idle import IdleAnimator, IdleScheduler
+from .speech_queue import DropPolicy, QueueMetrics, SpeechPriority, SpeechQueue
+from .warmup import Warmup, WarmupReport
 
-__all__ = ["App"]
+__all__ = [
+    "App",
+    "Avatar",
+    "AvatarConfig",
+    "DropPolicy",
+    "IdleAnimator",
+    "IdleScheduler",
+    "QueueMetrics",
+    "SpeechPriority",
+    "SpeechQueue",
+    "Warmup",
+    "WarmupReport",
+]
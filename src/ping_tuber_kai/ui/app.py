@@ -1,148 +1,466 @@
 """統合GUIアプリ."""
 
+import threading
+from collections.abc import Sequence
 from pathlib import Path
 
 import pygame
 
+from ..clock import Clock
 from ..config import settings
-from ..lipsync.viseme import Viseme
+from ..output.browser_source import BrowserSource, BrowserSourceError
 from ..output.obs_websocket import OBSController, is_obs_available
+from ..output.osc import OSCSink
 from ..output.pygame_window import PygameWindow
+from ..output.shared_frames import SharedFrameError, SharedFrameWriter
+from ..player.audio import OutputFactory
+from ..player.live import LiveInput
+from ..player.mixer import AudioMixer, MixerVoice
 from ..player.sync import SyncEngine
+from ..session.recorder import SessionRecorder
 from ..voicevox.client import VoicevoxClient
+from .avatar import Avatar, AvatarConfig
+from .idle import IdleAnimator, IdleScheduler
+from .speech_queue import SpeechPriority, SpeechQueue
+from .warmup import Warmup, WarmupReport
 
 
 class App:
-    """統合GUIアプリケーション."""
+    """統合GUIアプリケーション.
+
+    1つのプロセスで複数のアバターを動かせる。アバターごとに話者・口形状アセット・
+    描画領域（1つのウィンドウを横に並べて分割）・OBSソースのプレフィックスを持ち、
+    VOICEVOXクライアント（接続プール・クエリキャッシュ）と音声出力ストリーム（ミキサー）は
+    全アバターで共有する。
+
+    発話していない間はまばたき・呼吸の予定だけを実行し、次の予定（または入力・発話）まで
+    描画ループを止める。
+    """
 
     def __init__(
         self,
         use_obs: bool = False,
         assets_dir: Path | None = None,
+        use_live_input: bool = False,
+        warmup: bool | None = None,
+        warmup_speakers: Sequence[int] | None = None,
+        avatars: Sequence[AvatarConfig] | None = None,
+        use_browser_source: bool = False,
+        use_osc: bool = False,
+        use_shared_frames: bool = False,
+        record_path: Path | None = None,
+        clock: Clock | None = None,
+        audio_output: OutputFactory | None = None,
     ):
         """初期化.
 
         Args:
             use_obs: OBS WebSocket連携を使用するか
-            assets_dir: アセットディレクトリ
+            assets_dir: アセットディレクトリ（avatars未指定時の1体に使用）
+            use_live_input: マイク入力のライブリップシンクを使用するか（先頭のアバターに反映）
+            warmup: 起動時に話者・音声デバイスを事前準備するか（デフォルト: 設定から取得）
+            warmup_speakers: ウォームアップする話者ID（デフォルト: 各アバターの話者＋追加話者）
+            avatars: アバター設定（デフォルト: 設定の話者で1体）
+            use_browser_source: OBSブラウザソース用のローカルサーバーを起動するか
+            use_osc: OSC/VMCで口形状パラメータを送るか（送信先ポートはアバターごと）
+            use_shared_frames: 合成した画面を共有メモリにRGBAで書き込むか
+            record_path: セッションを追記するファイル（後から再現して遅延を調べる）
+            clock: 再生位置・フレーム・アイドルの待機に使う時計（デフォルト: 実時間）
+            audio_output: 出力ストリームを作る関数（デフォルト: sounddevice.OutputStream）
         """
         self.use_obs = use_obs and is_obs_available()
         self.assets_dir = assets_dir
+        self.use_live_input = use_live_input
+        self.use_browser_source = use_browser_source
+        self.use_osc = use_osc
+        self.use_shared_frames = use_shared_frames
+        self.record_path = record_path
+        self.clock = clock or Clock()
+        self.audio_output = audio_output
+        self.use_warmup = settings.warmup if warmup is None else warmup
+        self.avatar_configs = list(avatars) if avatars else [AvatarConfig(assets_dir=assets_dir)]
+        if warmup_speakers is None:
+            warmup_speakers = [
+                *(config.speaker for config in self.avatar_configs),
+                *settings.warmup_speaker_ids,
+            ]
+        self.warmup_speakers = list(warmup_speakers)
 
         self._voicevox: VoicevoxClient | None = None
-        self._sync_engine: SyncEngine | None = None
-        self._window: PygameWindow | None = None
-        self._obs: OBSController | None = None
+        self._mixer: AudioMixer | None = None
+        self._bgm: MixerVoice | None = None
+        self._avatars: list[Avatar] = []
+        self._live: LiveInput | None = None
+        self._browser: BrowserSource | None = None
+        self._frames: SharedFrameWriter | None = None
+        self._recorder: SessionRecorder | None = None
+        self._idle = IdleScheduler(clock=self.clock.now)
+        self._wake = threading.Event()  # 眠っている描画ループを起こす
+        self._warmup: Warmup | None = None
+        self._warmup_reported: bool = False
         self._running: bool = False
 
     def init(self) -> None:
         """アプリケーション初期化."""
-        # VOICEVOXクライアント
+        # VOICEVOXクライアント・音声出力（全アバターで共有）
         self._voicevox = VoicevoxClient()
+        self._mixer = AudioMixer(clock=self.clock, output=self.audio_output)
+
+        # セッション記録（オプション、ウォームアップのリクエストも記録する）
+        if self.record_path is not None:
+            self._recorder = SessionRecorder(
+                self.record_path,
+                [config.name for config in self.avatar_configs],
+                settings.fps,
+                clock=self.clock.now,
+            )
+            self._voicevox.on_request = self._recorder.request
+
+        # 同期エンジン（アバターごとにミキサーのボイスを持つ）
+        engines = [
+            SyncEngine(fps=settings.fps, player=self._mixer.create_voice(config.name))
+            for config in self.avatar_configs
+        ]
+
+        # ウォームアップ（ウィンドウ生成をブロックしないようバックグラウンドで実行）
+        if self.use_warmup:
+            self._warmup = Warmup(
+                self._voicevox if self.warmup_speakers else None,
+                self.warmup_speakers,
+                player=engines[0].player,
+            )
+            self._warmup.start()
+
+        # PyGameウィンドウ（アバターを横に並べて1つのウィンドウを共有）
+        width, height = settings.window_width, settings.window_height
+        windows = [
+            PygameWindow(
+                assets_dir=config.assets_dir, position=(index * width, 0), clock=self.clock
+            )
+            for index, config in enumerate(self.avatar_configs)
+        ]
+        windows[0].init(screen_size=(width * len(windows), height))
+        for window in windows[1:]:
+            window.init(screen=windows[0].screen)
+
+        # 共有メモリのフレーム出力（オプション）
+        if self.use_shared_frames:
+            try:
+                self._frames = SharedFrameWriter(windows[0].screen.get_size())
+                print(f"Shared frames: {self._frames.name}")
+            except SharedFrameError as e:
+                print(f"Shared frames failed: {e}")
+
+        # ブラウザソース（オプション）
+        if self.use_browser_source:
+            self._start_browser_source()
+
+        for config, engine, window in zip(self.avatar_configs, engines, windows, strict=True):
+            avatar = Avatar(
+                config,
+                self._voicevox,
+                engine,
+                window,
+                obs=self._connect_obs(config),
+                browser=self._browser.channel(config.name) if self._browser else None,
+                osc=self._start_osc(config),
+                clock=self.clock,
+            )
+            avatar.queue.on_ready = self.wake
+            avatar.recorder = self._recorder
+            if settings.idle_enabled:
+                avatar.idle = IdleAnimator(
+                    self._idle,
+                    window,
+                    lambda a=avatar: a.is_mouth_moving,
+                    obs=avatar.obs,
+                    browser=avatar.browser,
+                )
+                avatar.idle.start()
+            self._avatars.append(avatar)
+
+        # ライブ入力（オプション）
+        if self.use_live_input:
+            try:
+                self._live = LiveInput(fps=settings.fps)
+                self._live.start()
+            except Exception as e:
+                print(f"Live input failed: {e}")
+                self._live = None
+
+    def _connect_obs(self, config: AvatarConfig) -> OBSController | None:
+        """アバターのOBSソースに接続（オプション）."""
+        if not self.use_obs:
+            return None
+        try:
+            obs = OBSController(source_prefix=config.obs_source_prefix)
+            obs.connect()
+            return obs
+        except Exception as e:
+            print(f"OBS connection failed ({config.name}): {e}")
+            return None
+
+    def _start_browser_source(self) -> None:
+        """ブラウザソースのサーバーを起動し、アバターごとの配信を追加."""
+        browser = BrowserSource()
+        for config in self.avatar_configs:
+            browser.add_avatar(config.name, config.assets_dir or self.assets_dir)
+        try:
+            browser.start()
+        except BrowserSourceError as e:
+            print(f"Browser source failed: {e}")
+            return
+        self._browser = browser
+        for config in self.avatar_configs:
+            print(f"Browser source ({config.name}): {browser.url(config.name)}")
+
+    def _start_osc(self, config: AvatarConfig) -> OSCSink | None:
+        """アバターのOSC/VMC出力を開始（オプション）."""
+        if not self.use_osc:
+            return None
+        osc = OSCSink(port=config.osc_port)
+        osc.start()
+        return osc
+
+    def avatar(self, key: int | str = 0) -> Avatar:
+        """アバターを取得.
 
-        # 同期エンジン
-        self._sync_engine = SyncEngine(fps=settings.fps)
+        Args:
+            key: 番号または名前
 
-        # PyGameウィンドウ
-        self._window = PygameWindow(assets_dir=self.assets_dir)
-        self._window.init()
+        Returns:
+            Avatar: アバター
 
-        # OBS連携（オプション）
-        if self.use_obs:
-            try:
-                self._obs = OBSController()
-                self._obs.connect()
-            except Exception as e:
-                print(f"OBS connection failed: {e}")
-                self._obs = None
+        Raises:
+            RuntimeError: 初期化前の場合
+            KeyError: 該当するアバターがない場合
+        """
+        if not self._avatars:
+            raise RuntimeError("App not initialized. Call init() first.")
+        if isinstance(key, int):
+            return self._avatars[key]
+        for avatar in self._avatars:
+            if avatar.name == key:
+                return avatar
+        raise KeyError(f"Unknown avatar: {key}")
+
+    def speak(
+        self,
+        text: str,
+        speaker_id: int | None = None,
+        avatar: int | str = 0,
+    ) -> bool:
+        """テキストを発話（合成中・再生中の発話は中断して置き換える）.
 
-    def speak(self, text: str, speaker_id: int | None = None) -> None:
-        """テキストを発話.
+        別スレッドからinterrupt()や新しいspeak()が呼ばれると、
+        合成中のリクエストは中断されて発話しない。
 
         Args:
             text: 発話テキスト
-            speaker_id: 話者ID
+            speaker_id: 話者ID（デフォルト: アバターの話者）
+            avatar: 発話するアバター（番号または名前）
+
+        Returns:
+            bool: 再生を開始した場合True（中断された場合False）
         """
-        if self._voicevox is None or self._sync_engine is None:
-            raise RuntimeError("App not initialized. Call init() first.")
+        started = self.avatar(avatar).speak(text, speaker_id)
+        self.wake()
+        return started
+
+    def enqueue(
+        self,
+        text: str,
+        speaker_id: int | None = None,
+        priority: SpeechPriority = SpeechPriority.NORMAL,
+        avatar: int | str = 0,
+    ) -> bool:
+        """テキストを発話キューに追加（再生中の発話が終わってから順に発話）.
+
+        Args:
+            text: 発話テキスト
+            speaker_id: 話者ID（デフォルト: アバターの話者）
+            priority: 優先度
+            avatar: 発話するアバター（番号または名前）
 
-        # VOICEVOX APIから音声生成
-        query, audio = self._voicevox.speak(text, speaker_id)
+        Returns:
+            bool: キューに入った場合True（満杯で捨てられた場合False）
+        """
+        return self.avatar(avatar).enqueue(text, speaker_id, priority)
+
+    def interrupt(self, avatar: int | str | None = None) -> None:
+        """合成中のリクエストを中断し、再生中の音声をフェードアウトして口を閉じる.
 
-        # 同期エンジンに準備
-        self._sync_engine.prepare(query, audio)
+        Args:
+            avatar: 中断するアバター（Noneなら全員）
+        """
+        targets = self._avatars if avatar is None else [self.avatar(avatar)]
+        for target in targets:
+            target.interrupt()
+        self.wake()
 
-        # 再生開始
-        self._sync_engine.play()
+    def play_wav(self, wav_data: bytes, avatar: int | str = 0) -> None:
+        """AudioQueryのないWAVを音量ベースのリップシンクで再生.
 
-    def run(self, text: str | None = None, speaker_id: int | None = None) -> None:
+        Args:
+            wav_data: WAV形式のバイトデータ
+            avatar: 再生するアバター（番号または名前）
+        """
+        engine = self.avatar(avatar).sync_engine
+        engine.prepare_wav(wav_data)
+        engine.play()
+        self.wake()
+
+    def play_bgm(self, wav_data: bytes, gain: float | None = None) -> None:
+        """BGMをループ再生（発話中は自動で音量を下げる）.
+
+        Args:
+            wav_data: WAV形式のバイトデータ（サンプリングレートは問わない）
+            gain: 音量（線形、デフォルト: 設定から取得）
+        """
+        if self._mixer is None:
+            raise RuntimeError("App not initialized. Call init() first.")
+
+        if self._bgm is None:
+            self._bgm = self._mixer.create_voice("bgm", ducked=True)
+        self._bgm.gain = settings.bgm_gain if gain is None else gain
+        self._bgm.load_wav(wav_data)
+        self._bgm.play(loop=True)
+
+    def stop_bgm(self) -> None:
+        """BGMをフェードアウトして停止."""
+        if self._bgm is not None:
+            self._bgm.fade_out()
+
+    def run(
+        self,
+        text: str | None = None,
+        speaker_id: int | None = None,
+        wav_data: bytes | None = None,
+    ) -> None:
         """メインループ実行.
 
         Args:
-            text: 発話テキスト（指定時は自動再生）
+            text: 発話テキスト（指定時は先頭のアバターで自動再生）
             speaker_id: 話者ID
+            wav_data: 再生するWAVデータ（指定時は音量ベースで自動再生）
         """
-        if self._window is None or self._sync_engine is None:
+        if not self._avatars:
             raise RuntimeError("App not initialized. Call init() first.")
 
         self._running = True
+        primary = self._avatars[0].window
 
         # テキスト指定時は自動再生
         if text:
             self.speak(text, speaker_id)
+        elif wav_data:
+            self.play_wav(wav_data)
+        autoplay = bool(text or wav_data)
 
         while self._running:
-            # フレーム更新
-            viseme = self._sync_engine.update()
-
-            # 表示更新
-            self._update_viseme(viseme)
-
-            # PyGame更新
-            if not self._window.update():
+            # ウォームアップ完了を一度だけ報告
+            if self._warmup is not None and not self._warmup_reported and self._warmup.is_done:
+                self._warmup_reported = True
+                print(self._warmup.report.summary())
+
+            # 期限の来たまばたき・呼吸
+            self._idle.run_due()
+
+            # ライブ入力は先頭のアバターの発話していない間に反映
+            live_viseme = self._live.update() if self._live is not None else None
+
+            # アバターごとにキューの次の発話・フレーム更新・描画
+            # 口形状は起きた時刻ではなくフレームの締め切りの再生位置で求める
+            deadline = primary.pacer.deadline
+            dirty: list[pygame.Rect] = []
+            for index, avatar in enumerate(self._avatars):
+                avatar.play_queued()
+                avatar.update(live_viseme if index == 0 else None, at=deadline)
+                dirty.extend(avatar.window.draw())
+
+            # PyGame更新（描き直した矩形だけを反映）
+            if not primary.handle_events():
                 self._running = False
                 break
+            if dirty:
+                pygame.display.update(dirty)
+                if self._frames is not None:
+                    self._frames.write(primary.screen, dirty)
+            if self._recorder is not None:
+                self._recorder.frame(deadline, [avatar.position for avatar in self._avatars])
 
             # フレームレート制御
-            self._window.tick()
+            primary.tick()
+
+            # 何も動いていなければ次のアイドルイベントまで眠る（発話で起きる）
+            # SDLのイベント待ちは内部でポーリングするため、スレッドのイベントで眠り、
+            # 入力はidle_max_sleepごとに確認する
+            if settings.idle_sleep and not self._is_animating(autoplay):
+                timeout = self._idle.timeout()
+                if timeout is None or timeout > settings.idle_max_sleep:
+                    timeout = settings.idle_max_sleep
+                self.clock.wait(self._wake, timeout)
+                self._wake.clear()
+                primary.pacer.reset()
+                if self._recorder is not None:
+                    self._recorder.idle()
 
             # 再生完了チェック
-            if text and not self._sync_engine.is_playing:
+            if autoplay and not any(avatar.is_busy for avatar in self._avatars):
                 # 再生完了後も少し待機
-                pygame.time.wait(500)
+                self.clock.sleep(0.5)
                 self._running = False
 
-    def _update_viseme(self, viseme: Viseme) -> None:
-        """Viseme更新.
+    def _is_animating(self, autoplay: bool) -> bool:
+        """毎フレーム描画が必要か（発話・ライブ入力・ウォームアップ報告待ち）."""
+        if autoplay or self._live is not None:
+            return True
+        if self._warmup is not None and not self._warmup_reported:
+            return True
+        return any(avatar.is_busy or avatar.is_mouth_moving for avatar in self._avatars)
 
-        Args:
-            viseme: 口形状
-        """
-        # PyGame表示
-        if self._window is not None:
-            self._window.set_viseme(viseme)
+    def wake(self) -> None:
+        """眠っている描画ループを起こす（どのスレッドからでも呼べる）."""
+        self._wake.set()
 
-        # OBS更新
-        if self._obs is not None:
-            self._obs.set_viseme(viseme)
+    def stop(self) -> None:
+        """メインループを抜ける（どのスレッドからでも呼べる）."""
+        self._running = False
+        self.wake()
 
     def quit(self) -> None:
         """アプリケーション終了."""
         self._running = False
 
-        if self._sync_engine is not None:
-            self._sync_engine.stop()
+        for avatar in self._avatars:
+            avatar.close()
+
+        if self._mixer is not None:
+            self._mixer.close()
+
+        if self._live is not None:
+            self._live.stop()
+
+        if self._browser is not None:
+            self._browser.close()
+            self._browser = None
 
-        if self._obs is not None:
-            self._obs.hide_all()
-            self._obs.disconnect()
+        if self._frames is not None:
+            self._frames.close()
+            self._frames = None
 
-        if self._window is not None:
-            self._window.quit()
+        # 画面を所有する先頭のウィンドウを最後に閉じる
+        for avatar in reversed(self._avatars):
+            avatar.window.quit()
+        self._avatars.clear()
 
         if self._voicevox is not None:
             self._voicevox.close()
 
+        if self._recorder is not None:
+            self._recorder.close()
+            self._recorder = None
+
     def __enter__(self) -> "App":
         self.init()
         return self
@@ -150,6 +468,48 @@ class App:
     def __exit__(self, *args) -> None:
         self.quit()
 
+    @property
+    def mixer(self) -> AudioMixer | None:
+        """共有の音声ミキサー（初期化前はNone）."""
+        return self._mixer
+
+    @property
+    def avatars(self) -> list[Avatar]:
+        """アバター一覧（初期化前は空）."""
+        return list(self._avatars)
+
+    @property
+    def warmup_report(self) -> WarmupReport | None:
+        """ウォームアップ結果（未使用・実行中はNone）."""
+        if self._warmup is None or not self._warmup.is_done:
+            return None
+        return self._warmup.report
+
+    @property
+    def speech_queue(self) -> SpeechQueue | None:
+        """先頭のアバターの発話キュー（初期化前はNone）."""
+        return self._avatars[0].queue if self._avatars else None
+
+    @property
+    def live_input(self) -> LiveInput | None:
+        """ライブ入力（未使用時はNone）."""
+        return self._live
+
+    @property
+    def browser_source(self) -> BrowserSource | None:
+        """ブラウザソースのサーバー（未使用時はNone）."""
+        return self._browser
+
+    @property
+    def shared_frames(self) -> SharedFrameWriter | None:
+        """共有メモリのフレーム出力（未使用時はNone）."""
+        return self._frames
+
+    @property
+    def recorder(self) -> SessionRecorder | None:
+        """セッション記録（未使用時はNone）."""
+        return self._recorder
+
     @property
     def is_running(self) -> bool:
         """実行中かどうか."""
@@ -0,0 +1,349 @@
+"""アバターモジュール.
+
+1つのプロセスで複数のキャラクターを動かすため、キャラクターごとの状態
+（話者・口形状アセット・描画領域・OBSソース・同期エンジン・発話キュー）を
+1体ぶんにまとめる。VOICEVOXクライアントと音声出力はアプリ全体で共有する。
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..clock import Clock
+from ..config import settings
+from ..lipsync.blend import VisemeBlend
+from ..lipsync.openness import Openness
+from ..lipsync.scheduler import MouthSchedule, get_transitions
+from ..lipsync.viseme import Viseme
+from ..output.browser_source import BrowserChannel
+from ..output.obs_websocket import OBSController
+from ..output.osc import OSCSink
+from ..output.pygame_window import PygameWindow
+from ..player.mixer import MixerVoice
+from ..player.stream import PcmStream, WavStreamError
+from ..player.sync import SyncEngine
+from ..session.recorder import SessionRecorder
+from ..voicevox.cancel import CancelToken
+from ..voicevox.client import VoicevoxCancelledError, VoicevoxClient, VoicevoxError
+from ..voicevox.view import QueryLike
+from .idle import IdleAnimator
+from .speech_queue import SpeechPriority, SpeechQueue
+
+# ブラウザソースの予定を送り直す再生位置のずれ（秒、ストリーミング再生の途切れなど）
+BROWSER_RESYNC_THRESHOLD = 0.05
+
+
+@dataclass
+class AvatarConfig:
+    """アバター1体の設定."""
+
+    name: str = "avatar"
+    speaker_id: int | None = None  # 話者ID（デフォルト: 設定から取得）
+    assets_dir: Path | None = None  # 口形状アセット（デフォルト: 設定から取得）
+    obs_source_prefix: str = "mouth_"  # OBSの口形状ソース名のプレフィックス
+    osc_port: int | None = None  # OSC/VMCの送信先ポート（デフォルト: 設定から取得）
+
+    @property
+    def speaker(self) -> int:
+        """話者ID."""
+        return self.speaker_id if self.speaker_id is not None else settings.voicevox_speaker_id
+
+
+class Avatar:
+    """アバター1体ぶんの同期エンジン・表示・OBSソース・発話キュー."""
+
+    def __init__(
+        self,
+        config: AvatarConfig,
+        client: VoicevoxClient,
+        sync_engine: SyncEngine,
+        window: PygameWindow,
+        obs: OBSController | None = None,
+        browser: BrowserChannel | None = None,
+        osc: OSCSink | None = None,
+        clock: Clock | None = None,
+    ):
+        """初期化.
+
+        Args:
+            config: アバター設定
+            client: VOICEVOXクライアント（アバター間で共有）
+            sync_engine: 同期エンジン（プレイヤーは共有ミキサーのボイス）
+            window: 描画先（共有画面内の描画領域）
+            obs: OBS連携（未使用時はNone）
+            browser: ブラウザソースの配信（未使用時はNone）
+            osc: OSC/VMC出力（未使用時はNone）
+            clock: フレームの締め切りの基準の時計（デフォルト: 実時間）
+        """
+        self.config = config
+        self.client = client
+        self.sync_engine = sync_engine
+        self.window = window
+        self.obs = obs
+        self.browser = browser
+        self.osc = osc
+        self.clock = clock or Clock()
+        self.queue = SpeechQueue(client, clock=self.clock.now)
+        self.idle: IdleAnimator | None = None  # まばたき・呼吸（未使用時はNone）
+        self.recorder: SessionRecorder | None = None  # セッション記録（未使用時はNone）
+        self.position: float | None = None  # 記録中の最新フレームの再生位置（非再生時はNone）
+        self._cancel: CancelToken | None = None  # 合成・再生中の発話のトークン
+        self._viseme: Viseme = Viseme.CLOSED  # 最後に反映した口形状
+        self._browser_schedule: MouthSchedule | None = None  # ブラウザソースに送った予定
+        self._browser_started_at = 0.0  # 送った予定の再生開始時刻（時計の値）
+
+    @property
+    def name(self) -> str:
+        """アバター名."""
+        return self.config.name
+
+    def speak(self, text: str, speaker_id: int | None = None) -> bool:
+        """テキストを発話（合成中・再生中の発話は中断して置き換える）.
+
+        Args:
+            text: 発話テキスト
+            speaker_id: 話者ID（デフォルト: アバターの話者）
+
+        Returns:
+            bool: 再生を開始した場合True（中断された場合False）
+        """
+        self.interrupt()
+        cancel = CancelToken()
+        self._cancel = cancel
+
+        speaker = speaker_id if speaker_id is not None else self.config.speaker
+        if self.recorder is not None:
+            self.recorder.speak(self.name, text, speaker)
+        try:
+            if settings.voicevox_stream_synthesis and isinstance(
+                self.sync_engine.player, MixerVoice
+            ):
+                return self._speak_streaming(text, speaker, cancel)
+            query, audio = self.client.speak(text, speaker, cancel=cancel)
+        except VoicevoxCancelledError:
+            return False
+        if cancel.is_cancelled:
+            return False
+
+        self.sync_engine.prepare(query, audio)
+        self.sync_engine.play()
+        self._record_play(query, audio)
+        return True
+
+    def _speak_streaming(self, text: str, speaker: int, cancel: CancelToken) -> bool:
+        """合成結果を受信しながら再生（先頭のチャンクが届いた時点で再生開始）.
+
+        Args:
+            text: 発話テキスト
+            speaker: 話者ID
+            cancel: 発話のキャンセルトークン
+
+        Returns:
+            bool: 再生を開始した場合True（中断された場合False）
+
+        Raises:
+            VoicevoxError: 合成に失敗した、またはヘッダを受信できなかった場合
+        """
+        query = self.client.audio_query(text, speaker, cancel=cancel)
+        # ミキサーと同じレートで出力させてリサンプリングを避ける
+        mixer_rate = self.sync_engine.player.mixer.sample_rate
+        if query.output_sampling_rate != mixer_rate:
+            query.output_sampling_rate = mixer_rate
+
+        stream = PcmStream(settings.stream_buffer_seconds)
+        cancel.add_callback(stream.close)
+
+        def receive() -> None:
+            try:
+                for chunk in self.client.synthesis_stream(query, speaker, cancel=cancel):
+                    if stream.buffer is not None and stream.buffer.closed:
+                        break
+                    stream.feed(chunk)
+            except (VoicevoxError, WavStreamError) as e:
+                stream.fail(e)
+            else:
+                stream.finish()
+
+        threading.Thread(target=receive, name=f"{self.name}-synthesis", daemon=True).start()
+
+        if stream.wait_header(self.client.deadline("synthesis")) is None:
+            stream.close()
+            if cancel.is_cancelled or isinstance(stream.error, VoicevoxCancelledError):
+                return False
+            if stream.error is not None:
+                raise stream.error
+            raise VoicevoxError("synthesis stream ended before the WAV header")
+        if cancel.is_cancelled:
+            return False
+
+        self.sync_engine.prepare_stream(query, stream)
+        self.sync_engine.play()
+        self._record_play(query, None)
+        return True
+
+    def enqueue(
+        self,
+        text: str,
+        speaker_id: int | None = None,
+        priority: SpeechPriority = SpeechPriority.NORMAL,
+    ) -> bool:
+        """テキストを発話キューに追加.
+
+        Args:
+            text: 発話テキスト
+            speaker_id: 話者ID（デフォルト: アバターの話者）
+            priority: 優先度
+
+        Returns:
+            bool: キューに入った場合True（満杯で捨てられた場合False）
+        """
+        speaker = speaker_id if speaker_id is not None else self.config.speaker
+        if self.recorder is not None:
+            self.recorder.speak(self.name, text, speaker)
+        return self.queue.submit(text, speaker, priority) is not None
+
+    def play_queued(self) -> None:
+        """再生中でなければ、合成済みの次の発話を再生."""
+        if self.sync_engine.is_playing:
+            return
+        item = self.queue.pop_ready()
+        if item is None:
+            return
+        self.sync_engine.prepare(item.query, item.audio)
+        self.sync_engine.play()
+        self._record_play(item.query, item.audio)
+
+    def _record_play(self, query: QueryLike | None, audio: bytes | None) -> None:
+        """再生開始をセッション記録に残す."""
+        if self.recorder is not None:
+            self.recorder.play(self.name, query, audio, self.sync_engine.duration)
+
+    def interrupt(self) -> None:
+        """合成中のリクエストを中断し、再生中の音声をフェードアウトして口を閉じる."""
+        if self._cancel is not None:
+            self._cancel.cancel()
+            self._cancel = None
+        self.sync_engine.cancel()
+        if self.recorder is not None:
+            self.recorder.stop(self.name)
+
+    def update(self, fallback: Viseme | None = None, at: float | None = None) -> Viseme:
+        """フレーム更新（口形状を求めて表示・OBSに反映、画面への描画はしない）.
+
+        Args:
+            fallback: 発話していないときに使う口形状（ライブ入力など）
+            at: フレームの締め切り（時計（Clock.now）の値、この時刻の再生位置で口形状を求める）
+
+        Returns:
+            Viseme: 反映した口形状
+        """
+        viseme = self.sync_engine.update(at)
+        blend = self.sync_engine.get_current_blend(at)
+        openness = self.sync_engine.get_current_openness(at)
+        if fallback is not None and not self.sync_engine.is_playing:
+            viseme = fallback
+
+        self._apply(viseme, blend, openness)
+        if self.osc is not None:
+            self.osc.set_viseme(viseme, blend)
+        if self.browser is not None:
+            self._update_browser(viseme, at)
+        if self.recorder is not None:
+            self._record_update(viseme, at)
+        self._viseme = viseme
+        return viseme
+
+    def _record_update(self, viseme: Viseme, at: float | None) -> None:
+        """フレームの再生位置と口形状の切り替えをセッション記録に残す."""
+        engine = self.sync_engine
+        self.position = engine.elapsed_at(at) if engine.is_playing else None
+        if viseme != self._viseme:
+            self.recorder.viseme(self.name, self.position, viseme)
+
+    def _update_browser(self, viseme: Viseme, at: float | None = None) -> None:
+        """ブラウザソースに反映（発話は開始時に予定をまとめて送り、以降は送らない）.
+
+        再生開始時刻のずれは時計（Clock.now）の値で比べ、ページに送るときだけ
+        同じ瞬間に取った実時刻（time.time()）に換算する。
+
+        Args:
+            viseme: 発話していないときの口形状
+            at: フレームの締め切り（時計の値、Noneで現在時刻）
+        """
+        engine = self.sync_engine
+        schedule = engine.schedule
+        if engine.is_playing and schedule is not None:
+            now = self.clock.now()
+            at = now if at is None else at
+            elapsed = engine.elapsed_at(at)
+            if elapsed <= 0:
+                return  # 最初のサンプルが出るまでは開始時刻が決まらない
+            started_at = at - elapsed
+            if (
+                schedule is not self._browser_schedule
+                or abs(started_at - self._browser_started_at) > BROWSER_RESYNC_THRESHOLD
+            ):
+                self._browser_schedule = schedule
+                self._browser_started_at = started_at
+                wall_started_at = time.time() - (now - started_at)
+                self.browser.play(get_transitions(schedule), wall_started_at)
+            return
+
+        if self._browser_schedule is not None:
+            self._browser_schedule = None
+            self.browser.stop(viseme)
+        else:
+            self.browser.set_viseme(viseme)
+
+    def _apply(
+        self,
+        viseme: Viseme,
+        blend: VisemeBlend | None = None,
+        openness: Openness = Openness.NORMAL,
+    ) -> None:
+        """口形状を表示・OBSに反映.
+
+        Args:
+            viseme: 口形状
+            blend: 口形状ブレンド（指定時はウィンドウをブレンド表示）
+            openness: 口の開き具合
+        """
+        # ブレンドできない出力は最大重みの形状に揃える
+        if blend is not None:
+            viseme = blend.primary
+
+        self.window.set_openness(openness)
+        if blend is not None:
+            self.window.set_blend(blend)
+        else:
+            self.window.set_viseme(viseme)
+
+        if self.obs is not None:
+            self.obs.set_viseme(viseme)
+
+    def close(self) -> None:
+        """発話キュー・再生・OBSソースを片付ける（共有リソースは閉じない）."""
+        if self._cancel is not None:
+            self._cancel.cancel()
+        if self.idle is not None:
+            self.idle.stop()
+        self.queue.close()
+        self.sync_engine.stop()
+        if self.browser is not None:
+            self.browser.stop()
+        if self.osc is not None:
+            self.osc.close()
+        if self.obs is not None:
+            self.obs.hide_all()
+            self.obs.disconnect()
+
+    @property
+    def is_mouth_moving(self) -> bool:
+        """再生中、または口が閉じていない（ライブ入力など）か."""
+        return self.sync_engine.is_playing or self._viseme != Viseme.CLOSED
+
+    @property
+    def is_busy(self) -> bool:
+        """再生中または発話待ちがあるか."""
+        return self.sync_engine.is_playing or len(self.queue) > 0
@@ -0,0 +1,265 @@
+"""アイドルアニメーションモジュール.
+
+発話していない間のまばたき・呼吸を、乱数で事前に作った予定表から生成する。
+予定はヒープに時刻順で積み、描画ループは次の予定時刻まで眠れる。
+まばたきは口が動いている間は先送りし、発話の切れ目で行う。
+"""
+
+import heapq
+import itertools
+import math
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from ..config import settings
+from ..output.browser_source import BrowserChannel
+from ..output.obs_websocket import OBSController
+from ..output.pygame_window import PygameWindow
+
+# まばたき中に表示するオーバーレイ（overlay_blink.png / OBSソース {prefix}blink）
+BLINK_OVERLAY = "blink"
+
+# 事前に作るまばたき間隔の数（使い切ったら先頭から繰り返す）
+BLINK_PLAN_SIZE = 64
+
+# 連続まばたき（2回続けて瞬く）の割合
+DOUBLE_BLINK_RATE = 0.15
+
+# 呼吸1周期あたりの段数
+BREATHE_STEPS = 16
+
+
+@dataclass(order=True)
+class Timer:
+    """予定1件."""
+
+    due: float
+    seq: int
+    callback: Callable[[float], None] = field(compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+
+class IdleScheduler:
+    """時刻順のタイマー（ヒープ）.
+
+    描画ループはtimeout()で次の予定までの時間を得て眠り、起きたらrun_due()で
+    期限の来た予定を実行する。予定の追加は描画ループのスレッドから行う。
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        """初期化.
+
+        Args:
+            clock: 時計（秒）
+        """
+        self.clock = clock
+        self._heap: list[Timer] = []
+        self._seq = itertools.count()
+
+    def schedule(self, due: float, callback: Callable[[float], None]) -> Timer:
+        """予定を追加.
+
+        Args:
+            due: 実行する時刻（clockの値）
+            callback: 実行する関数（実行時刻を受け取る）
+
+        Returns:
+            Timer: 追加した予定（cancel()で取り消せる）
+        """
+        timer = Timer(due, next(self._seq), callback)
+        heapq.heappush(self._heap, timer)
+        return timer
+
+    def cancel(self, timer: Timer) -> None:
+        """予定を取り消す（ヒープからは実行時刻に取り除く）."""
+        timer.cancelled = True
+
+    def run_due(self, now: float | None = None) -> int:
+        """期限の来た予定を時刻順に実行.
+
+        Args:
+            now: 現在時刻（デフォルト: clockから取得）
+
+        Returns:
+            int: 実行した予定の数
+        """
+        now = self.clock() if now is None else now
+        count = 0
+        while self._heap and self._heap[0].due <= now:
+            timer = heapq.heappop(self._heap)
+            if not timer.cancelled:
+                timer.callback(now)
+                count += 1
+        return count
+
+    def timeout(self, now: float | None = None) -> float | None:
+        """次の予定までの時間（秒、予定がなければNone）."""
+        while self._heap and self._heap[0].cancelled:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return None
+        now = self.clock() if now is None else now
+        return max(self._heap[0].due - now, 0.0)
+
+    def __len__(self) -> int:
+        return sum(1 for timer in self._heap if not timer.cancelled)
+
+
+class IdleAnimator:
+    """アバター1体のまばたき・呼吸.
+
+    まばたきはoverlay_blink.png（ウィンドウ・ブラウザソース）と {prefix}blink ソース（OBS）の
+    表示で、呼吸はウィンドウの描画位置の上下で表す。どちらも素材がなければ何もしない。
+    """
+
+    def __init__(
+        self,
+        scheduler: IdleScheduler,
+        window: PygameWindow,
+        is_speaking: Callable[[], bool],
+        obs: OBSController | None = None,
+        seed: int | None = None,
+        browser: BrowserChannel | None = None,
+    ):
+        """初期化.
+
+        Args:
+            scheduler: 予定を積むタイマー（アバター間で共有）
+            window: 描画先
+            is_speaking: 口が動いているか（Trueの間はまばたきを先送り）
+            obs: OBS連携（未使用時はNone）
+            seed: 予定表の乱数シード（Noneで毎回異なる）
+            browser: ブラウザソースの配信（未使用時はNone）
+        """
+        self.scheduler = scheduler
+        self.window = window
+        self.is_speaking = is_speaking
+        self.obs = obs
+        self.browser = browser
+        self.blinks = 0  # まばたきした回数
+        self.deferred = 0  # 発話中のため先送りした回数
+
+        rng = random.Random(seed)
+        low, high = settings.idle_blink_interval
+        self._blink_plan = [
+            (rng.uniform(low, high), rng.random() < DOUBLE_BLINK_RATE)
+            for _ in range(BLINK_PLAN_SIZE)
+        ]
+        self._blink_index = rng.randrange(BLINK_PLAN_SIZE)
+        self._breathe_plan = _breathe_plan(
+            settings.idle_breathe_period, settings.idle_breathe_amplitude
+        )
+        self._breathe_index = 0
+        self._deferred_since: float | None = None
+        self._timers: list[Timer] = []
+
+    def start(self, now: float | None = None) -> None:
+        """まばたき・呼吸の予定を開始.
+
+        Args:
+            now: 開始時刻（デフォルト: 時計から取得）
+        """
+        self.stop()
+        now = self.scheduler.clock() if now is None else now
+        self._set_blink(False)
+        self._schedule_blink(now)
+        if self._breathe_plan:
+            self._timers.append(self.scheduler.schedule(now, self._breathe))
+
+    def stop(self) -> None:
+        """予定を取り消し、目を開けて元の位置に戻す."""
+        for timer in self._timers:
+            self.scheduler.cancel(timer)
+        self._timers.clear()
+        self._set_blink(False)
+        self.window.set_offset((0, 0))
+
+    def _schedule(self, due: float, callback: Callable[[float], None]) -> None:
+        self._timers = [timer for timer in self._timers if not timer.cancelled]
+        self._timers.append(self.scheduler.schedule(due, callback))
+
+    def _schedule_blink(self, now: float) -> None:
+        interval, _ = self._blink_plan[self._blink_index]
+        self._schedule(now + interval, self._blink)
+
+    def _blink(self, now: float) -> None:
+        """まばたき開始（口が動いていれば先送り）."""
+        if self.is_speaking():
+            if self._deferred_since is None:
+                self._deferred_since = now
+            # 長い発話の間は先送りし続けず、予定どおり瞬く
+            if now - self._deferred_since < settings.idle_blink_max_defer:
+                self.deferred += 1
+                self._schedule(now + settings.idle_blink_defer, self._blink)
+                return
+        self._deferred_since = None
+
+        _, double = self._blink_plan[self._blink_index]
+        self._blink_index = (self._blink_index + 1) % BLINK_PLAN_SIZE
+        self.blinks += 1
+        self._set_blink(True)
+        self._schedule(now + settings.idle_blink_duration, self._open_eyes(double))
+
+    def _open_eyes(self, double: bool) -> Callable[[float], None]:
+        def open_eyes(now: float) -> None:
+            self._set_blink(False)
+            if double:
+                # 連続まばたきは目を開けてすぐもう一度
+                self._schedule(now + settings.idle_blink_duration, self._blink_again)
+            else:
+                self._schedule_blink(now)
+
+        return open_eyes
+
+    def _blink_again(self, now: float) -> None:
+        self._set_blink(True)
+        self._schedule(now + settings.idle_blink_duration, self._open_eyes(False))
+
+    def _breathe(self, now: float) -> None:
+        """呼吸の次の段へ."""
+        delay, offset = self._breathe_plan[self._breathe_index]
+        self._breathe_index = (self._breathe_index + 1) % len(self._breathe_plan)
+        self.window.set_offset((0, offset))
+        self._schedule(now + delay, self._breathe)
+
+    def _set_blink(self, closed: bool) -> None:
+        if self.window.has_overlay(BLINK_OVERLAY):
+            self.window.set_overlay_visible(BLINK_OVERLAY, closed)
+        if self.obs is not None:
+            self.obs.set_overlay_visible(BLINK_OVERLAY, closed)
+        if self.browser is not None:
+            self.browser.set_overlay(BLINK_OVERLAY, closed)
+
+
+def _breathe_plan(period: float, amplitude: int) -> list[tuple[float, int]]:
+    """呼吸1周期ぶんの（次の段までの時間, 上下のずれ）.
+
+    ずれが変わらない段はまとめるので、振幅が小さいほど予定は少ない。
+
+    Args:
+        period: 周期（秒）
+        amplitude: 振幅（ピクセル、0で無効）
+
+    Returns:
+        list[tuple[float, int]]: 予定表（空なら呼吸しない）
+    """
+    if amplitude <= 0 or period <= 0:
+        return []
+    step = period / BREATHE_STEPS
+    offsets = [
+        round(amplitude * (1 - math.cos(2 * math.pi * i / BREATHE_STEPS)) / 2)
+        for i in range(BREATHE_STEPS)
+    ]
+    plan: list[tuple[float, int]] = []
+    for offset in offsets:
+        if plan and plan[-1][1] == offset:
+            plan[-1] = (plan[-1][0] + step, offset)
+        else:
+            plan.append((step, offset))
+    # 周期の先頭と末尾が同じずれならまとめる
+    if len(plan) > 1 and plan[0][1] == plan[-1][1]:
+        delay, offset = plan.pop()
+        plan[0] = (plan[0][0] + delay, offset)
+    return plan
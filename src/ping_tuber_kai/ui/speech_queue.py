@@ -0,0 +1,329 @@
+"""発話キューモジュール.
+
+チャットが殺到すると、発話できる量より多くのメッセージが届く。
+優先度付きのキューに溜め、満杯なら方針に従って捨て、同じ内容の待機中の発話はまとめる。
+再生中に先頭から数件を先行合成しておき、WAVバッファの保持数・サイズは上限で抑える。
+"""
+
+import bisect
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import IntEnum, StrEnum
+
+from ..config import settings
+from ..player.audio import LatencyStats
+from ..voicevox.cancel import CancelToken
+from ..voicevox.client import VoicevoxCancelledError, VoicevoxClient, VoicevoxError
+from ..voicevox.models import AudioQuery
+
+
+class SpeechPriority(IntEnum):
+    """発話の優先度（大きいほど先に発話）."""
+
+    LOW = 0
+    NORMAL = 1
+    HIGH = 2
+
+
+class DropPolicy(StrEnum):
+    """キューが満杯のときに捨てる発話."""
+
+    OLDEST = "oldest"  # 最も古い発話
+    LOWEST_PRIORITY = "lowest_priority"  # 最も優先度の低い発話（同じなら古い方）
+
+
+class ItemState(StrEnum):
+    """発話の合成状態."""
+
+    PENDING = "pending"  # 未合成
+    SYNTHESIZING = "synthesizing"  # 合成中
+    READY = "ready"  # 合成済み（再生待ち）
+    FAILED = "failed"  # 合成失敗
+
+
+@dataclass(eq=False)
+class SpeechItem:
+    """キュー内の発話."""
+
+    text: str
+    speaker_id: int | None
+    priority: SpeechPriority
+    seq: int  # 投入順の通し番号
+    enqueued_at: float = 0.0  # 投入した時刻（キューの時計の値）
+    state: ItemState = ItemState.PENDING
+    query: AudioQuery | None = None
+    audio: bytes | None = None
+    error: VoicevoxError | None = None
+    stalled: bool = False  # 再生側が合成完了を待ったか
+    cancel: CancelToken = field(default_factory=CancelToken)
+
+    @property
+    def key(self) -> tuple[str, int | None]:
+        """重複判定のキー."""
+        return (self.text, self.speaker_id)
+
+    @property
+    def order(self) -> tuple[int, int]:
+        """発話順のソートキー（優先度の高い順、同じなら投入順）."""
+        return (-self.priority, self.seq)
+
+
+@dataclass
+class QueueMetrics:
+    """発話キューの統計."""
+
+    submitted: int = 0  # 投入された件数（重複を含む）
+    deduplicated: int = 0  # 待機中の発話とまとめた件数
+    dropped: int = 0  # 満杯で捨てた件数
+    spoken: int = 0  # 取り出した件数
+    failed: int = 0  # 合成に失敗した件数
+    prefetch_hits: int = 0  # 取り出し時に合成が済んでいた件数
+    evicted: int = 0  # 先行合成の対象から外れてバッファを解放した件数
+    depth: int = 0  # 現在の待機件数
+    peak_depth: int = 0
+    buffered_bytes: int = 0  # 保持中のWAVの合計サイズ
+    peak_buffered_bytes: int = 0
+    wait: LatencyStats = field(default_factory=LatencyStats)  # 投入→取り出し（秒）
+
+
+class SpeechQueue:
+    """優先度・重複排除・先行合成つきの発話キュー.
+
+    submit()はどのスレッドからでも呼べる。合成はバックグラウンドのスレッドで行い、
+    再生側はpop_ready()で先頭の発話を取り出す（合成が済むまでは取り出さない）。
+    """
+
+    def __init__(
+        self,
+        client: VoicevoxClient,
+        max_depth: int | None = None,
+        policy: DropPolicy | str | None = None,
+        prefetch: int | None = None,
+        max_buffer_bytes: int | None = None,
+        on_ready: Callable[[], None] | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        """初期化.
+
+        Args:
+            client: VOICEVOXクライアント
+            max_depth: 最大待機件数（デフォルト: 設定から取得）
+            policy: 満杯のときに捨てる発話（デフォルト: 設定から取得）
+            prefetch: 先行合成する件数（デフォルト: 設定から取得）
+            max_buffer_bytes: 先行合成したWAVの合計サイズの目安（デフォルト: 設定から取得）
+            on_ready: 発話の合成が済んだ・失敗したときに呼ぶ関数（合成スレッドから呼ばれる）
+            clock: 待ち時間を測る時計（秒）
+
+        Raises:
+            ValueError: 件数が1未満の場合
+        """
+        self.client = client
+        self.max_depth = max_depth if max_depth is not None else settings.speech_queue_depth
+        self.policy = DropPolicy(policy or settings.speech_queue_policy)
+        self.prefetch = prefetch if prefetch is not None else settings.speech_prefetch
+        self.max_buffer_bytes = (
+            max_buffer_bytes if max_buffer_bytes is not None else settings.speech_buffer_bytes
+        )
+        if self.max_depth < 1 or self.prefetch < 1:
+            raise ValueError("max_depth and prefetch must be at least 1")
+
+        self.on_ready = on_ready
+        self.clock = clock
+        self.metrics = QueueMetrics()
+        self._pending: list[SpeechItem] = []  # 発話順に整列
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.prefetch, thread_name_prefix="speech")
+        self._closed = False
+
+    def submit(
+        self,
+        text: str,
+        speaker_id: int | None = None,
+        priority: SpeechPriority = SpeechPriority.NORMAL,
+    ) -> SpeechItem | None:
+        """発話を投入.
+
+        同じテキスト・話者の発話が待機中なら新しく積まずにまとめ、優先度は高い方に揃える。
+
+        Args:
+            text: 発話テキスト
+            speaker_id: 話者ID
+            priority: 優先度
+
+        Returns:
+            SpeechItem | None: 待機中の発話（まとめた場合は既存の発話、捨てた場合はNone）
+        """
+        text = text.strip()
+        if not text:
+            return None
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("SpeechQueue is closed")
+            self.metrics.submitted += 1
+
+            for item in self._pending:
+                if item.key == (text, speaker_id):
+                    self.metrics.deduplicated += 1
+                    if priority > item.priority:
+                        self._pending.remove(item)
+                        item.priority = SpeechPriority(priority)
+                        bisect.insort(self._pending, item, key=lambda i: i.order)
+                        self._schedule_locked()
+                    return item
+
+            self._seq += 1
+            item = SpeechItem(
+                text, speaker_id, SpeechPriority(priority), self._seq, enqueued_at=self.clock()
+            )
+            bisect.insort(self._pending, item, key=lambda i: i.order)
+
+            if len(self._pending) > self.max_depth:
+                victim = self._victim_locked()
+                self._pending.remove(victim)
+                self._release_locked(victim)
+                self.metrics.dropped += 1
+                if victim is item:
+                    self._update_depth_locked()
+                    return None
+
+            self._update_depth_locked()
+            self._schedule_locked()
+            return item
+
+    def pop_ready(self) -> SpeechItem | None:
+        """先頭の発話を取り出す（非ブロッキング）.
+
+        合成に失敗した発話は捨てて次を見る。先頭の合成が済んでいなければ、
+        後ろの発話が済んでいても順序を守って待つ。
+
+        Returns:
+            SpeechItem | None: 合成済みの発話（なければNone）
+        """
+        with self._lock:
+            discarded = False
+            while self._pending:
+                head = self._pending[0]
+                if head.state == ItemState.FAILED:
+                    self._pending.pop(0)
+                    self.metrics.failed += 1
+                    discarded = True
+                    continue
+                if head.state != ItemState.READY:
+                    head.stalled = True
+                    break
+
+                self._pending.pop(0)
+                self.metrics.buffered_bytes -= len(head.audio or b"")
+                self.metrics.spoken += 1
+                self.metrics.prefetch_hits += not head.stalled
+                self.metrics.wait.add(self.clock() - head.enqueued_at)
+                self._update_depth_locked()
+                self._schedule_locked()
+                return head
+
+            if discarded:
+                # 失敗した発話を捨てて空いた枠の合成を始める
+                self._schedule_locked()
+            self._update_depth_locked()
+            return None
+
+    def clear(self) -> None:
+        """待機中の発話をすべて捨てる（合成中のリクエストも中断）."""
+        with self._lock:
+            for item in self._pending:
+                self._release_locked(item)
+            self.metrics.dropped += len(self._pending)
+            self._pending.clear()
+            self._update_depth_locked()
+
+    def close(self) -> None:
+        """キューを閉じる（待機中の発話を捨て、合成スレッドを止める）."""
+        self.clear()
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def pending(self) -> list[SpeechItem]:
+        """待機中の発話（発話順のコピー）.
+
+        Returns:
+            list[SpeechItem]: 待機中の発話
+        """
+        with self._lock:
+            return list(self._pending)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def _victim_locked(self) -> SpeechItem:
+        """満杯のときに捨てる発話."""
+        if self.policy == DropPolicy.OLDEST:
+            return min(self._pending, key=lambda i: i.seq)
+        return min(self._pending, key=lambda i: (i.priority, i.seq))
+
+    def _schedule_locked(self) -> None:
+        """先頭prefetch件を合成し、範囲外になった発話のバッファを解放."""
+        window = self._pending[: self.prefetch]
+        for item in self._pending[self.prefetch :]:
+            if item.state in (ItemState.SYNTHESIZING, ItemState.READY):
+                self._release_locked(item)
+                item.state = ItemState.PENDING
+                item.cancel = CancelToken()
+                self.metrics.evicted += 1
+
+        for index, item in enumerate(window):
+            if item.state != ItemState.PENDING:
+                continue
+            # 先頭は必ず合成する（サイズ上限で詰まらないように）
+            if index > 0 and self.metrics.buffered_bytes >= self.max_buffer_bytes:
+                break
+            item.state = ItemState.SYNTHESIZING
+            self._executor.submit(self._synthesize, item, item.cancel)
+
+    def _synthesize(self, item: SpeechItem, cancel: CancelToken) -> None:
+        """1件を合成（合成スレッド）."""
+        try:
+            query, audio = self.client.speak(item.text, item.speaker_id, cancel=cancel)
+        except VoicevoxCancelledError:
+            return
+        except VoicevoxError as e:
+            with self._lock:
+                if cancel.is_cancelled:
+                    return
+                item.state = ItemState.FAILED
+                item.error = e
+                self._schedule_locked()
+        else:
+            with self._lock:
+                # 合成中に捨てられた・先行合成の対象から外れた発話は破棄
+                if cancel.is_cancelled:
+                    return
+                item.query, item.audio = query, audio
+                item.state = ItemState.READY
+                self.metrics.buffered_bytes += len(audio)
+                self.metrics.peak_buffered_bytes = max(
+                    self.metrics.peak_buffered_bytes, self.metrics.buffered_bytes
+                )
+                self._schedule_locked()
+
+        # 再生側が眠っていれば起こす（失敗した発話もpop_readyで捨てて次へ進めるように）
+        if self.on_ready is not None:
+            self.on_ready()
+
+    def _release_locked(self, item: SpeechItem) -> None:
+        """合成中のリクエストを中断し、保持中のWAVを解放."""
+        item.cancel.cancel()
+        if item.audio is not None:
+            self.metrics.buffered_bytes -= len(item.audio)
+        item.query = None
+        item.audio = None
+
+    def _update_depth_locked(self) -> None:
+        self.metrics.depth = len(self._pending)
+        self.metrics.peak_depth = max(self.metrics.peak_depth, self.metrics.depth)
@@ -0,0 +1,131 @@
+"""起動時ウォームアップモジュール.
+
+VOICEVOXは話者モデルを初回合成時に読み込むため、配信の最初の1行だけ大きく遅れる。
+ウィンドウ生成と並行してバックグラウンドで話者の初期化・短い発話の合成・
+出力デバイスのオープンを済ませ、かかった時間を報告する。
+"""
+
+import threading
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+
+from ..config import settings
+from ..player.audio import AudioPlayer
+from ..voicevox.client import VoicevoxClient
+
+
+@dataclass
+class WarmupReport:
+    """ウォームアップ結果（時間は秒）."""
+
+    speakers: dict[int, float] = field(default_factory=dict)  # 話者ID→初期化時間（済みは0）
+    utterance: float = 0.0  # 短い発話のaudio_query + synthesis
+    audio_device: float = 0.0  # 出力デバイスのオープン〜クローズ
+    total: float = 0.0
+    errors: list[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        """1行の要約.
+
+        Returns:
+            str: 要約文字列
+        """
+        speakers = ", ".join(
+            f"{speaker_id}={'ready' if seconds == 0.0 else f'{seconds:.2f}s'}"
+            for speaker_id, seconds in self.speakers.items()
+        )
+        text = (
+            f"Warm-up finished in {self.total:.2f}s "
+            f"(speakers: {speakers or '-'}; utterance {self.utterance:.2f}s; "
+            f"audio {self.audio_device:.2f}s)"
+        )
+        if self.errors:
+            text += f" with {len(self.errors)} error(s): " + "; ".join(self.errors)
+        return text
+
+
+class Warmup:
+    """バックグラウンドのウォームアップ処理."""
+
+    def __init__(
+        self,
+        client: VoicevoxClient | None,
+        speaker_ids: Sequence[int],
+        player: AudioPlayer | None = None,
+        text: str | None = None,
+    ):
+        """初期化.
+
+        Args:
+            client: VOICEVOXクライアント（Noneなら話者・発話の準備を省略）
+            speaker_ids: 初期化する話者ID（先頭の話者で短い発話を合成）
+            player: 事前に開く出力デバイスのプレイヤー（Noneなら省略）
+            text: ウォームアップ用の発話（デフォルト: 設定から取得）
+        """
+        self.client = client
+        self.speaker_ids = list(dict.fromkeys(speaker_ids))
+        self.player = player
+        self.text = text if text is not None else settings.warmup_text
+        self.report = WarmupReport()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """バックグラウンドで開始（呼び出し元はブロックしない）."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self.run, name="warmup", daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """完了まで待機.
+
+        Args:
+            timeout: 最大待機時間（秒、Noneで無制限）
+
+        Returns:
+            bool: 完了した場合True
+        """
+        if self._thread is None:
+            return True
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def run(self) -> WarmupReport:
+        """ウォームアップを実行（同期）.
+
+        各段階の失敗は報告に記録し、以降の段階は続行する。
+
+        Returns:
+            WarmupReport: 結果
+        """
+        started = time.perf_counter()
+
+        if self.client is not None and self.speaker_ids:
+            try:
+                self.report.speakers = self.client.initialize_speakers(self.speaker_ids)
+            except Exception as e:
+                self.report.errors.append(f"speakers: {e}")
+
+            # 短い発話でテキスト解析・合成経路とクエリキャッシュを温める
+            if self.text:
+                try:
+                    stage = time.perf_counter()
+                    self.client.speak(self.text, self.speaker_ids[0])
+                    self.report.utterance = time.perf_counter() - stage
+                except Exception as e:
+                    self.report.errors.append(f"utterance: {e}")
+
+        if self.player is not None:
+            try:
+                self.report.audio_device = self.player.warm_up()
+            except Exception as e:
+                self.report.errors.append(f"audio: {e}")
+
+        self.report.total = time.perf_counter() - started
+        return self.report
+
+    @property
+    def is_done(self) -> bool:
+        """完了したかどうか（未開始はFalse）."""
+        return self._thread is not None and not self._thread.is_alive()
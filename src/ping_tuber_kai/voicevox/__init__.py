@@ -1,6 +1,21 @@
 """VOICEVOX API クライアントモジュール."""
 
+from .cancel import CancelToken
 from .client import VoicevoxClient
+from .edit import QueryEdit
 from .models import AccentPhrase, AudioQuery, Mora
+from .resilience import CircuitBreaker, RetryPolicy
+from .view import AudioQueryView, parse_query_view
 
-__all__ = ["VoicevoxClient", "AudioQuery", "AccentPhrase", "Mora"]
+__all__ = [
+    "VoicevoxClient",
+    "CancelToken",
+    "QueryEdit",
+    "AudioQuery",
+    "AccentPhrase",
+    "Mora",
+    "AudioQueryView",
+    "parse_query_view",
+    "RetryPolicy",
+    "CircuitBreaker",
+]
@@ -0,0 +1,65 @@
+"""キャンセルトークンモジュール."""
+
+import threading
+from collections.abc import Callable
+
+
+class CancelToken:
+    """発話1件ぶんの処理（合成リクエスト・再生）を中断するためのトークン.
+
+    cancel()はどのスレッドからでも呼べる。登録済みのコールバックは
+    cancel()を呼んだスレッドで1回だけ実行される。
+    """
+
+    def __init__(self):
+        """初期化."""
+        self._event = threading.Event()
+        self._callbacks: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def cancel(self) -> None:
+        """キャンセル（2回目以降は何もしない）."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def add_callback(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """キャンセル時のコールバックを登録（キャンセル済みなら即実行）.
+
+        Args:
+            callback: キャンセル時に呼ぶ関数
+
+        Returns:
+            Callable[[], None]: 登録を解除する関数
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove(callback)
+        callback()
+        return lambda: None
+
+    def _remove(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """キャンセルされるまで待機.
+
+        Args:
+            timeout: 最大待機時間（秒、Noneで無制限）
+
+        Returns:
+            bool: キャンセルされた場合True
+        """
+        return self._event.wait(timeout)
+
+    @property
+    def is_cancelled(self) -> bool:
+        """キャンセル済みかどうか."""
+        return self._event.is_set()
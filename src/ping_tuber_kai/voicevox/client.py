@@ -1,30 +1,152 @@
 """VOICEVOX API クライアント."""
 
+import http.client
+import io
+import socket
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
 import httpx
 
 from ..config import settings
+from .cancel import CancelToken
+from .edit import QueryEdit
 from .models import AudioQuery, Speaker
+from .resilience import (
+    DEFAULT_DEADLINES,
+    RETRY_STATUSES,
+    EngineHealth,
+    RetryPolicy,
+    get_engine_health,
+)
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+CHUNK_SIZE = 65536  # 応答本文を受信する単位（バイト）
+
+T = TypeVar("T")
+R = TypeVar("R")
 
 
 class VoicevoxError(Exception):
     """VOICEVOX APIエラー."""
 
+    def __init__(self, message: str, status_code: int | None = None):
+        """初期化.
+
+        Args:
+            message: エラーメッセージ
+            status_code: HTTPステータス（応答がない場合はNone）
+        """
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class VoicevoxUnavailableError(VoicevoxError):
+    """Engine停止中のためリクエストを送らずに失敗（サーキットブレーカー遮断中）."""
+
+    pass
+
+
+class VoicevoxCancelledError(VoicevoxError):
+    """キャンセルトークンによる中断."""
+
+    pass
+
+
+class VoicevoxResponseError(VoicevoxError):
+    """Engineの応答の内容が不正（zipの破損・WAV数の不一致など）."""
+
     pass
 
 
+class _DeadlineStream(httpx.SyncByteStream):
+    """期限を過ぎたら受信を打ち切る応答本文（次の受信の上限は残り時間に縮める）.
+
+    httpcoreは受信のたびにリクエストのtimeoutの値を参照するので、
+    チャンクごとにreadの上限を書き換える。
+    """
+
+    def __init__(self, stream: httpx.SyncByteStream, deadline: float, path: str, timeouts: dict):
+        """初期化.
+
+        Args:
+            stream: 元の応答本文
+            deadline: 期限（time.monotonic()の値）
+            path: パス（エラーメッセージに使用）
+            timeouts: リクエストのtimeout（extensions["timeout"]）
+        """
+        self._stream = stream
+        self._deadline = deadline
+        self._path = path
+        self._timeouts = timeouts
+
+    def __iter__(self) -> Iterator[bytes]:
+        chunks = iter(self._stream)
+        while True:
+            remaining = self._deadline - time.monotonic()
+            if remaining <= 0:
+                raise httpx.ReadTimeout(f"{self._path} deadline exceeded")
+            self._timeouts["read"] = remaining
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                return
+            yield chunk
+
+    def close(self) -> None:
+        self._stream.close()
+
+
+def _shutdown(sock: socket.socket | None) -> None:
+    """ソケットをshutdown（別スレッドで待機中の受信も失敗して戻る）."""
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
 class VoicevoxClient:
-    """VOICEVOX Engine APIクライアント."""
+    """VOICEVOX Engine APIクライアント.
+
+    各操作は操作ごとの期限内でジッタ付きリトライを行い、
+    Engine単位で共有するサーキットブレーカーが遮断中なら即座に失敗する。
+    """
 
-    def __init__(self, host: str | None = None, timeout: float = 30.0):
+    def __init__(
+        self,
+        host: str | None = None,
+        timeout: float | None = None,
+        deadlines: dict[str, float] | None = None,
+        retry: RetryPolicy | None = None,
+    ):
         """初期化.
 
         Args:
             host: VOICEVOX Engine URL（デフォルト: 設定から取得）
-            timeout: タイムアウト秒数
+            timeout: 全操作共通の期限（秒、指定時は操作ごとの期限より優先）
+            deadlines: 操作名→期限（秒、リトライを含む）の上書き
+            retry: リトライ方針（デフォルト: 設定から取得）
         """
         self.host = host or settings.voicevox_host
         self.timeout = timeout
+        self.deadlines = {**DEFAULT_DEADLINES, **(deadlines or {})}
+        self.retry = retry or RetryPolicy(
+            retries=settings.voicevox_retries, base_delay=settings.voicevox_retry_backoff
+        )
+        self.health: EngineHealth = get_engine_health(self.host)
         self._client: httpx.Client | None = None
+        self._multi_synthesis: bool | None = None  # /multi_synthesis対応（None=未確認）
+        self._cancellable: bool | None = None  # /cancellable_synthesis対応（None=未確認）
+        self._query_cache: OrderedDict[tuple[str, int], AudioQuery] = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        # 操作ごとの所要時間の通知先（操作名, 秒, 成功したか、セッション記録などに使う）
+        self.on_request: Callable[[str, float, bool], None] | None = None
 
     @property
     def client(self) -> httpx.Client:
@@ -45,12 +167,214 @@ class VoicevoxClient:
     def __exit__(self, *args) -> None:
         self.close()
 
-    def audio_query(self, text: str, speaker_id: int | None = None) -> AudioQuery:
+    def deadline(self, operation: str) -> float:
+        """操作の期限（秒）.
+
+        Args:
+            operation: 操作名
+
+        Returns:
+            float: リトライを含む期限
+        """
+        if self.timeout is not None:
+            return self.timeout
+        return self.deadlines.get(operation, DEFAULT_DEADLINES["synthesis"])
+
+    def _request(
+        self,
+        operation: str,
+        method: str,
+        path: str,
+        retry: bool = True,
+        cancel: CancelToken | None = None,
+        **kwargs,
+    ) -> httpx.Response:
+        """期限・リトライ・サーキットブレーカーを適用してリクエスト.
+
+        接続失敗・タイムアウト・5xxは一時的な障害としてブレーカーに記録し、
+        期限内ならジッタ付きで再試行する。4xxは即座に失敗する。
+
+        Args:
+            operation: 操作名（期限とエラーメッセージに使用）
+            method: HTTPメソッド
+            path: パス
+            retry: 再試行するか（冪等な操作のみ）
+            cancel: キャンセルトークン（指定時は送信中のリクエストも中断できる）
+            **kwargs: httpx.Client.requestに渡す引数
+
+        Returns:
+            httpx.Response: 成功した応答
+
+        Raises:
+            VoicevoxCancelledError: キャンセルされた場合
+            VoicevoxUnavailableError: ブレーカー遮断中の場合
+            VoicevoxError: 失敗した場合、または期限を超えた場合
+        """
+        if self.on_request is None:
+            return self._request_with_retry(operation, method, path, retry, cancel, **kwargs)
+
+        started = time.perf_counter()
+        ok = False
+        try:
+            response = self._request_with_retry(operation, method, path, retry, cancel, **kwargs)
+            ok = True
+            return response
+        finally:
+            self.on_request(operation, time.perf_counter() - started, ok)
+
+    def _request_with_retry(
+        self,
+        operation: str,
+        method: str,
+        path: str,
+        retry: bool,
+        cancel: CancelToken | None,
+        **kwargs,
+    ) -> httpx.Response:
+        """_request()の本体（リトライを含む）."""
+        breaker = self.health.breaker
+        deadline = time.monotonic() + self.deadline(operation)
+        attempt = 0
+
+        while True:
+            if cancel is not None and cancel.is_cancelled:
+                raise VoicevoxCancelledError(f"{operation} cancelled")
+            if not breaker.allow():
+                self.health.mark(False)
+                raise VoicevoxUnavailableError(
+                    f"{operation} skipped: engine unavailable "
+                    f"(retry in {breaker.retry_after():.1f}s)"
+                )
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise VoicevoxError(f"{operation} deadline exceeded")
+
+            try:
+                if cancel is None:
+                    response = self._send(method, path, deadline, **kwargs)
+                else:
+                    response = self._send_cancellable(method, path, cancel, deadline, **kwargs)
+            except httpx.RequestError as e:
+                error = VoicevoxError(f"Request failed: {e!r}")
+                error.__cause__ = e
+            else:
+                status = response.status_code
+                if status not in RETRY_STATUSES:
+                    breaker.record_success()
+                    self.health.mark(True)
+                    if response.is_error:
+                        raise VoicevoxError(f"{operation} failed: {status}", status_code=status)
+                    return response
+                error = VoicevoxError(f"{operation} failed: {status}", status_code=status)
+
+            breaker.record_failure()
+            delay = self.retry.delay(attempt)
+            if not retry or attempt >= self.retry.retries or time.monotonic() + delay >= deadline:
+                self.health.mark(False)
+                raise error
+            if cancel is not None:
+                cancel.wait(delay)
+            else:
+                time.sleep(delay)
+            attempt += 1
+
+    def _send(self, method: str, path: str, deadline: float, **kwargs) -> httpx.Response:
+        """1回分のリクエスト（応答本文の受信も期限で打ち切る）.
+
+        httpxのtimeoutは接続・送信・受信の1回ごとの上限なので、少しずつ届く応答は
+        期限を過ぎても受信し続けてしまう。本文はチャンクごとに期限を確かめながら読み、
+        次の受信の上限も残り時間に縮める。
+
+        Args:
+            method: HTTPメソッド
+            path: パス
+            deadline: 期限（time.monotonic()の値）
+            **kwargs: httpx.Client.streamに渡す引数
+
+        Raises:
+            httpx.TimeoutException: 期限を過ぎた場合
+            httpx.TransportError: 通信に失敗した場合
+        """
+        timeout = max(deadline - time.monotonic(), 0.0)
+        with self.client.stream(method, path, timeout=timeout, **kwargs) as response:
+            timeouts = response.request.extensions.get("timeout", {})
+            response.stream = _DeadlineStream(response.stream, deadline, path, timeouts)
+            response.read()
+        return response
+
+    def _send_cancellable(
+        self,
+        method: str,
+        path: str,
+        cancel: CancelToken,
+        deadline: float,
+        params: dict | None = None,
+        content: bytes | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> httpx.Response:
+        """キャンセル可能な1回分のリクエスト.
+
+        httpxの同期APIは送信中のリクエストを別スレッドから中断できないため、
+        ソケットを直接shutdownできるhttp.clientで送る。切断はEngine側にも伝わり、
+        /cancellable_synthesisなら合成処理も打ち切られる。期限は_send()と同じく
+        本文の受信ごとに確かめ、ソケットのタイムアウトを残り時間に縮める。
+
+        Raises:
+            VoicevoxCancelledError: キャンセルされた場合
+            httpx.TimeoutException: 期限を過ぎた場合
+            httpx.TransportError: 通信に失敗した場合
+        """
+        url = httpx.URL(self.host).join(path).copy_merge_params(params or {})
+        connection_cls = (
+            http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+        )
+        timeout = max(deadline - time.monotonic(), 0.0)
+        connection = connection_cls(url.host, url.port, timeout=timeout)
+
+        remove = cancel.add_callback(lambda: _shutdown(connection.sock))
+        try:
+            connection.connect()
+            # 接続中にキャンセルされた場合はabortが空振りしているのでここで確認
+            if cancel.is_cancelled:
+                raise VoicevoxCancelledError(f"{path} cancelled")
+            connection.request(method, url.raw_path.decode(), body=content, headers=headers or {})
+            connection.sock.settimeout(max(deadline - time.monotonic(), 0.0))
+            response = connection.getresponse()
+            chunks = []
+            while chunk := response.read1(CHUNK_SIZE):
+                chunks.append(chunk)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise httpx.ReadTimeout(f"{path} deadline exceeded")
+                connection.sock.settimeout(remaining)
+            return httpx.Response(
+                response.status, headers=response.getheaders(), content=b"".join(chunks)
+            )
+        except (OSError, http.client.HTTPException) as e:
+            if cancel.is_cancelled:
+                raise VoicevoxCancelledError(f"{path} cancelled") from e
+            if isinstance(e, TimeoutError) or time.monotonic() >= deadline:
+                raise httpx.ReadTimeout(f"{path} deadline exceeded") from e
+            raise httpx.TransportError(repr(e)) from e
+        finally:
+            remove()
+            connection.close()
+
+    def audio_query(
+        self,
+        text: str,
+        speaker_id: int | None = None,
+        cancel: CancelToken | None = None,
+    ) -> AudioQuery:
         """音声合成クエリを生成.
 
+        同じテキスト・話者のクエリはLRUキャッシュから複製して返す。
+
         Args:
             text: 合成するテキスト
             speaker_id: 話者ID（デフォルト: 設定から取得）
+            cancel: キャンセルトークン
 
         Returns:
             AudioQuery: 音声合成クエリ
@@ -59,61 +383,429 @@ class VoicevoxClient:
             VoicevoxError: API呼び出しに失敗した場合
         """
         speaker = speaker_id if speaker_id is not None else settings.voicevox_speaker_id
+        key = (text, speaker)
+        with self._query_cache_lock:
+            cached = self._query_cache.get(key)
+            if cached is not None:
+                self._query_cache.move_to_end(key)
+                return cached.model_copy(deep=True)
 
-        try:
-            response = self.client.post(
-                "/audio_query",
-                params={"text": text, "speaker": speaker},
-            )
-            response.raise_for_status()
-            return AudioQuery.model_validate(response.json())
-        except httpx.HTTPStatusError as e:
-            raise VoicevoxError(f"audio_query failed: {e.response.status_code}") from e
-        except httpx.RequestError as e:
-            raise VoicevoxError(f"Request failed: {e}") from e
-
-    def synthesis(self, query: AudioQuery, speaker_id: int | None = None) -> bytes:
+        response = self._request(
+            "audio_query",
+            "POST",
+            "/audio_query",
+            cancel=cancel,
+            params={"text": text, "speaker": speaker},
+        )
+        query = AudioQuery.from_json(response.content)
+
+        if settings.voicevox_query_cache_size > 0:
+            with self._query_cache_lock:
+                self._query_cache[key] = query.model_copy(deep=True)
+                while len(self._query_cache) > settings.voicevox_query_cache_size:
+                    self._query_cache.popitem(last=False)
+        return query
+
+    def synthesis(
+        self,
+        query: AudioQuery,
+        speaker_id: int | None = None,
+        cancel: CancelToken | None = None,
+    ) -> bytes:
         """音声を合成.
 
+        キャンセルトークン指定時は、Engineが対応していれば/cancellable_synthesisを使い、
+        キャンセルで接続を切ってEngine側の合成も打ち切る。
+
         Args:
             query: 音声合成クエリ
             speaker_id: 話者ID（デフォルト: 設定から取得）
+            cancel: キャンセルトークン
 
         Returns:
             bytes: WAV形式の音声データ
 
         Raises:
+            VoicevoxCancelledError: キャンセルされた場合
             VoicevoxError: API呼び出しに失敗した場合
         """
         speaker = speaker_id if speaker_id is not None else settings.voicevox_speaker_id
+        # 未変更のクエリは受け取ったJSONをそのまま送る
+        request = {
+            "params": {"speaker": speaker},
+            "content": query.to_json(),
+            "headers": JSON_HEADERS,
+        }
+
+        if cancel is not None and self._cancellable is not False:
+            try:
+                response = self._request(
+                    "cancellable_synthesis",
+                    "POST",
+                    "/cancellable_synthesis",
+                    cancel=cancel,
+                    **request,
+                )
+                self._cancellable = True
+                return response.content
+            except VoicevoxError as e:
+                # 起動オプションで無効なEngineは404を返す
+                if e.status_code not in (404, 405):
+                    raise
+                self._cancellable = False
+
+        response = self._request("synthesis", "POST", "/synthesis", cancel=cancel, **request)
+        return response.content
+
+    def synthesis_stream(
+        self,
+        query: AudioQuery,
+        speaker_id: int | None = None,
+        cancel: CancelToken | None = None,
+    ) -> Iterator[bytes]:
+        """音声を合成し、受信したバイト列を届いた順に返す.
+
+        応答全体を待たずに返すので、呼び出し側は先頭のチャンクからWAVヘッダを解析して
+        再生を始められる。途中まで受信した応答はやり直せないため再試行はしない。
+        キャンセルすると接続を閉じて受信を打ち切る。synthesisと同じく、受信の完了までを
+        期限で打ち切り、所要時間をon_requestに通知する。
+
+        Args:
+            query: 音声合成クエリ
+            speaker_id: 話者ID（デフォルト: 設定から取得）
+            cancel: キャンセルトークン
+
+        Yields:
+            bytes: 受信したWAVのバイト列
+
+        Raises:
+            VoicevoxCancelledError: キャンセルされた場合
+            VoicevoxUnavailableError: ブレーカー遮断中の場合
+            VoicevoxError: API呼び出しに失敗した場合、または期限を超えた場合
+        """
+        if self.on_request is None:
+            yield from self._synthesis_stream(query, speaker_id, cancel)
+            return
+
+        started = time.perf_counter()
+        ok = False
+        try:
+            yield from self._synthesis_stream(query, speaker_id, cancel)
+            ok = True
+        finally:
+            self.on_request("synthesis", time.perf_counter() - started, ok)
+
+    def _synthesis_stream(
+        self,
+        query: AudioQuery,
+        speaker_id: int | None,
+        cancel: CancelToken | None,
+    ) -> Iterator[bytes]:
+        """synthesis_stream()の本体."""
+        speaker = speaker_id if speaker_id is not None else settings.voicevox_speaker_id
+        breaker = self.health.breaker
+        deadline = time.monotonic() + self.deadline("synthesis")
+        if not breaker.allow():
+            self.health.mark(False)
+            raise VoicevoxUnavailableError(
+                f"synthesis skipped: engine unavailable (retry in {breaker.retry_after():.1f}s)"
+            )
 
         try:
-            response = self.client.post(
+            with self.client.stream(
+                "POST",
                 "/synthesis",
                 params={"speaker": speaker},
-                json=query.model_dump(by_alias=True),
-            )
-            response.raise_for_status()
-            return response.content
-        except httpx.HTTPStatusError as e:
-            raise VoicevoxError(f"synthesis failed: {e.response.status_code}") from e
-        except httpx.RequestError as e:
-            raise VoicevoxError(f"Request failed: {e}") from e
-
-    def speak(self, text: str, speaker_id: int | None = None) -> tuple[AudioQuery, bytes]:
+                content=query.to_json(),
+                headers=JSON_HEADERS,
+                timeout=max(deadline - time.monotonic(), 0.0),
+            ) as response:
+                status = response.status_code
+                if status in RETRY_STATUSES:
+                    breaker.record_failure()
+                    self.health.mark(False)
+                    raise VoicevoxError(f"synthesis failed: {status}", status_code=status)
+                breaker.record_success()
+                self.health.mark(True)
+                if response.is_error:
+                    raise VoicevoxError(f"synthesis failed: {status}", status_code=status)
+
+                timeouts = response.request.extensions.get("timeout", {})
+                response.stream = _DeadlineStream(response.stream, deadline, "/synthesis", timeouts)
+                remove = cancel.add_callback(response.close) if cancel is not None else None
+                try:
+                    # チャンクサイズを指定すると揃うまで溜められるので受信した単位で返す
+                    for chunk in response.iter_bytes():
+                        if cancel is not None and cancel.is_cancelled:
+                            break
+                        yield chunk
+                finally:
+                    if remove is not None:
+                        remove()
+        except (httpx.RequestError, httpx.StreamError) as e:
+            if cancel is not None and cancel.is_cancelled:
+                raise VoicevoxCancelledError("synthesis cancelled") from e
+            breaker.record_failure()
+            self.health.mark(False)
+            raise VoicevoxError(f"Request failed: {e!r}") from e
+        if cancel is not None and cancel.is_cancelled:
+            raise VoicevoxCancelledError("synthesis cancelled")
+
+    def speak(
+        self,
+        text: str,
+        speaker_id: int | None = None,
+        cancel: CancelToken | None = None,
+    ) -> tuple[AudioQuery, bytes]:
         """テキストから音声を合成（audio_query + synthesis）.
 
         Args:
             text: 合成するテキスト
             speaker_id: 話者ID（デフォルト: 設定から取得）
+            cancel: キャンセルトークン
 
         Returns:
             tuple[AudioQuery, bytes]: (音声クエリ, WAV音声データ)
+
+        Raises:
+            VoicevoxCancelledError: キャンセルされた場合
         """
-        query = self.audio_query(text, speaker_id)
-        audio = self.synthesis(query, speaker_id)
+        query = self.audio_query(text, speaker_id, cancel)
+        audio = self.synthesis(query, speaker_id, cancel)
         return query, audio
 
+    def _map_concurrent(
+        self,
+        func: Callable[[T], R],
+        items: Sequence[T],
+        max_concurrency: int | None,
+    ) -> list[R]:
+        """同時接続数を制限して並行実行（結果は入力順）."""
+        workers = min(max_concurrency or settings.voicevox_max_concurrency, len(items))
+        if workers <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(func, items))
+
+    def audio_queries(
+        self,
+        texts: Sequence[str],
+        speaker_id: int | None = None,
+        max_concurrency: int | None = None,
+    ) -> list[AudioQuery]:
+        """複数テキストの音声合成クエリを並行して生成.
+
+        Args:
+            texts: 合成するテキストのリスト
+            speaker_id: 話者ID（デフォルト: 設定から取得）
+            max_concurrency: 最大同時接続数（デフォルト: 設定から取得）
+
+        Returns:
+            list[AudioQuery]: textsと同じ順の音声合成クエリ
+
+        Raises:
+            VoicevoxError: API呼び出しに失敗した場合
+        """
+        return self._map_concurrent(
+            lambda text: self.audio_query(text, speaker_id), texts, max_concurrency
+        )
+
+    def multi_synthesis(
+        self,
+        queries: Sequence[AudioQuery],
+        speaker_id: int | None = None,
+    ) -> list[bytes]:
+        """複数クエリを1リクエストで合成（/multi_synthesis）.
+
+        Args:
+            queries: 音声合成クエリのリスト
+            speaker_id: 話者ID（デフォルト: 設定から取得）
+
+        Returns:
+            list[bytes]: queriesと同じ順のWAV音声データ
+
+        Raises:
+            VoicevoxResponseError: 応答のzipが不正、またはWAV数が一致しない場合
+            VoicevoxError: API呼び出しに失敗した場合
+        """
+        speaker = speaker_id if speaker_id is not None else settings.voicevox_speaker_id
+
+        try:
+            response = self._request(
+                "multi_synthesis",
+                "POST",
+                "/multi_synthesis",
+                params={"speaker": speaker},
+                content=b"[" + b",".join(query.to_json() for query in queries) + b"]",
+                headers=JSON_HEADERS,
+            )
+            # Engineは 001.wav, 002.wav, ... の順でzipに格納する
+            with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+                names = sorted(name for name in archive.namelist() if name.endswith(".wav"))
+                wavs = [archive.read(name) for name in names]
+        except VoicevoxError as e:
+            if e.status_code in (404, 405):
+                self._multi_synthesis = False
+            raise
+        except zipfile.BadZipFile as e:
+            raise VoicevoxResponseError(f"multi_synthesis returned invalid zip: {e}") from e
+
+        if len(wavs) != len(queries):
+            raise VoicevoxResponseError(
+                f"multi_synthesis returned {len(wavs)} of {len(queries)} wavs"
+            )
+        self._multi_synthesis = True
+        return wavs
+
+    def synthesize_many(
+        self,
+        queries: Sequence[AudioQuery],
+        speaker_id: int | None = None,
+        max_concurrency: int | None = None,
+    ) -> list[bytes]:
+        """複数クエリを一括合成.
+
+        Engineが/multi_synthesisに対応していれば1リクエストで合成し、非対応（404・405）
+        または応答が不正な場合は、同時接続数を制限したsynthesisの並行呼び出しに
+        フォールバックする。Engineの障害（5xx・期限切れ・遮断中）ではフォールバックせずに
+        失敗する（障害中のEngineにN件のリクエストを重ねないため）。
+
+        Args:
+            queries: 音声合成クエリのリスト
+            speaker_id: 話者ID（デフォルト: 設定から取得）
+            max_concurrency: フォールバック時の最大同時接続数（デフォルト: 設定から取得）
+
+        Returns:
+            list[bytes]: queriesと同じ順のWAV音声データ
+
+        Raises:
+            VoicevoxError: API呼び出しに失敗した場合
+        """
+        if len(queries) > 1 and self._multi_synthesis is not False:
+            try:
+                return self.multi_synthesis(queries, speaker_id)
+            except VoicevoxResponseError:
+                pass
+            except VoicevoxError as e:
+                if e.status_code not in (404, 405):
+                    raise
+
+        return self._map_concurrent(
+            lambda query: self.synthesis(query, speaker_id), queries, max_concurrency
+        )
+
+    def speak_many(
+        self,
+        texts: Sequence[str],
+        speaker_id: int | None = None,
+        max_concurrency: int | None = None,
+    ) -> list[tuple[AudioQuery, bytes]]:
+        """複数テキストを一括合成（audio_queries + synthesize_many）.
+
+        結果はそのままSyncEngine.prepareに渡せる。
+
+        Args:
+            texts: 合成するテキストのリスト
+            speaker_id: 話者ID（デフォルト: 設定から取得）
+            max_concurrency: 最大同時接続数（デフォルト: 設定から取得）
+
+        Returns:
+            list[tuple[AudioQuery, bytes]]: textsと同じ順の(音声クエリ, WAV音声データ)
+        """
+        queries = self.audio_queries(texts, speaker_id, max_concurrency)
+        wavs = self.synthesize_many(queries, speaker_id, max_concurrency)
+        return list(zip(queries, wavs, strict=True))
+
+    def resynthesize(
+        self,
+        query: AudioQuery,
+        edit: QueryEdit,
+        speaker_id: int | None = None,
+    ) -> tuple[AudioQuery, bytes]:
+        """キャッシュ済みAudioQueryを編集して再合成（synthesisのみ呼び出す）.
+
+        Args:
+            query: 以前のaudio_queryの結果
+            edit: 話速・無音・ポーズ・モーラ長の編集内容
+            speaker_id: 話者ID（デフォルト: 設定から取得）
+
+        Returns:
+            tuple[AudioQuery, bytes]: (編集後の音声クエリ, WAV音声データ)
+
+        Raises:
+            ValueError: 編集内容が不正な場合
+            VoicevoxError: API呼び出しに失敗した場合
+        """
+        edited = edit.apply(query)
+        audio = self.synthesis(edited, speaker_id)
+        return edited, audio
+
+    def is_initialized_speaker(self, speaker_id: int) -> bool:
+        """話者のモデルが読み込み済みか確認.
+
+        Args:
+            speaker_id: 話者ID
+
+        Returns:
+            bool: 初期化済みの場合True
+
+        Raises:
+            VoicevoxError: API呼び出しに失敗した場合
+        """
+        response = self._request(
+            "is_initialized_speaker",
+            "GET",
+            "/is_initialized_speaker",
+            params={"speaker": speaker_id},
+        )
+        return bool(response.json())
+
+    def initialize_speaker(self, speaker_id: int, skip_reinit: bool = True) -> None:
+        """話者のモデルを読み込む（初回合成の遅延を前倒し）.
+
+        Args:
+            speaker_id: 話者ID
+            skip_reinit: 初期化済みなら何もしない
+
+        Raises:
+            VoicevoxError: API呼び出しに失敗した場合
+        """
+        self._request(
+            "initialize_speaker",
+            "POST",
+            "/initialize_speaker",
+            retry=skip_reinit,  # 再初期化を伴う呼び出しは冪等でない
+            params={"speaker": speaker_id, "skip_reinit": str(skip_reinit).lower()},
+        )
+
+    def initialize_speakers(
+        self,
+        speaker_ids: Sequence[int],
+        max_concurrency: int | None = None,
+    ) -> dict[int, float]:
+        """未初期化の話者だけ並行して初期化.
+
+        Args:
+            speaker_ids: 話者IDのリスト
+            max_concurrency: 最大同時接続数（デフォルト: 設定から取得）
+
+        Returns:
+            dict[int, float]: 話者ID→初期化にかかった時間（秒、初期化済みは0.0）
+
+        Raises:
+            VoicevoxError: API呼び出しに失敗した場合
+        """
+
+        def initialize(speaker_id: int) -> float:
+            if self.is_initialized_speaker(speaker_id):
+                return 0.0
+            started = time.perf_counter()
+            self.initialize_speaker(speaker_id)
+            return time.perf_counter() - started
+
+        ids = list(dict.fromkeys(speaker_ids))
+        return dict(zip(ids, self._map_concurrent(initialize, ids, max_concurrency), strict=True))
+
     def get_speakers(self) -> list[Speaker]:
         """話者一覧を取得.
 
@@ -123,23 +815,25 @@ class VoicevoxClient:
         Raises:
             VoicevoxError: API呼び出しに失敗した場合
         """
-        try:
-            response = self.client.get("/speakers")
-            response.raise_for_status()
-            return [Speaker.model_validate(s) for s in response.json()]
-        except httpx.HTTPStatusError as e:
-            raise VoicevoxError(f"get_speakers failed: {e.response.status_code}") from e
-        except httpx.RequestError as e:
-            raise VoicevoxError(f"Request failed: {e}") from e
+        response = self._request("get_speakers", "GET", "/speakers")
+        return [Speaker.model_validate(s) for s in response.json()]
 
     def is_available(self) -> bool:
         """VOICEVOX Engineが利用可能か確認.
 
+        同じEngineを使うクライアント間で共有した確認結果が有効期限内なら、
+        リクエストを送らずにそれを返す。ブレーカー遮断中もリクエストを送らない。
+
         Returns:
             bool: 利用可能な場合True
         """
+        cached = self.health.cached()
+        if cached is not None:
+            return cached
+
         try:
-            response = self.client.get("/version")
-            return response.status_code == 200
-        except httpx.RequestError:
+            self._request("health", "GET", "/version", retry=False)
+            return True
+        except VoicevoxError:
+            self.health.mark(False)
             return False
@@ -0,0 +1,90 @@
+"""AudioQuery編集モジュール.
+
+キャッシュ済みのAudioQueryに話速・無音・ポーズ・モーラ長の変更を適用する。
+audio_queryを呼び直さず、synthesisだけで再合成できる。
+"""
+
+from dataclasses import dataclass, field
+
+from .models import AccentPhrase, AudioQuery, Mora
+
+
+@dataclass
+class QueryEdit:
+    """AudioQueryへの編集内容（Noneの項目は変更しない）."""
+
+    speed_scale: float | None = None  # 話速
+    pre_phoneme_length: float | None = None  # 開始無音（秒）
+    post_phoneme_length: float | None = None  # 終了無音（秒）
+    pause_length: float | None = None  # ポーズ長（秒）
+    pause_length_scale: float | None = None  # ポーズ長の倍率
+    mora_lengths: dict[int, float] = field(default_factory=dict)  # モーラ番号→新しい長さ（秒）
+
+    def apply(self, query: AudioQuery) -> AudioQuery:
+        """編集を適用したAudioQueryを作成（元のクエリは変更しない）.
+
+        モーラ番号はポーズを除く全アクセント句を通した通し番号。
+        子音と母音の長さは比率を保ったまま指定の長さに伸縮する。
+
+        Args:
+            query: 編集元のAudioQuery
+
+        Returns:
+            AudioQuery: 編集後のAudioQuery
+
+        Raises:
+            ValueError: 長さや倍率が不正、またはモーラ番号が範囲外の場合
+        """
+        updates = {
+            name: value
+            for name, value in (
+                ("speed_scale", self.speed_scale),
+                ("pre_phoneme_length", self.pre_phoneme_length),
+                ("post_phoneme_length", self.post_phoneme_length),
+                ("pause_length", self.pause_length),
+                ("pause_length_scale", self.pause_length_scale),
+            )
+            if value is not None
+        }
+        if updates.get("speed_scale", 1.0) <= 0:
+            raise ValueError(f"speed_scale must be positive: {self.speed_scale}")
+        if any(value < 0 for value in updates.values()):
+            raise ValueError(f"lengths must not be negative: {updates}")
+
+        if self.mora_lengths:
+            updates["accent_phrases"] = self._retime(query)
+
+        # updateを指定した複製は保持しているJSONを使わない
+        return query.model_copy(update=updates, deep=True)
+
+    def _retime(self, query: AudioQuery) -> tuple[AccentPhrase, ...]:
+        """モーラ長を変更したアクセント句（モーラは変更できないので作り直す）."""
+        count = sum(len(phrase.moras) for phrase in query.accent_phrases)
+        for index, length in self.mora_lengths.items():
+            if not 0 <= index < count:
+                raise ValueError(f"mora index out of range: {index}")
+            if length <= 0:
+                raise ValueError(f"mora length must be positive: {length}")
+
+        phrases = []
+        index = 0
+        for phrase in query.accent_phrases:
+            moras = []
+            for mora in phrase.moras:
+                length = self.mora_lengths.get(index)
+                moras.append(mora if length is None else _resize(mora, length))
+                index += 1
+            phrases.append(phrase.model_copy(update={"moras": tuple(moras)}))
+        return tuple(phrases)
+
+
+def _resize(mora: Mora, length: float) -> Mora:
+    """子音と母音の長さの比率を保ったまま、指定の長さに伸縮したモーラ."""
+    ratio = length / mora.total_length if mora.total_length > 0 else 1.0
+    consonant_length = None if mora.consonant_length is None else mora.consonant_length * ratio
+    return mora.model_copy(
+        update={
+            "consonant_length": consonant_length,
+            "vowel_length": length - (consonant_length or 0.0),
+        }
+    )
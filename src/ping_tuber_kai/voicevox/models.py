@@ -1,10 +1,17 @@
 """VOICEVOX API Pydanticモデル定義."""
 
-from pydantic import BaseModel, Field
+from typing import Any
+
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class Mora(BaseModel):
-    """モーラ（音素単位）."""
+    """モーラ（音素単位、変更不可）.
+
+    書き換えはmodel_copy(update=...)で新しいモーラを作る（QueryEditを参照）。
+    """
+
+    model_config = {"frozen": True}
 
     text: str = Field(description="表示用テキスト（カタカナ）")
     consonant: str | None = Field(default=None, description="子音")
@@ -26,9 +33,11 @@ class Mora(BaseModel):
 
 
 class AccentPhrase(BaseModel):
-    """アクセント句."""
+    """アクセント句（変更不可）."""
 
-    moras: list[Mora] = Field(description="モーラのリスト")
+    model_config = {"frozen": True}
+
+    moras: tuple[Mora, ...] = Field(description="モーラのリスト")
     accent: int = Field(description="アクセント位置")
     pause_mora: Mora | None = Field(default=None, description="ポーズモーラ")
     is_interrogative: bool = Field(default=False, description="疑問文かどうか")
@@ -37,7 +46,7 @@ class AccentPhrase(BaseModel):
 class AudioQuery(BaseModel):
     """音声合成クエリ."""
 
-    accent_phrases: list[AccentPhrase] = Field(description="アクセント句のリスト")
+    accent_phrases: tuple[AccentPhrase, ...] = Field(description="アクセント句のリスト")
     speed_scale: float = Field(default=1.0, alias="speedScale", description="話速")
     pitch_scale: float = Field(default=0.0, alias="pitchScale", description="音高")
     intonation_scale: float = Field(default=1.0, alias="intonationScale", description="抑揚")
@@ -48,6 +57,12 @@ class AudioQuery(BaseModel):
     post_phoneme_length: float = Field(
         default=0.1, alias="postPhonemeLength", description="終了無音"
     )
+    pause_length: float | None = Field(
+        default=None, alias="pauseLength", description="句読点のポーズ長（秒、Noneで自動）"
+    )
+    pause_length_scale: float = Field(
+        default=1.0, alias="pauseLengthScale", description="ポーズ長の倍率"
+    )
     output_sampling_rate: int = Field(
         default=24000, alias="outputSamplingRate", description="サンプリングレート"
     )
@@ -56,6 +71,65 @@ class AudioQuery(BaseModel):
 
     model_config = {"populate_by_name": True}
 
+    # Engineから受け取ったJSON（未変更ならsynthesisへそのまま転送する）
+    _raw_json: bytes | None = PrivateAttr(default=None)
+
+    @classmethod
+    def from_json(cls, data: bytes) -> "AudioQuery":
+        """JSONバイト列から直接検証して生成（元のバイト列を保持）.
+
+        dictを経由せずmodel_validate_jsonで検証する。
+
+        Args:
+            data: AudioQueryのJSON
+
+        Returns:
+            AudioQuery: 音声合成クエリ
+        """
+        query = cls.model_validate_json(data)
+        query._raw_json = bytes(data)
+        return query
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        # フィールドを書き換えたら保持しているJSONは使えない
+        if name in type(self).model_fields:
+            self.discard_raw_json()
+
+    def model_copy(
+        self, *, update: dict[str, Any] | None = None, deep: bool = False
+    ) -> "AudioQuery":
+        """複製（updateでフィールドを書き換えた場合は保持しているJSONを使わない）.
+
+        model_copyのupdateは__setattr__を通らないため、ここで破棄する。
+        """
+        copied = super().model_copy(update=update, deep=deep)
+        if update:
+            copied.discard_raw_json()
+        return copied
+
+    def discard_raw_json(self) -> None:
+        """保持しているJSONを破棄（以後はシリアライズ結果を送る）."""
+        super().__setattr__("_raw_json", None)
+
+    def to_json(self) -> bytes:
+        """synthesisに送るJSONバイト列.
+
+        Returns:
+            bytes: 未変更なら受け取ったJSON、変更済みならシリアライズ結果
+        """
+        if self._raw_json is not None:
+            return self._raw_json
+        return self.model_dump_json(by_alias=True).encode()
+
+    @property
+    def has_raw_json(self) -> bool:
+        """受け取ったJSONをそのまま転送できるか.
+
+        アクセント句・モーラは変更できないため、クエリ自身のフィールドを書き換えるまでTrue。
+        """
+        return self._raw_json is not None
+
 
 class Speaker(BaseModel):
     """話者情報."""
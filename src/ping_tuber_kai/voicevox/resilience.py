@@ -0,0 +1,192 @@
+"""VOICEVOX Engine呼び出しの耐障害性モジュール.
+
+操作ごとの期限、ジッタ付きリトライ、サーキットブレーカー、
+Engine（ホスト）単位で共有するヘルス状態を提供する。
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import StrEnum
+
+from ..config import settings
+
+# 操作ごとの期限（秒、リトライを含む全体の上限）
+DEFAULT_DEADLINES: dict[str, float] = {
+    "audio_query": 10.0,
+    "synthesis": 30.0,
+    "multi_synthesis": 60.0,
+    "cancellable_synthesis": 30.0,
+    "initialize_speaker": 60.0,
+    "is_initialized_speaker": 5.0,
+    "get_speakers": 10.0,
+    "health": 1.0,
+}
+
+# リトライ対象のHTTPステータス（Engineの一時的な障害）
+RETRY_STATUSES = frozenset({500, 502, 503, 504})
+
+
+class BreakerState(StrEnum):
+    """サーキットブレーカーの状態."""
+
+    CLOSED = "closed"  # 通常
+    OPEN = "open"  # 遮断中（即座に失敗）
+    HALF_OPEN = "half_open"  # 試行1件だけ通す
+
+
+@dataclass
+class RetryPolicy:
+    """ジッタ付き指数バックオフのリトライ方針."""
+
+    retries: int = 2  # 初回以外の最大試行回数
+    base_delay: float = 0.1  # 初回リトライの最大待機（秒）
+    max_delay: float = 1.0  # 待機の上限（秒）
+
+    def delay(self, attempt: int) -> float:
+        """attempt回目の失敗後の待機時間（Full Jitter）.
+
+        Args:
+            attempt: 失敗した試行の番号（0始まり）
+
+        Returns:
+            float: 待機時間（秒）
+        """
+        return random.uniform(0.0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+class CircuitBreaker:
+    """連続失敗でEngineへの呼び出しを一定時間遮断する."""
+
+    def __init__(self, threshold: int | None = None, reset_timeout: float | None = None):
+        """初期化.
+
+        Args:
+            threshold: 遮断するまでの連続失敗回数（デフォルト: 設定から取得）
+            reset_timeout: 遮断後、試行を再開するまでの時間（秒、デフォルト: 設定から取得）
+        """
+        self.threshold = threshold or settings.voicevox_breaker_threshold
+        self.reset_timeout = (
+            reset_timeout if reset_timeout is not None else settings.voicevox_breaker_reset
+        )
+        self._state = BreakerState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> BreakerState:
+        """現在の状態（遮断時間が過ぎていれば半開）."""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> BreakerState:
+        # 遮断時間経過で半開。結果が記録されないまま放置された試行も同じ時間で解放する
+        if self._state != BreakerState.CLOSED and (
+            time.monotonic() - self._opened_at >= self.reset_timeout
+        ):
+            self._state = BreakerState.HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def allow(self) -> bool:
+        """呼び出してよいか（半開時は試行1件のみ許可）.
+
+        Returns:
+            bool: 許可する場合True
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == BreakerState.CLOSED:
+                return True
+            if state == BreakerState.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """成功を記録（遮断を解除）."""
+        with self._lock:
+            self._state = BreakerState.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """失敗を記録（閾値到達・半開中の失敗で遮断）."""
+        with self._lock:
+            self._failures += 1
+            if self._state == BreakerState.HALF_OPEN or self._failures >= self.threshold:
+                self._state = BreakerState.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def retry_after(self) -> float:
+        """遮断が解除されるまでの残り時間（秒、遮断中でなければ0）."""
+        with self._lock:
+            if self._current_state() != BreakerState.OPEN:
+                return 0.0
+            return max(self.reset_timeout - (time.monotonic() - self._opened_at), 0.0)
+
+
+@dataclass
+class EngineHealth:
+    """Engine単位で共有するヘルス状態."""
+
+    breaker: CircuitBreaker = field(default_factory=CircuitBreaker)
+    available: bool | None = None  # 最後に確認した状態（None=未確認）
+    checked_at: float = 0.0  # 最終確認時刻（monotonic）
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def mark(self, available: bool) -> None:
+        """確認結果を記録.
+
+        Args:
+            available: 利用可能か
+        """
+        with self._lock:
+            self.available = available
+            self.checked_at = time.monotonic()
+
+    def cached(self, ttl: float | None = None) -> bool | None:
+        """有効期限内の確認結果.
+
+        Args:
+            ttl: 有効期限（秒、デフォルト: 設定から取得）
+
+        Returns:
+            bool | None: 期限内ならその結果、期限切れ・未確認ならNone
+        """
+        ttl = settings.voicevox_health_ttl if ttl is None else ttl
+        with self._lock:
+            if self.available is None or time.monotonic() - self.checked_at > ttl:
+                return None
+            return self.available
+
+
+_engines: dict[str, EngineHealth] = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine_health(host: str) -> EngineHealth:
+    """ホストごとの共有ヘルス状態を取得（同じEngineを使うクライアント間で共有）.
+
+    Args:
+        host: VOICEVOX Engine URL
+
+    Returns:
+        EngineHealth: 共有ヘルス状態
+    """
+    key = host.rstrip("/")
+    with _engines_lock:
+        if key not in _engines:
+            _engines[key] = EngineHealth()
+        return _engines[key]
+
+
+def reset_engine_health() -> None:
+    """共有ヘルス状態をすべて破棄."""
+    with _engines_lock:
+        _engines.clear()
@@ -0,0 +1,136 @@
+"""AudioQueryの軽量ビュー.
+
+タイムライン抽出に必要なフィールドだけをJSONのパース結果から直接取り出す。
+Pydanticの検証を通さないため、Engineの応答をそのまま信頼できる場面でのみ使う。
+"""
+
+from dataclasses import dataclass
+
+from pydantic_core import from_json
+
+from .models import AudioQuery, Mora
+
+
+@dataclass(slots=True)
+class MoraView:
+    """モーラの軽量ビュー."""
+
+    consonant: str | None
+    consonant_length: float | None
+    vowel: str
+    vowel_length: float
+    pitch: float
+
+    @property
+    def total_length(self) -> float:
+        """モーラの総長さ（秒）."""
+        return (self.consonant_length or 0.0) + self.vowel_length
+
+    @property
+    def is_voiced_vowel(self) -> bool:
+        """有声母音かどうか（小文字=有声、大文字=無声）."""
+        return self.vowel.islower() or self.vowel == "N"
+
+
+@dataclass(slots=True)
+class AccentPhraseView:
+    """アクセント句の軽量ビュー."""
+
+    moras: list[MoraView]
+    pause_mora: MoraView | None
+
+
+@dataclass(slots=True)
+class AudioQueryView:
+    """AudioQueryの軽量ビュー（タイミングと音量のみ）."""
+
+    accent_phrases: list[AccentPhraseView]
+    speed_scale: float = 1.0
+    volume_scale: float = 1.0
+    pre_phoneme_length: float = 0.1
+    post_phoneme_length: float = 0.1
+    pause_length: float | None = None
+    pause_length_scale: float = 1.0
+
+    @classmethod
+    def from_query(cls, query: AudioQuery) -> "AudioQueryView":
+        """検証済みAudioQueryから作成.
+
+        Args:
+            query: VOICEVOX AudioQuery
+
+        Returns:
+            AudioQueryView: 軽量ビュー
+        """
+        return cls(
+            accent_phrases=[
+                AccentPhraseView(
+                    moras=[_mora_from_model(mora) for mora in phrase.moras],
+                    pause_mora=_mora_from_model(phrase.pause_mora) if phrase.pause_mora else None,
+                )
+                for phrase in query.accent_phrases
+            ],
+            speed_scale=query.speed_scale,
+            volume_scale=query.volume_scale,
+            pre_phoneme_length=query.pre_phoneme_length,
+            post_phoneme_length=query.post_phoneme_length,
+            pause_length=query.pause_length,
+            pause_length_scale=query.pause_length_scale,
+        )
+
+
+# タイムライン抽出が受け付けるクエリ
+QueryLike = AudioQuery | AudioQueryView
+
+
+def _mora_from_model(mora: Mora) -> MoraView:
+    return MoraView(
+        mora.consonant, mora.consonant_length, mora.vowel, mora.vowel_length, mora.pitch
+    )
+
+
+def _mora(data: dict) -> MoraView:
+    return MoraView(
+        data.get("consonant"),
+        data.get("consonant_length"),
+        data["vowel"],
+        float(data["vowel_length"]),
+        float(data["pitch"]),
+    )
+
+
+def parse_query_view(data: bytes | str) -> AudioQueryView:
+    """AudioQueryのJSONから軽量ビューを作成.
+
+    Args:
+        data: AudioQueryのJSON
+
+    Returns:
+        AudioQueryView: 軽量ビュー
+
+    Raises:
+        ValueError: JSONが不正、または必須フィールドがない場合
+    """
+    try:
+        # pydantic-coreのJSONパーサはjson.loadsより速い
+        raw = from_json(data)
+        phrases = [
+            AccentPhraseView(
+                moras=[_mora(mora) for mora in phrase["moras"]],
+                pause_mora=_mora(phrase["pause_mora"]) if phrase.get("pause_mora") else None,
+            )
+            for phrase in raw["accent_phrases"]
+        ]
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"invalid AudioQuery JSON: {e!r}") from e
+
+    pause_length = raw.get("pauseLength")
+    return AudioQueryView(
+        accent_phrases=phrases,
+        speed_scale=float(raw.get("speedScale", 1.0)),
+        volume_scale=float(raw.get("volumeScale", 1.0)),
+        pre_phoneme_length=float(raw.get("prePhonemeLength", 0.1)),
+        post_phoneme_length=float(raw.get("postPhonemeLength", 0.1)),
+        pause_length=None if pause_length is None else float(pause_length),
+        pause_length_scale=float(raw.get("pauseLengthScale", 1.0)),
+    )
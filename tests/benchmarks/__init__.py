@@ -0,0 +1,8 @@
+"""マイクロベンチマーク（性能の退行検出）.
+
+リップシンクと再生のホットパスを合成コーパスで計測し、リポジトリに置いた基準値
+（baseline.json）と比べる。通常のテスト（pytest）では計測しない。
+
+    uv run python -m tests.benchmarks          # 基準値と比較（閾値を超えて遅くなったら終了コード1）
+    uv run python -m tests.benchmarks --save   # 基準値を更新
+"""
@@ -0,0 +1,88 @@
+"""マイクロベンチマークの実行と基準値との比較.
+
+使い方:
+    uv run python -m tests.benchmarks
+    uv run python -m tests.benchmarks -k create_mouth_schedule --threshold 0.1
+    uv run python -m tests.benchmarks --absolute    # 基準値と同じマシンで比べる場合
+    uv run python -m tests.benchmarks --save        # 基準値を更新
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from .suite import BASELINE, Results, confirm, run, select
+
+
+def main() -> None:
+    """メイン関数."""
+    parser = argparse.ArgumentParser(
+        prog="python -m tests.benchmarks", description="マイクロベンチマークの退行検出"
+    )
+    parser.add_argument("-k", dest="pattern", default=None, help="名前にこれを含むケースだけ実行")
+    parser.add_argument("--baseline", type=Path, default=BASELINE, help="基準値のファイル")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="遅くなったとみなす割合（デフォルト: 0.25 = 基準の1.25倍）",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="ケースごとの計測回数")
+    parser.add_argument(
+        "--absolute", action="store_true", help="較正で正規化せずに比べる（同じマシンの基準値）"
+    )
+    parser.add_argument(
+        "--save", action="store_true", help="計測結果で基準値を上書き（--repeat 7程度を推奨）"
+    )
+    parser.add_argument("--output", type=Path, default=None, help="計測結果をJSONで保存")
+    args = parser.parse_args()
+
+    cases = select(args.pattern)
+    if not cases:
+        print(f"Error: no case matches {args.pattern!r}", file=sys.stderr)
+        sys.exit(1)
+    if args.save and args.pattern is not None:
+        print("Error: --save measures all cases (do not use -k)", file=sys.stderr)
+        sys.exit(1)
+
+    baseline = None
+    if not args.save:
+        try:
+            baseline = Results.load(args.baseline)
+        except (OSError, ValueError) as e:
+            print(f"Error: cannot read baseline: {e} (run with --save)", file=sys.stderr)
+            sys.exit(1)
+
+    def progress(name: str, seconds: float) -> None:
+        print(f"  {name:<36}{seconds * 1000:>10.3f} ms", file=sys.stderr)
+
+    print(f"measuring {len(cases)} cases (repeat {args.repeat})", file=sys.stderr)
+    results = run(cases, repeat=args.repeat, progress=progress)
+    if baseline is None:
+        results.save(args.baseline)
+        print(f"saved baseline to {args.baseline}")
+        return
+
+    comparisons = confirm(
+        baseline, results, args.threshold, normalize=not args.absolute, repeat=args.repeat
+    )
+    mode = "absolute" if args.absolute else "normalized by calibration"
+    scale = baseline.calibration / results.calibration
+    print(f"calibration: {results.calibration * 1000:.3f} ms (baseline x{1 / scale:.2f}), {mode}")
+    print(f"{'case':<36}{'baseline':>12}{'current':>12}{'ratio':>8}")
+    for c in comparisons:
+        base = f"{c.baseline * 1000:.3f}ms" if c.baseline is not None else "-"
+        ratio = f"{c.ratio:.2f}" if c.ratio is not None else "new"
+        mark = "  REGRESSED" if c.regressed else ""
+        print(f"{c.name:<36}{base:>12}{c.current * 1000:>10.3f}ms{ratio:>8}{mark}")
+    if args.output is not None:
+        results.save(args.output)
+
+    regressed = [c for c in comparisons if c.regressed]
+    if regressed:
+        print(f"\n{len(regressed)} case(s) slower than baseline by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
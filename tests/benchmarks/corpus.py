@@ -0,0 +1,152 @@
+"""ベンチマーク用の合成コーパス.
+
+Engineに依存せず、乱数の種から毎回同じAudioQueryとWAVを作る。モーラの子音・母音・長さは
+実際の日本語の発話に近い分布（無声化・撥音・句読点のポーズを含む）にしてある。
+
+    chat: 配信のコメント読み上げ程度の短い文（1〜3秒）× 200
+    paragraph: 段落（10〜20秒）× 20
+    reading: 30分の朗読（段落ごとに合成する想定で、約20秒のクエリを並べる）
+"""
+
+import io
+import random
+from dataclasses import dataclass
+
+import numpy as np
+import soundfile as sf
+
+from ping_tuber_kai.lipsync.phoneme import get_total_duration
+from ping_tuber_kai.voicevox.models import AccentPhrase, AudioQuery, Mora
+
+SEED = 20240601
+SAMPLE_RATE = 24000
+
+# (子音, 重み)（Noneは母音のみのモーラ）
+CONSONANTS: list[tuple[str | None, int]] = [
+    (None, 12),
+    ("k", 10),
+    ("s", 7),
+    ("sh", 5),
+    ("t", 8),
+    ("ch", 3),
+    ("ts", 2),
+    ("n", 9),
+    ("h", 4),
+    ("f", 1),
+    ("m", 6),
+    ("y", 4),
+    ("r", 7),
+    ("w", 3),
+    ("g", 4),
+    ("z", 2),
+    ("j", 2),
+    ("d", 4),
+    ("b", 2),
+    ("p", 1),
+    ("ky", 1),
+    ("ny", 1),
+]
+VOWELS: list[tuple[str, int]] = [("a", 10), ("i", 8), ("u", 7), ("e", 5), ("o", 9), ("N", 3)]
+
+# 無声化しやすい子音（この後のi・uは一定の確率で無声母音にする）
+DEVOICING = {"k", "s", "sh", "t", "ch", "ts", "h", "f", "p"}
+
+
+@dataclass
+class Corpus:
+    """合成コーパス."""
+
+    name: str
+    queries: list[AudioQuery]
+
+    @property
+    def duration(self) -> float:
+        """全クエリの合計の長さ（秒、Engineと同じ丸め）."""
+        return sum(get_total_duration(query, quantize=True) for query in self.queries)
+
+    @property
+    def moras(self) -> int:
+        """全クエリのモーラ数."""
+        return sum(len(phrase.moras) for query in self.queries for phrase in query.accent_phrases)
+
+
+def _mora(rng: random.Random) -> Mora:
+    consonant = rng.choices([c for c, _ in CONSONANTS], [w for _, w in CONSONANTS])[0]
+    vowel = rng.choices([v for v, _ in VOWELS], [w for _, w in VOWELS])[0]
+    if vowel == "N":
+        consonant = None
+    elif consonant in DEVOICING and vowel in "iu" and rng.random() < 0.3:
+        vowel = vowel.upper()
+    return Mora(
+        text="ア",
+        consonant=consonant,
+        consonant_length=round(rng.uniform(0.03, 0.09), 6) if consonant else None,
+        vowel=vowel,
+        vowel_length=round(rng.uniform(0.05, 0.16), 6),
+        pitch=0.0 if vowel.isupper() else round(rng.uniform(5.0, 6.2), 6),
+    )
+
+
+def _query(rng: random.Random, seconds: float) -> AudioQuery:
+    """おおよそseconds秒の文（アクセント句を並べ、句読点でポーズを入れる）."""
+    phrases: list[AccentPhrase] = []
+    elapsed = 0.2  # 前後の無音
+    while elapsed < seconds:
+        moras = [_mora(rng) for _ in range(rng.randint(2, 7))]
+        pause = None
+        if rng.random() < 0.25:
+            length = round(rng.uniform(0.2, 0.45), 6)
+            pause = Mora(text="、", vowel="pau", vowel_length=length, pitch=0.0)
+        phrases.append(
+            AccentPhrase(moras=moras, accent=rng.randint(1, len(moras)), pause_mora=pause)
+        )
+        elapsed += sum(m.total_length for m in moras) + (pause.vowel_length if pause else 0.0)
+    return AudioQuery(accent_phrases=phrases)
+
+
+def _queries(seed: str, count: int, low: float, high: float) -> list[AudioQuery]:
+    rng = random.Random(f"{SEED}-{seed}")
+    return [_query(rng, rng.uniform(low, high)) for _ in range(count)]
+
+
+def chat() -> Corpus:
+    """短い文（1〜3秒）× 200."""
+    return Corpus("chat", _queries("chat", 200, 1.0, 3.0))
+
+
+def paragraphs() -> Corpus:
+    """段落（10〜20秒）× 20."""
+    return Corpus("paragraph", _queries("paragraph", 20, 10.0, 20.0))
+
+
+def reading(minutes: float = 30.0) -> Corpus:
+    """minutes分の朗読（約20秒の段落を合計がminutes分になるまで並べる）."""
+    rng = random.Random(f"{SEED}-reading")
+    queries: list[AudioQuery] = []
+    total = 0.0
+    while total < minutes * 60:
+        query = _query(rng, rng.uniform(15.0, 25.0))
+        queries.append(query)
+        total += get_total_duration(query, quantize=True)
+    return Corpus("reading", queries)
+
+
+def wav(seconds: float, seed: int = 0, sample_rate: int = SAMPLE_RATE) -> bytes:
+    """seconds秒の合成音声（16bit PCM、母音程度の高さの音を音量の包絡で区切る）.
+
+    Args:
+        seconds: 長さ（秒）
+        seed: 乱数の種
+        sample_rate: サンプリングレート
+
+    Returns:
+        bytes: WAVデータ
+    """
+    rng = np.random.default_rng(SEED + seed)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    envelope = np.abs(np.sin(2 * np.pi * 3.0 * t))  # 1秒に約6モーラ
+    samples = 0.4 * envelope * np.sin(2 * np.pi * 180.0 * t)
+    samples += 0.01 * rng.standard_normal(len(t))
+    buffer = io.BytesIO()
+    sf.write(buffer, samples.astype(np.float32), sample_rate, format="WAV", subtype="PCM_16")
+    return buffer.getvalue()
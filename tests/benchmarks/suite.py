@@ -0,0 +1,356 @@
+"""マイクロベンチマークのケースと、基準値との比較.
+
+各ケースは合成コーパス（corpus）を1回処理する時間を測る。計測はtimeitと同じく
+GCを止め、1回が0.2秒以上になる回数を繰り返した最小値を取る。
+
+マシンの速さの違いは、純Pythonの固定の処理（較正）の時間で割って吸収する。
+基準値と同じマシンで比べるなら正規化しない（absolute）方がノイズは小さい。
+"""
+
+import functools
+import json
+import os
+import platform
+import random
+import time
+import timeit
+import weakref
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pygame
+import sounddevice as sd
+
+from ping_tuber_kai.clock import VirtualClock
+from ping_tuber_kai.lipsync.phoneme import extract_phoneme_timeline, get_total_duration
+from ping_tuber_kai.lipsync.scheduler import create_mouth_schedule, get_viseme_at_time
+from ping_tuber_kai.output.shared_frames import SharedFrameWriter
+from ping_tuber_kai.player import AudioMixer, AudioPlayer, NullAudioDevice
+
+from . import corpus
+
+BASELINE = Path(__file__).parent / "baseline.json"
+FORMAT_VERSION = 1
+FPS = 60
+BLOCKSIZE = 240  # 10ms（24kHz）
+LOOKUPS_PER_SECOND = 10  # get_viseme_at_timeの問い合わせ数（音声1秒あたり）
+FRAME_SIZE = (1920, 1080)
+MOUTH_RECT = (800, 700, 320, 200)  # 部分書き込みで描き直す口の矩形
+
+
+@dataclass
+class Case:
+    """ベンチマークのケース."""
+
+    name: str
+    setup: Callable[[], Callable[[], object]]  # 計測する関数を返す（準備は計測に含めない）
+
+
+@dataclass
+class Results:
+    """計測結果."""
+
+    calibration: float  # 較正の処理の時間（秒）
+    cases: dict[str, float]  # ケース名 -> 1回あたりの時間（秒）
+    environment: dict[str, str] = field(default_factory=dict)
+
+    def normalized(self, name: str) -> float:
+        """較正の時間に対する比."""
+        return self.cases[name] / self.calibration
+
+    def save(self, path: Path) -> None:
+        """JSONで保存."""
+        data = {
+            "version": FORMAT_VERSION,
+            "environment": self.environment,
+            "calibration": self.calibration,
+            "cases": dict(sorted(self.cases.items())),
+        }
+        path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Path) -> "Results":
+        """JSONから読み込み.
+
+        Raises:
+            ValueError: 形式のバージョンが違う場合
+        """
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported baseline version: {data.get('version')}")
+        return cls(data["calibration"], data["cases"], data.get("environment", {}))
+
+
+@dataclass
+class Comparison:
+    """1ケースの基準値との比較."""
+
+    name: str
+    baseline: float | None  # 基準値（秒、基準にないケースはNone）
+    current: float  # 今回の値（秒）
+    ratio: float | None  # 今回 / 基準（正規化する場合は較正の比で補正）
+    regressed: bool  # 閾値を超えて遅くなったか
+
+
+# コーパスは生成に時間がかかるので、ケース間で使い回す
+@functools.cache
+def _corpus(name: str) -> corpus.Corpus:
+    return {"chat": corpus.chat, "paragraph": corpus.paragraphs, "reading": corpus.reading}[name]()
+
+
+@functools.cache
+def _timelines(name: str) -> list:
+    return [extract_phoneme_timeline(q, quantize=True) for q in _corpus(name).queries]
+
+
+def _extract(name: str) -> Callable[[], object]:
+    queries = _corpus(name).queries
+    return lambda: [extract_phoneme_timeline(q, quantize=True) for q in queries]
+
+
+def _schedule(name: str) -> Callable[[], object]:
+    pairs = [
+        (timeline, get_total_duration(query, quantize=True))
+        for timeline, query in zip(_timelines(name), _corpus(name).queries, strict=True)
+    ]
+    return lambda: [create_mouth_schedule(timeline, duration, FPS) for timeline, duration in pairs]
+
+
+def _lookup(name: str) -> Callable[[], object]:
+    """再生中の任意の時刻の問い合わせ（時刻は乱数の種で固定）."""
+    rng = random.Random(f"{corpus.SEED}-lookup-{name}")
+    lookups = []
+    for timeline, query in zip(_timelines(name), _corpus(name).queries, strict=True):
+        duration = get_total_duration(query, quantize=True)
+        count = max(int(duration * LOOKUPS_PER_SECOND), 1)
+        lookups += [(timeline, rng.uniform(0.0, duration)) for _ in range(count)]
+    return lambda: [get_viseme_at_time(timeline, time) for timeline, time in lookups]
+
+
+def _load_wav(seconds: float) -> Callable[[], object]:
+    data = corpus.wav(seconds)
+    clock = VirtualClock()
+    player = AudioPlayer(clock=clock, output=NullAudioDevice(clock))
+    return lambda: player.load_wav(data)
+
+
+def _player_callback() -> Callable[[], object]:
+    """AudioPlayerの出力コールバックで段落1つ（15秒）を末尾まで出力."""
+    clock = VirtualClock()
+    device = NullAudioDevice(clock)
+    player = AudioPlayer(blocksize=BLOCKSIZE, clock=clock, output=device)
+    player.load_wav(corpus.wav(15.0))
+    outdata = np.zeros((BLOCKSIZE, 1), dtype=np.float32)
+    time_info = _time_info()
+
+    def run() -> None:
+        device.streams.clear()
+        player.play()
+        callback = device.streams[-1].callback
+        try:
+            while True:
+                callback(outdata, BLOCKSIZE, time_info, None)
+        except sd.CallbackStop:
+            pass
+
+    return run
+
+
+def _mixer_callback() -> Callable[[], object]:
+    """AudioMixerの出力コールバックで10秒出力（発話1つ + 変換ありのBGM、ダッキング中）."""
+    clock = VirtualClock()
+    mixer = AudioMixer(
+        sample_rate=corpus.SAMPLE_RATE,
+        blocksize=BLOCKSIZE,
+        channels=1,
+        clock=clock,
+        output=NullAudioDevice(clock),
+    )
+    voice = mixer.create_voice("voice")
+    voice.load_wav(corpus.wav(3.0))
+    voice.play(loop=True)
+    bgm = mixer.create_voice("bgm", gain=0.4, ducked=True)
+    bgm.load_wav(corpus.wav(5.0, seed=1, sample_rate=44100))
+    bgm.play(loop=True)
+    outdata = np.zeros((BLOCKSIZE, 1), dtype=np.float32)
+    time_info = _time_info()
+    blocks = 10 * corpus.SAMPLE_RATE // BLOCKSIZE
+
+    def run() -> None:
+        for _ in range(blocks):
+            mixer._callback(outdata, BLOCKSIZE, time_info, None)
+
+    return run
+
+
+def _shared_frames(partial: bool) -> Callable[[], object]:
+    """1080pの画面を共有メモリに1フレーム書き込む（partialなら口の矩形だけ）."""
+    pygame.init()
+    screen = pygame.Surface(FRAME_SIZE)
+    name = f"ptk_bench_{os.getpid()}_{time.monotonic_ns()}"
+    writer = SharedFrameWriter(FRAME_SIZE, name=name)
+    rects = [pygame.Rect(MOUTH_RECT)] if partial else None
+    # 全体を書いたスロットが残っている間は部分書き込みでも全体を写すので先に埋める
+    for _ in range(writer.slots):
+        writer.write(screen, rects)
+
+    def run() -> None:
+        writer.write(screen, rects)
+
+    # 共有メモリは計測する関数と一緒に破棄する
+    weakref.finalize(run, writer.close)
+    return run
+
+
+def _time_info() -> SimpleNamespace:
+    return SimpleNamespace(currentTime=0.0, outputBufferDacTime=0.0, inputBufferAdcTime=0.0)
+
+
+CORPORA = ("chat", "paragraph", "reading")
+CASES: list[Case] = [
+    *(Case(f"extract_phoneme_timeline/{c}", functools.partial(_extract, c)) for c in CORPORA),
+    *(Case(f"create_mouth_schedule/{c}", functools.partial(_schedule, c)) for c in CORPORA),
+    *(Case(f"get_viseme_at_time/{c}", functools.partial(_lookup, c)) for c in CORPORA),
+    Case("load_wav/chat", functools.partial(_load_wav, 2.0)),
+    Case("load_wav/paragraph", functools.partial(_load_wav, 15.0)),
+    Case("audio_callback/player", _player_callback),
+    Case("audio_callback/mixer", _mixer_callback),
+    Case("shared_frames/full_1080p", functools.partial(_shared_frames, False)),
+    Case("shared_frames/partial_1080p", functools.partial(_shared_frames, True)),
+]
+
+
+def _calibration_workload() -> int:
+    """較正用の固定の処理（ケースと同じく純Pythonのループと属性参照が中心）."""
+    items = [(i, i % 7) for i in range(20000)]
+    total = 0
+    for index, value in items:
+        if value < 3:
+            total += index
+    return total + len(sorted(items, key=lambda item: item[1]))
+
+
+def measure(func: Callable[[], object], repeat: int = 3) -> float:
+    """1回あたりの時間（秒、repeat回の最小値）.
+
+    Args:
+        func: 計測する関数
+        repeat: 計測の回数
+
+    Returns:
+        float: 1回あたりの時間（秒）
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def select(pattern: str | None = None) -> list[Case]:
+    """名前にpatternを含むケース（Noneで全部）."""
+    return [case for case in CASES if pattern is None or pattern in case.name]
+
+
+def environment() -> dict[str, str]:
+    """計測した環境."""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor() or platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def run(
+    cases: list[Case],
+    repeat: int = 3,
+    progress: Callable[[str, float], None] | None = None,
+) -> Results:
+    """ケースを計測.
+
+    Args:
+        cases: 計測するケース
+        repeat: ケースごとの計測の回数
+        progress: ケースを1つ計測するごとに呼ぶ関数（ケース名, 秒）
+
+    Returns:
+        Results: 計測結果
+    """
+    # 較正は前後で測って速い方を取る（計測中の負荷の変化を拾いにくくする）
+    calibration = measure(_calibration_workload, repeat)
+    results = Results(calibration, {}, environment())
+    for case in cases:
+        seconds = measure(case.setup(), repeat)
+        results.cases[case.name] = seconds
+        if progress is not None:
+            progress(case.name, seconds)
+    results.calibration = min(calibration, measure(_calibration_workload, repeat))
+    return results
+
+
+def confirm(
+    baseline: Results,
+    results: Results,
+    threshold: float = 0.25,
+    normalize: bool = True,
+    attempts: int = 2,
+    repeat: int = 3,
+) -> list[Comparison]:
+    """比較し、閾値を超えたケースは測り直して最小値で判定し直す.
+
+    一時的な負荷による誤検出を減らすため。測り直した値はresultsに書き戻す。
+
+    Args:
+        baseline: 基準値
+        results: 今回の結果（測り直した値で更新する）
+        threshold: 遅くなったとみなす割合
+        normalize: 較正の時間で割って比べるか
+        attempts: 測り直す最大回数
+        repeat: 測り直すときの計測の回数
+
+    Returns:
+        list[Comparison]: 最終的な比較
+    """
+    cases = {case.name: case for case in CASES}
+    comparisons = compare(baseline, results, threshold, normalize)
+    for _ in range(attempts):
+        regressed = [c.name for c in comparisons if c.regressed and c.name in cases]
+        if not regressed:
+            break
+        for name in regressed:
+            seconds = measure(cases[name].setup(), repeat)
+            results.cases[name] = min(results.cases[name], seconds)
+        comparisons = compare(baseline, results, threshold, normalize)
+    return comparisons
+
+
+def compare(
+    baseline: Results,
+    current: Results,
+    threshold: float = 0.25,
+    normalize: bool = True,
+) -> list[Comparison]:
+    """今回の結果を基準値と比較.
+
+    Args:
+        baseline: 基準値
+        current: 今回の結果
+        threshold: 遅くなったとみなす割合（0.25なら基準の1.25倍を超えたら）
+        normalize: 較正の時間で割って比べるか（別のマシンで計測した基準値と比べる場合）
+
+    Returns:
+        list[Comparison]: 今回計測したケースごとの比較
+    """
+    scale = baseline.calibration / current.calibration if normalize else 1.0
+    comparisons = []
+    for name, seconds in current.cases.items():
+        base = baseline.cases.get(name)
+        if base is None:
+            comparisons.append(Comparison(name, None, seconds, None, False))
+            continue
+        ratio = seconds * scale / base
+        comparisons.append(Comparison(name, base, seconds, ratio, ratio > 1.0 + threshold))
+    return comparisons
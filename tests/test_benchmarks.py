@@ -0,0 +1,81 @@
+"""マイクロベンチマーク（tests/benchmarks）のテスト.
+
+計測そのものはしない。コーパスが決定的であること、各ケースが動くこと、
+基準値との比較が退行を検出することを確かめる。
+"""
+
+from tests.benchmarks import corpus, suite
+from tests.benchmarks.suite import BASELINE, CASES, Case, Results, compare, confirm
+
+
+class TestCorpus:
+    """合成コーパスのテスト."""
+
+    def test_deterministic(self):
+        """毎回同じクエリ・WAVを作る."""
+        assert corpus.paragraphs().queries == corpus.paragraphs().queries
+        assert corpus.wav(0.5) == corpus.wav(0.5)
+        assert corpus.wav(0.5) != corpus.wav(0.5, seed=1)
+
+    def test_durations(self):
+        """各コーパスが想定した長さになる."""
+        chat = corpus.chat()
+        assert len(chat.queries) == 200
+        assert 1.0 <= chat.duration / len(chat.queries) <= 3.5
+
+        reading = corpus.reading()
+        assert 30 * 60 <= reading.duration < 30 * 60 + 30
+        assert reading.moras > 5000
+
+
+class TestSuite:
+    """ケースと比較のテスト."""
+
+    def test_cases_run(self):
+        """朗読以外の各ケースを1回ずつ実行できる."""
+        for case in CASES:
+            if not case.name.endswith("/reading"):
+                case.setup()()
+
+    def test_baseline_covers_cases(self):
+        """リポジトリの基準値にすべてのケースがある."""
+        baseline = Results.load(BASELINE)
+        assert set(baseline.cases) == {case.name for case in CASES}
+        assert baseline.calibration > 0
+
+    def test_compare_normalizes_by_calibration(self):
+        """較正の比で補正して閾値を超えたケースを退行とし、基準にないケースは新規とする."""
+        baseline = Results(0.01, {"a": 1.0, "b": 1.0})
+        current = Results(0.02, {"a": 2.6, "b": 2.2, "c": 1.0})
+
+        normalized = {c.name: c for c in compare(baseline, current, threshold=0.25)}
+        assert normalized["a"].regressed and abs(normalized["a"].ratio - 1.3) < 1e-9
+        assert not normalized["b"].regressed
+        assert normalized["c"].ratio is None and not normalized["c"].regressed
+
+        absolute = compare(baseline, current, threshold=0.25, normalize=False)
+        assert [c.name for c in absolute if c.regressed] == ["a", "b"]
+
+    def test_confirm_remeasures_regressions(self, monkeypatch):
+        """閾値を超えたケースは測り直し、速い方の値で判定し直す."""
+        monkeypatch.setattr(suite, "CASES", [Case("noisy", lambda: lambda: None)])
+        timings = iter([1.0])
+        monkeypatch.setattr(suite, "measure", lambda func, repeat=3: next(timings))
+        baseline = Results(1.0, {"noisy": 1.0})
+        results = Results(1.0, {"noisy": 1.5})
+
+        comparisons = confirm(baseline, results)
+
+        assert not comparisons[0].regressed
+        assert results.cases["noisy"] == 1.0
+
+    def test_confirm_keeps_real_regression(self, monkeypatch):
+        """測り直しても遅いままなら退行とする."""
+        monkeypatch.setattr(suite, "CASES", [Case("slow", lambda: lambda: None)])
+        monkeypatch.setattr(suite, "measure", lambda func, repeat=3: 1.6)
+        results = Results(1.0, {"slow": 1.5})
+
+        comparisons = confirm(Results(1.0, {"slow": 1.0}), results)
+
+        assert comparisons[0].regressed
+        assert results.cases["slow"] == 1.5
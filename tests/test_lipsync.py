@@ -1,9 +1,26 @@
 """リップシンクモジュールのテスト."""
 
+import io
+import json
+import time
+from pathlib import Path
+
+import numpy as np
 import pytest
+import soundfile as sf
 
+from ping_tuber_kai.lipsync.amplitude import (
+    VOWEL_FORMANTS,
+    AmplitudeAnalyzer,
+    compare_schedules,
+    create_amplitude_schedule,
+    hysteresis,
+)
+from ping_tuber_kai.lipsync.blend import VISEME_INDEX, create_blend_schedule
+from ping_tuber_kai.lipsync.openness import Openness, create_openness_track
 from ping_tuber_kai.lipsync.phoneme import (
     PhonemeEvent,
+    PhonemeTimeline,
     extract_phoneme_timeline,
     get_total_duration,
 )
@@ -11,7 +28,8 @@ from ping_tuber_kai.lipsync.scheduler import (
     create_mouth_schedule,
     get_viseme_at_time,
 )
-from ping_tuber_kai.lipsync.viseme import Viseme, get_viseme
+from ping_tuber_kai.lipsync.stabilizer import count_transitions, stabilize_timeline
+from ping_tuber_kai.lipsync.viseme import Viseme, VisemeMap, get_viseme
 from ping_tuber_kai.voicevox.models import AccentPhrase, AudioQuery, Mora
 
 
@@ -39,9 +57,42 @@ class TestViseme:
         assert get_viseme(phoneme, is_vowel=True) == Viseme.CLOSED
 
     def test_consonant(self):
-        """子音は閉じ."""
+        """後続母音が不明な子音は閉じ."""
         assert get_viseme("k", is_vowel=False) == Viseme.CLOSED
 
+    @pytest.mark.parametrize("consonant", ["m", "my", "b", "by", "p", "py"])
+    def test_bilabial_is_closed(self, consonant: str):
+        """両唇音は閉じ."""
+        assert get_viseme(consonant, is_vowel=False, next_vowel="a") == Viseme.CLOSED
+
+    @pytest.mark.parametrize("consonant", ["k", "s", "t", "n", "h", "r", "w", "f"])
+    def test_other_consonant_holds_next_vowel(self, consonant: str):
+        """両唇音以外は後続母音の口形状."""
+        assert get_viseme(consonant, is_vowel=False, next_vowel="o") == Viseme.O
+
+    def test_map_from_dict(self):
+        """テーブルの上書き."""
+        viseme_map = VisemeMap.from_dict(
+            {"consonants": {"f": "u", "w": "bilabial"}, "vowels": {"N": "closed"}}
+        )
+
+        assert viseme_map.lookup("f", is_vowel=False, next_vowel="a") == Viseme.U
+        assert viseme_map.lookup("w", is_vowel=False, next_vowel="a") == Viseme.CLOSED
+        assert viseme_map.lookup("N") == Viseme.CLOSED
+        assert viseme_map.lookup("k", is_vowel=False, next_vowel="a") == Viseme.A
+
+    def test_map_rejects_unknown_value(self):
+        """不明な値はエラー."""
+        with pytest.raises(ValueError):
+            VisemeMap.from_dict({"consonants": {"k": "wide"}})
+
+    def test_map_load_from_file(self, tmp_path):
+        """JSONファイルから読み込み."""
+        path = tmp_path / "visemes.json"
+        path.write_text('{"consonants": {"s": "i"}}', encoding="utf-8")
+
+        assert VisemeMap.load(path).lookup("s", is_vowel=False, next_vowel="a") == Viseme.I
+
     def test_pause(self):
         """ポーズは閉じ."""
         assert get_viseme("pau", is_vowel=True) == Viseme.CLOSED
@@ -93,6 +144,19 @@ class TestPhonemeTimeline:
         assert timeline[0].start == pytest.approx(0.1)
         assert timeline[0].phoneme == "k"
 
+    def test_consonant_visemes(self, sample_query: AudioQuery):
+        """子音イベントは後続母音の口形状を保持."""
+        timeline = extract_phoneme_timeline(sample_query)
+
+        # k→o, n→i, ch→i, w→a
+        consonants = [e for e in timeline if not e.is_vowel]
+        assert [e.resolve_viseme() for e in consonants] == [
+            Viseme.O,
+            Viseme.I,
+            Viseme.I,
+            Viseme.A,
+        ]
+
     def test_timeline_continuity(self, sample_query: AudioQuery):
         """タイムラインの連続性."""
         timeline = extract_phoneme_timeline(sample_query)
@@ -143,3 +207,310 @@ class TestMouthSchedule:
         assert get_viseme_at_time(timeline, 0.25) == Viseme.A
         assert get_viseme_at_time(timeline, 0.75) == Viseme.I
         assert get_viseme_at_time(timeline, 1.5) == Viseme.CLOSED  # 範囲外
+
+
+def _synthesize(timeline: PhonemeTimeline, total_duration: float, sample_rate: int) -> np.ndarray:
+    """母音区間にフォルマント相当の正弦波を置いた疑似音声を生成."""
+    t = np.arange(int(total_duration * sample_rate)) / sample_rate
+    samples = np.zeros(len(t), dtype=np.float32)
+    for event in timeline:
+        viseme = event.resolve_viseme()
+        if viseme not in VOWEL_FORMANTS:
+            continue
+        f1, f2 = VOWEL_FORMANTS[viseme]
+        span = slice(int(event.start * sample_rate), int(event.end * sample_rate))
+        samples[span] = 0.4 * np.sin(2 * np.pi * f1 * t[span]) + 0.3 * np.sin(
+            2 * np.pi * f2 * t[span]
+        )
+    return samples
+
+
+def _long_query(repeats: int) -> AudioQuery:
+    """「まみむめも」の繰り返しからなるAudioQuery."""
+    phrases = [
+        AccentPhrase(
+            moras=[
+                Mora(
+                    text=vowel,
+                    consonant="m",
+                    consonant_length=0.06,
+                    vowel=vowel,
+                    vowel_length=0.18,
+                    pitch=5.0,
+                )
+                for vowel in "aiueo"
+            ],
+            accent=1,
+            pause_mora=Mora(text="、", vowel="pau", vowel_length=0.2, pitch=0.0),
+        )
+        for _ in range(repeats)
+    ]
+    return AudioQuery(accent_phrases=phrases)
+
+
+class TestAmplitudeAnalyzer:
+    """音量ベース解析のテスト."""
+
+    SAMPLE_RATE = 24000
+
+    def test_silence_is_closed(self):
+        """無音は閉じ."""
+        analyzer = AmplitudeAnalyzer(sample_rate=self.SAMPLE_RATE, fps=60)
+        schedule = analyzer.analyze(np.zeros(self.SAMPLE_RATE, dtype=np.float32))
+
+        assert len(schedule) == 60
+        assert all(frame.viseme == Viseme.CLOSED for frame in schedule)
+
+    @pytest.mark.parametrize("viseme", list(VOWEL_FORMANTS))
+    def test_vowel_estimate(self, viseme: Viseme):
+        """フォルマント相当の信号から母音を推定."""
+        timeline = [
+            PhonemeEvent(
+                phoneme=viseme.value, start=0.0, duration=1.0, is_vowel=True, is_voiced=True
+            ),
+        ]
+        samples = _synthesize(timeline, 1.0, self.SAMPLE_RATE)
+        visemes = AmplitudeAnalyzer(sample_rate=self.SAMPLE_RATE, fps=60).analyze_visemes(samples)
+
+        assert visemes.count(viseme) / len(visemes) > 0.9
+
+    def test_hysteresis(self):
+        """閾値の間は直前の状態を維持."""
+        level = np.array([0.0, 0.2, 0.1, 0.1, 0.05, 0.1])
+        result = hysteresis(level, open_threshold=0.15, close_threshold=0.08)
+
+        assert result.tolist() == [False, True, True, True, False, False]
+
+    def test_block_matches_whole_buffer(self):
+        """ブロック逐次処理は一括処理と同じフレーム境界・開閉になる."""
+        query = _long_query(2)
+        timeline = extract_phoneme_timeline(query)
+        samples = _synthesize(timeline, get_total_duration(query), self.SAMPLE_RATE)
+
+        whole = AmplitudeAnalyzer(sample_rate=self.SAMPLE_RATE, fps=60).analyze_visemes(samples)
+
+        streaming = AmplitudeAnalyzer(sample_rate=self.SAMPLE_RATE, fps=60)
+        blocks: list[Viseme] = []
+        for start in range(0, len(samples), 256):
+            blocks.extend(streaming.process_block(samples[start : start + 256]))
+
+        assert len(blocks) == len(samples) * 60 // self.SAMPLE_RATE
+        agree = sum(a == b for a, b in zip(whole, blocks, strict=False)) / len(blocks)
+        assert agree > 0.95
+
+    def test_accuracy_against_mora_schedule(self):
+        """モーラ由来スケジュールとの一致度."""
+        query = _long_query(4)
+        timeline = extract_phoneme_timeline(query)
+        total_duration = get_total_duration(query)
+        samples = _synthesize(timeline, total_duration, self.SAMPLE_RATE)
+
+        buffer = io.BytesIO()
+        sf.write(buffer, samples, self.SAMPLE_RATE, format="WAV")
+
+        reference = create_mouth_schedule(timeline, total_duration, fps=60)
+        estimate = create_amplitude_schedule(buffer.getvalue(), fps=60)
+        result = compare_schedules(reference, estimate)
+
+        assert result.open_accuracy > 0.9
+        assert result.viseme_accuracy > 0.85
+
+    def test_faster_than_real_time(self):
+        """長尺音声を実時間より十分速く解析."""
+        duration = 120.0
+        rng = np.random.default_rng(0)
+        samples = (0.3 * rng.standard_normal(int(duration * self.SAMPLE_RATE))).astype(np.float32)
+
+        start = time.perf_counter()
+        AmplitudeAnalyzer(sample_rate=self.SAMPLE_RATE, fps=60).analyze(samples)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < duration / 10
+
+
+class TestBlendSchedule:
+    """口形状ブレンドのテスト."""
+
+    @pytest.fixture
+    def timeline(self) -> PhonemeTimeline:
+        return [
+            PhonemeEvent(phoneme="a", start=0.0, duration=0.5, is_vowel=True, is_voiced=True),
+            PhonemeEvent(phoneme="i", start=0.5, duration=0.5, is_vowel=True, is_voiced=True),
+        ]
+
+    def test_weights_are_normalized(self, timeline: PhonemeTimeline):
+        """各フレームの重みの和は1."""
+        blend = create_blend_schedule(timeline, 1.0, fps=60, transition=0.1, lookahead=0.0)
+
+        assert len(blend) == 61
+        assert np.allclose(blend.weights.sum(axis=1), 1.0)
+
+    def test_steady_state_matches_hard_schedule(self, timeline: PhonemeTimeline):
+        """遷移区間外はハード切り替えと同じ形状."""
+        blend = create_blend_schedule(timeline, 1.0, fps=60, transition=0.1, lookahead=0.0)
+
+        assert blend.at_time(0.25).primary == Viseme.A
+        assert blend.at_time(0.25).mix == pytest.approx(0.0)
+        assert blend.at_time(0.75).primary == Viseme.I
+
+    def test_transition_blends_neighbors(self, timeline: PhonemeTimeline):
+        """境界付近では前後の形状が混ざる."""
+        blend = create_blend_schedule(timeline, 1.0, fps=60, transition=0.1, lookahead=0.0)
+        frame = blend.at_frame(30)  # t=0.5（境界）
+
+        assert {frame.primary, frame.secondary} == {Viseme.A, Viseme.I}
+        assert frame.mix == pytest.approx(0.5, abs=0.05)
+
+    def test_lookahead_anticipates_next_shape(self, timeline: PhonemeTimeline):
+        """先読みで次の形状が前倒しになる."""
+        blend = create_blend_schedule(timeline, 1.0, fps=60, transition=0.0, lookahead=0.05)
+
+        assert blend.at_time(0.46).primary == Viseme.I
+
+    def test_hold_extends_short_shapes(self):
+        """最小保持時間より短い形状も保持時間ぶん最大重みを保つ."""
+        timeline = [
+            PhonemeEvent(phoneme="o", start=0.1, duration=0.01, is_vowel=True, is_voiced=True),
+        ]
+        blend = create_blend_schedule(
+            timeline, 0.5, fps=100, transition=0.0, lookahead=0.0, hold=0.05
+        )
+        column = blend.weights[:, VISEME_INDEX[Viseme.O]]
+
+        assert np.count_nonzero(column == 1.0) >= 5
+
+
+def _events(*spec: tuple[str, float]) -> PhonemeTimeline:
+    """(音素, 長さ) の並びから連続したタイムラインを作る."""
+    timeline: PhonemeTimeline = []
+    start = 0.0
+    for phoneme, duration in spec:
+        is_vowel = phoneme in {"a", "i", "u", "e", "o", "N", "A", "I", "U", "E", "O"}
+        timeline.append(
+            PhonemeEvent(
+                phoneme=phoneme,
+                start=start,
+                duration=duration,
+                is_vowel=is_vowel,
+                is_voiced=phoneme.islower() or phoneme == "N",
+            )
+        )
+        start += duration
+    return timeline
+
+
+class TestStabilizer:
+    """最小保持・ちらつき抑制のテスト."""
+
+    def test_merges_short_span_into_previous(self):
+        """最小保持時間未満の区間は直前に吸収."""
+        timeline = _events(("a", 0.2), ("i", 0.01), ("u", 0.2))
+        result = stabilize_timeline(timeline, min_hold=0.04, flicker_window=0.0)
+
+        assert [e.phoneme for e in result.timeline] == ["a", "u"]
+        assert result.timeline[0].end == pytest.approx(0.21)
+        assert result.removed_transitions == 1
+
+    def test_collapses_aba_flicker(self):
+        """A-B-AのBを潰す."""
+        timeline = _events(("a", 0.2), ("k", 0.05), ("a", 0.2))
+        result = stabilize_timeline(timeline, min_hold=0.02, flicker_window=0.06)
+
+        assert len(result.timeline) == 1
+        assert result.timeline[0].duration == pytest.approx(0.45)
+        assert result.transitions_before == 4
+        assert result.transitions_after == 2
+
+    def test_keeps_long_spans(self):
+        """十分長い区間はそのまま."""
+        timeline = _events(("a", 0.2), ("k", 0.1), ("i", 0.2))
+        result = stabilize_timeline(timeline, min_hold=0.04, flicker_window=0.06)
+
+        assert [e.phoneme for e in result.timeline] == ["a", "k", "i"]
+        assert result.removed_transitions == 0
+
+    def test_short_first_span_merges_forward(self):
+        """先頭の短い区間は直後に吸収."""
+        timeline = _events(("k", 0.01), ("a", 0.2))
+        result = stabilize_timeline(timeline, min_hold=0.04, flicker_window=0.0)
+
+        assert len(result.timeline) == 1
+        assert result.timeline[0].start == pytest.approx(0.0)
+        assert result.timeline[0].phoneme == "a"
+
+    def test_preserves_continuity(self):
+        """安定化後もタイムラインは連続で、総時間は変わらない."""
+        timeline = extract_phoneme_timeline(_long_query(2))
+        result = stabilize_timeline(timeline, min_hold=0.1, flicker_window=0.1)
+
+        for i in range(len(result.timeline) - 1):
+            assert result.timeline[i].end == pytest.approx(result.timeline[i + 1].start)
+        assert result.timeline[0].start == pytest.approx(timeline[0].start)
+        assert result.timeline[-1].end == pytest.approx(timeline[-1].end)
+        assert count_transitions(result.timeline) == result.transitions_after
+
+
+class TestConsonantAwareTransitions:
+    """子音考慮マッピングによる切り替え回数の削減."""
+
+    @pytest.fixture
+    def corpus(self) -> list[AudioQuery]:
+        path = Path(__file__).parent / "data" / "audio_queries.json"
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return [AudioQuery.model_validate(item) for item in data]
+
+    def test_reduces_transitions(self, corpus: list[AudioQuery]):
+        """子音で毎回閉じる旧マッピングより切り替えが減る."""
+        legacy = sum(
+            count_transitions(extract_phoneme_timeline(q, VisemeMap.vowels_only())) for q in corpus
+        )
+        aware = sum(count_transitions(extract_phoneme_timeline(q, VisemeMap())) for q in corpus)
+
+        assert aware < legacy * 0.75
+
+
+class TestOpenness:
+    """口の開き具合のテスト."""
+
+    SAMPLE_RATE = 24000
+
+    def _query(self, pitches: list[float]) -> AudioQuery:
+        moras = [Mora(text="ア", vowel="a", vowel_length=0.2, pitch=pitch) for pitch in pitches]
+        return AudioQuery(accent_phrases=[AccentPhrase(moras=moras, accent=1)])
+
+    def _render(self, query: AudioQuery, gains: list[float]) -> np.ndarray:
+        """モーラごとの音量で正弦波を生成."""
+        duration = get_total_duration(query)
+        samples = np.zeros(int(duration * self.SAMPLE_RATE), dtype=np.float32)
+        t = np.arange(int(0.2 * self.SAMPLE_RATE)) / self.SAMPLE_RATE
+        for i, gain in enumerate(gains):
+            start = int((query.pre_phoneme_length + 0.2 * i) * self.SAMPLE_RATE)
+            samples[start : start + len(t)] = gain * np.sin(2 * np.pi * 200.0 * t)
+        return samples
+
+    def test_loud_and_quiet_moras(self):
+        """大きい音節は大、小さい音節は小."""
+        query = self._query([5.5] * 5)
+        samples = self._render(query, [0.3, 0.3, 0.9, 0.3, 0.08])
+        track = create_openness_track(query, samples, self.SAMPLE_RATE, threshold=0.8)
+
+        assert track.at_time(0.1 + 0.2 * 0 + 0.1) == Openness.NORMAL
+        assert track.at_time(0.1 + 0.2 * 2 + 0.1) == Openness.WIDE
+        assert track.at_time(0.1 + 0.2 * 4 + 0.1) == Openness.SMALL
+
+    def test_high_pitch_opens_wider(self):
+        """ピッチが高い音節は大きく開く."""
+        query = self._query([5.5, 5.5, 5.9, 5.5, 5.5])
+        samples = self._render(query, [0.3] * 5)
+        track = create_openness_track(query, samples, self.SAMPLE_RATE, threshold=0.8)
+
+        assert track.at_time(0.1 + 0.2 * 2 + 0.1) == Openness.WIDE
+        assert track.at_time(0.1 + 0.1) == Openness.NORMAL
+
+    def test_outside_moras_is_normal(self):
+        """モーラ外は通常."""
+        query = self._query([5.5])
+        track = create_openness_track(query, self._render(query, [0.3]), self.SAMPLE_RATE)
+
+        assert track.at_time(0.0) == Openness.NORMAL
+        assert track.at_time(10.0) == Openness.NORMAL
@@ -0,0 +1,619 @@
+"""出力モジュールのテスト."""
+
+import base64
+import json
+import os
+import socket
+import struct
+import time
+import urllib.request
+
+import numpy as np
+import pygame
+import pytest
+
+from ping_tuber_kai.config import settings
+from ping_tuber_kai.lipsync.blend import VisemeBlend, create_blend_schedule
+from ping_tuber_kai.lipsync.openness import Openness
+from ping_tuber_kai.lipsync.phoneme import PhonemeEvent
+from ping_tuber_kai.lipsync.viseme import Viseme
+from ping_tuber_kai.output.browser_source import BrowserSource, read_frame
+from ping_tuber_kai.output.compositor import LayerCompositor
+from ping_tuber_kai.output.osc import OSCSink, viseme_parameters
+from ping_tuber_kai.output.pacer import FramePacer
+from ping_tuber_kai.output.pygame_window import BLEND_CACHE_SIZE, PygameWindow
+from ping_tuber_kai.output.shared_frames import SharedFrameReader, SharedFrameWriter
+from ping_tuber_kai.player.sync import SyncEngine
+from ping_tuber_kai.voicevox.models import AccentPhrase, AudioQuery, Mora
+
+# ウィンドウを開かずに描画する
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+
+@pytest.fixture
+def window(tmp_path):
+    """プレースホルダー画像のみのウィンドウ（1080p）."""
+    with PygameWindow(width=1920, height=1080, assets_dir=tmp_path) as w:
+        yield w
+
+
+class TestPygameWindowBlend:
+    """口形状ブレンド描画のテスト."""
+
+    def test_blend_surfaces_are_cached(self, window: PygameWindow):
+        """同じブレンドは合成済みサーフェスを再利用."""
+        window.set_blend(VisemeBlend(Viseme.A, Viseme.I, 0.3))
+        first = window._get_frame_surface()
+        window.set_blend(VisemeBlend(Viseme.A, Viseme.I, 0.3))
+
+        assert window._get_frame_surface() is first
+
+    def test_no_blend_uses_source_image(self, window: PygameWindow):
+        """混合率0は元画像をそのまま使う."""
+        window.set_viseme(Viseme.O)
+
+        assert window._get_frame_surface() is window._images[Viseme.O]
+
+    def test_openness_selects_variant(self, window: PygameWindow):
+        """開き具合に応じて差分画像を使う."""
+        window.set_viseme(Viseme.A)
+        window.set_openness(Openness.WIDE)
+
+        assert window._get_frame_surface() is window._variants[(Viseme.A, Openness.WIDE)]
+
+        window.set_openness(Openness.NORMAL)
+        assert window._get_frame_surface() is window._images[Viseme.A]
+
+    def test_cache_is_bounded(self, window: PygameWindow):
+        """キャッシュは上限を超えない."""
+        visemes = list(Viseme)
+        for a in visemes:
+            for b in visemes:
+                for mix in (0.1, 0.2, 0.3, 0.4, 0.5):
+                    window.set_blend(VisemeBlend(a, b, mix))
+                    window._get_frame_surface()
+
+        assert len(window._blend_cache) <= BLEND_CACHE_SIZE
+
+    def test_fast_speech_reuses_blends(self, window: PygameWindow):
+        """早口の発話でも合成済みのブレンドを使い回し、フレームごとに合成し直さない."""
+        vowels = "aiueo" * 12
+        timeline = [
+            PhonemeEvent(phoneme=v, start=i * 0.08, duration=0.08, is_vowel=True, is_voiced=True)
+            for i, v in enumerate(vowels)
+        ]
+        blend = create_blend_schedule(timeline, len(vowels) * 0.08, fps=60)
+        for frame in range(len(blend)):
+            window.set_blend(blend.at_frame(frame))
+            assert window.update()
+        cached = dict(window._blend_cache)
+        assert cached
+
+        for frame in range(len(blend)):
+            window.set_blend(blend.at_frame(frame))
+            assert window.update()
+
+        assert window._blend_cache.keys() == cached.keys()
+        assert all(window._blend_cache[key] is surface for key, surface in cached.items())
+
+
+class TestSharedScreen:
+    """1つの画面を複数アバターで共有するテスト."""
+
+    def test_windows_draw_side_by_side(self, tmp_path):
+        """共有したウィンドウはそれぞれの描画領域に描く."""
+        left = PygameWindow(width=100, height=80, assets_dir=tmp_path)
+        right = PygameWindow(width=100, height=80, assets_dir=tmp_path, position=(100, 0))
+        left.init(screen_size=(200, 80))
+        right.init(screen=left.screen)
+
+        assert right.screen is left.screen
+        assert left.screen.get_size() == (200, 80)
+
+        left.screen.fill((0, 0, 0))
+        right.set_viseme(Viseme.A)
+        right.draw()
+        assert left.screen.get_at((150, 5))[:3] == (50, 50, 50)  # プレースホルダー背景
+        assert left.screen.get_at((50, 5))[:3] == (0, 0, 0)
+
+        right.quit()
+        assert left.is_initialized
+        left.quit()
+
+
+class TestLayeredCompositor:
+    """レイヤー合成と差分描画のテスト."""
+
+    def test_viseme_change_repaints_only_mouth(self, window: PygameWindow):
+        """初回は全体、以降は口形状が変わったときだけ口の矩形を描き直す."""
+        full = pygame.Rect(0, 0, 1920, 1080)
+        assert window.draw() == [full]
+        assert window.draw() == []
+
+        window.set_viseme(Viseme.A)
+        mouth = window.compositor.mouth_rect
+        assert window.draw() == [mouth]
+        assert mouth.width * mouth.height < full.width * full.height // 10
+
+    def test_matches_full_frame_rendering(self, window: PygameWindow):
+        """切り出した口を重ねた結果は全身画像と同じ."""
+        window.draw()
+        window.set_viseme(Viseme.A)
+        window.draw()
+
+        expected = window._create_placeholder(Viseme.A).convert()
+        mouth = window.compositor.mouth_rect
+        for point in (mouth.center, mouth.topleft, (10, 10)):
+            assert window.screen.get_at(point) == expected.get_at(point)
+
+    def test_assets_keep_only_mouth_crops(self, window: PygameWindow):
+        """全身画像は1枚だけ保持し、口形状は口の矩形だけを持つ."""
+        full_frames = (len(window._images) + len(window._variants)) * 1920 * 1080 * 4
+        assert window.asset_bytes < full_frames // 4
+
+    def test_base_mouth_parts_and_overlay(self, tmp_path, monkeypatch):
+        """base.png・口の部品・オーバーレイを重ね、オーバーレイの切り替えはその矩形だけ."""
+        monkeypatch.setattr(settings, "mouth_rect", (40, 60, 20, 10))
+        pygame.init()
+        base = pygame.Surface((100, 100))
+        base.fill((0, 0, 255))
+        pygame.image.save(base, str(tmp_path / "base.png"))
+        part = pygame.Surface((20, 10), pygame.SRCALPHA)
+        part.fill((255, 0, 0, 255), pygame.Rect(5, 0, 10, 10))
+        pygame.image.save(part, str(tmp_path / "a.png"))
+        eyes = pygame.Surface((100, 100), pygame.SRCALPHA)
+        eyes.fill((0, 255, 0, 255), pygame.Rect(30, 20, 40, 10))
+        pygame.image.save(eyes, str(tmp_path / "overlay_eyes.png"))
+
+        with PygameWindow(width=100, height=100, assets_dir=tmp_path) as window:
+            window.draw()
+            window.set_viseme(Viseme.A)
+            assert window.draw() == [pygame.Rect(40, 60, 20, 10)]
+            assert window.screen.get_at((50, 65))[:3] == (255, 0, 0)
+            assert window.screen.get_at((41, 65))[:3] == (0, 0, 255)  # 部品の透過部分
+            assert window.screen.get_at((50, 25))[:3] == (0, 255, 0)
+
+            window.set_overlay_visible("eyes", False)
+            assert window.draw() == [pygame.Rect(30, 20, 40, 10)]
+            assert window.screen.get_at((50, 25))[:3] == (0, 0, 255)
+
+    def test_overlapping_dirty_rects_are_merged(self):
+        """重なる矩形はまとめて1回だけ描く."""
+        pygame.init()
+        target = pygame.Surface((100, 100))
+        compositor = LayerCompositor((100, 100), mouth_rect=pygame.Rect(10, 10, 20, 20))
+        compositor.render(target)
+        compositor.invalidate(pygame.Rect(20, 20, 20, 20))
+        compositor.set_mouth(pygame.Surface((20, 20)))
+
+        assert compositor.render(target) == [pygame.Rect(10, 10, 30, 30)]
+        assert compositor.pixels_drawn == 100 * 100 + 30 * 30
+
+
+class _WebSocketClient:
+    """テスト用の最小WebSocketクライアント（受信のみ）."""
+
+    def __init__(self, port: int, avatar: str):
+        self.sock = socket.create_connection(("127.0.0.1", port), timeout=2.0)
+        key = base64.b64encode(os.urandom(16)).decode()
+        self.sock.sendall(
+            f"GET /ws?avatar={avatar} HTTP/1.1\r\nHost: localhost\r\n"
+            f"Upgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode()
+        )
+        response = b""
+        while b"\r\n\r\n" not in response:
+            response += self.sock.recv(1)
+        self.status = response.split(b" ", 2)[1]
+
+    def receive(self) -> dict:
+        _, payload = read_frame(self.sock)
+        return json.loads(payload)
+
+    def pending(self, wait: float = 0.1) -> bytes:
+        """届いている未読のバイト列."""
+        self.sock.settimeout(wait)
+        try:
+            return self.sock.recv(4096)
+        except TimeoutError:
+            return b""
+        finally:
+            self.sock.settimeout(2.0)
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+def _wait_for(condition, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+class TestBrowserSource:
+    """ブラウザソース（HTTP・WebSocket）のテスト."""
+
+    @pytest.fixture
+    def source(self, tmp_path):
+        pygame.init()
+        for name in ("closed.png", "a.png", "overlay_blink.png", "notes.txt"):
+            pygame.image.save(pygame.Surface((4, 4)), str(tmp_path / name))
+        with BrowserSource(port=0) as source:
+            source.add_avatar("alice", tmp_path, size=(100, 100))
+            yield source
+
+    def _get(self, source: BrowserSource, path: str) -> tuple[int, bytes]:
+        url = f"http://127.0.0.1:{source.port}{path}"
+        try:
+            with urllib.request.urlopen(url, timeout=2.0) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, b""
+
+    def test_serves_page_manifest_and_sprites(self, source: BrowserSource):
+        """ページ・画像一覧を返し、画像は一覧にあるファイルだけ配信する."""
+        status, page = self._get(source, "/?avatar=alice")
+        assert status == 200 and b"WebSocket" in page
+
+        status, body = self._get(source, "/manifest.json?avatar=alice")
+        manifest = json.loads(body)
+        assert set(manifest["sprites"]) == {"closed", "a", "overlay_blink"}
+        assert self._get(source, manifest["sprites"]["a"])[0] == 200
+        assert self._get(source, "/sprites/alice/notes.txt")[0] == 404
+        assert self._get(source, "/sprites/alice/../a.png")[0] == 404
+
+    def test_play_sends_one_message_per_utterance(self, source: BrowserSource):
+        """接続時に現在の状態、発話時は予定を1メッセージで全視聴者に送る."""
+        channel = source.channel("alice")
+        viewers = [_WebSocketClient(source.port, "alice") for _ in range(3)]
+        try:
+            assert all(v.status == b"101" for v in viewers)
+            for viewer in viewers:
+                assert viewer.receive()["t"] == "hello"
+                assert viewer.receive() == {"t": "ov", "n": "blink", "on": True}
+            _wait_for(lambda: channel.viewer_count == 3)
+
+            channel.play([(0.0, Viseme.A), (0.1, Viseme.CLOSED)], started_at=1000.0)
+            for viewer in viewers:
+                assert viewer.receive() == {
+                    "t": "play",
+                    "at": 1000000,
+                    "e": [[0, "a"], [100, "closed"]],
+                }
+            assert channel.messages_sent == 1
+        finally:
+            for viewer in viewers:
+                viewer.close()
+
+    def test_no_traffic_while_idle(self, source: BrowserSource):
+        """変化しない口形状・オーバーレイは送らない."""
+        channel = source.channel("alice")
+        viewer = _WebSocketClient(source.port, "alice")
+        try:
+            viewer.receive()
+            viewer.receive()
+            _wait_for(lambda: channel.viewer_count == 1)
+
+            for _ in range(100):
+                channel.set_viseme(Viseme.CLOSED)
+                channel.set_overlay("blink", True)
+            assert channel.messages_sent == 0
+            assert viewer.pending() == b""
+
+            channel.set_overlay("blink", False)
+            assert viewer.receive() == {"t": "ov", "n": "blink", "on": False}
+        finally:
+            viewer.close()
+
+    def test_stalled_viewer_does_not_block_sender(self, source: BrowserSource):
+        """受信しない視聴者がいても送信側は待たされず、その視聴者は切断される."""
+        channel = source.channel("alice")
+        viewer = _WebSocketClient(source.port, "alice")
+        try:
+            _wait_for(lambda: channel.viewer_count == 1)
+            transitions = [(i * 0.01, Viseme.A) for i in range(2000)]  # 1メッセージ約30KB
+            slowest = 0.0
+            for _ in range(300):  # ソケットのバッファと送信キューを溢れさせる
+                started = time.monotonic()
+                channel.play(transitions, started_at=1000.0)
+                slowest = max(slowest, time.monotonic() - started)
+            assert slowest < 0.5
+            _wait_for(lambda: channel.viewer_count == 0, timeout=5.0)
+        finally:
+            viewer.close()
+
+    def test_disconnected_viewer_is_dropped(self, source: BrowserSource):
+        """切断した視聴者は一覧から外れる."""
+        channel = source.channel("alice")
+        viewer = _WebSocketClient(source.port, "alice")
+        _wait_for(lambda: channel.viewer_count == 1)
+        viewer.close()
+        _wait_for(lambda: channel.viewer_count == 0)
+
+
+def _read_osc_string(data: bytes, offset: int) -> tuple[str, int]:
+    end = data.index(b"\0", offset)
+    return data[offset:end].decode(), (end // 4 + 1) * 4
+
+
+def _decode_bundle(data: bytes) -> list[tuple[str, list]]:
+    """OSCバンドルを (アドレス, 引数) の一覧に戻す."""
+    assert data.startswith(b"#bundle\0")
+    messages = []
+    offset = 16
+    while offset < len(data):
+        (size,) = struct.unpack(">i", data[offset : offset + 4])
+        message = data[offset + 4 : offset + 4 + size]
+        offset += 4 + size
+        address, pos = _read_osc_string(message, 0)
+        tags, pos = _read_osc_string(message, pos)
+        args = []
+        for tag in tags[1:]:
+            if tag == "s":
+                value, pos = _read_osc_string(message, pos)
+            else:
+                (value,) = struct.unpack(">f" if tag == "f" else ">i", message[pos : pos + 4])
+                pos += 4
+            args.append(value)
+        messages.append((address, args))
+    return messages
+
+
+class TestOSCSink:
+    """OSC/VMC出力のテスト."""
+
+    @pytest.fixture
+    def receiver(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(("127.0.0.1", 0))
+        sock.settimeout(1.0)
+        yield sock
+        sock.close()
+
+    def _drain(self, receiver: socket.socket, wait: float = 0.05) -> list[bytes]:
+        packets = []
+        receiver.settimeout(wait)
+        try:
+            while True:
+                packets.append(receiver.recv(4096))
+        except TimeoutError:
+            return packets
+        finally:
+            receiver.settimeout(1.0)
+
+    def test_blend_is_split_between_vowels(self):
+        """ブレンドは上位2形状を混合率で按分し、閉じ・「ん」は0."""
+        blend = VisemeBlend(Viseme.A, Viseme.O, 0.25)
+        assert viseme_parameters(Viseme.A, blend) == {
+            "A": 0.75,
+            "I": 0.0,
+            "U": 0.0,
+            "E": 0.0,
+            "O": 0.25,
+        }
+        assert set(viseme_parameters(Viseme.N).values()) == {0.0}
+
+    def test_vmc_packet(self, receiver):
+        """母音ごとのBlend/Valと最後にApplyを1パケットで送る."""
+        port = receiver.getsockname()[1]
+        with OSCSink(port=port, protocol="vmc", heartbeat=10.0) as sink:
+            receiver.recv(4096)  # 起動時の閉じ
+            sink.set_viseme(Viseme.I)
+            messages = _decode_bundle(receiver.recv(4096))
+        assert messages[-1] == ("/VMC/Ext/Blend/Apply", [])
+        assert ("/VMC/Ext/Blend/Val", ["I", 1.0]) in messages
+        assert ("/VMC/Ext/Blend/Val", ["A", 0.0]) in messages
+
+    def test_change_only_with_heartbeat(self, receiver):
+        """同じ値は送らず、heartbeatごとに送り直す."""
+        port = receiver.getsockname()[1]
+        with OSCSink(port=port, protocol="osc", heartbeat=0.2) as sink:
+            receiver.recv(4096)  # 起動時の閉じ
+            for _ in range(100):
+                sink.set_viseme(Viseme.A)
+            assert len(self._drain(receiver)) == 1
+
+            packet = receiver.recv(4096)  # heartbeat
+            assert ("/avatar/parameters/MouthA", [1.0]) in _decode_bundle(packet)
+
+    def test_rate_is_capped_at_120hz(self, receiver):
+        """毎回値が変わっても送信はrateまでにまとめ、呼び出し側は待たない."""
+        port = receiver.getsockname()[1]
+        visemes = [Viseme.A, Viseme.I, Viseme.U, Viseme.E, Viseme.O]
+        with OSCSink(port=port, rate=120.0) as sink:
+            calls = 0
+            started = time.perf_counter()
+            while time.perf_counter() - started < 0.5:
+                sink.set_viseme(visemes[calls % len(visemes)])
+                calls += 1
+                time.sleep(0.001)
+            per_call = (time.perf_counter() - started) / calls
+        packets = len(self._drain(receiver))
+        assert calls > packets
+        assert 20 < packets <= 0.5 * 120 + 3  # 閉じる時の1パケットを含む
+        assert per_call < 0.005
+
+
+class TestSharedFrames:
+    """共有メモリのフレーム出力のテスト."""
+
+    @pytest.fixture
+    def name(self):
+        return f"ptk_test_{os.getpid()}_{time.monotonic_ns()}"
+
+    def test_reader_sees_rgba_frames(self, name):
+        """書き込んだ画面をRGBAで読め、書き込みごとにシーケンス番号が進む."""
+        pygame.init()
+        screen = pygame.Surface((64, 48))
+        screen.fill((10, 20, 30))
+        with SharedFrameWriter((64, 48), name=name) as writer, SharedFrameReader(name) as reader:
+            assert reader.read() is None
+            writer.write(screen, timestamp=123.0)
+
+            frame = reader.read()
+            assert frame.sequence == 1 and frame.timestamp == 123.0
+            assert frame.pixels.shape == (48, 64, 4)
+            assert tuple(frame.pixels[5, 5]) == (10, 20, 30, 255)
+            assert frame.is_valid()
+            assert reader.read(after=frame.sequence) is None
+            del frame
+
+    def test_partial_writes_catch_up_old_slots(self, name):
+        """描き直した矩形だけを写しても、どのスロットも最新の画面になる."""
+        pygame.init()
+        screen = pygame.Surface((64, 48))
+        screen.fill((0, 0, 0))
+        with SharedFrameWriter((64, 48), name=name, slots=3) as writer:
+            with SharedFrameReader(name) as reader:
+                writer.write(screen)
+                for i in range(1, 8):
+                    rect = pygame.Rect(i * 4, 0, 4, 4)
+                    screen.fill((255, 0, 0), rect)
+                    writer.write(screen, [rect])
+                    frame = reader.read()
+                    assert np.array_equal(
+                        frame.pixels[..., :3], pygame.surfarray.array3d(screen).transpose(1, 0, 2)
+                    )
+                    del frame
+                assert writer.pixels_written < 7 * 64 * 48
+
+    def test_overwritten_frame_is_invalid(self, name):
+        """読んでいる間にスロットが上書きされたら is_valid() がFalse."""
+        pygame.init()
+        screen = pygame.Surface((8, 8))
+        with SharedFrameWriter((8, 8), name=name, slots=3) as writer:
+            with SharedFrameReader(name) as reader:
+                writer.write(screen)
+                frame = reader.read()
+                for _ in range(3):
+                    writer.write(screen)
+                assert not frame.is_valid()
+                del frame
+
+    def test_partial_writes_copy_only_dirty_rect(self, name):
+        """部分書き込みは、全体を書いたスロットを使い切った後は口の矩形だけを写す."""
+        pygame.init()
+        screen = pygame.Surface((1920, 1080))
+        mouth = pygame.Rect(800, 700, 320, 200)
+        full = 1920 * 1080
+        with SharedFrameWriter((1920, 1080), name=name, slots=3) as writer:
+            with SharedFrameReader(name) as reader:
+                for i in range(3):
+                    screen.fill((i, i, i))
+                    writer.write(screen)
+                assert writer.pixels_written == 3 * full
+
+                for i in range(120):
+                    screen.fill((i, 0, 0), mouth)
+                    writer.write(screen, [mouth])
+                # 全体を書いたフレームが残る2スロットは全体を写し直す
+                assert writer.pixels_written == 5 * full + 118 * mouth.width * mouth.height
+
+                frame = reader.read()
+                assert frame.sequence == 123
+                assert tuple(frame.pixels[mouth.centery, mouth.centerx]) == (119, 0, 0, 255)
+                assert tuple(frame.pixels[0, 0]) == (2, 2, 2, 255)
+                del frame
+
+
+class _FakeClock:
+    """スリープで進む時計（寝過ごし量を指定できる、読むたびに1マイクロ秒進む）."""
+
+    def __init__(self, oversleep: float = 0.0):
+        self.now = 100.0
+        self.oversleep = oversleep
+
+    def __call__(self) -> float:
+        self.now += 1e-6
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds + self.oversleep
+
+
+class _ClockPlayer:
+    """start_timeから時計どおりに進むプレイヤー."""
+
+    sample_rate = 24000
+    samples = None
+
+    def __init__(self, clock: _FakeClock):
+        self.clock = clock
+        self.start_time = 0.0
+        self.is_playing = False
+
+    def load_wav(self, audio_data: bytes) -> float:
+        return 1.0
+
+    def play(self, blocking: bool = False) -> None:
+        self.start_time = self.clock.now
+        self.is_playing = True
+
+    def elapsed_at(self, at: float) -> float:
+        return at - self.start_time if self.is_playing else 0.0
+
+    @property
+    def elapsed_time(self) -> float:
+        return self.elapsed_at(self.clock.now)
+
+
+class TestFramePacer:
+    """フレームペーサーのテスト."""
+
+    def test_deadlines_stay_on_grid(self):
+        """寝過ごしても締め切りは周期どおりに並び、スピンで締め切りちょうどに起きる."""
+        clock = _FakeClock(oversleep=0.0005)
+        pacer = FramePacer(fps=100, clock=clock, sleep=clock.sleep, spin_max=0.002)
+        pacer.wait()
+        start = pacer.deadline
+        for frame in range(1, 20):
+            pacer.wait()
+            assert pacer.deadline == pytest.approx(start + frame * 0.01)
+        assert pacer.stats.frames == 19
+        assert pacer.stats.dropped == 0
+        assert pacer.stats.lateness.max < 0.001
+        assert pacer.stats.jitter.max < 0.0001  # 寝過ごしてもフレーム間隔はぶれない
+
+    def test_late_frames_are_dropped_not_queued(self):
+        """描画が周期を超えたら、過ぎた締め切りは飛ばして次の締め切りを待つ."""
+        clock = _FakeClock()
+        pacer = FramePacer(fps=100, clock=clock, sleep=clock.sleep, spin_max=0.0)
+        pacer.wait()
+        start = pacer.deadline
+
+        clock.now += 0.035  # 3.5フレームぶんかかった描画
+        pacer.wait()
+        assert pacer.stats.dropped == 3
+        assert pacer.deadline == pytest.approx(start + 0.04)
+        assert clock.now == pytest.approx(start + 0.04, abs=1e-4)
+
+        clock.now += 0.013  # 少しの遅れは飛ばさず、すぐ次のフレームへ
+        pacer.wait()
+        assert pacer.stats.dropped == 3
+        assert clock.now == pytest.approx(start + 0.053, abs=1e-4)
+
+    @pytest.mark.parametrize("fps", [60, 144])
+    def test_viseme_change_latency_under_one_frame(self, fps, monkeypatch):
+        """締め切りの再生位置で口形状を求めると、描画に時間がかかっても変化の遅れは1フレーム未満."""
+        monkeypatch.setattr(settings, "openness_enabled", False)
+        clock = _FakeClock(oversleep=0.0015)
+        engine = SyncEngine(fps=fps, player=_ClockPlayer(clock))
+        moras = [
+            Mora(text="ア", vowel="a", vowel_length=0.2, pitch=5.0),
+            Mora(text="イ", vowel="i", vowel_length=0.2, pitch=5.0),
+        ]
+        query = AudioQuery(accent_phrases=[AccentPhrase(moras=moras, accent=1)])
+        engine.prepare(query, b"")
+        change = next(e.start for e in engine.timeline if e.phoneme == "i")
+
+        pacer = FramePacer(fps=fps, clock=clock, sleep=clock.sleep, spin_max=0.0)
+        engine.play()
+        started = clock.now
+        while True:
+            pacer.wait()
+            if engine.update(at=pacer.deadline) == Viseme.I:
+                break
+            clock.now += 0.4 / fps  # 描画
+        latency = pacer.deadline - (started + change)
+        assert 0 <= latency < 1 / fps
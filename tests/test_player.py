@@ -1,10 +1,26 @@
 """プレイヤーモジュールのテスト."""
 
+import io
+import threading
+import time
+from types import SimpleNamespace
 
+import numpy as np
+import pytest
+import soundfile as sf
+
+from ping_tuber_kai.clock import VirtualClock
 from ping_tuber_kai.lipsync.phoneme import PhonemeEvent
 from ping_tuber_kai.lipsync.scheduler import create_mouth_schedule
 from ping_tuber_kai.lipsync.viseme import Viseme
-from ping_tuber_kai.player.audio import PlaybackState
+from ping_tuber_kai.player import audio as audio_module
+from ping_tuber_kai.player.audio import AudioPlayer, PlaybackState
+from ping_tuber_kai.player.live import LatencyStats, LiveInput
+from ping_tuber_kai.player.mixer import AudioMixer
+from ping_tuber_kai.player.null_device import NullAudioDevice
+from ping_tuber_kai.player.stream import PcmStream, RingBuffer, WavStreamError, parse_wav_header
+from ping_tuber_kai.player.sync import SyncEngine
+from ping_tuber_kai.voicevox.models import AccentPhrase, AudioQuery, Mora
 
 
 class TestPlaybackState:
@@ -72,3 +88,518 @@ class TestMouthScheduleIntegration:
 
         # 無声母音部分は閉じ
         assert schedule[1].viseme == Viseme.CLOSED
+
+
+class TestLiveInput:
+    """ライブ入力のテスト（コールバックを直接駆動）."""
+
+    SAMPLE_RATE = 24000
+
+    def _feed(self, live: LiveInput, amplitude: float, blocks: int) -> None:
+        t = np.arange(live.blocksize) / self.SAMPLE_RATE
+        block = (amplitude * np.sin(2 * np.pi * 800.0 * t)).astype(np.float32).reshape(-1, 1)
+        time_info = SimpleNamespace(currentTime=0.0, inputBufferAdcTime=0.0)
+        for _ in range(blocks):
+            live._callback(block, live.blocksize, time_info, None)
+
+    def test_voice_opens_and_silence_closes(self):
+        """発声で開き、無音で閉じる."""
+        live = LiveInput(sample_rate=self.SAMPLE_RATE, fps=60, latency=0.01)
+
+        self._feed(live, 0.5, blocks=10)
+        assert live.update() != Viseme.CLOSED
+
+        self._feed(live, 0.0, blocks=10)
+        assert live.update() == Viseme.CLOSED
+
+    def test_latency_is_measured_and_bounded(self):
+        """入力→反映の遅延を計測し、目標ブロック長程度に収まる."""
+        live = LiveInput(sample_rate=self.SAMPLE_RATE, fps=60, latency=0.01)
+
+        self._feed(live, 0.5, blocks=5)
+        live.update()
+        live.update()  # 同じ更新は二重計測しない
+
+        assert live.latency_stats.count == 1
+        assert 0.0 < live.latency_stats.last < live.latency + 0.05
+
+    def test_latency_stats(self):
+        """統計の集計."""
+        stats = LatencyStats()
+        for value in (0.01, 0.03, 0.02):
+            stats.add(value)
+
+        assert stats.count == 3
+        assert stats.mean == pytest.approx(0.02)
+        assert stats.max == pytest.approx(0.03)
+        assert stats.last == pytest.approx(0.02)
+
+
+class _RealtimeStream:
+    """出力デバイスの代わりに実時間でコールバックを呼ぶストリーム."""
+
+    def __init__(self, samplerate, blocksize, callback, finished_callback, **kwargs):
+        self.samplerate = samplerate
+        self.blocksize = blocksize
+        self.callback = callback
+        self.finished_callback = finished_callback
+        self.blocks: list[np.ndarray] = []
+        self._running = False
+        self._thread: threading.Thread | None = None
+
+    def _run(self) -> None:
+        period = self.blocksize / self.samplerate
+        next_time = time.perf_counter()
+        while self._running:
+            outdata = np.zeros((self.blocksize, 1), dtype=np.float32)
+            now = time.perf_counter()
+            time_info = SimpleNamespace(currentTime=now, outputBufferDacTime=now + period)
+            try:
+                self.callback(outdata, self.blocksize, time_info, None)
+                self.blocks.append(outdata)
+            except audio_module.sd.CallbackStop:
+                self.blocks.append(outdata)
+                break
+            next_time += period
+            time.sleep(max(next_time - time.perf_counter(), 0.0))
+        self._running = False
+        self.finished_callback()
+
+    def start(self) -> None:
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._running = False
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def close(self) -> None:
+        pass
+
+
+class TestCancel:
+    """キャンセル（バージイン）のテスト."""
+
+    @pytest.fixture
+    def engine(self, monkeypatch):
+        streams: list[_RealtimeStream] = []
+
+        def make_stream(**kwargs):
+            streams.append(_RealtimeStream(**kwargs))
+            return streams[-1]
+
+        monkeypatch.setattr(audio_module.sd, "OutputStream", make_stream)
+        t = np.arange(24000 * 2) / 24000
+        buffer = io.BytesIO()
+        samples = (0.5 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+        sf.write(buffer, samples, 24000, format="WAV")
+
+        moras = [Mora(text="ア", vowel="a", vowel_length=0.18, pitch=5.5) for _ in range(10)]
+        query = AudioQuery(accent_phrases=[AccentPhrase(moras=moras, accent=1)])
+
+        engine = SyncEngine(fps=60)
+        engine.prepare(query, buffer.getvalue())
+        yield engine, streams
+        engine.stop()
+
+    def test_fade_out_within_one_block(self, engine):
+        """キャンセル後の最初のブロックで無音になり、口は同時に閉じる."""
+        engine, streams = engine
+        engine.play()
+        time.sleep(0.15)
+
+        engine.cancel()
+        assert engine.get_current_viseme() == Viseme.CLOSED
+        assert not engine.is_playing
+
+        deadline = time.perf_counter() + 1.0
+        while engine.player.is_playing and time.perf_counter() < deadline:
+            time.sleep(0.001)
+        stream = streams[-1]
+        last = stream.blocks[-1][:, 0]
+
+        assert not engine.player.is_playing
+        assert abs(last[-1]) < 1e-3
+        assert np.abs(last[: len(last) // 4]).max() > 0.1  # 1ブロックでフェード（急に切らない）
+
+    def test_cancel_to_silence_latency(self, engine):
+        """キャンセルから無音までの遅延は出力ブロック2つ分以内."""
+        engine, _ = engine
+        block = engine.player.blocksize / 24000
+
+        for delay in (0.05, 0.08, 0.11):
+            engine.play()
+            time.sleep(delay)
+            engine.cancel()
+            engine.player.wait()
+
+        stats = engine.cancel_latency
+        assert stats.count == 3
+        assert stats.max <= 2 * block + 0.01
+
+
+def _wav(samples: np.ndarray, sample_rate: int = 24000) -> bytes:
+    buffer = io.BytesIO()
+    sf.write(buffer, samples.astype(np.float32), sample_rate, format="WAV")
+    return buffer.getvalue()
+
+
+class _ManualStream:
+    """コールバックをテストから1ブロックずつ呼ぶ出力ストリーム."""
+
+    def __init__(self, **kwargs):
+        self.callback = kwargs["callback"]
+        self.blocksize = kwargs["blocksize"]
+        self.started = False
+
+    def pull(self) -> np.ndarray:
+        outdata = np.zeros((self.blocksize, 1), dtype=np.float32)
+        time_info = SimpleNamespace(currentTime=0.0, outputBufferDacTime=0.0)
+        self.callback(outdata, self.blocksize, time_info, None)
+        return outdata[:, 0].copy()
+
+    def start(self) -> None:
+        self.started = True
+
+    def stop(self) -> None:
+        self.started = False
+
+    def close(self) -> None:
+        pass
+
+
+class TestMixer:
+    """ソフトウェアミキサーのテスト."""
+
+    @pytest.fixture
+    def mixer(self, monkeypatch):
+        streams: list[_ManualStream] = []
+
+        def make_stream(**kwargs):
+            streams.append(_ManualStream(**kwargs))
+            return streams[-1]
+
+        monkeypatch.setattr(audio_module.sd, "OutputStream", make_stream)
+        with AudioMixer(sample_rate=24000, blocksize=256) as mixer:
+            yield mixer, streams
+
+    def test_voices_share_one_stream(self, mixer):
+        """複数ボイスを1本のストリームで足し合わせる."""
+        mixer, streams = mixer
+        first = mixer.create_voice("a")
+        second = mixer.create_voice("b")
+        first.load_wav(_wav(np.full(512, 0.25)))
+        second.load_wav(_wav(np.full(256, 0.5)))
+        first.play()
+        second.play()
+
+        block = streams[0].pull()
+        assert len(streams) == 1
+        np.testing.assert_allclose(block, 0.75, atol=1e-4)
+
+        # 短い方が先に終わる
+        streams[0].pull()
+        assert first.is_playing
+        assert not second.is_playing
+        np.testing.assert_allclose(streams[0].pull(), 0.0)
+        assert not first.is_playing
+
+    def test_fade_out_one_voice(self, mixer):
+        """フェードアウトは対象のボイスだけを1ブロックで止める."""
+        mixer, streams = mixer
+        first = mixer.create_voice("a")
+        second = mixer.create_voice("b")
+        for voice in (first, second):
+            voice.load_wav(_wav(np.full(2400, 0.25)))
+            voice.play()
+
+        first.fade_out()
+        block = streams[0].pull()
+        assert block[0] == pytest.approx(0.5, abs=2e-3)
+        assert block[-1] == pytest.approx(0.25, abs=1e-3)
+        assert not first.is_playing
+        assert second.is_playing
+        assert first.cancel_latency.count == 1
+
+    def test_play_waits_for_block_in_progress(self, mixer):
+        """読み出し中のブロックが終わってから再生を始め、終端の処理で新しい再生を止めない."""
+        mixer, streams = mixer
+        voice = mixer.create_voice()
+        voice.load_wav(_wav(np.full(128, 0.25)))  # 1ブロックで終わる
+        voice.play()
+
+        entered = threading.Event()
+        release = threading.Event()
+        read = voice._read
+
+        def blocking_read(out, frames):
+            entered.set()
+            release.wait(2.0)
+            return read(out, frames)
+
+        voice._read = blocking_read
+        callback = threading.Thread(target=streams[0].pull)
+        callback.start()
+        assert entered.wait(2.0)
+        restart = threading.Thread(target=voice.play)
+        restart.start()
+        time.sleep(0.05)
+        assert restart.is_alive()  # コールバックの終了を待っている
+
+        release.set()
+        callback.join(2.0)
+        restart.join(2.0)
+        assert voice.is_playing
+        assert voice._position == 0.0
+
+    def test_resamples_in_callback(self, mixer):
+        """出力レートと異なるWAVは元のレートのまま保持し、読み出し時に補間する."""
+        mixer, streams = mixer
+        voice = mixer.create_voice()
+        t = np.arange(48000) / 48000
+        duration = voice.load_wav(_wav(0.5 * np.sin(2 * np.pi * 440 * t), sample_rate=48000))
+
+        assert duration == pytest.approx(1.0)
+        assert voice.sample_rate == 48000
+        assert len(voice.samples) == 48000
+
+        voice.play()
+        out = np.concatenate([streams[0].pull() for _ in range(10)])
+        expected = 0.5 * np.sin(2 * np.pi * 440 * np.arange(len(out)) / 24000)
+        np.testing.assert_allclose(out, expected, atol=2e-3)
+
+    def test_gain_and_ducking(self, mixer):
+        """ボイスごとのゲインを掛け、発話中はBGMを滑らかに下げて戻す."""
+        mixer, streams = mixer
+        mixer.duck_gain, mixer.duck_ramp = 0.2, 256 * 4 / 24000  # 4ブロックで切り替え
+        bgm = mixer.create_voice("bgm", gain=0.5, ducked=True)
+        voice = mixer.create_voice("voice", gain=0.5)
+        bgm.load_wav(_wav(np.full(1000, 0.5)))
+        voice.load_wav(_wav(np.full(256 * 6, 0.5)))
+
+        bgm.play(loop=True)
+        np.testing.assert_allclose(streams[0].pull(), 0.25, atol=1e-4)
+
+        voice.play()
+        blocks = [streams[0].pull() for _ in range(8)]
+        levels = [block[-1] - 0.25 for block in blocks[:6]]
+        assert levels == sorted(levels, reverse=True)  # BGMは徐々に下がる
+        assert blocks[5][-1] == pytest.approx(0.25 + 0.5 * 0.5 * 0.2, abs=1e-3)
+        assert np.abs(np.diff(np.concatenate(blocks[:6]))).max() < 0.02  # 段差なし
+
+        # 発話が終わると戻り、BGMはループし続ける
+        for _ in range(4):
+            streams[0].pull()
+        assert mixer.duck_level == pytest.approx(1.0)
+        np.testing.assert_allclose(streams[0].pull(), 0.25, atol=1e-4)
+        assert bgm.is_playing
+
+    def test_sample_clock(self, mixer):
+        """経過時間は出力したサンプル数に基づき、コールバックが止まれば進まない."""
+        mixer, streams = mixer
+        voice = mixer.create_voice()
+        voice.load_wav(_wav(np.zeros(48000), sample_rate=48000))
+        voice.play()
+        assert voice.elapsed_time == 0.0
+
+        for _ in range(10):
+            streams[0].pull()
+        block = 256 / 24000
+        time.sleep(0.05)
+        assert voice.elapsed_time == pytest.approx(10 * block, abs=1e-6)
+
+    def test_multichannel_output(self, monkeypatch):
+        """出力チャンネル数を指定でき、全チャンネルに同じ信号を出す."""
+        streams: list[_ManualStream] = []
+
+        def make_stream(**kwargs):
+            streams.append(_ManualStream(**kwargs))
+            streams[-1].channels = kwargs["channels"]
+            return streams[-1]
+
+        monkeypatch.setattr(audio_module.sd, "OutputStream", make_stream)
+        with AudioMixer(sample_rate=24000, blocksize=256, channels=2) as mixer:
+            voice = mixer.create_voice()
+            voice.load_wav(_wav(np.full(512, 0.25)))
+            voice.play()
+            outdata = np.zeros((256, 2), dtype=np.float32)
+            time_info = SimpleNamespace(currentTime=0.0, outputBufferDacTime=0.0)
+            streams[0].callback(outdata, 256, time_info, None)
+
+        assert streams[0].channels == 2
+        np.testing.assert_allclose(outdata, 0.25, atol=1e-4)
+
+
+class TestStream:
+    """受信しながら再生するストリームのテスト."""
+
+    @pytest.fixture
+    def mixer(self, monkeypatch):
+        streams: list[_ManualStream] = []
+
+        def make_stream(**kwargs):
+            streams.append(_ManualStream(**kwargs))
+            return streams[-1]
+
+        monkeypatch.setattr(audio_module.sd, "OutputStream", make_stream)
+        with AudioMixer(sample_rate=24000, blocksize=256) as mixer:
+            yield mixer, streams
+
+    def test_parse_header_incrementally(self):
+        """dataチャンクの開始まで届くまではNone、届いたらフォーマットを返す."""
+        wav = _wav(np.zeros(100))
+        header = None
+        for end in range(1, len(wav)):
+            header = parse_wav_header(wav[:end])
+            if header is not None:
+                break
+
+        assert header is not None
+        assert end == header.data_offset
+        assert (header.sample_rate, header.channels) == (24000, 1)
+        assert header.duration == pytest.approx(100 / 24000)
+
+        with pytest.raises(WavStreamError):
+            parse_wav_header(b"OggS" + bytes(40))
+
+    def test_ring_buffer_wraps_and_applies_backpressure(self):
+        """容量を超える書き込みは読み出しで空くまで待ち、折り返しても順序を保つ."""
+        buffer = RingBuffer(100)
+        data = np.arange(250, dtype=np.float32)
+        assert buffer.write(data[:150], timeout=0.05) == 100
+
+        writer = threading.Thread(target=buffer.write, args=(data[100:],))
+        writer.start()
+        out = np.zeros(250, dtype=np.float32)
+        read = 0
+        while read < 250:
+            read += buffer.read(out[read:], 30)
+            time.sleep(0.001)
+        writer.join(timeout=1.0)
+
+        np.testing.assert_array_equal(out, data)
+        assert buffer.available == 0
+
+    def test_plays_from_first_chunk(self, mixer):
+        """ヘッダと先頭のPCMだけで再生を始め、受信完了で終わる."""
+        mixer, streams = mixer
+        wav = _wav(np.full(1024, 0.25))
+        stream = PcmStream()
+        stream.feed(wav[:200])  # ヘッダ + 先頭のPCM
+        assert stream.header is not None
+
+        voice = mixer.create_voice()
+        voice.load_stream(stream, prebuffer=0.0)
+        voice.play()
+        first = streams[0].pull()
+        assert 0 < np.count_nonzero(first) < 256
+
+        stream.feed(wav[200:])
+        stream.finish()
+        out = np.concatenate([first] + [streams[0].pull() for _ in range(4)])
+        assert np.count_nonzero(out) == 1024
+        assert not voice.is_playing
+
+    def test_underrun_outputs_silence_and_holds_clock(self, mixer):
+        """受信が追いつかなければ無音を出してクロックを止め、溜まったら再開する."""
+        mixer, streams = mixer
+        wav = _wav(np.full(2400, 0.25))
+        header_end = parse_wav_header(wav).data_offset
+        stream = PcmStream()
+        stream.feed(wav[: header_end + 2 * 256])  # 256サンプル（1ブロック）ぶん
+
+        voice = mixer.create_voice()
+        voice.load_stream(stream, prebuffer=256 / 24000)
+        voice.play()
+        np.testing.assert_allclose(streams[0].pull(), 0.25, atol=1e-3)
+
+        np.testing.assert_allclose(streams[0].pull(), 0.0)
+        assert voice.underruns == 1
+        time.sleep(0.02)
+        assert voice.elapsed_time == pytest.approx(256 / 24000, abs=1e-6)
+        assert voice.is_playing
+
+        stream.feed(wav[header_end + 2 * 256 :])
+        stream.finish()
+        np.testing.assert_allclose(streams[0].pull(), 0.25, atol=1e-3)
+
+    def test_rejects_rate_mismatch(self, mixer):
+        """ミキサーと異なるレートのストリームは読み込まない."""
+        mixer, _ = mixer
+        stream = PcmStream()
+        stream.feed(_wav(np.zeros(10), sample_rate=48000))
+        with pytest.raises(ValueError):
+            mixer.create_voice().load_stream(stream)
+
+
+class TestVirtualClock:
+    """仮想時間の時計とヌル出力デバイスのテスト."""
+
+    def test_timers_fire_in_order_while_advancing(self):
+        """進めた範囲で期限の来たタイマーを時刻順に、その時刻で実行する."""
+        clock = VirtualClock()
+        fired: list[tuple[str, float]] = []
+        stop = clock.every(0.25, lambda now: fired.append(("every", now)))
+        clock.call_at(0.6, lambda now: fired.append(("once", now)))
+
+        clock.advance(1.0)
+        stop()
+        clock.advance(1.0)
+
+        assert fired == [
+            ("every", 0.25),
+            ("every", 0.5),
+            ("once", 0.6),
+            ("every", 0.75),
+            ("every", 1.0),
+        ]
+        assert clock.now() == 2.0
+
+    def test_wait_stops_when_event_is_set(self):
+        """wait()はタイマーがイベントをセットした時刻で止まり、なければタイムアウトまで進む."""
+        clock = VirtualClock()
+        event = threading.Event()
+        clock.call_at(0.3, lambda now: event.set())
+
+        assert clock.wait(event, 1.0)
+        assert clock.now() == 0.3
+        event.clear()
+        assert not clock.wait(event, 1.0)
+        assert clock.now() == 1.3
+        with pytest.raises(RuntimeError):
+            clock.wait(event)
+
+    def test_player_runs_on_null_device(self):
+        """ヌル出力デバイスのコールバックが仮想時間で進み、再生位置が時計に従う."""
+        clock = VirtualClock()
+        device = NullAudioDevice(clock)
+        player = AudioPlayer(blocksize=240, clock=clock, output=device)
+        player.load_wav(_wav(np.full(24000 * 3, 0.25)))
+
+        started = time.perf_counter()
+        player.play()
+        clock.advance(1.0)
+        assert player.elapsed_time == pytest.approx(1.0)
+        assert player.is_playing
+        player.wait()
+
+        assert time.perf_counter() - started < 1.0
+        assert clock.now() == pytest.approx(3.0, abs=0.02)
+        assert not player.is_playing
+        assert device.streams[0].frames_written == pytest.approx(24000 * 3, abs=240)
+        assert device.streams[0].peak == pytest.approx(0.25)
+
+    def test_mixer_sample_clock_on_null_device(self):
+        """ミキサーのサンプルクロックも仮想時間のコールバックで進む."""
+        clock = VirtualClock()
+        device = NullAudioDevice(clock)
+        with AudioMixer(sample_rate=24000, blocksize=256, clock=clock, output=device) as mixer:
+            voice = mixer.create_voice()
+            voice.load_wav(_wav(np.full(24000, 0.25)))
+            voice.play()
+            clock.advance(0.5)
+            assert voice.elapsed_at(clock.now()) == pytest.approx(0.5, abs=256 / 24000)
+            clock.advance(1.0)
+            assert not voice.is_playing
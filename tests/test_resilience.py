@@ -0,0 +1,368 @@
+"""VOICEVOXクライアントの耐障害性テスト（障害を注入するローカル模擬Engine）."""
+
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ping_tuber_kai.voicevox.cancel import CancelToken
+from ping_tuber_kai.voicevox.client import (
+    VoicevoxCancelledError,
+    VoicevoxClient,
+    VoicevoxError,
+    VoicevoxUnavailableError,
+)
+from ping_tuber_kai.voicevox.models import AccentPhrase, AudioQuery, Mora
+from ping_tuber_kai.voicevox.resilience import (
+    BreakerState,
+    CircuitBreaker,
+    RetryPolicy,
+    reset_engine_health,
+)
+
+QUERY = AudioQuery(
+    accent_phrases=[
+        AccentPhrase(moras=[Mora(text="ア", vowel="a", vowel_length=0.1, pitch=5.0)], accent=1)
+    ]
+).model_dump_json(by_alias=True)
+
+
+class FaultServer(ThreadingHTTPServer):
+    """障害を順に注入する模擬Engine.
+
+    plan の先頭から1リクエストずつ取り出して応答する（空なら正常応答）。
+    "hang" は応答せず待機、"drop" は応答せず切断、数値はそのHTTPステータスを返す。
+    "trickle" は trickle_body を trickle_chunk バイトずつ間隔を空けて返す。
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _FaultHandler)
+        self.plan: deque = deque()
+        self.hits: list[str] = []
+        self.lock = threading.Lock()
+        self.trickle_body = b""
+        self.trickle_chunk = 1024
+        self.trickle_interval = 0.05
+
+    @property
+    def host(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _FaultHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _handle(self) -> None:
+        server: FaultServer = self.server
+        length = int(self.headers.get("Content-Length", 0))
+        if length:
+            self.rfile.read(length)
+        with server.lock:
+            server.hits.append(self.path.split("?")[0])
+            fault = server.plan.popleft() if server.plan else None
+
+        if fault == "hang":
+            time.sleep(1.0)
+            self.close_connection = True
+            return
+        if fault == "drop":
+            self.close_connection = True
+            self.connection.close()
+            return
+        if fault == "trickle":
+            self._trickle(server)
+            return
+
+        status = fault if isinstance(fault, int) else 200
+        body = (QUERY if self.path.startswith("/audio_query") else json.dumps("0.22.0")).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _trickle(self, server: FaultServer) -> None:
+        body = server.trickle_body
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/wav")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            for start in range(0, len(body), server.trickle_chunk):
+                self.wfile.write(body[start : start + server.trickle_chunk])
+                self.wfile.flush()
+                time.sleep(server.trickle_interval)
+        except OSError:
+            self.close_connection = True
+
+    do_GET = _handle  # noqa: N815
+    do_POST = _handle  # noqa: N815
+
+
+@pytest.fixture(autouse=True)
+def _fresh_health():
+    reset_engine_health()
+    yield
+    reset_engine_health()
+
+
+@pytest.fixture
+def server():
+    server = FaultServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _client(server: FaultServer, **kwargs) -> VoicevoxClient:
+    kwargs.setdefault("retry", RetryPolicy(retries=2, base_delay=0.01))
+    return VoicevoxClient(host=server.host, **kwargs)
+
+
+class TestRetry:
+    """リトライと期限のテスト."""
+
+    def test_retries_transient_errors(self, server):
+        """5xx・切断は再試行して成功する."""
+        server.plan.extend([503, "drop"])
+        with _client(server) as client:
+            query = client.audio_query("あ", 1)
+
+        assert query.accent_phrases[0].moras[0].vowel == "a"
+        assert server.hits.count("/audio_query") == 3
+
+    def test_client_errors_are_not_retried(self, server):
+        """4xxは再試行せず、ステータスを保持して失敗する."""
+        server.plan.append(422)
+        with _client(server) as client, pytest.raises(VoicevoxError) as excinfo:
+            client.audio_query("あ", 1)
+
+        assert excinfo.value.status_code == 422
+        assert len(server.hits) == 1
+
+    def test_gives_up_after_retries(self, server):
+        """再試行回数を超えたら失敗する."""
+        server.plan.extend([500, 500, 500, 500])
+        with _client(server) as client, pytest.raises(VoicevoxError, match="500"):
+            client.audio_query("あ", 1)
+
+        assert len(server.hits) == 3
+
+    def test_deadline_bounds_stalled_engine(self, server):
+        """応答しないEngineでも操作ごとの期限で打ち切る."""
+        server.plan.extend(["hang", "hang", "hang"])
+        with _client(server, deadlines={"audio_query": 0.3}) as client:
+            started = time.perf_counter()
+            with pytest.raises(VoicevoxError):
+                client.audio_query("あ", 1)
+            elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.6
+
+    def test_deadline_bounds_trickled_body(self, server):
+        """少しずつ届く応答も、本文の受信中に期限を過ぎたら打ち切る."""
+        server.trickle_body = bytes(4096)
+        server.trickle_chunk = 256  # 16回に分けて0.8秒かけて送る
+        deadlines = {"audio_query": 0.3, "cancellable_synthesis": 0.3}
+        with _client(server, deadlines=deadlines) as client:
+            for call in (
+                lambda: client.audio_query("あ", 1),
+                lambda: client.synthesis(
+                    AudioQuery.model_validate_json(QUERY), 1, cancel=CancelToken()
+                ),
+            ):
+                server.plan.extend(["trickle"] * 3)
+                started = time.perf_counter()
+                with pytest.raises(VoicevoxError, match="deadline exceeded"):
+                    call()
+                assert time.perf_counter() - started < 0.6
+                server.plan.clear()
+
+    def test_retry_delay_is_bounded(self):
+        """ジッタ付き待機は上限を超えない."""
+        policy = RetryPolicy(base_delay=0.1, max_delay=0.3)
+        delays = [policy.delay(attempt) for attempt in range(6) for _ in range(50)]
+
+        assert all(0.0 <= delay <= 0.3 for delay in delays)
+        assert len(set(delays)) > 1
+
+
+class TestMultiSynthesisFallback:
+    """一括合成のフォールバック条件のテスト."""
+
+    def test_engine_failure_is_not_fanned_out(self, server):
+        """5xxで失敗した一括合成は、synthesisの並行呼び出しに切り替えない."""
+        server.plan.extend([503, 503, 503])
+        queries = [AudioQuery.model_validate_json(QUERY)] * 2
+        with _client(server) as client, pytest.raises(VoicevoxError) as excinfo:
+            client.synthesize_many(queries, 1)
+
+        assert excinfo.value.status_code == 503
+        assert server.hits == ["/multi_synthesis"] * 3
+
+    def test_invalid_zip_falls_back(self, server):
+        """応答がzipでなければsynthesisの並行呼び出しに切り替える."""
+        queries = [AudioQuery.model_validate_json(QUERY)] * 2
+        with _client(server) as client:
+            assert len(client.synthesize_many(queries, 1)) == 2
+
+        assert server.hits == ["/multi_synthesis", "/synthesis", "/synthesis"]
+
+
+class TestCircuitBreaker:
+    """サーキットブレーカーと共有ヘルス状態のテスト."""
+
+    def test_fails_fast_while_open(self, server):
+        """連続失敗で遮断し、遮断中はリクエストを送らずに失敗する."""
+        server.plan.extend([503] * 4)
+        client = _client(server, retry=RetryPolicy(retries=0))
+        client.health.breaker = CircuitBreaker(threshold=2, reset_timeout=0.2)
+
+        for _ in range(2):
+            with pytest.raises(VoicevoxError):
+                client.synthesis(AudioQuery.model_validate_json(QUERY), 1)
+        hits = len(server.hits)
+
+        started = time.perf_counter()
+        with pytest.raises(VoicevoxUnavailableError):
+            client.audio_query("あ", 1)
+        assert time.perf_counter() - started < 0.05
+        assert len(server.hits) == hits
+        assert not client.is_available()
+
+        # 遮断時間経過後の試行が成功すれば解除
+        server.plan.clear()
+        time.sleep(0.25)
+        assert client.health.breaker.state == BreakerState.HALF_OPEN
+        client.audio_query("い", 1)
+        assert client.health.breaker.state == BreakerState.CLOSED
+        client.close()
+
+    def test_half_open_allows_single_trial(self):
+        """半開中は試行1件だけ通し、失敗すれば再び遮断する."""
+        breaker = CircuitBreaker(threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        assert not breaker.allow()
+
+        time.sleep(0.06)
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == BreakerState.OPEN
+
+    def test_health_is_shared_and_cached(self, server):
+        """接続確認は同じEngineのクライアント間で共有・キャッシュされる."""
+        with _client(server) as first, _client(server) as second:
+            assert first.is_available()
+            assert second.is_available()
+            second.audio_query("あ", 1)
+            assert first.is_available()
+
+        assert server.hits.count("/version") == 1
+
+
+class TestCancel:
+    """送信中リクエストのキャンセルのテスト."""
+
+    def test_cancel_aborts_in_flight_synthesis(self, server):
+        """合成中にキャンセルすると応答を待たずに中断する."""
+        server.plan.append("hang")
+        token = CancelToken()
+        threading.Timer(0.1, token.cancel).start()
+
+        with _client(server) as client:
+            started = time.perf_counter()
+            with pytest.raises(VoicevoxCancelledError):
+                client.synthesis(AudioQuery.model_validate_json(QUERY), 1, cancel=token)
+            elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.5
+        assert server.hits == ["/cancellable_synthesis"]
+
+    def test_falls_back_without_cancellable_synthesis(self, server):
+        """/cancellable_synthesisが無効なEngineでは/synthesisを使う."""
+        server.plan.append(404)
+        with _client(server) as client:
+            query = AudioQuery.model_validate_json(QUERY)
+            assert client.synthesis(query, 1, cancel=CancelToken())
+            assert client.synthesis(query, 1, cancel=CancelToken())
+
+        assert server.hits == ["/cancellable_synthesis", "/synthesis", "/synthesis"]
+
+    def test_cancelled_token_skips_request(self, server):
+        """キャンセル済みのトークンではリクエストを送らない."""
+        token = CancelToken()
+        token.cancel()
+        with _client(server) as client, pytest.raises(VoicevoxCancelledError):
+            client.audio_query("あ", 1, cancel=token)
+
+        assert server.hits == []
+
+
+class TestSynthesisStream:
+    """合成結果のストリーミング受信のテスト."""
+
+    def test_yields_chunks_before_response_completes(self, server):
+        """応答全体を待たずに届いた順にチャンクを返す."""
+        server.trickle_body = bytes(range(256)) * 16  # 4096バイトを4回に分けて送る
+        server.plan.append("trickle")
+        with _client(server) as client:
+            started = time.perf_counter()
+            chunks = client.synthesis_stream(AudioQuery.model_validate_json(QUERY), 1)
+            first = next(chunks)
+            first_at = time.perf_counter() - started
+            received = first + b"".join(chunks)
+            total = time.perf_counter() - started
+
+        assert received == server.trickle_body
+        assert first_at < total - 2 * server.trickle_interval
+        assert server.hits == ["/synthesis"]
+
+    def test_server_error_is_not_retried(self, server):
+        """5xxはブレーカーに記録して失敗し、再試行しない."""
+        server.plan.append(503)
+        with _client(server) as client, pytest.raises(VoicevoxError) as excinfo:
+            list(client.synthesis_stream(AudioQuery.model_validate_json(QUERY), 1))
+
+        assert excinfo.value.status_code == 503
+        assert server.hits == ["/synthesis"]
+
+    def test_cancel_stops_receiving(self, server):
+        """キャンセルすると受信を打ち切る."""
+        server.trickle_body = bytes(64 * 1024)
+        server.plan.append("trickle")
+        token = CancelToken()
+        with _client(server) as client, pytest.raises(VoicevoxCancelledError):
+            for _ in client.synthesis_stream(
+                AudioQuery.model_validate_json(QUERY), 1, cancel=token
+            ):
+                token.cancel()
+
+    def test_deadline_and_latency(self, server):
+        """受信の完了までを期限で打ち切り、所要時間をon_requestに通知する."""
+        server.trickle_body = bytes(4096)
+        server.trickle_chunk = 256  # 16回に分けて0.8秒かけて送る
+        server.plan.append("trickle")
+        calls = []
+        with _client(server, deadlines={"synthesis": 0.3}) as client:
+            client.on_request = lambda *args: calls.append(args)
+            started = time.perf_counter()
+            with pytest.raises(VoicevoxError, match="deadline exceeded"):
+                list(client.synthesis_stream(AudioQuery.model_validate_json(QUERY), 1))
+            assert time.perf_counter() - started < 0.6
+
+            server.plan.clear()
+            assert list(client.synthesis_stream(AudioQuery.model_validate_json(QUERY), 1))
+
+        assert [(op, ok) for op, _, ok in calls] == [("synthesis", False), ("synthesis", True)]
+        assert calls[0][1] >= 0.3
@@ -0,0 +1,251 @@
+"""セッション記録・再現のテスト."""
+
+import json
+
+import httpx
+import pytest
+
+from ping_tuber_kai.lipsync.viseme import Viseme
+from ping_tuber_kai.player.audio import LatencyStats
+from ping_tuber_kai.player.sync import SyncEngine
+from ping_tuber_kai.session import SessionRecorder, read_sessions, replay
+from ping_tuber_kai.session.recorder import query_json, wav_hash
+from ping_tuber_kai.ui.avatar import Avatar, AvatarConfig
+from ping_tuber_kai.voicevox.client import VoicevoxClient, VoicevoxError
+from ping_tuber_kai.voicevox.models import AccentPhrase, AudioQuery, Mora
+from ping_tuber_kai.voicevox.view import AudioQueryView, parse_query_view
+
+FPS = 60
+
+
+class _Clock:
+    """手動で進める時計."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _PositionPlayer:
+    """指定した再生位置を返すプレイヤー."""
+
+    def __init__(self):
+        self.position: float | None = None
+        self.cancel_latency = LatencyStats()
+
+    @property
+    def is_playing(self) -> bool:
+        return self.position is not None
+
+    @property
+    def elapsed_time(self) -> float:
+        return self.position or 0.0
+
+    def elapsed_at(self, at: float) -> float:
+        return self.elapsed_time
+
+    def play(self, blocking: bool = False) -> None:
+        self.position = 0.0
+
+    def stop(self) -> None:
+        self.position = None
+
+    def fade_out(self) -> None:
+        pass
+
+
+class _Window:
+    def set_viseme(self, viseme: Viseme) -> None:
+        pass
+
+    def set_blend(self, blend) -> None:
+        pass
+
+    def set_openness(self, openness) -> None:
+        pass
+
+
+class _Sink:
+    def __init__(self):
+        self.visemes: list[Viseme] = []
+
+    def set_viseme(self, viseme: Viseme) -> None:
+        self.visemes.append(viseme)
+
+
+def _query() -> AudioQuery:
+    def mora(text: str, consonant: str | None, vowel: str) -> Mora:
+        return Mora(
+            text=text,
+            consonant=consonant,
+            consonant_length=0.05 if consonant else None,
+            vowel=vowel,
+            vowel_length=0.12,
+            pitch=5.0,
+        )
+
+    moras = [mora("コ", "k", "o"), mora("ン", None, "N"), mora("ニ", "n", "i")]
+    moras += [mora("チ", "ch", "i"), mora("ワ", "w", "a")]
+    return AudioQuery(accent_phrases=[AccentPhrase(moras=moras, accent=5)])
+
+
+def _record(path, clock: _Clock, late_at: int | None = None) -> None:
+    """1体のアバターが1回発話するセッションを記録（フレームは60fps）."""
+    player = _PositionPlayer()
+    engine = SyncEngine(fps=FPS, player=player)
+    engine.prepare_query(_query())
+    avatar = Avatar(AvatarConfig(name="zundamon"), None, engine, _Window())
+
+    with SessionRecorder(path, ["zundamon"], FPS, clock=clock) as recorder:
+        avatar.recorder = recorder
+        recorder.speak("zundamon", "こんにちは", 3)
+        recorder.request("audio_query", 0.012, True)
+        recorder.request("synthesis", 0.2, True)
+        engine.play()
+        avatar._record_play(_query(), b"RIFF....WAVE")
+
+        frame = 0
+        while player.position is not None:
+            deadline = clock.now
+            clock.now += 0.004 if frame != late_at else 0.03
+            avatar.update(at=deadline)
+            recorder.frame(deadline, [avatar.position])
+            clock.now = deadline + 1 / FPS
+            frame += 1
+            player.position = frame / FPS if frame / FPS < engine.duration else None
+        avatar.update(at=clock.now)
+        recorder.frame(clock.now, [avatar.position])
+
+
+class TestSessionRecorder:
+    """セッション記録のテスト."""
+
+    def test_records_are_compact_lines(self, tmp_path):
+        """1行1レコード（区切りに空白なし）で、時刻はセッション開始からの秒."""
+        clock = _Clock()
+        path = tmp_path / "session.jsonl"
+        with SessionRecorder(path, ["a", "b"], FPS, clock=clock) as recorder:
+            clock.now += 0.5
+            recorder.speak("b", "やあ", 1)
+            recorder.viseme("b", 0.25, Viseme.A)
+            recorder.request("synthesis", 0.1234567, False)
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert " " not in "".join(lines)
+        assert json.loads(lines[0])[:4] == ["h", 1, FPS, ["a", "b"]]
+        assert json.loads(lines[1]) == ["s", 0.5, 1, "やあ", 1]
+        assert json.loads(lines[2]) == ["v", 0.5, 1, 0.25, "a"]
+        assert json.loads(lines[3]) == ["c", 0.5, "synthesis", 0.123457, 0]
+
+    def test_appends_sessions_and_skips_torn_line(self, tmp_path):
+        """追記したセッションは別々に読め、書きかけの最終行は読み飛ばす."""
+        path = tmp_path / "session.jsonl"
+        for text in ("1回目", "2回目"):
+            with SessionRecorder(path, ["a"], FPS) as recorder:
+                recorder.speak("a", text, 0)
+        with path.open("a", encoding="utf-8") as f:
+            f.write('["f",1.0,0.9')
+
+        sessions = read_sessions(path)
+        assert [s.records[0][3] for s in sessions] == ["1回目", "2回目"]
+        assert len(sessions[1].records) == 1
+
+    def test_query_json_round_trips_view(self):
+        """軽量ビューも読み戻せる形で記録する."""
+        view = AudioQueryView.from_query(_query())
+        assert parse_query_view(json.dumps(query_json(view))) == view
+        assert parse_query_view(json.dumps(query_json(_query()))) == view
+
+    def test_client_reports_request_latency(self):
+        """VOICEVOXへのリクエストごとに所要時間と成否を通知する."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/audio_query":
+                return httpx.Response(200, json=_query().model_dump(by_alias=True))
+            return httpx.Response(400)
+
+        client = VoicevoxClient(host="http://engine")
+        client._client = httpx.Client(
+            base_url="http://engine", transport=httpx.MockTransport(handler)
+        )
+        calls = []
+        client.on_request = lambda *args: calls.append(args)
+        client.audio_query("こんにちは", 1)
+        with pytest.raises(VoicevoxError):
+            client.synthesis(_query(), 1)
+
+        assert [(op, ok) for op, _, ok in calls] == [("audio_query", True), ("synthesis", False)]
+        assert all(seconds >= 0 for _, seconds, _ in calls)
+
+
+class TestReplay:
+    """セッション再現のテスト."""
+
+    def test_replay_matches_recording(self, tmp_path):
+        """同じ口形状生成で再現すれば記録と一致し、実時間より速く終わる."""
+        path = tmp_path / "session.jsonl"
+        _record(path, _Clock())
+        session = read_sessions(path)[0]
+
+        sink = _Sink()
+        report = replay(session, sinks={"zundamon": [sink]})
+
+        assert report.divergences == []
+        assert report.late == []
+        assert report.utterances == 1
+        assert report.speak_requests == 1
+        assert report.frames > 30
+        assert report.request_latency["synthesis"].max == 0.2
+        assert sink.visemes[0] != Viseme.CLOSED
+        assert sink.visemes[-1] == Viseme.CLOSED
+        assert Viseme.O in sink.visemes and Viseme.A in sink.visemes
+        assert report.replay_seconds < report.duration
+        assert "0 diverged" in report.summary()
+
+    def test_reports_late_and_dropped_frames(self, tmp_path):
+        """締め切りから遅れて反映したフレームと、飛ばした締め切りを報告する."""
+        path = tmp_path / "session.jsonl"
+        _record(path, _Clock(), late_at=5)
+        session = read_sessions(path)[0]
+        frames = [r for r in session.records if r[0] == "f"]
+        # 10フレーム目の後の締め切りを2つ飛ばしたことにする
+        offset = 2 / FPS
+        for record in frames[10:]:
+            record[1] += offset
+            record[2] += offset
+
+        report = replay(session)
+
+        assert [(frame.index, frame.dropped) for frame in report.late] == [(5, 0), (10, 2)]
+        assert abs(report.late[0].lateness - 0.03) < 1e-6
+
+    def test_reports_divergence(self, tmp_path):
+        """記録と違う口形状になったフレームを報告する."""
+        path = tmp_path / "session.jsonl"
+        _record(path, _Clock())
+        session = read_sessions(path)[0]
+        for record in session.records:
+            if record[0] == "v" and record[4] == "a":
+                record[4] = "o"
+
+        report = replay(session)
+
+        assert report.divergences
+        assert {(d.recorded, d.replayed) for d in report.divergences} == {(Viseme.O, Viseme.A)}
+        assert all(d.avatar == "zundamon" for d in report.divergences)
+
+    def test_records_hash_and_interrupt(self, tmp_path):
+        """WAVはハッシュで記録し、中断した発話はそれ以降の口形状を求めない."""
+        path = tmp_path / "session.jsonl"
+        with SessionRecorder(path, ["a"], FPS) as recorder:
+            recorder.play("a", _query(), b"RIFF", 0.7)
+            recorder.stop("a")
+            recorder.frame(None, [None])
+
+        session = read_sessions(path)[0]
+        assert session.records[0][4] == wav_hash(b"RIFF")
+        report = replay(session)
+        assert report.utterances == 1
+        assert report.divergences == []
@@ -0,0 +1,593 @@
+"""UIモジュールのテスト."""
+
+import io
+import os
+import threading
+import time
+
+import httpx
+import numpy as np
+import pygame
+import pytest
+import soundfile as sf
+
+from ping_tuber_kai.clock import VirtualClock
+from ping_tuber_kai.config import settings
+from ping_tuber_kai.lipsync.openness import Openness
+from ping_tuber_kai.lipsync.scheduler import MouthFrame, MouthSchedule
+from ping_tuber_kai.lipsync.viseme import Viseme
+from ping_tuber_kai.output.pygame_window import PygameWindow
+from ping_tuber_kai.player import audio as audio_module
+from ping_tuber_kai.player.mixer import AudioMixer
+from ping_tuber_kai.player.null_device import NullAudioDevice
+from ping_tuber_kai.player.sync import SyncEngine
+from ping_tuber_kai.session import read_sessions, replay
+from ping_tuber_kai.ui.app import App
+from ping_tuber_kai.ui.avatar import Avatar, AvatarConfig
+from ping_tuber_kai.ui.idle import BLINK_OVERLAY, IdleAnimator, IdleScheduler, _breathe_plan
+from ping_tuber_kai.ui.speech_queue import DropPolicy, SpeechPriority, SpeechQueue
+from ping_tuber_kai.ui.warmup import Warmup
+from ping_tuber_kai.voicevox.client import VoicevoxCancelledError, VoicevoxClient, VoicevoxError
+from ping_tuber_kai.voicevox.models import AccentPhrase, AudioQuery, Mora
+
+# ウィンドウを開かずに描画する
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+
+class _Player:
+    """出力デバイスの代わり."""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.calls = 0
+
+    def warm_up(self) -> float:
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("no device")
+        return 0.01
+
+
+def _engine(paths: list[str]) -> VoicevoxClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        if request.url.path == "/is_initialized_speaker":
+            return httpx.Response(200, json=False)
+        if request.url.path == "/initialize_speaker":
+            return httpx.Response(204)
+        if request.url.path == "/audio_query":
+            query = AudioQuery(
+                accent_phrases=[
+                    AccentPhrase(
+                        moras=[Mora(text="ア", vowel="a", vowel_length=0.1, pitch=5.0)],
+                        accent=1,
+                    )
+                ]
+            )
+            return httpx.Response(200, json=query.model_dump(by_alias=True))
+        if request.url.path == "/synthesis":
+            return httpx.Response(200, content=b"RIFF")
+        return httpx.Response(404)
+
+    client = VoicevoxClient(host="http://engine")
+    client._client = httpx.Client(base_url="http://engine", transport=httpx.MockTransport(handler))
+    return client
+
+
+class TestWarmup:
+    """ウォームアップのテスト."""
+
+    def test_background_warmup(self):
+        """話者初期化・短い発話・デバイスオープンをバックグラウンドで行う."""
+        paths: list[str] = []
+        client = _engine(paths)
+        player = _Player()
+        warmup = Warmup(client, [1, 3], player=player, text="あ")
+
+        warmup.start()
+        assert warmup.wait(timeout=5.0)
+
+        report = warmup.report
+        assert warmup.is_done
+        assert set(report.speakers) == {1, 3}
+        assert paths.count("/initialize_speaker") == 2
+        assert paths.count("/synthesis") == 1
+        assert player.calls == 1
+        assert report.total >= report.utterance
+        assert not report.errors
+        assert "Warm-up finished" in report.summary()
+
+        # 発話はクエリキャッシュに残る
+        client.audio_query("あ", 1)
+        assert paths.count("/audio_query") == 1
+
+    def test_errors_are_reported(self):
+        """失敗した段階は報告に記録し、他の段階は続行する."""
+        player = _Player(fail=True)
+        warmup = Warmup(None, [], player=player)
+
+        report = warmup.run()
+
+        assert report.speakers == {}
+        assert player.calls == 1
+        assert report.errors == ["audio: no device"]
+        assert "1 error" in report.summary()
+
+
+class _Synth:
+    """合成を手動で完了させる模擬クライアント."""
+
+    def __init__(self, size: int = 1000, block: bool = False):
+        self.size = size
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+        self.started: list[str] = []
+        self.cancelled: list[str] = []
+        self.lock = threading.Lock()
+
+    def speak(self, text, speaker_id=None, cancel=None):
+        with self.lock:
+            self.started.append(text)
+        while not self.release.wait(0.005):
+            if cancel is not None and cancel.is_cancelled:
+                with self.lock:
+                    self.cancelled.append(text)
+                raise VoicevoxCancelledError("cancelled")
+        return AudioQuery(accent_phrases=[]), b"\0" * self.size
+
+
+def _drain(queue: SpeechQueue, count: int, timeout: float = 2.0) -> list[str]:
+    spoken = []
+    deadline = time.monotonic() + timeout
+    while len(spoken) < count and time.monotonic() < deadline:
+        item = queue.pop_ready()
+        if item is None:
+            time.sleep(0.005)
+        else:
+            spoken.append(item.text)
+    return spoken
+
+
+class TestSpeechQueue:
+    """発話キューのテスト."""
+
+    def test_priority_order_and_dedup(self):
+        """優先度の高い順・投入順に発話し、待機中の同じ発話はまとめる."""
+        synth = _Synth(block=True)
+        queue = SpeechQueue(synth, max_depth=8, prefetch=1)
+        queue.submit("a")
+        queue.submit("b")
+        queue.submit("c", priority=SpeechPriority.HIGH)
+        assert queue.submit("b", priority=SpeechPriority.HIGH).priority == SpeechPriority.HIGH
+
+        synth.release.set()
+        assert _drain(queue, 3) == ["b", "c", "a"]
+        assert queue.metrics.deduplicated == 1
+        assert queue.metrics.evicted >= 1  # 先頭から外れた"a"の先行合成は取り消し
+        assert queue.metrics.spoken == 3
+        queue.close()
+
+    def test_drop_policies(self):
+        """満杯のときは方針に従って捨てる."""
+        synth = _Synth(block=True)
+        oldest = SpeechQueue(synth, max_depth=2, policy=DropPolicy.OLDEST, prefetch=1)
+        lowest = SpeechQueue(synth, max_depth=2, policy=DropPolicy.LOWEST_PRIORITY, prefetch=1)
+        for queue in (oldest, lowest):
+            queue.submit("low", priority=SpeechPriority.LOW)
+            queue.submit("normal")
+            queue.submit("high", priority=SpeechPriority.HIGH)
+
+        assert [item.text for item in oldest.pending()] == ["high", "normal"]
+        assert [item.text for item in lowest.pending()] == ["high", "normal"]
+        assert lowest.submit("late", priority=SpeechPriority.LOW) is None
+        assert lowest.metrics.dropped == 2
+
+        # 先行合成中に捨てた発話はリクエストも中断する
+        time.sleep(0.05)
+        assert "low" in synth.cancelled
+        synth.release.set()
+        oldest.close()
+        lowest.close()
+
+    def test_bounded_buffers_under_flood(self):
+        """大量投入でも待機件数・保持するWAVは上限内に収まる."""
+        synth = _Synth(size=10_000)
+        queue = SpeechQueue(synth, max_depth=5, prefetch=2, max_buffer_bytes=15_000)
+        for i in range(200):
+            queue.submit(f"msg {i}", priority=SpeechPriority(i % 3))
+            if i % 20 == 0:
+                queue.pop_ready()
+        time.sleep(0.05)
+
+        metrics = queue.metrics
+        assert metrics.peak_depth <= 5
+        assert metrics.peak_buffered_bytes <= 2 * 10_000
+        assert metrics.dropped > 150
+        assert len(_drain(queue, 5)) == 5
+        assert queue.metrics.buffered_bytes == 0
+        queue.close()
+
+    def test_prefetch_while_playing(self):
+        """再生中に次の発話を先行合成しておく."""
+        queue = SpeechQueue(_Synth(), prefetch=2)
+        queue.submit("first")
+        queue.submit("second")
+        assert _drain(queue, 1) == ["first"]
+        time.sleep(0.05)
+
+        assert queue.pop_ready().text == "second"
+        assert queue.metrics.prefetch_hits >= 1
+        assert queue.metrics.wait.count == 2
+        queue.close()
+
+    def test_failure_wakes_consumer(self):
+        """合成に失敗したら再生側を起こし、失敗した発話を捨てて次を合成する."""
+
+        class _Failing(_Synth):
+            def speak(self, text, speaker_id=None, cancel=None):
+                if text == "bad":
+                    raise VoicevoxError("engine down")
+                return super().speak(text, speaker_id, cancel)
+
+        woken = threading.Event()
+        queue = SpeechQueue(_Failing(), prefetch=1, on_ready=woken.set)
+        queue.submit("bad")
+        queue.submit("good")
+        assert woken.wait(1.0)
+
+        assert _drain(queue, 1) == ["good"]
+        assert queue.metrics.failed == 1
+        queue.close()
+
+    def test_wait_uses_injected_clock(self):
+        """待ち時間は渡した時計で測る."""
+        clock = VirtualClock()
+        queue = SpeechQueue(_Synth(), prefetch=1, clock=clock.now)
+        item = queue.submit("a")
+        assert item.enqueued_at == clock.now()
+        clock.advance(2.5)
+
+        assert _drain(queue, 1) == ["a"]
+        assert queue.metrics.wait.max == pytest.approx(2.5)
+        queue.close()
+
+
+class TestMultiAvatar:
+    """複数アバターのテスト."""
+
+    def test_avatars_share_client_and_mixer(self, tmp_path):
+        """アバターごとの話者・描画領域・OBSプレフィックスを持ち、クライアントと出力は共有."""
+        configs = [
+            AvatarConfig("zundamon", speaker_id=3, assets_dir=tmp_path, obs_source_prefix="z_"),
+            AvatarConfig("metan", speaker_id=2, assets_dir=tmp_path, obs_source_prefix="m_"),
+        ]
+        app = App(avatars=configs, warmup=False)
+        app.init()
+        try:
+            first, second = app.avatars
+            assert app.warmup_speakers == [3, 2]
+            assert first.client is second.client
+            assert first.queue.client is first.client
+            assert first.sync_engine.player.mixer is second.sync_engine.player.mixer
+            assert first.window.screen is second.window.screen
+            assert second.window.position == (first.window.width, 0)
+            assert app.avatar("metan") is second
+            assert second.config.obs_source_prefix == "m_"
+        finally:
+            app.quit()
+
+
+class _IdleStream:
+    """コールバックを呼ばない出力ストリーム."""
+
+    def __init__(self, **kwargs):
+        pass
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class _StreamingSynth:
+    """先頭チャンクだけ返し、残りは手動で送る模擬クライアント."""
+
+    def __init__(self):
+        self.rest = threading.Event()
+        self.query: AudioQuery | None = None
+
+    def deadline(self, operation: str) -> float:
+        return 1.0
+
+    def audio_query(self, text, speaker_id=None, cancel=None):
+        mora = Mora(text="ア", vowel="a", vowel_length=0.5, pitch=5.0)
+        self.query = AudioQuery(accent_phrases=[AccentPhrase(moras=[mora], accent=1)])
+        return self.query
+
+    def synthesis_stream(self, query, speaker_id=None, cancel=None):
+        buffer = io.BytesIO()
+        sf.write(
+            buffer, np.full(12000, 0.25, dtype=np.float32), query.output_sampling_rate, format="WAV"
+        )
+        wav = buffer.getvalue()
+        yield wav[:1024]
+        self.rest.wait(2.0)
+        yield wav[1024:]
+
+
+class TestStreamingSpeech:
+    """受信しながら発話するテスト."""
+
+    def test_playback_starts_before_synthesis_completes(self, monkeypatch):
+        """先頭チャンクが届いた時点で再生と口形状が始まる."""
+        monkeypatch.setattr(audio_module.sd, "OutputStream", _IdleStream)
+        client = _StreamingSynth()
+        with AudioMixer(sample_rate=24000, blocksize=256) as mixer:
+            engine = SyncEngine(player=mixer.create_voice())
+            avatar = Avatar(AvatarConfig(), client, engine, window=None)
+            try:
+                assert avatar.speak("あ")
+                assert not client.rest.is_set()
+                assert client.query.output_sampling_rate == 24000
+                assert engine.is_playing
+                assert engine.duration == pytest.approx(0.5)  # WAVヘッダの長さ
+                assert engine.schedule is not None
+            finally:
+                client.rest.set()
+                avatar.interrupt()
+
+
+class _FakeEngine:
+    """再生位置を手動で進める同期エンジン."""
+
+    def __init__(self):
+        self.is_playing = False
+        self.schedule: MouthSchedule | None = None
+        self.elapsed_time = 0.0
+
+    def elapsed_at(self, at=None) -> float:
+        return self.elapsed_time
+
+    def update(self, at=None) -> Viseme:
+        return Viseme.A if self.is_playing else Viseme.CLOSED
+
+    def get_current_blend(self, at=None):
+        return None
+
+    def get_current_openness(self, at=None) -> Openness:
+        return Openness.NORMAL
+
+
+class _FakeWindow:
+    def set_openness(self, openness) -> None:
+        pass
+
+    def set_viseme(self, viseme) -> None:
+        pass
+
+
+class _RecordingChannel:
+    def __init__(self):
+        self.calls: list[tuple] = []
+
+    def play(self, transitions, started_at) -> None:
+        self.calls.append(("play", transitions))
+        self.started_at = started_at
+
+    def stop(self, viseme=Viseme.CLOSED) -> None:
+        self.calls.append(("stop", viseme))
+
+    def set_viseme(self, viseme) -> None:
+        self.calls.append(("set", viseme))
+
+
+class TestBrowserSourceSync:
+    """アバターからブラウザソースへの反映のテスト."""
+
+    def test_schedule_is_sent_once_per_utterance(self):
+        """再生開始後に予定を1回だけ送り、終わったら止める."""
+        engine = _FakeEngine()
+        channel = _RecordingChannel()
+        avatar = Avatar(AvatarConfig(), None, engine, _FakeWindow(), browser=channel)
+        schedule: MouthSchedule = [MouthFrame(0, 0.0, Viseme.A), MouthFrame(1, 1 / 60, Viseme.A)]
+
+        engine.is_playing, engine.schedule = True, schedule
+        avatar.update()  # 最初のサンプルが出るまでは送らない
+        started = time.time()
+        for _ in range(10):
+            engine.elapsed_time = time.time() - started + 0.001
+            avatar.update()
+            time.sleep(0.005)
+        engine.is_playing = False
+        avatar.update()
+        avatar.update()
+
+        # 停止後の口形状は毎フレーム渡す（変化の判定はチャンネル側）
+        assert channel.calls == [
+            ("play", [(0.0, Viseme.A)]),
+            ("stop", Viseme.CLOSED),
+            ("set", Viseme.CLOSED),
+        ]
+
+    def test_virtual_clock_sends_schedule_once(self):
+        """仮想時間でも締め切りの再生位置で比べるので、予定を送り直さない."""
+        clock = VirtualClock(start=50.0)
+        engine = _FakeEngine()
+        engine.elapsed_at = lambda at: at - 10.0
+        channel = _RecordingChannel()
+        avatar = Avatar(AvatarConfig(), None, engine, _FakeWindow(), browser=channel, clock=clock)
+        engine.is_playing, engine.schedule = True, [MouthFrame(0, 0.0, Viseme.A)]
+
+        for _ in range(600):
+            avatar.update(at=clock.now())
+            clock.advance(1 / 60)
+
+        assert [call[0] for call in channel.calls] == ["play"]
+        # 開始時刻は実時刻に換算して送る（40秒前に再生を始めた）
+        assert abs(channel.started_at - (time.time() - 40.0)) < 1.0
+
+
+class TestIdle:
+    """アイドルアニメーションのテスト."""
+
+    @pytest.fixture
+    def window(self, tmp_path):
+        pygame.init()
+        eyes = pygame.Surface((100, 100), pygame.SRCALPHA)
+        eyes.fill((0, 0, 0, 255), pygame.Rect(30, 20, 40, 4))
+        pygame.image.save(eyes, str(tmp_path / f"overlay_{BLINK_OVERLAY}.png"))
+        with PygameWindow(width=100, height=100, assets_dir=tmp_path) as window:
+            yield window
+
+    def test_scheduler_runs_in_time_order(self):
+        """予定は時刻順に実行し、取り消した予定は実行しない."""
+        scheduler = IdleScheduler(clock=lambda: 0.0)
+        ran: list[str] = []
+        scheduler.schedule(2.0, lambda now: ran.append("b"))
+        cancelled = scheduler.schedule(1.5, lambda now: ran.append("x"))
+        scheduler.schedule(1.0, lambda now: ran.append("a"))
+        scheduler.cancel(cancelled)
+
+        assert scheduler.timeout() == 1.0
+        assert scheduler.run_due(1.9) == 1
+        assert scheduler.timeout(1.9) == pytest.approx(0.1)
+        scheduler.run_due(5.0)
+        assert ran == ["a", "b"]
+        assert scheduler.timeout() is None
+
+    def test_blink_toggles_overlay(self, window, monkeypatch):
+        """まばたきの間だけ目のオーバーレイを表示し、その矩形だけを描き直す."""
+        monkeypatch.setattr(settings, "idle_breathe_amplitude", 0)
+        scheduler = IdleScheduler(clock=lambda: 0.0)
+        idle = IdleAnimator(scheduler, window, lambda: False, seed=1)
+        idle.start(0.0)
+        window.draw()
+        overlay = window.compositor.get_overlay(BLINK_OVERLAY)
+        assert not overlay.visible
+
+        due = scheduler.timeout(0.0)
+        assert settings.idle_blink_interval[0] <= due <= settings.idle_blink_interval[1]
+        scheduler.run_due(due)
+        assert overlay.visible
+        assert window.draw() == [overlay.rect]
+
+        scheduler.run_due(due + settings.idle_blink_duration)
+        assert not overlay.visible or idle.blinks == 2  # 連続まばたき
+        assert idle.blinks >= 1
+
+    def test_blink_waits_for_mouth_to_stop(self, window, monkeypatch):
+        """口が動いている間はまばたきを先送りし、止まったら瞬く."""
+        monkeypatch.setattr(settings, "idle_breathe_amplitude", 0)
+        speaking = [True]
+        scheduler = IdleScheduler(clock=lambda: 0.0)
+        idle = IdleAnimator(scheduler, window, lambda: speaking[0], seed=1)
+        idle.start(0.0)
+
+        now = scheduler.timeout(0.0)
+        scheduler.run_due(now)
+        assert idle.blinks == 0
+        assert idle.deferred == 1
+
+        speaking[0] = False
+        now += settings.idle_blink_defer
+        scheduler.run_due(now)
+        assert idle.blinks == 1
+
+    def test_breathe_plan_skips_unchanged_steps(self):
+        """呼吸は上下のずれが変わる段だけを予定し、1周期の長さは保つ."""
+        plan = _breathe_plan(4.0, 2)
+        offsets = [offset for _, offset in plan]
+
+        assert sum(delay for delay, _ in plan) == pytest.approx(4.0)
+        assert set(offsets) == {0, 1, 2}
+        assert all(a != b for a, b in zip(offsets, offsets[1:] + offsets[:1], strict=True))
+        assert _breathe_plan(4.0, 0) == []
+
+    def test_breathing_shifts_whole_avatar(self, window):
+        """呼吸で全体をずらすと描画領域全体を描き直し、はみ出さない."""
+        window.draw()
+        window.set_offset((0, 2))
+        assert window.draw() == [pygame.Rect(0, 0, 100, 100)]
+        assert window.draw() == []
+
+    def test_idle_loop_sleeps_until_next_event(self, tmp_path, monkeypatch):
+        """何も動かない間は描画ループが60fpsで回らない."""
+        monkeypatch.setattr(settings, "idle_breathe_amplitude", 0)
+        app = App(avatars=[AvatarConfig(assets_dir=tmp_path)], warmup=False)
+        app.init()
+        frames = []
+        window = app.avatars[0].window
+        tick = window.tick
+        monkeypatch.setattr(window, "tick", lambda fps=None: frames.append(1) or tick(fps))
+        threading.Timer(0.6, app.stop).start()
+        try:
+            app.run()
+        finally:
+            app.quit()
+
+        assert len(frames) < 15  # 60fpsなら約36フレーム
+
+
+class _InstantSynth:
+    """すぐに合成結果を返すクライアント（1.2秒の「あいうえお」）."""
+
+    def __init__(self):
+        moras = [
+            Mora(text=text, vowel=vowel, vowel_length=0.2, pitch=5.0)
+            for text, vowel in zip("アイウエオ", "aiueo", strict=True)
+        ]
+        self.query = AudioQuery(accent_phrases=[AccentPhrase(moras=moras, accent=1)])
+        buffer = io.BytesIO()
+        sf.write(buffer, np.full(int(24000 * 1.2), 0.25, dtype=np.float32), 24000, format="WAV")
+        self.wav = buffer.getvalue()
+
+    def speak(self, text, speaker_id=None, cancel=None):
+        return self.query, self.wav
+
+
+class TestVirtualTime:
+    """仮想時間で長時間の配信を回すテスト."""
+
+    def test_ten_minute_broadcast_runs_in_seconds(self, tmp_path, monkeypatch):
+        """10分間（20秒ごとに発話）をヌル出力デバイスで回し、記録を再現すると一致する."""
+        monkeypatch.setattr(settings, "voicevox_stream_synthesis", False)
+        clock = VirtualClock()
+        device = NullAudioDevice(clock)
+        record = tmp_path / "session.jsonl"
+        app = App(
+            avatars=[AvatarConfig(assets_dir=tmp_path)],
+            warmup=False,
+            clock=clock,
+            audio_output=device,
+            record_path=record,
+        )
+        app.init()
+        app.avatar().client = _InstantSynth()
+        for index in range(30):
+            clock.call_at(10.0 + index * 20.0, lambda now: app.speak("あいうえお"))
+        clock.call_at(600.0, lambda now: app.stop())
+
+        started = time.perf_counter()
+        try:
+            app.run()
+        finally:
+            app.quit()
+        elapsed = time.perf_counter() - started
+
+        assert clock.now() == pytest.approx(600.0, abs=0.2)
+        assert elapsed < 30.0
+        # ミキサーは最初の発話から止まらずにコールバックを受けている
+        stream = device.streams[0]
+        assert stream.frames_written == pytest.approx(590 * 24000 * 1.0, rel=0.01)
+        assert stream.peak == pytest.approx(0.25)
+
+        report = replay(read_sessions(record)[0])
+        assert report.utterances == 30
+        assert report.divergences == []
+        assert report.late == []
+        assert report.frames > 30 * 60
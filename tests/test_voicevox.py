@@ -1,8 +1,23 @@
 """VOICEVOX モジュールのテスト."""
 
+import io
+import json
+import threading
+import time
+import zipfile
+from pathlib import Path
+
+import httpx
+import numpy as np
 import pytest
+import soundfile as sf
+from pydantic import ValidationError
 
+from ping_tuber_kai.lipsync.phoneme import extract_phoneme_timeline, get_total_duration
+from ping_tuber_kai.voicevox.client import VoicevoxClient
+from ping_tuber_kai.voicevox.edit import QueryEdit
 from ping_tuber_kai.voicevox.models import AccentPhrase, AudioQuery, Mora
+from ping_tuber_kai.voicevox.view import AudioQueryView, parse_query_view
 
 
 class TestMora:
@@ -110,3 +125,370 @@ class TestAudioQuery:
         assert "speedScale" in data
         assert "prePhonemeLength" in data
         assert data["accent_phrases"][0]["moras"][0]["text"] == "コ"
+
+
+def _engine_wav(data: dict) -> bytes:
+    """VOICEVOX Engineと同じ規則（音素ごとに93.75fpsへ丸め）で長さを決めた無音WAV."""
+    speed = data["speedScale"]
+    lengths = [data["prePhonemeLength"], data["postPhonemeLength"]]
+    for phrase in data["accent_phrases"]:
+        for mora in phrase["moras"]:
+            if mora["consonant"]:
+                lengths.append(mora["consonant_length"])
+            lengths.append(mora["vowel_length"])
+        if phrase["pause_mora"]:
+            pause = data["pauseLength"]
+            if pause is None:
+                pause = phrase["pause_mora"]["vowel_length"]
+            lengths.append(pause * data["pauseLengthScale"])
+
+    frames = np.round(np.array(lengths) * 93.75 / speed).astype(np.int64)
+    buffer = io.BytesIO()
+    sf.write(buffer, np.zeros(int(frames.sum()) * 256, dtype=np.float32), 24000, format="WAV")
+    return buffer.getvalue()
+
+
+class TestQueryEdit:
+    """AudioQuery編集と再合成のテスト."""
+
+    @pytest.fixture
+    def corpus(self) -> list[AudioQuery]:
+        path = Path(__file__).parent / "data" / "audio_queries.json"
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return [AudioQuery.model_validate(item) for item in data]
+
+    @pytest.fixture
+    def engine(self):
+        calls: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            if request.url.path == "/synthesis":
+                return httpx.Response(200, content=_engine_wav(json.loads(request.content)))
+            return httpx.Response(404)
+
+        client = VoicevoxClient(host="http://engine")
+        client._client = httpx.Client(
+            base_url="http://engine", transport=httpx.MockTransport(handler)
+        )
+        yield client, calls
+        client.close()
+
+    def test_apply_does_not_modify_original(self, corpus):
+        """編集は元のクエリを変更しない."""
+        query = corpus[0]
+        edited = QueryEdit(speed_scale=1.5, pre_phoneme_length=0.3).apply(query)
+
+        assert edited.speed_scale == 1.5
+        assert edited.pre_phoneme_length == 0.3
+        assert query.speed_scale == 1.0
+        assert edited.accent_phrases[0].moras[0] is not query.accent_phrases[0].moras[0]
+
+    def test_mora_length_keeps_consonant_ratio(self, corpus):
+        """モーラ長の変更で子音と母音の比率を保つ."""
+        query = corpus[0]
+        index, mora = next(
+            (i, m)
+            for i, m in enumerate(m for p in query.accent_phrases for m in p.moras)
+            if m.consonant
+        )
+        edited = QueryEdit(mora_lengths={index: mora.total_length * 2}).apply(query)
+        new = [m for p in edited.accent_phrases for m in p.moras][index]
+
+        assert new.total_length == pytest.approx(mora.total_length * 2)
+        assert new.consonant_length == pytest.approx(mora.consonant_length * 2)
+
+    def test_invalid_edit(self, corpus):
+        """不正な編集はValueError."""
+        with pytest.raises(ValueError):
+            QueryEdit(speed_scale=0).apply(corpus[0])
+        with pytest.raises(ValueError):
+            QueryEdit(mora_lengths={10_000: 0.1}).apply(corpus[0])
+
+    @pytest.mark.parametrize("speed", [0.5, 0.8, 1.0, 1.37, 2.0])
+    def test_timeline_matches_wav_length(self, corpus, engine, speed):
+        """話速・無音・ポーズを変えてもタイムライン長が合成WAV長と一致する."""
+        client, calls = engine
+        edit = QueryEdit(
+            speed_scale=speed,
+            pre_phoneme_length=0.05,
+            post_phoneme_length=0.2,
+            pause_length_scale=1.5,
+        )
+
+        for query in corpus:
+            edited, wav = client.resynthesize(query, edit)
+            info = sf.info(io.BytesIO(wav))
+            wav_duration = info.frames / info.samplerate
+
+            timeline = extract_phoneme_timeline(edited, quantize=True)
+            end = timeline[-1].end + round(0.2 / speed * 93.75) / 93.75
+            assert get_total_duration(edited, quantize=True) == pytest.approx(wav_duration)
+            assert end == pytest.approx(wav_duration)
+
+            # 丸めなしでもずれは音素あたり半フレーム以内
+            assert abs(get_total_duration(edited) - wav_duration) <= len(timeline) * 0.5 / 93.75
+
+        assert set(calls) == {"/synthesis"}
+
+    def test_speed_scale_shortens_timeline(self, corpus):
+        """話速2倍でタイムラインが半分になる."""
+        query = corpus[0]
+        normal = extract_phoneme_timeline(query)
+        fast = extract_phoneme_timeline(QueryEdit(speed_scale=2.0).apply(query))
+
+        assert fast[-1].end == pytest.approx(normal[-1].end / 2)
+        assert get_total_duration(QueryEdit(speed_scale=2.0).apply(query)) == pytest.approx(
+            get_total_duration(query) / 2
+        )
+
+
+class TestBatchSynthesis:
+    """一括クエリ生成・一括合成のテスト."""
+
+    @staticmethod
+    def _client(multi: bool, delay: float = 0.0):
+        stats = {"in_flight": 0, "max_in_flight": 0, "paths": []}
+        lock = threading.Lock()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            with lock:
+                stats["paths"].append(request.url.path)
+                stats["in_flight"] += 1
+                stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+            time.sleep(delay)
+            with lock:
+                stats["in_flight"] -= 1
+
+            if request.url.path == "/audio_query":
+                text = request.url.params["text"]
+                query = AudioQuery(
+                    accent_phrases=[
+                        AccentPhrase(
+                            moras=[
+                                Mora(text="ア", vowel="a", vowel_length=0.1, pitch=5.0)
+                                for _ in text
+                            ],
+                            accent=1,
+                        )
+                    ],
+                    kana=text,
+                )
+                return httpx.Response(200, json=query.model_dump(by_alias=True))
+            if request.url.path == "/synthesis":
+                data = json.loads(request.content)
+                return httpx.Response(200, content=_engine_wav(data))
+            if request.url.path == "/multi_synthesis" and multi:
+                archive = io.BytesIO()
+                with zipfile.ZipFile(archive, "w") as zf:
+                    for i, data in enumerate(json.loads(request.content)):
+                        zf.writestr(f"{i + 1:03}.wav", _engine_wav(data))
+                return httpx.Response(200, content=archive.getvalue())
+            return httpx.Response(404)
+
+        client = VoicevoxClient(host="http://engine")
+        client._client = httpx.Client(
+            base_url="http://engine", transport=httpx.MockTransport(handler)
+        )
+        return client, stats
+
+    def test_audio_queries_bounded_concurrency(self):
+        """audio_queriesは同時接続数を制限して並行実行し、順序を保つ."""
+        client, stats = self._client(multi=True, delay=0.02)
+        texts = ["あ" * n for n in range(1, 9)]
+
+        queries = client.audio_queries(texts, max_concurrency=3)
+
+        assert [q.kana for q in queries] == texts
+        assert 1 < stats["max_in_flight"] <= 3
+
+    def test_speak_many_uses_multi_synthesis(self):
+        """対応Engineでは/multi_synthesisを1回だけ呼ぶ."""
+        client, stats = self._client(multi=True)
+        texts = ["あ", "ああ", "あああ"]
+
+        results = client.speak_many(texts)
+
+        assert stats["paths"].count("/multi_synthesis") == 1
+        assert "/synthesis" not in stats["paths"]
+        for (query, wav), text in zip(results, texts, strict=True):
+            info = sf.info(io.BytesIO(wav))
+            assert query.kana == text
+            assert info.frames / info.samplerate == pytest.approx(
+                get_total_duration(query, quantize=True)
+            )
+
+    def test_fallback_without_multi_synthesis(self):
+        """非対応Engineでは並行synthesisにフォールバックし、以後は試さない."""
+        client, stats = self._client(multi=False)
+
+        first = client.speak_many(["あ", "ああ"])
+        second = client.speak_many(["あああ", "ああああ"])
+
+        assert len(first) == len(second) == 2
+        assert stats["paths"].count("/multi_synthesis") == 1
+        assert stats["paths"].count("/synthesis") == 4
+
+
+class TestSpeakerWarmup:
+    """話者初期化とクエリキャッシュのテスト."""
+
+    @staticmethod
+    def _client(initialized: set[int], delay: float = 0.0):
+        paths: list[str] = []
+        lock = threading.Lock()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            with lock:
+                paths.append(request.url.path)
+            speaker = int(request.url.params.get("speaker", -1))
+            if request.url.path == "/is_initialized_speaker":
+                return httpx.Response(200, json=speaker in initialized)
+            if request.url.path == "/initialize_speaker":
+                assert request.url.params["skip_reinit"] == "true"
+                time.sleep(delay)
+                with lock:
+                    initialized.add(speaker)
+                return httpx.Response(204)
+            if request.url.path == "/audio_query":
+                query = AudioQuery(
+                    accent_phrases=[
+                        AccentPhrase(
+                            moras=[Mora(text="ア", vowel="a", vowel_length=0.1, pitch=5.0)],
+                            accent=1,
+                        )
+                    ]
+                )
+                return httpx.Response(200, json=query.model_dump(by_alias=True))
+            return httpx.Response(404)
+
+        client = VoicevoxClient(host="http://engine")
+        client._client = httpx.Client(
+            base_url="http://engine", transport=httpx.MockTransport(handler)
+        )
+        return client, paths
+
+    def test_initialize_only_uninitialized(self):
+        """初期化済みの話者は初期化しない."""
+        client, paths = self._client(initialized={1})
+
+        result = client.initialize_speakers([1, 3, 3, 5])
+
+        assert list(result) == [1, 3, 5]
+        assert result[1] == 0.0
+        assert paths.count("/initialize_speaker") == 2
+
+    def test_initialize_concurrently(self):
+        """複数話者の初期化は並行して行う."""
+        client, _ = self._client(initialized=set(), delay=0.1)
+
+        started = time.perf_counter()
+        client.initialize_speakers([1, 2, 3, 4], max_concurrency=4)
+
+        assert time.perf_counter() - started < 0.3
+
+    def test_audio_query_cache(self):
+        """同じテキスト・話者のクエリはキャッシュから複製して返す."""
+        client, paths = self._client(initialized=set())
+
+        first = client.audio_query("あ", 1)
+        first.speed_scale = 2.0
+        second = client.audio_query("あ", 1)
+        client.audio_query("あ", 2)
+
+        assert paths.count("/audio_query") == 2
+        assert second.speed_scale == 1.0
+
+
+class TestFastPath:
+    """JSON直接検証・生JSON転送・軽量ビューのテスト."""
+
+    @pytest.fixture
+    def payload(self) -> bytes:
+        path = Path(__file__).parent / "data" / "audio_queries.json"
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return json.dumps(data[1], ensure_ascii=False).encode()
+
+    def test_from_json_matches_model_validate(self, payload):
+        """from_jsonはmodel_validateと同じ結果になり、元のJSONを保持する."""
+        query = AudioQuery.from_json(payload)
+
+        expected = AudioQuery.model_validate(json.loads(payload))
+        assert query.model_dump() == expected.model_dump()
+        assert query.has_raw_json
+        assert query.to_json() == payload
+
+    def test_modification_discards_raw_json(self, payload):
+        """フィールド変更・編集・明示破棄で再シリアライズに切り替わる."""
+        query = AudioQuery.from_json(payload)
+        assert query.model_copy(deep=True).has_raw_json
+        assert not QueryEdit(speed_scale=1.2).apply(query).has_raw_json
+
+        query.speed_scale = 1.2
+        assert not query.has_raw_json
+        assert json.loads(query.to_json())["speedScale"] == 1.2
+
+        assert not query.model_copy(update={"pitch_scale": 0.1}).has_raw_json
+        assert not AudioQuery.from_json(payload).model_copy(update={"kana": "ア"}).has_raw_json
+
+    def test_nested_edit_discards_raw_json(self, payload):
+        """モーラは変更できず、作り直したアクセント句を渡すと再シリアライズする."""
+        query = AudioQuery.from_json(payload)
+        with pytest.raises(ValidationError):
+            query.accent_phrases[0].moras[0].pitch = 6.5
+        with pytest.raises(TypeError):
+            query.accent_phrases[0].moras[0] = query.accent_phrases[0].moras[1]
+        assert query.to_json() == payload
+
+        phrase = query.accent_phrases[0]
+        mora = phrase.moras[0].model_copy(update={"pitch": 6.5})
+        phrase = phrase.model_copy(update={"moras": (mora, *phrase.moras[1:])})
+        query.accent_phrases = (phrase, *query.accent_phrases[1:])
+        assert json.loads(query.to_json())["accent_phrases"][0]["moras"][0]["pitch"] == 6.5
+
+    def test_edit_keeps_other_queries_raw_json(self, payload):
+        """あるクエリの編集は、同じJSONから作った他のクエリの転送に影響しない."""
+        a = AudioQuery.from_json(payload)
+        b = AudioQuery.from_json(payload)
+
+        edited = QueryEdit(mora_lengths={0: 0.3}).apply(b)
+
+        assert not edited.has_raw_json
+        assert a.has_raw_json and b.has_raw_json
+        assert a.model_copy(deep=True).to_json() == payload
+
+    def test_synthesis_forwards_raw_bytes(self, payload):
+        """未変更のクエリは受け取ったJSONをそのままsynthesisに送る."""
+        sent: list[bytes] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/audio_query":
+                return httpx.Response(200, content=payload)
+            sent.append(request.content)
+            return httpx.Response(200, content=_engine_wav(json.loads(request.content)))
+
+        client = VoicevoxClient(host="http://engine")
+        client._client = httpx.Client(
+            base_url="http://engine", transport=httpx.MockTransport(handler)
+        )
+        query, _ = client.speak("テスト")
+        client.resynthesize(query, QueryEdit(speed_scale=1.5))
+
+        assert sent[0] == payload
+        assert json.loads(sent[1])["speedScale"] == 1.5
+
+    def test_view_timeline_matches_model(self, payload):
+        """軽量ビューから同じタイムラインと総時間が得られる."""
+        query = AudioQuery.from_json(payload)
+        for view in (parse_query_view(payload), AudioQueryView.from_query(query)):
+            assert extract_phoneme_timeline(view, quantize=True) == extract_phoneme_timeline(
+                query, quantize=True
+            )
+            assert get_total_duration(view) == pytest.approx(get_total_duration(query))
+
+    def test_view_rejects_invalid_json(self):
+        """不正なJSONはValueError."""
+        with pytest.raises(ValueError):
+            parse_query_view(b'{"speedScale": 1.0}')
+        with pytest.raises(ValueError):
+            parse_query_view(b"{")